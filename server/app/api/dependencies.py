@@ -0,0 +1,29 @@
+"""
+Request dependencies shared by the API routes.
+
+Until authentication lands, the calling user is identified by the
+`X-User-Id` header, set by the gateway in front of the API. Requests
+without it act as the default user, which owns every row stored
+without a user, unless REQUIRE_USER_ID is on.
+"""
+
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from app.core.config import settings
+
+
+def get_user_id(x_user_id: Optional[int] = Header(None, ge=1)) -> Optional[int]:
+    """
+    User the request acts for, from the X-User-Id header.
+    
+    Returns:
+        Optional[int]: The user ID, or None for the default user
+    
+    Raises:
+        HTTPException: 401 if the header is missing and REQUIRE_USER_ID is on
+    """
+    if x_user_id is None and settings.require_user_id:
+        raise HTTPException(status_code=401, detail="X-User-Id header is required")
+    return x_user_id
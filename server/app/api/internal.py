@@ -0,0 +1,66 @@
+"""
+Internal operational endpoints for PaySplit.AI.
+
+These are meant for operators and monitoring, not for the frontend,
+and are hidden from the OpenAPI schema.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.database import async_engine, engine
+from app.core.metrics import render_metrics
+from app.core.pool import pool_stats
+from app.services.cache import get_cache
+
+
+router = APIRouter(include_in_schema=False)
+
+# Mounted at the application root, where Prometheus scrapes by default
+metrics_router = APIRouter(include_in_schema=False)
+
+
+@router.get("/pool")
+def get_pool_stats():
+    """
+    Live connection pool statistics.
+    - Pool size, checked-out connections and overflow in use
+    - Cumulative checkouts, waits for a free connection, and timeouts
+    """
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.pool) if async_engine is not None else None,
+    }
+
+
+@router.get("/cache")
+def get_cache_stats():
+    """
+    Response cache statistics.
+    - Backend in use
+    - Hit and miss counters, overall and per endpoint
+    """
+    return get_cache().stats()
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Prometheus metrics in the text exposition format.
+    - Request latency histograms per route and status
+    - Queries and DB time per request, and per-stage upload timings
+    - Connection pool and response cache gauges sampled at scrape time
+    """
+    gauges = []
+    pools = {"sync": engine.pool, "async": async_engine.pool if async_engine is not None else None}
+    for name, pool in pools.items():
+        if pool is None:
+            continue
+        for key, value in pool_stats(pool).items():
+            if isinstance(value, (int, float)):
+                gauges.append((f"db_pool_{key}", {"engine": name}, value))
+    cache = get_cache().stats()
+    gauges.append(("response_cache_hits", {}, cache["hits"]))
+    gauges.append(("response_cache_misses", {}, cache["misses"]))
+    
+    return PlainTextResponse(render_metrics(gauges), media_type="text/plain; version=0.0.4")
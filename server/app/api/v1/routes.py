@@ -1,106 +1,593 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.services.csv_parser import parse_csv
-from app.services.transaction_service import TransactionService
-from app.core.database import get_db
+from datetime import date, datetime
+from typing import Optional
+import orjson
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from app.api.dependencies import get_user_id
+from app.services.async_transaction_service import AsyncTransactionService
+from app.services.bank_profiles import get_profile
+from app.services.cache import get_cache
+from app.services.export_service import EXPORT_FORMATS, check_export_format, stream_export
+from app.services.jobs import get_job_manager
+from app.services.statement_readers import check_statement_format
+from app.services.tax_service import QUARTERS, quarter_label
+from app.services.tax_tables import get_tax_table
+from app.core.database import DBSession, get_session, get_session_factory
+from app.core.metrics import timed_stage
+from app.core.money import normalize_currency
 
 
 router = APIRouter()
 
 @router.post("/upload")
 async def upload_csv(
+    response: Response,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    include_transactions: bool = True,
+    background: bool = False,
+    profile: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session)
 ):
     """
-    Endpoint to upload a CSV file for processing.
-    - Accepts only `.csv` files
-    - Parses and stores transactions in database
-    - Returns saved transaction data
+    Endpoint to upload a bank statement for processing.
+    - Accepts `.csv`, `.ofx`, `.qfx` and `.xlsx` (with openpyxl installed) files
+    - The bank's column layout is detected from the CSV or worksheet
+      header; pass `profile` to name it instead
+    - Streams the file in batches and stores transactions in database
+    - Rows with an invalid date, amount or type are skipped and reported
+    - Rows already stored by an earlier upload are skipped and counted;
+      a byte-identical file is recognised without being parsed
+    - Returns saved transaction data (set `include_transactions=false`
+      to keep the response and memory use small for large files)
+    - With `background=true` the file is queued and a job ID is returned
+      immediately (202); poll `/jobs/{job_id}` for progress
+    - Transactions are stored for the user in the `X-User-Id` header
     """
-    # Check if filename exists and is a CSV file
+    # Check if filename exists and has a supported extension
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided.")
     
-    if not file.filename.lower().endswith('.csv'):
-        raise HTTPException(status_code=400, detail="File must be a CSV.")
+    try:
+        check_statement_format(file.filename)
+        if profile is not None:
+            get_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if background:
+        try:
+            job = await run_in_threadpool(
+                get_job_manager().submit_upload, file.file, file.filename, user_id, profile
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error queueing file: {str(e)}")
+        response.status_code = 202
+        return {
+            "message": "File queued for processing.",
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/api/v1/jobs/{job.id}"
+        }
     
     try:
-        # Parse CSV data
-        parsed_data = await parse_csv(file)
-        
-        # Save transactions to database
-        transaction_service = TransactionService(db)
+        # Stream parsed batches straight into a single bulk transaction
+        transaction_service = AsyncTransactionService(db, user_id)
         saved_transactions = []
         
-        for transaction_data in parsed_data:
-            transaction = transaction_service.create_transaction(transaction_data)
-            saved_transactions.append(transaction.to_dict())
+        def collect(transactions):
+            with timed_stage("serialize"):
+                saved_transactions.extend(t.to_dict() for t in transactions)
         
-        return {
-            "message": f"CSV processed successfully. {len(saved_transactions)} transactions saved.",
-            "transactions": saved_transactions
+        result = await transaction_service.import_file(
+            file.file,
+            filename=file.filename,
+            on_batch=collect if include_transactions else None,
+            profile=profile
+        )
+        
+        if result.duplicate_file:
+            message = "File was already uploaded. 0 transactions saved."
+        else:
+            message = (
+                f"CSV processed successfully. {result.inserted} transactions saved, "
+                f"{result.skipped} duplicates skipped."
+            )
+        payload = {
+            "message": message,
+            "count": result.inserted,
+            "skipped_count": result.skipped,
+            "duplicate_file": result.duplicate_file,
+            "rejected_count": result.rejected_count,
+            "rejected": result.rejected
         }
+        if include_transactions:
+            payload["transactions"] = saved_transactions
+        with timed_stage("serialize"):
+            return ORJSONResponse(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
 
 
 @router.get("/transactions")
-def get_transactions(
-    limit: int = 100,
-    db: Session = Depends(get_db)
+async def get_transactions(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session)
 ):
     """
-    Retrieve all transactions from the database.
-    - Returns list of all stored transactions
-    - Supports pagination with limit parameter
+    Retrieve transactions from the database, newest first.
+    - Returns one page of stored transactions
+    - Supports cursor pagination: pass `next_cursor` back as `cursor`
+    - Supports filtering by type, category, amount range and date range
+    - Responses are cached until transactions are next written
     """
     try:
-        transaction_service = TransactionService(db)
-        transactions = transaction_service.get_all_transactions(limit=limit)
-        
-        return {
-            "transactions": [t.to_dict() for t in transactions],
-            "count": len(transactions)
+        transaction_service = AsyncTransactionService(db, user_id)
+        filters = {
+            "limit": limit,
+            "cursor": cursor,
+            "transaction_type": transaction_type,
+            "category": category,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+            "start_date": start_date,
+            "end_date": end_date,
         }
+        
+        async def load_page():
+            # Column rows go straight to orjson: no ORM objects, no to_dict,
+            # no jsonable_encoder. The encoded body is what gets cached.
+            rows, next_cursor = await transaction_service.get_transaction_rows_page(**filters)
+            return orjson.dumps({
+                "transactions": rows,
+                "count": len(rows),
+                "next_cursor": next_cursor
+            }).decode('utf-8')
+        
+        body = await get_cache().get_or_compute("transactions.list.body", filters, load_page, user_id=user_id)
+        return Response(content=body, media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving transactions: {str(e)}")
 
 
+@router.get("/transactions/search")
+async def search_transactions(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session)
+):
+    """
+    Search transaction descriptions, best matches first.
+    - Every word must match the start of a word ("amaz" finds "Amazon")
+    - Backed by FTS5 on SQLite and tsvector/trigram indexes on PostgreSQL
+    - The most recently added matches (up to 5000) come first, ranked;
+      pages past them list older matches, most recently added first
+    - Supports cursor pagination: pass `next_cursor` back as `cursor`
+    - Supports filtering by type, category and date range
+    - Responses are cached until transactions are next written
+    """
+    try:
+        transaction_service = AsyncTransactionService(db, user_id)
+        filters = {
+            "limit": limit,
+            "cursor": cursor,
+            "transaction_type": transaction_type,
+            "category": category,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        
+        async def load_results():
+            rows, next_cursor, backend = await transaction_service.search_transactions(q, **filters)
+            return orjson.dumps({
+                "transactions": rows,
+                "count": len(rows),
+                "next_cursor": next_cursor,
+                "backend": backend
+            }).decode('utf-8')
+        
+        body = await get_cache().get_or_compute(
+            "transactions.search.body", {"q": q, **filters}, load_results, user_id=user_id
+        )
+        return Response(content=body, media_type="application/json")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching transactions: {str(e)}")
+
+
 @router.get("/transactions/summary")
-def get_transaction_summary(db: Session = Depends(get_db)):
+async def get_transaction_summary(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    category: Optional[str] = None,
+    currency: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session)
+):
     """
-    Get a summary of all transactions.
+    Get a summary of the user's transactions.
     - Returns total income, expenses, and net amount
     - Includes transaction counts by type
+    - Supports optional date range, category and currency filters
+    - `currency` is required when the transactions span several currencies
+    - Totals are exact: amounts are summed in integer cents by the database
+    - Responses are cached until transactions are next written
     """
     try:
-        transaction_service = TransactionService(db)
-        summary = transaction_service.get_transaction_summary()
+        transaction_service = AsyncTransactionService(db, user_id)
+        filters = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "category": category,
+            "currency": currency,
+        }
         
-        return summary
+        return await get_cache().get_or_compute(
+            "transactions.summary",
+            filters,
+            lambda: transaction_service.get_transaction_summary(**filters),
+            user_id=user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving summary: {str(e)}")
 
 
+@router.get("/transactions/by-merchant")
+async def get_transactions_by_merchant(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=1000),
+    currency: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session)
+):
+    """
+    Get income and expense totals per merchant.
+    - Merchants are ordered by number of transactions, most frequent first
+    - Grouping runs on the integer merchant id, not the description text
+    - Supports optional date range, type, category and currency filters
+    - `currency` is required when the totals span several currencies
+    - Responses are cached until transactions are next written
+    """
+    try:
+        transaction_service = AsyncTransactionService(db, user_id)
+        filters = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "transaction_type": transaction_type,
+            "category": category,
+            "limit": limit,
+            "currency": currency,
+        }
+        
+        async def load_merchants():
+            merchants = await transaction_service.get_merchant_summary(**filters)
+            return {"merchants": merchants, "count": len(merchants)}
+        
+        return await get_cache().get_or_compute("transactions.by_merchant", filters, load_merchants, user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving merchant totals: {str(e)}")
+
+
+@router.get("/transactions/rollup")
+async def get_transaction_rollup(
+    granularity: str = "month",
+    group_by: Optional[str] = None,
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None,
+    currency: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session)
+):
+    """
+    Get income and expense totals per period from the rollup table.
+    - `granularity` is `month`, `quarter` or `year`
+    - `group_by` optionally splits periods by `category` or `is_business`
+    - `currency` restricts totals to one currency; required when the
+      user's transactions span several currencies
+    - Cost grows with the number of months, not transactions
+    """
+    try:
+        transaction_service = AsyncTransactionService(db, user_id)
+        params = {
+            "granularity": granularity,
+            "group_by": group_by,
+            "start_month": start_month,
+            "end_month": end_month,
+            "currency": currency,
+        }
+        
+        async def load_rollup():
+            periods = await transaction_service.get_rollup(**params)
+            return {"granularity": granularity, "periods": periods}
+        
+        return await get_cache().get_or_compute("transactions.rollup", params, load_rollup, user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving rollup: {str(e)}")
+
+
+@router.get("/analytics/trend")
+async def get_spend_trend(
+    granularity: str = "month",
+    transaction_type: str = "Expense",
+    window: int = Query(3, ge=1, le=120),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    currency: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session),
+    session_factory = Depends(get_session_factory)
+):
+    """
+    Get income or expense totals per period with a rolling average.
+    - `granularity` is `month`, `quarter` or `year`; empty periods count as zero
+    - `window` is the number of periods in the trailing average
+    - Computed from an in-memory columnar snapshot of the user's ledger,
+      refreshed with new rows after writes
+    """
+    try:
+        transaction_service = AsyncTransactionService(db, user_id, session_factory)
+        params = {
+            "granularity": granularity,
+            "transaction_type": transaction_type,
+            "window": window,
+            "start_date": start_date,
+            "end_date": end_date,
+            "currency": currency,
+        }
+        
+        async def load_trend():
+            periods = await transaction_service.get_spend_trend(**params)
+            return {"granularity": granularity, "transaction_type": transaction_type, "periods": periods}
+        
+        return await get_cache().get_or_compute("analytics.trend", params, load_trend, user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving trend: {str(e)}")
+
+
+@router.get("/analytics/categories")
+async def get_category_stats(
+    transaction_type: str = "Expense",
+    percentiles: str = "50,90",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    currency: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session),
+    session_factory = Depends(get_session_factory)
+):
+    """
+    Get count, total, mean and amount percentiles per category.
+    - `percentiles` is a comma-separated list, e.g. `25,50,75,95`
+    - Categories are ordered by total, largest first
+    - Computed from the user's in-memory ledger snapshot
+    """
+    try:
+        transaction_service = AsyncTransactionService(db, user_id, session_factory)
+        try:
+            points = [float(p) for p in percentiles.split(",")]
+        except ValueError:
+            raise ValueError("percentiles must be a comma-separated list of numbers")
+        params = {
+            "transaction_type": transaction_type,
+            "percentiles": points,
+            "start_date": start_date,
+            "end_date": end_date,
+            "currency": currency,
+        }
+        
+        async def load_categories():
+            categories = await transaction_service.get_category_stats(**params)
+            return {"transaction_type": transaction_type, "categories": categories}
+        
+        return await get_cache().get_or_compute("analytics.categories", params, load_categories, user_id=user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving category statistics: {str(e)}")
+
+
+@router.get("/analytics/year-over-year")
+async def get_year_over_year(
+    granularity: str = "month",
+    transaction_type: str = "Expense",
+    currency: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session),
+    session_factory = Depends(get_session_factory)
+):
+    """
+    Get totals per month or quarter next to the same period a year earlier.
+    - `change_pct` is null when the earlier period had no total
+    - Computed from the user's in-memory ledger snapshot
+    """
+    try:
+        transaction_service = AsyncTransactionService(db, user_id, session_factory)
+        params = {
+            "granularity": granularity,
+            "transaction_type": transaction_type,
+            "currency": currency,
+        }
+        
+        async def load_year_over_year():
+            periods = await transaction_service.get_year_over_year(**params)
+            return {"granularity": granularity, "transaction_type": transaction_type, "periods": periods}
+        
+        return await get_cache().get_or_compute(
+            "analytics.year_over_year", params, load_year_over_year, user_id=user_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving year-over-year totals: {str(e)}")
+
+
+@router.get("/tax/estimate")
+async def get_tax_estimate(
+    year: int,
+    filing_status: str = "single",
+    quarter: Optional[int] = Query(None, ge=1, le=4),
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session)
+):
+    """
+    Estimate quarterly self-employment and federal income tax.
+    - Quarters are the IRS payment periods, not calendar quarters: Q1 is
+      January-March, Q2 April-May, Q3 June-August and Q4 September-December
+    - Pass `quarter` (1-4) for one quarter; all four are returned by default
+    - Deductible expenses are each expense's business share
+      (amount x business_percentage)
+    - Estimates are cached per quarter and only recomputed after that
+      quarter's transactions change
+    """
+    try:
+        get_tax_table(year, filing_status)
+        quarters = list(QUARTERS) if quarter is None else [quarter]
+        transaction_service = AsyncTransactionService(db, user_id)
+        
+        async def load_estimates(labels):
+            missing = [q for q in quarters if quarter_label(year, q) in labels]
+            estimates = await transaction_service.get_tax_estimates(
+                year=year, filing_status=filing_status, quarters=missing
+            )
+            return {estimate["period"]: estimate for estimate in estimates}
+        
+        estimates = await get_cache().get_quarters_or_compute(
+            "tax.estimate",
+            {"filing_status": filing_status},
+            [quarter_label(year, q) for q in quarters],
+            load_estimates,
+            user_id=user_id
+        )
+        periods = list(estimates.values())
+        return {
+            "year": year,
+            "filing_status": filing_status,
+            "quarters": periods,
+            "estimated_tax": round(sum(p["estimated_tax"] for p in periods), 2),
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error estimating taxes: {str(e)}")
+
+
+@router.get("/transactions/export")
+async def export_transactions(
+    format: str = "ndjson",
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    currency: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_user_id),
+    session_factory = Depends(get_session_factory)
+):
+    """
+    Download the full ledger, oldest first.
+    - `format` is `ndjson`, `csv` or `parquet` (needs pyarrow)
+    - Rows are streamed from a server-side cursor in constant memory
+    - Supports the same filters as the transaction list, plus currency
+    """
+    try:
+        check_export_format(format)
+        if currency is not None:
+            currency = normalize_currency(currency)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    chunks = stream_export(
+        session_factory,
+        format,
+        user_id=user_id,
+        transaction_type=transaction_type,
+        category=category,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        start_date=start_date,
+        end_date=end_date,
+        currency=currency
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="transactions.{extension}"'}
+    )
+
+
 @router.get("/transactions/{transaction_id}")
-def get_transaction(
+async def get_transaction(
     transaction_id: int,
-    db: Session = Depends(get_db)
+    user_id: Optional[int] = Depends(get_user_id),
+    db: DBSession = Depends(get_session)
 ):
     """
     Retrieve a specific transaction by ID.
     - Returns detailed transaction information
     """
     try:
-        transaction_service = TransactionService(db)
-        transaction = transaction_service.get_transaction_by_id(transaction_id)
+        transaction_service = AsyncTransactionService(db, user_id)
+        
+        async def load_transaction():
+            transaction = await transaction_service.get_transaction_by_id(transaction_id)
+            # Misses are not cached, so a later insert with this ID is seen
+            return transaction.to_dict() if transaction else None
         
-        if not transaction:
+        transaction = await get_cache().get_or_compute(
+            "transactions.detail", {"transaction_id": transaction_id}, load_transaction, user_id=user_id
+        )
+        if transaction is None:
             raise HTTPException(status_code=404, detail="Transaction not found")
         
-        return transaction.to_dict()
+        return transaction
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error retrieving transaction: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error retrieving transaction: {str(e)}")
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, user_id: Optional[int] = Depends(get_user_id)):
+    """
+    Get the status of a background upload.
+    - Returns rows parsed, inserted and rejected so far
+    - Includes elapsed time and throughput in rows per second
+    - Only the user who queued the upload can see it
+    """
+    job = get_job_manager().get(job_id)
+    if job is None or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
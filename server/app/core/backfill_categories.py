@@ -0,0 +1,50 @@
+"""
+Category backfill script for PaySplit.AI.
+
+This script categorizes transactions stored before the categorization
+engine existed, or imported with CATEGORIZER_ENABLED off, and rebuilds
+the rollups afterwards:
+
+    python -m app.core.backfill_categories
+    python -m app.core.backfill_categories --overwrite
+"""
+
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.categorizer import get_categorizer
+from app.services.transaction_service import DEFAULT_BACKFILL_BATCH_SIZE, TransactionService
+
+
+def backfill_categories(batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE, overwrite: bool = False):
+    """
+    Categorize stored transactions in a single database transaction.
+    
+    Args:
+        batch_size: Rows read and categorized per round trip
+        overwrite: Recategorize rows that already have a category
+    """
+    print("Backfilling transaction categories...")
+    
+    def report(processed: int, seconds: float):
+        rate = processed / seconds if seconds else 0.0
+        print(f"  {processed} rows processed, {rate:,.0f} rows/sec")
+    
+    db = SessionLocal()
+    try:
+        updated = TransactionService(db).backfill_categories(batch_size, overwrite, on_progress=report)
+    finally:
+        db.close()
+    
+    stats = get_categorizer().stats()
+    print(f"Transaction categories backfilled successfully! {updated} rows updated "
+          f"({stats['hits']} memo hits, {stats['misses']} misses).")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Categorize stored transactions.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BACKFILL_BATCH_SIZE)
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Recategorize rows that already have a category")
+    args = parser.parse_args()
+    backfill_categories(args.batch_size, args.overwrite)
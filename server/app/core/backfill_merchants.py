@@ -0,0 +1,44 @@
+"""
+Merchant backfill script for PaySplit.AI.
+
+This script links transactions stored before the merchants table
+existed to their merchant, creating merchants as needed:
+
+    python -m app.core.backfill_merchants
+"""
+
+import argparse
+
+from app.core.database import SessionLocal
+from app.services.merchants import get_merchant_directory
+from app.services.transaction_service import DEFAULT_BACKFILL_BATCH_SIZE, TransactionService
+
+
+def backfill_merchants(batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE):
+    """
+    Link stored transactions to merchants in a single database transaction.
+    
+    Args:
+        batch_size: Rows read and resolved per round trip
+    """
+    print("Backfilling transaction merchants...")
+    
+    def report(processed: int, seconds: float):
+        rate = processed / seconds if seconds else 0.0
+        print(f"  {processed} rows processed, {rate:,.0f} rows/sec")
+    
+    db = SessionLocal()
+    try:
+        updated = TransactionService(db).backfill_merchants(batch_size, on_progress=report)
+    finally:
+        db.close()
+    
+    print(f"Transaction merchants backfilled successfully! {updated} rows linked to "
+          f"{get_merchant_directory().stats()['merchants']} merchants.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Link stored transactions to merchants.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+    backfill_merchants(args.batch_size)
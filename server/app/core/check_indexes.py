@@ -0,0 +1,149 @@
+"""
+Index check script for PaySplit.AI.
+
+This script compares the indexes of the live database with the ones
+the models (and the search index) declare, and reports:
+- Missing indexes: declared but not in the database, e.g. a migration
+  that hasn't been run
+- Unexpected indexes: in the database but not declared anywhere
+- Invalid indexes (PostgreSQL): left behind by a failed CREATE INDEX
+  CONCURRENTLY; rerun the migration to rebuild them
+- Unused indexes (PostgreSQL): never scanned since statistics were last
+  reset, so they only slow down writes
+
+    python -m app.core.check_indexes
+
+Exits with status 1 when indexes are missing or invalid.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+from app.core.database import Base
+from app.core.migrations import current_revision, head_revision
+from app.core.search_index import FTS_TABLE, POSTGRESQL_INDEXES, fts_available
+from app.models.merchant import Merchant  # noqa: F401
+from app.models.rollup import TransactionRollup  # noqa: F401
+from app.models.transaction import Transaction  # noqa: F401
+from app.models.upload import UploadedFile  # noqa: F401
+
+
+# Search indexes that are only created when pg_trgm can be installed
+_OPTIONAL_INDEXES = {("transactions", POSTGRESQL_INDEXES[1])}
+
+
+@dataclass
+class IndexReport:
+    """Differences between the declared and the live indexes, as (table, index) pairs."""
+    
+    missing: List[Tuple[str, str]] = field(default_factory=list)
+    unexpected: List[Tuple[str, str]] = field(default_factory=list)
+    invalid: List[Tuple[str, str]] = field(default_factory=list)
+    unused: List[Tuple[str, str]] = field(default_factory=list)
+    # Whether the database reports index usage (PostgreSQL only)
+    usage_available: bool = False
+    revision: Optional[str] = None
+    head: Optional[str] = None
+    
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.invalid
+
+
+def declared_indexes(dialect: str) -> Set[Tuple[str, str]]:
+    """(table, index) pairs the models and search index declare for a database."""
+    declared = {
+        (table.name, index.name)
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+    }
+    if dialect == "postgresql":
+        declared.add(("transactions", POSTGRESQL_INDEXES[0]))
+    return declared
+
+
+def check_indexes(connection: Connection) -> IndexReport:
+    """
+    Compare the live indexes of the model tables with the declared ones.
+    
+    Only tables declared by the models are inspected; unique and primary
+    key constraints are not indexes here and are left out.
+    """
+    dialect = connection.dialect.name
+    inspector = inspect(connection)
+    live = set()
+    for table in Base.metadata.sorted_tables:
+        if inspector.has_table(table.name):
+            live.update((table.name, name) for name in _live_index_names(connection, inspector, table.name))
+    
+    declared = declared_indexes(dialect)
+    report = IndexReport(
+        missing=sorted(declared - live),
+        unexpected=sorted(live - declared - _OPTIONAL_INDEXES),
+        revision=current_revision(connection),
+        head=head_revision(),
+    )
+    if dialect == "sqlite" and inspector.has_table("transactions") and not fts_available(connection):
+        report.missing.append(("transactions", FTS_TABLE))
+    
+    if dialect == "postgresql":
+        report.usage_available = True
+        report.invalid = [tuple(row) for row in connection.execute(text(
+            "SELECT c.relname, ic.relname FROM pg_index i "
+            "JOIN pg_class ic ON ic.oid = i.indexrelid JOIN pg_class c ON c.oid = i.indrelid "
+            "WHERE NOT i.indisvalid ORDER BY 1, 2"
+        ))]
+        report.unused = [tuple(row) for row in connection.execute(text(
+            "SELECT s.relname, s.indexrelname FROM pg_stat_user_indexes s "
+            "JOIN pg_index i ON i.indexrelid = s.indexrelid "
+            "WHERE s.idx_scan = 0 AND NOT i.indisunique AND NOT i.indisprimary ORDER BY 1, 2"
+        ))]
+    return report
+
+
+def _live_index_names(connection: Connection, inspector, table: str) -> List[str]:
+    """
+    Names of a table's indexes.
+    
+    SQLite's reflection skips expression indexes such as the rollup key,
+    so there they are read from sqlite_master; indexes without SQL are
+    the automatic ones behind unique and primary key constraints.
+    """
+    if connection.dialect.name == "sqlite":
+        return list(connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table AND sql IS NOT NULL"
+        ), {"table": table}).scalars())
+    return [index["name"] for index in inspector.get_indexes(table)]
+
+
+def print_report(report: IndexReport) -> None:
+    print(f"Schema revision: {report.revision or 'none'} (latest: {report.head})")
+    sections = [
+        ("Missing indexes", report.missing),
+        ("Unexpected indexes", report.unexpected),
+        ("Invalid indexes", report.invalid),
+    ]
+    if report.usage_available:
+        sections.append(("Unused indexes (never scanned since statistics were reset)", report.unused))
+    for title, indexes in sections:
+        print(f"{title}: {len(indexes)}")
+        for table, index in indexes:
+            print(f"  - {table}.{index}")
+    if not report.usage_available:
+        print("Unused indexes: not reported by this database")
+
+
+if __name__ == "__main__":
+    from app.core.database import engine
+    
+    print("Checking database indexes...")
+    with engine.connect() as connection:
+        result = check_indexes(connection)
+    print_report(result)
+    if not result.ok:
+        sys.exit(1)
+    print("Database indexes checked successfully!")
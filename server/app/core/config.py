@@ -0,0 +1,128 @@
+"""
+Application settings for PaySplit.AI.
+
+All tunables are read from environment variables (or a `.env` file) once
+at startup, so production deployments can size the database pool and
+turn off SQL logging without code changes.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return float(value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Database and runtime settings.
+    
+    Environment variables:
+    - DATABASE_URL / ASYNC_DATABASE_URL: connection URLs
+    - DB_ECHO: log every SQL statement (default off)
+    - DB_POOL_SIZE: persistent connections per engine (default 5)
+    - DB_MAX_OVERFLOW: extra connections allowed under load (default 10)
+    - DB_POOL_TIMEOUT: seconds to wait for a free connection (default 30)
+    - DB_POOL_RECYCLE: seconds before a connection is replaced, -1 to disable (default 1800)
+    - DB_POOL_PRE_PING: test connections before use (default on)
+    - DB_STATEMENT_TIMEOUT_MS: per-statement timeout on PostgreSQL (default none)
+    - CACHE_BACKEND: response cache, 'memory', 'redis' or 'none' (default memory)
+    - CACHE_TTL_SECONDS: lifetime of cached responses (default 60)
+    - CACHE_MAX_ENTRIES: size of the in-process LRU (default 1024)
+    - ANALYTICS_MAX_SNAPSHOTS: users whose ledger snapshot is kept in memory (default 64)
+    - ANALYTICS_SNAPSHOT_MAX_AGE: seconds before a snapshot is reloaded when the
+      cache isn't shared between workers (default 300)
+    - REDIS_URL: Redis server for CACHE_BACKEND=redis
+    - JOB_WORKERS: concurrent background upload imports per process (default 2)
+    - INGEST_WORKERS: experimental; processes parsing large background uploads
+      in parallel, 0 for one per CPU (default 1: parse in the importing thread).
+      Not yet faster than serial parsing in benchmarks
+    - UPLOAD_SPOOL_DIR: where background uploads are spooled (default system temp dir)
+    - DEBUG_TIMING: honour X-Debug-Timing request headers (default true)
+    - CATEGORIZER_ENABLED: categorize transactions as they are imported (default true)
+    - REQUIRE_USER_ID: reject API requests without an X-User-Id header (default off)
+    - DEFAULT_CURRENCY: currency of imported rows without a Currency column (default USD)
+    """
+    
+    database_url: str = "postgresql://taanishqsethi@localhost:5432/paysplit_ai"
+    async_database_url: Optional[str] = None
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: Optional[int] = None
+    cache_backend: str = "memory"
+    cache_ttl_seconds: float = 60.0
+    cache_max_entries: int = 1024
+    analytics_max_snapshots: int = 64
+    analytics_snapshot_max_age: float = 300.0
+    redis_url: str = "redis://localhost:6379/0"
+    job_workers: int = 2
+    ingest_workers: int = 1
+    upload_spool_dir: Optional[str] = None
+    debug_timing: bool = True
+    categorizer_enabled: bool = True
+    require_user_id: bool = False
+    default_currency: str = "USD"
+    
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build settings from environment variables, falling back to defaults."""
+        defaults = cls()
+        return cls(
+            database_url=os.getenv("DATABASE_URL", defaults.database_url),
+            async_database_url=os.getenv("ASYNC_DATABASE_URL") or None,
+            db_echo=_env_bool("DB_ECHO", defaults.db_echo),
+            db_pool_size=_env_int("DB_POOL_SIZE", defaults.db_pool_size),
+            db_max_overflow=_env_int("DB_MAX_OVERFLOW", defaults.db_max_overflow),
+            db_pool_timeout=_env_float("DB_POOL_TIMEOUT", defaults.db_pool_timeout),
+            db_pool_recycle=_env_int("DB_POOL_RECYCLE", defaults.db_pool_recycle),
+            db_pool_pre_ping=_env_bool("DB_POOL_PRE_PING", defaults.db_pool_pre_ping),
+            db_statement_timeout_ms=_env_int("DB_STATEMENT_TIMEOUT_MS", defaults.db_statement_timeout_ms),
+            cache_backend=os.getenv("CACHE_BACKEND", defaults.cache_backend).strip().lower(),
+            cache_ttl_seconds=_env_float("CACHE_TTL_SECONDS", defaults.cache_ttl_seconds),
+            cache_max_entries=_env_int("CACHE_MAX_ENTRIES", defaults.cache_max_entries),
+            analytics_max_snapshots=_env_int("ANALYTICS_MAX_SNAPSHOTS", defaults.analytics_max_snapshots),
+            analytics_snapshot_max_age=_env_float(
+                "ANALYTICS_SNAPSHOT_MAX_AGE", defaults.analytics_snapshot_max_age
+            ),
+            redis_url=os.getenv("REDIS_URL", defaults.redis_url),
+            job_workers=_env_int("JOB_WORKERS", defaults.job_workers),
+            ingest_workers=_env_int("INGEST_WORKERS", defaults.ingest_workers),
+            upload_spool_dir=os.getenv("UPLOAD_SPOOL_DIR") or None,
+            debug_timing=_env_bool("DEBUG_TIMING", defaults.debug_timing),
+            categorizer_enabled=_env_bool("CATEGORIZER_ENABLED", defaults.categorizer_enabled),
+            require_user_id=_env_bool("REQUIRE_USER_ID", defaults.require_user_id),
+            default_currency=os.getenv("DEFAULT_CURRENCY", defaults.default_currency).strip().upper(),
+        )
+
+
+# Settings used by the application
+settings = Settings.from_env()
@@ -3,34 +3,72 @@ Database configuration and connection setup for PaySplit.AI.
 
 This module handles:
 - Database connection setup
-- Session management
+- Session management (sync, and async when configured)
 - Database URL configuration
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from sqlalchemy.orm import Session, sessionmaker
+from typing import Any, Dict, Union
+from app.core.config import Settings, settings
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 
-# Load environment variables
-load_dotenv()
 
-# Database URL - use environment variable or default to SQLite for development
-DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
-    "postgresql://taanishqsethi@localhost:5432/paysplit_ai"
-)
+def engine_options(url: str, config: Settings, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build create_engine keyword arguments from settings.
+    
+    Pool sizing only applies to server databases; SQLite keeps
+    SQLAlchemy's default pool for its file or in-memory mode.
+    """
+    dialect = make_url(url).get_backend_name()
+    options: Dict[str, Any] = {"echo": config.db_echo, "pool_pre_ping": config.db_pool_pre_ping}
+    
+    if dialect != "sqlite":
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout,
+            pool_recycle=config.db_pool_recycle,
+        )
+    
+    if config.db_statement_timeout_ms and dialect == "postgresql":
+        timeout = str(config.db_statement_timeout_ms)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    
+    return options
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    echo=True  # Set to False in production to reduce log noise
-)
+
+# Database URL - use DATABASE_URL or the development PostgreSQL database
+DATABASE_URL = settings.database_url
+
+# Create SQLAlchemy engine (SQL echo and pool sizing come from settings)
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, settings))
+
+# Async database URL - set it (e.g. postgresql+asyncpg://... or
+# sqlite+aiosqlite:///...) to serve requests through the async engine
+ASYNC_DATABASE_URL = settings.async_database_url
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create the async engine and AsyncSessionLocal class when configured
+async_engine = (
+    create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, settings, is_async=True))
+    if ASYNC_DATABASE_URL else None
+)
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -46,4 +84,34 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+# Dependency to get an async database session
+async def get_async_db():
+    """
+    Async database session dependency for FastAPI.
+    
+    Yields an AsyncSession bound to the async engine. Only usable when
+    ASYNC_DATABASE_URL is configured.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("ASYNC_DATABASE_URL is not configured")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency used by the routes: async when configured, sync otherwise
+DBSession = Union[Session, AsyncSession]
+get_session = get_async_db if AsyncSessionLocal is not None else get_db
+
+
+# Dependency to get a session factory for work that outlives the request
+def get_session_factory() -> sessionmaker:
+    """
+    Session factory dependency for streamed responses.
+    
+    FastAPI closes yield dependencies before a StreamingResponse body is
+    sent, so streaming endpoints open (and close) their own session.
+    """
+    return SessionLocal
@@ -1,31 +1,34 @@
 """
 Database initialization script for PaySplit.AI.
 
-This script creates all database tables and sets up the initial database structure.
-Run this script once to set up your database.
+This script brings the database to the latest schema revision (see
+app.core.migrations). A new database gets its tables from the models;
+an existing one is upgraded with the Alembic revisions in
+server/migrations, which build new indexes without locking writes.
+It's safe to run on every deploy.
 """
 
 from app.core.database import engine, Base
-from app.models.transaction import Transaction
+from app.core.migrations import head_revision, migrate
 
 
 def init_db():
     """
-    Initialize the database by creating all tables.
+    Initialize or upgrade the database schema.
     
-    This function creates all tables defined in your models.
-    It's safe to run multiple times (tables won't be recreated if they exist).
+    Tables that don't exist yet are created, existing databases are
+    migrated to the latest revision, and databases created before
+    migrations existed are adopted.
     """
-    print("Creating database tables...")
+    print("Migrating database schema...")
     
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    action = migrate(engine)
     
-    print("Database tables created successfully!")
+    print(f"Database schema {action} successfully! Revision: {head_revision()}")
     print("Available tables:")
     for table_name in Base.metadata.tables.keys():
         print(f"  - {table_name}")
 
 
 if __name__ == "__main__":
-    init_db() 
\ No newline at end of file
+    init_db()
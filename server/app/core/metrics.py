@@ -0,0 +1,282 @@
+"""
+Request and database instrumentation for PaySplit.AI.
+
+This module handles:
+- Per-request statistics (queries, DB time, named stages) kept in a
+  context variable, so code anywhere below a request can add to them
+- SQLAlchemy cursor hooks that count queries and time spent in the database
+- ASGI middleware recording latency histograms per route
+- Rendering everything in the Prometheus text exposition format
+
+Metrics are kept in process memory with no client library; with several
+workers, each worker exposes its own series.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Default latency buckets in seconds (the Prometheus client defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for the number of queries issued by one request
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Request header asking for the X-Debug-Timing response header
+DEBUG_TIMING_HEADER = "x-debug-timing"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered Prometheus-style."""
+    
+    def __init__(self, name: str, help: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            # Layout: one count per bucket, then +Inf count, then sum
+            series = self._series.setdefault(labels, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+    
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            base = _format_labels(self.label_names, labels)
+            for bound, count in zip(self.buckets, series):
+                yield f"{self.name}_bucket{_with_le(base, repr(float(bound)))} {_format_number(count)}"
+            yield f"{self.name}_bucket{_with_le(base, '+Inf')} {_format_number(series[-2])}"
+            yield f"{self.name}_count{base} {_format_number(series[-2])}"
+            yield f"{self.name}_sum{base} {_format_number(series[-1])}"
+
+
+class Counter:
+    """Monotonic counter with labels."""
+    
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+    
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = dict(self._values)
+        for labels, value in sorted(snapshot.items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_number(value)}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _with_le(labels: str, bound: str) -> str:
+    le = f'le="{bound}"'
+    return "{" + le + "}" if not labels else labels[:-1] + "," + le + "}"
+
+
+def _format_number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency",
+    ("method", "route", "status"), LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "Database queries issued per HTTP request",
+    ("method", "route"), QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds", "Time spent in the database per HTTP request",
+    ("method", "route"), LATENCY_BUCKETS
+)
+REQUEST_STAGE_TIME = Histogram(
+    "http_request_stage_duration_seconds", "Time spent per named stage of an HTTP request",
+    ("route", "stage"), LATENCY_BUCKETS
+)
+DB_QUERIES = Counter("db_queries_total", "Database queries issued, inside or outside requests")
+DB_TIME = Counter("db_query_duration_seconds_total", "Time spent in the database, inside or outside requests")
+
+METRICS = (REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME, REQUEST_STAGE_TIME, DB_QUERIES, DB_TIME)
+
+
+@dataclass
+class RequestStats:
+    """Statistics accumulated while serving one request."""
+    
+    queries: int = 0
+    db_seconds: float = 0.0
+    stages: Dict[str, float] = field(default_factory=dict)
+    
+    def add_stage(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+# The stats object is shared by reference, so work moved to the threadpool
+# (which copies the context) still adds to the request's totals
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    """Statistics of the request being served, or None outside a request."""
+    return _current_stats.get()
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[None]:
+    """Add the time spent in the block to the current request's `stage`."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_stage(stage, time.perf_counter() - start)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERIES.inc()
+    DB_TIME.inc(elapsed)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+_hooks_installed = False
+
+
+def install_query_hooks() -> None:
+    """Count and time every cursor execution on every engine (idempotent)."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _hooks_installed = True
+
+
+def format_debug_timing(stats: RequestStats, total_seconds: float) -> str:
+    """Render request statistics for the X-Debug-Timing response header."""
+    parts = [f"total={total_seconds * 1000:.1f}ms", f"db={stats.db_seconds * 1000:.1f}ms", f"queries={stats.queries}"]
+    parts.extend(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in stats.stages.items())
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, query counts and DB time per route.
+    
+    Routes are labelled by their path template (`/transactions/{transaction_id}`),
+    never the raw path, to keep the number of series bounded. Requests
+    sending an `X-Debug-Timing` header get the per-request breakdown back
+    in an `X-Debug-Timing` response header when `debug_timing` is on.
+    """
+    
+    def __init__(self, app: Any, debug_timing: bool = True):
+        self.app = app
+        self.debug_timing = debug_timing
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+        wants_timing = self.debug_timing and any(
+            name == DEBUG_TIMING_HEADER.encode() for name, _ in scope.get("headers", [])
+        )
+        
+        async def send_with_metrics(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if wants_timing:
+                    header = format_debug_timing(stats, time.perf_counter() - start)
+                    message = {**message, "headers": [*message.get("headers", []), (b"x-debug-timing", header.encode())]}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _current_stats.reset(token)
+            elapsed = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            REQUEST_LATENCY.observe(elapsed, method, route, str(status))
+            REQUEST_QUERIES.observe(stats.queries, method, route)
+            REQUEST_DB_TIME.observe(stats.db_seconds, method, route)
+            for stage, seconds in stats.stages.items():
+                REQUEST_STAGE_TIME.observe(seconds, route, stage)
+
+
+def render_metrics(gauges: Iterable[Tuple[str, Dict[str, str], float]] = ()) -> str:
+    """
+    Render all metrics in the Prometheus text format.
+    
+    Args:
+        gauges: Extra (name, labels, value) samples taken at scrape time
+    """
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    
+    typed = set()
+    for name, labels, value in sorted(gauges, key=lambda g: g[0]):
+        if name not in typed:
+            lines.append(f"# TYPE {name} gauge")
+            typed.add(name)
+        lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_number(value)}")
+    return "\n".join(lines) + "\n"
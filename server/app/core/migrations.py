@@ -0,0 +1,158 @@
+"""
+Schema migrations for PaySplit.AI.
+
+Migrations are Alembic revisions in server/migrations. This module holds
+what the revisions and init_db share:
+- Building an Alembic config bound to an engine or connection
+- Bringing a database to the latest revision, including databases that
+  were created with `create_all` before migrations existed
+- Operation helpers that keep revisions safe to run against a live
+  database: indexes are built with CREATE INDEX CONCURRENTLY on
+  PostgreSQL (no write lock on the table), and every step is skipped
+  when its table, column or index already exists
+"""
+
+import os
+from typing import Any, Optional, Sequence
+
+from alembic import command, op
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.search_index import FTS_TABLE, POSTGRESQL_INDEXES
+
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# First revision: the transactions table as created before migrations existed
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """
+    Alembic config for server/migrations.
+    
+    Args:
+        connection: Connection to migrate; defaults to the application engine
+    """
+    config = Config(os.path.join(SERVER_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(SERVER_DIR, "migrations"))
+    config.attributes["connection"] = connection
+    # Keep the application's logging setup when migrating from code
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Leave the search index (see app.core.search_index) out of autogenerate."""
+    if type_ == "table" and name.startswith(FTS_TABLE):
+        return False
+    if type_ == "index" and name in POSTGRESQL_INDEXES:
+        return False
+    return True
+
+
+def head_revision() -> str:
+    """Latest revision in server/migrations."""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """Revision the database is at, or None if it has never been migrated."""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def migrate(bind: Engine, revision: str = "head") -> str:
+    """
+    Bring a database up to `revision`.
+    
+    - Empty database: tables are created from the models and stamped
+      with the head revision, without replaying history
+    - Database created with `create_all` before migrations existed:
+      stamped with the baseline revision, then upgraded; revisions skip
+      the tables, columns and indexes it already has
+    - Migrated database: upgraded
+    
+    Returns:
+        str: What was done: 'created', 'adopted' or 'upgraded'
+    """
+    # Imported here so the models are registered on Base.metadata
+    from app.core.database import Base
+    from app.models.merchant import Merchant  # noqa: F401
+    from app.models.rollup import TransactionRollup  # noqa: F401
+    from app.models.transaction import Transaction  # noqa: F401
+    from app.models.upload import UploadedFile  # noqa: F401
+    
+    with bind.connect() as connection:
+        revision_before = current_revision(connection)
+        has_transactions = inspect(connection).has_table("transactions")
+    
+    if revision_before is None and not has_transactions and revision == "head":
+        Base.metadata.create_all(bind=bind)
+        with bind.begin() as connection:
+            command.stamp(alembic_config(connection), "head")
+        return "created"
+    
+    action = "upgraded"
+    if revision_before is None and has_transactions:
+        with bind.begin() as connection:
+            command.stamp(alembic_config(connection), BASELINE_REVISION)
+        action = "adopted"
+    with bind.connect() as connection:
+        command.upgrade(alembic_config(connection), revision)
+        connection.commit()
+    return action
+
+
+def has_table(name: str) -> bool:
+    """Whether the migrated database has a table (never, when emitting SQL offline)."""
+    if op.get_context().as_sql:
+        return False
+    return inspect(op.get_bind()).has_table(name)
+
+
+def has_column(table: str, column: str) -> bool:
+    """Whether a table of the migrated database has a column (never, when emitting SQL offline)."""
+    if op.get_context().as_sql:
+        return False
+    return any(c["name"] == column for c in inspect(op.get_bind()).get_columns(table))
+
+
+def create_index_online(name: str, table: str, columns: Sequence[Any], unique: bool = False) -> None:
+    """
+    Create an index unless it exists, without blocking writes on PostgreSQL.
+    
+    `columns` are column names or `sa.text` expressions.
+    
+    On PostgreSQL the index is built with CREATE INDEX CONCURRENTLY,
+    outside the revision's transaction. A concurrent build that failed
+    earlier leaves an INVALID index behind, which is dropped and rebuilt.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.create_index(name, table, list(columns), unique=unique, if_not_exists=True)
+        return
+    
+    with op.get_context().autocommit_block():
+        invalid = not op.get_context().as_sql and bind.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name}).first() is not None
+        if invalid:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+        op.create_index(
+            name, table, list(columns), unique=unique, if_not_exists=True, postgresql_concurrently=True
+        )
+
+
+def drop_index_online(name: str, table: str) -> None:
+    """Drop an index if it exists, with DROP INDEX CONCURRENTLY on PostgreSQL."""
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,137 @@
+"""
+Money amounts for PaySplit.AI.
+
+Amounts are stored as integer cents (hundredths of the currency unit)
+in a BIGINT column, so sums are exact and computed by the database;
+floats only appear at the API boundary, converted once from the exact
+total. This module handles:
+- Vectorized parsing of CSV amounts such as "$1,234.56" or "(45.00)"
+- Converting single values to and from cents
+- Validating ISO 4217 currency codes
+- Refusing to add up amounts in different currencies
+"""
+
+import math
+from typing import Any, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Cents per currency unit; amounts are kept at two decimal places
+CENTS_PER_UNIT = 100
+
+# Largest absolute amount accepted, in cents. Parsing goes through
+# float64, which represents every cent exactly up to 2**53.
+MAX_ABS_CENTS = 10 ** 15
+
+# Currency the database assigns to rows written without one; imports
+# use settings.default_currency instead
+DEFAULT_CURRENCY = 'USD'
+
+# Amount string cleanup: currency symbols, thousands separators and
+# spaces are dropped, and "(45.00)" (a negative in bank exports) becomes
+# "-45.00"
+_AMOUNT_TRANSLATION = {ord(c): None for c in " \t\xa0,$€£¥)"}
+_AMOUNT_TRANSLATION[ord("(")] = "-"
+
+# Commas that can't be thousands separators: not followed by exactly three
+# digits, or after the decimal point. Catches decimal commas ("1.234,56"),
+# which would otherwise be misread once commas are dropped
+_MISPLACED_COMMA = r",(?!\d{3}(?!\d))|\..*,"
+
+
+def parse_cents(values: pd.Series) -> np.ndarray:
+    """
+    Parse a column of amounts into cents.
+    
+    Numbers and plain numeric strings take the `pd.to_numeric` fast path.
+    Otherwise currency symbols, spaces and thousands separators are
+    dropped and "(45.00)" means -45.00. Amounts with more than two
+    decimals are rounded to the nearest cent.
+    
+    Args:
+        values: Raw amounts, e.g. a CSV column
+    
+    Returns:
+        np.ndarray: float64 cents with NaN for missing or invalid amounts
+            (including decimal commas and amounts beyond MAX_ABS_CENTS)
+    """
+    try:
+        amount = pd.to_numeric(values)
+    except (ValueError, TypeError):
+        text = values.astype(str)
+        amount = pd.to_numeric(text.str.translate(_AMOUNT_TRANSLATION), errors='coerce')
+        amount = amount.where(~text.str.contains(_MISPLACED_COMMA))
+    
+    cents = np.rint(amount.to_numpy(dtype=float, na_value=np.nan) * CENTS_PER_UNIT)
+    cents[~(np.abs(cents) <= MAX_ABS_CENTS)] = np.nan
+    return cents
+
+
+def to_cents(value: Any) -> int:
+    """
+    Parse one amount into cents, accepting the same formats as `parse_cents`.
+    
+    Raises:
+        ValueError: If the amount is missing or invalid
+    """
+    cents = parse_cents(pd.Series([value], dtype=object))[0]
+    if np.isnan(cents):
+        raise ValueError(f"invalid amount: {value!r}")
+    return int(cents)
+
+
+def from_cents(cents: int) -> float:
+    """Amount in currency units, for API responses."""
+    return cents / CENTS_PER_UNIT
+
+
+def business_cents(cents: int, percentage: float) -> int:
+    """
+    Cents of an amount attributed to business use.
+    
+    Rounded half away from zero per transaction, like the SQL ROUND in
+    `RollupService.rebuild`, so incremental and rebuilt rollups agree.
+    """
+    share = cents * (percentage or 0.0)
+    return int(math.copysign(math.floor(abs(share) + 0.5), share))
+
+
+def normalize_currency(code: Any) -> str:
+    """
+    Upper-case, stripped ISO 4217 currency code.
+    
+    Raises:
+        ValueError: If the code is not three letters
+    """
+    normalized = str(code).strip().upper()
+    if len(normalized) != 3 or not normalized.isascii() or not normalized.isalpha():
+        raise ValueError(f"currency must be a three-letter ISO 4217 code, got {code!r}")
+    return normalized
+
+
+def single_currency(currencies: Iterable[str]) -> Optional[str]:
+    """
+    The one currency of amounts about to be added together.
+    
+    Totals requested without a currency filter are only meaningful when
+    every amount is in the same currency; cents of different currencies
+    are never summed.
+    
+    Args:
+        currencies: Currency of each amount (or group of amounts)
+    
+    Returns:
+        Optional[str]: The shared currency, None when there are no amounts
+    
+    Raises:
+        ValueError: If the amounts are in more than one currency
+    """
+    found = sorted(set(currencies))
+    if len(found) > 1:
+        raise ValueError(
+            f"amounts are in more than one currency ({', '.join(found)}); "
+            f"pass currency to choose one"
+        )
+    return found[0] if found else None
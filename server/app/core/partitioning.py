@@ -0,0 +1,194 @@
+"""
+Optional PostgreSQL partitioning of the transactions table.
+
+The ORM creates a plain transactions table, which the user-led indexes
+keep fast for any number of users. Very large deployments can instead
+create it as a declaratively partitioned table, before running init_db
+on a new database:
+- user: HASH (user_id) partitions, so each user's rows, indexes and
+  vacuum work stay in one small partition. Every row needs a user, so
+  run the API with REQUIRE_USER_ID on
+- month: RANGE (date) partitions, one per month, plus a default
+  partition for dates outside the created months. Old months can be
+  detached or dropped in one statement
+
+Partitioned tables need the partition key in their primary key and
+unique indexes, so the primary key becomes (id, key) and the fingerprint
+index (fingerprint, key). Fingerprints hash the user and the date, so
+deduplication is unchanged.
+
+    python -m app.core.partitioning user --partitions 16           # print the DDL
+    python -m app.core.partitioning month --start 2020-01 --end 2026-12 --apply
+    python -m app.core.partitioning month --start 2027-01 --end 2027-12 --add-months --apply
+    python -m app.core.init_db
+"""
+
+import argparse
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from app.core.search_index import create_search_index
+from app.models.merchant import Merchant
+from app.models.transaction import Transaction
+
+
+# Partition key column of each scheme
+PARTITION_KEYS = {"user": "user_id", "month": "date"}
+
+DEFAULT_HASH_PARTITIONS = 16
+
+# Indexes of the plain table replaced by the partitioned definitions
+_REPLACED_INDEXES = ("ix_transactions_id", "uq_transactions_fingerprint")
+
+
+def partitioned_table_ddl(
+    scheme: str,
+    partitions: int = DEFAULT_HASH_PARTITIONS,
+    start_month: Optional[date] = None,
+    end_month: Optional[date] = None
+) -> List[str]:
+    """
+    DDL creating the transactions table partitioned by `scheme`.
+    
+    Columns and indexes are taken from the Transaction model, so the
+    partitioned table matches what the ORM expects.
+    
+    Args:
+        scheme: 'user' or 'month'
+        partitions: Number of hash partitions, for 'user'
+        start_month: First monthly partition, for 'month'
+        end_month: Last monthly partition, for 'month'
+    
+    Returns:
+        List of SQL statements, in execution order
+    
+    Raises:
+        ValueError: If the scheme or its options are invalid
+    """
+    if scheme not in PARTITION_KEYS:
+        raise ValueError(f"scheme must be one of {', '.join(PARTITION_KEYS)}")
+    key = PARTITION_KEYS[scheme]
+    dialect = postgresql.dialect()
+    table = Transaction.__table__
+    
+    columns = []
+    for column in table.columns:
+        definition = str(CreateColumn(column).compile(dialect=dialect))
+        if column.name == key and column.nullable:
+            definition += " NOT NULL"
+        columns.append(definition)
+    columns.append(f"PRIMARY KEY (id, {key})")
+    for fk in table.foreign_keys:
+        columns.append(f"FOREIGN KEY ({fk.parent.name}) REFERENCES {fk.column.table.name} ({fk.column.name})")
+    
+    partition_by = "HASH (user_id)" if scheme == "user" else "RANGE (date)"
+    statements = [
+        f"CREATE TABLE {table.name} (\n    " + ",\n    ".join(columns) + f"\n) PARTITION BY {partition_by}"
+    ]
+    
+    if scheme == "user":
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        statements += [
+            f"CREATE TABLE {table.name}_p{i} PARTITION OF {table.name} "
+            f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})"
+            for i in range(partitions)
+        ]
+    else:
+        if start_month is None or end_month is None:
+            raise ValueError("start_month and end_month are required for monthly partitions")
+        statements += month_partition_ddl(start_month, end_month)
+        statements.append(f"CREATE TABLE {table.name}_default PARTITION OF {table.name} DEFAULT")
+    
+    # Indexes on the partitioned table are created on every partition
+    statements += [
+        str(CreateIndex(index).compile(dialect=dialect))
+        for index in sorted(table.indexes, key=lambda index: index.name)
+        if index.name not in _REPLACED_INDEXES
+    ]
+    statements.append(f"CREATE UNIQUE INDEX uq_transactions_fingerprint ON {table.name} (fingerprint, {key})")
+    return statements
+
+
+def month_partition_ddl(start_month: date, end_month: date) -> List[str]:
+    """
+    DDL adding one partition per month from `start_month` to `end_month`.
+    
+    Months already created are skipped. A month can't be added while
+    the default partition holds rows dated in it; move those rows first.
+    
+    Raises:
+        ValueError: If end_month is before start_month
+    """
+    month = start_month.replace(day=1)
+    if end_month.replace(day=1) < month:
+        raise ValueError("end_month must not be before start_month")
+    
+    statements = []
+    while month <= end_month:
+        following = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS transactions_y{month.year}m{month.month:02d} PARTITION OF transactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+    return statements
+
+
+def create_partitioned_transactions(connection: Connection, statements: List[str]) -> None:
+    """
+    Run partitioning DDL, creating the merchants table and search index around it.
+    
+    Raises:
+        ValueError: If the connection is not to PostgreSQL
+    """
+    if connection.dialect.name != "postgresql":
+        raise ValueError("Partitioning requires PostgreSQL")
+    Merchant.__table__.create(connection, checkfirst=True)
+    for statement in statements:
+        connection.execute(text(statement))
+    create_search_index(connection)
+
+
+def _month(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m").date()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create a partitioned transactions table on PostgreSQL.")
+    parser.add_argument("scheme", choices=sorted(PARTITION_KEYS))
+    parser.add_argument("--partitions", type=int, default=DEFAULT_HASH_PARTITIONS,
+                        help="Number of hash partitions (user)")
+    parser.add_argument("--start", type=_month, help="First month, YYYY-MM (month)")
+    parser.add_argument("--end", type=_month, help="Last month, YYYY-MM (month)")
+    parser.add_argument("--add-months", action="store_true",
+                        help="Only add monthly partitions to an existing table")
+    parser.add_argument("--apply", action="store_true",
+                        help="Run the DDL against DATABASE_URL instead of printing it")
+    args = parser.parse_args()
+    
+    if args.add_months:
+        if args.scheme != "month" or args.start is None or args.end is None:
+            parser.error("--add-months needs the month scheme with --start and --end")
+        ddl = month_partition_ddl(args.start, args.end)
+    else:
+        ddl = partitioned_table_ddl(args.scheme, args.partitions, args.start, args.end)
+    
+    if not args.apply:
+        print(";\n\n".join(ddl) + ";")
+    else:
+        from app.core.database import engine
+        
+        print(f"Creating {args.scheme} partitions of the transactions table...")
+        with engine.begin() as connection:
+            if args.add_months:
+                for statement in ddl:
+                    connection.execute(text(statement))
+            else:
+                create_partitioned_transactions(connection, ddl)
+        print(f"Transactions partitions created successfully! {len(ddl)} statements run.")
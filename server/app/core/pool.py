@@ -0,0 +1,89 @@
+"""
+Connection pool instrumentation for PaySplit.AI.
+
+The stock QueuePool reports its size and checked-out connections, but
+not how often requests had to wait for a connection. These subclasses
+add wait and timeout counters so pools can be sized per worker from
+live numbers.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class _WaitTrackingMixin:
+    """Counts checkouts that found the pool exhausted and had to wait."""
+    
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+    
+    def _do_get(self):
+        # Same condition QueuePool uses to decide to block on its queue
+        exhausted = self.checkedin() == 0 and self.overflow() >= self._max_overflow > -1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self.checkouts += 1
+                if exhausted:
+                    self.waits += 1
+                    self.wait_seconds += time.perf_counter() - start
+    
+    def recreate(self):
+        # Keep counters across pool recreation (e.g. after engine.dispose())
+        pool = super().recreate()
+        pool.checkouts, pool.waits = self.checkouts, self.waits
+        pool.wait_seconds, pool.timeouts = self.wait_seconds, self.timeouts
+        return pool
+
+
+class InstrumentedQueuePool(_WaitTrackingMixin, QueuePool):
+    """QueuePool with wait/timeout counters, for sync engines."""
+
+
+class InstrumentedAsyncQueuePool(_WaitTrackingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with wait/timeout counters, for async engines."""
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """
+    Snapshot the state of a connection pool.
+    
+    Args:
+        pool: The engine's pool (`engine.pool` or `async_engine.pool`)
+        
+    Returns:
+        Dict with pool sizing, live usage and, for instrumented pools,
+        cumulative checkout/wait/timeout counters
+    """
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    if isinstance(pool, _WaitTrackingMixin):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "waits": pool.waits,
+            "wait_time_ms": round(pool.wait_seconds * 1000, 3),
+            "timeouts": pool.timeouts,
+        })
+    return stats
@@ -0,0 +1,35 @@
+"""
+Rollup rebuild script for PaySplit.AI.
+
+This script recomputes the transaction_rollups table from the
+transactions table. Run it after bulk data fixes made outside the API,
+or to compact rollups that concurrent uploads split across rows:
+
+    python -m app.core.rebuild_rollups
+"""
+
+from app.core.database import SessionLocal
+from app.services.rollup_service import RollupService
+
+
+def rebuild_rollups():
+    """
+    Rebuild all transaction rollups in a single database transaction.
+    """
+    print("Rebuilding transaction rollups...")
+    
+    db = SessionLocal()
+    try:
+        rows = RollupService(db).rebuild()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    
+    print(f"Transaction rollups rebuilt successfully! {rows} rollup rows written.")
+
+
+if __name__ == "__main__":
+    rebuild_rollups()
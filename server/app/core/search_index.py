@@ -0,0 +1,169 @@
+"""
+Full-text search index for transaction descriptions.
+
+The index lives outside the ORM models because each database builds it
+differently:
+- SQLite: an FTS5 external-content table over transactions.description,
+  kept in sync by triggers
+- PostgreSQL: a GIN index on to_tsvector('simple', description) and,
+  when the pg_trgm extension can be installed, a trigram GIN index for
+  fuzzy matches
+- Anything else: no index; search falls back to a LIKE scan
+
+`create_search_index` runs automatically after the transactions table
+is created and is safe to run again on an existing database. Searches
+check for the index once per engine (`search_index_available`); an index
+created or dropped by another process, e.g. a migration, is seen after
+a restart:
+
+    python -m app.core.search_index
+"""
+
+import logging
+import weakref
+from contextlib import nullcontext
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration used by the PostgreSQL index and queries;
+# 'simple' doesn't stem, which suits merchant names
+TSVECTOR_CONFIG = "simple"
+
+FTS_TABLE = "transactions_fts"
+
+_SQLITE_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description,
+        content='transactions',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF description ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+)
+
+POSTGRESQL_INDEXES = ("ix_transactions_description_tsv", "ix_transactions_description_trgm")
+
+# Result of search_index_available per engine
+_available: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+
+_POSTGRESQL_TSVECTOR_DDL = (
+    "CREATE INDEX {concurrently}IF NOT EXISTS ix_transactions_description_tsv ON transactions "
+    f"USING gin (to_tsvector('{TSVECTOR_CONFIG}', description))"
+)
+
+_POSTGRESQL_TRIGRAM_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX {concurrently}IF NOT EXISTS ix_transactions_description_trgm ON transactions "
+    "USING gin (description gin_trgm_ops)",
+)
+
+
+def create_search_index(connection: Connection, concurrently: bool = False) -> None:
+    """
+    Create the search index for the connection's database, if missing.
+    
+    On SQLite the FTS table is rebuilt from the transactions table, so
+    running this against an existing database indexes the stored rows.
+    
+    Args:
+        connection: Connection to the database
+        concurrently: Build the PostgreSQL indexes with CREATE INDEX
+            CONCURRENTLY; the connection must be in autocommit mode
+    """
+    _available.pop(connection.engine, None)
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        existed = fts_available(connection)
+        for statement in _SQLITE_DDL:
+            connection.execute(text(statement))
+        if not existed:
+            connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        keyword = "CONCURRENTLY " if concurrently else ""
+        connection.execute(text(_POSTGRESQL_TSVECTOR_DDL.format(concurrently=keyword)))
+        try:
+            # The extension needs privileges the application role may not
+            # have; search then works without fuzzy matching. In autocommit
+            # mode a failed statement leaves nothing to roll back
+            with nullcontext() if concurrently else connection.begin_nested():
+                for statement in _POSTGRESQL_TRIGRAM_DDL:
+                    connection.execute(text(statement.format(concurrently=keyword)))
+        except DBAPIError as e:
+            logger.warning("pg_trgm unavailable, fuzzy search disabled: %s", e)
+
+
+def drop_search_index(connection: Connection) -> None:
+    """Drop the SQLite FTS table and its triggers, or the PostgreSQL indexes."""
+    _available.pop(connection.engine, None)
+    if connection.dialect.name == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            connection.execute(text(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}"))
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+    elif connection.dialect.name == "postgresql":
+        for name in POSTGRESQL_INDEXES:
+            connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def fts_available(connection: Connection) -> bool:
+    """Whether the SQLite FTS table exists."""
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first() is not None
+
+
+def trigram_available(connection: Connection) -> bool:
+    """Whether the PostgreSQL trigram index exists."""
+    return connection.execute(
+        text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": POSTGRESQL_INDEXES[1]}
+    ).first() is not None
+
+
+def search_index_available(connection: Connection) -> bool:
+    """
+    Whether the database has the SQLite FTS table or the PostgreSQL
+    trigram index, checked on an engine's first call and then cached.
+    """
+    engine = connection.engine
+    available = _available.get(engine)
+    if available is None:
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            available = fts_available(connection)
+        elif dialect == "postgresql":
+            available = trigram_available(connection)
+        else:
+            available = False
+        _available[engine] = available
+    return available
+
+
+if __name__ == "__main__":
+    from app.core.database import engine
+    
+    print("Creating transaction search index...")
+    with engine.begin() as connection:
+        create_search_index(connection)
+    print("Transaction search index created successfully!")
@@ -1,9 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.routes import router as v1_router
+from app.api.internal import metrics_router, router as internal_router
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, install_query_hooks
 
 app = FastAPI(title='PaySplit-AI', version='0.1.0')
 
+# Count queries and DB time on every engine, attributed to the current request
+install_query_hooks()
+
 # CORS configuration so that the frontend can communicate with the backend
 app.add_middleware(
     CORSMiddleware,
@@ -14,5 +20,14 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Latency histograms per route and the optional X-Debug-Timing header
+app.add_middleware(MetricsMiddleware, debug_timing=settings.debug_timing)
+
 # Include the API router for version 1
-app.include_router(v1_router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(v1_router, prefix="/api/v1")
+
+# Include internal operational endpoints (pool statistics, etc.)
+app.include_router(internal_router, prefix="/internal")
+
+# Prometheus scrape endpoint
+app.include_router(metrics_router)
@@ -0,0 +1,34 @@
+"""
+Database models for merchants.
+
+This module defines the merchants dimension table. Every transaction's
+description is normalized to a merchant key during upload, and the
+transaction stores the merchant's integer id, so grouping by merchant
+compares integers instead of free text.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class Merchant(Base):
+    """
+    A merchant, identified by its normalized description.
+    """
+    
+    __tablename__ = "merchants"
+    
+    id = Column(Integer, primary_key=True)
+    
+    # Normalized key, see app.services.merchants.normalize_merchant
+    name = Column(String(255), nullable=False, unique=True)
+    
+    # Description the merchant was first seen with, for display
+    display_name = Column(String(255), nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        """String representation of the merchant."""
+        return f"<Merchant(id={self.id}, name='{self.name}')>"
@@ -0,0 +1,65 @@
+"""
+Database models for precomputed transaction rollups.
+
+This module defines the rollup table that stores monthly sums and counts
+per (user, month, currency, type, category, business flag), so dashboard and
+analytic queries read O(months) rows instead of every transaction.
+"""
+
+from sqlalchemy import BigInteger, Column, Integer, String, Date, Boolean, Index, func, literal_column
+from app.core.database import Base
+from app.core.money import DEFAULT_CURRENCY
+
+
+class TransactionRollup(Base):
+    """
+    Monthly aggregate of transactions sharing the same rollup key.
+    
+    Rows are maintained incrementally by TransactionService and can be
+    rebuilt from scratch with `python -m app.core.rebuild_rollups`.
+    There is exactly one row per key (see ROLLUP_KEY), so concurrent
+    writers upsert into the same row.
+    """
+    
+    __tablename__ = "transaction_rollups"
+    
+    # Primary key
+    id = Column(Integer, primary_key=True)
+    
+    # Rollup key
+    user_id = Column(Integer, nullable=True)
+    month = Column(Date, nullable=False)  # First day of the month
+    currency = Column(String(3), nullable=False, server_default=DEFAULT_CURRENCY)
+    transaction_type = Column(String(50), nullable=False)
+    category = Column(String(100), nullable=True)
+    is_business = Column(Boolean, nullable=False, default=False)
+    
+    # Aggregates, in integer cents like Transaction.amount_cents
+    total_cents = Column(BigInteger, nullable=False, default=0)
+    business_cents = Column(BigInteger, nullable=False, default=0)  # Sum of app.core.money.business_cents
+    transaction_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        """String representation of the rollup row."""
+        return (
+            f"<TransactionRollup(month={self.month}, type='{self.transaction_type}', "
+            f"category='{self.category}', count={self.transaction_count})>"
+        )
+
+
+# Stand-ins for NULL in the unique key, which would otherwise never
+# conflict: user ids start at 1 and categories are never empty
+NO_USER = literal_column("0")
+NO_CATEGORY = literal_column("''")
+
+# Rollup key as indexed; ON CONFLICT targets must repeat it exactly
+ROLLUP_KEY = (
+    func.coalesce(TransactionRollup.user_id, NO_USER),
+    TransactionRollup.month,
+    TransactionRollup.currency,
+    TransactionRollup.transaction_type,
+    func.coalesce(TransactionRollup.category, NO_CATEGORY),
+    TransactionRollup.is_business,
+)
+
+Index("uq_transaction_rollups_key", *ROLLUP_KEY, unique=True)
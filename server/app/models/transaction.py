@@ -7,9 +7,13 @@ This module defines the database schema for:
 - Categories (future feature)
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Index, cast, event
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.money import CENTS_PER_UNIT, DEFAULT_CURRENCY, from_cents
+from app.core.search_index import create_search_index, drop_search_index
+from app.models.merchant import Merchant  # noqa: F401  (registers the table merchant_id refers to)
 
 
 class Transaction(Base):
@@ -21,14 +25,35 @@ class Transaction(Base):
     """
     
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Every query is scoped to one user, so indexes lead with user_id
+        # and a user's reads touch only their own index range, however
+        # many other users share the table.
+        # Keyset pagination walks (date, id) newest first; the filtered
+        # variants let type/category filters use the same ordering
+        Index("ix_transactions_user_date_id", "user_id", "date", "id"),
+        Index("ix_transactions_user_type_date_id", "user_id", "transaction_type", "date", "id"),
+        Index("ix_transactions_user_category_date_id", "user_id", "category", "date", "id"),
+        # Uploads skip rows whose fingerprint already exists; rows created
+        # one at a time have no fingerprint and are never deduplicated.
+        # Fingerprints include the user, so one index serves all users
+        Index("uq_transactions_fingerprint", "fingerprint", unique=True),
+        # Covers the per-merchant aggregates, so grouping never visits the table
+        Index(
+            "ix_transactions_user_merchant_type_amount_date",
+            "user_id", "merchant_id", "transaction_type", "amount_cents", "date"
+        ),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
     
     # Transaction details
-    date = Column(DateTime, nullable=False, index=True)
+    date = Column(DateTime, nullable=False)
     description = Column(Text, nullable=False)
-    amount = Column(Float, nullable=False)
+    # Integer cents, so sums are exact; see app.core.money
+    amount_cents = Column(BigInteger, nullable=False)
+    currency = Column(String(3), nullable=False, server_default=DEFAULT_CURRENCY)  # ISO 4217 code
     transaction_type = Column(String(50), nullable=False)  # 'Income' or 'Expense'
     
     # Categorization fields (for future AI features)
@@ -40,8 +65,24 @@ class Transaction(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    # User association (for future multi-user support)
-    user_id = Column(Integer, nullable=True, index=True)
+    # Owning user; None for the default user, see TransactionService
+    user_id = Column(Integer, nullable=True)
+    
+    # Hash of the normalized row, see app.services.dedup.RowFingerprinter
+    fingerprint = Column(String(64), nullable=True)
+    
+    # Merchant the description normalizes to, see app.services.merchants
+    merchant_id = Column(Integer, ForeignKey("merchants.id"), nullable=True)
+    
+    @hybrid_property
+    def amount(self) -> float:
+        """Amount in currency units, for display; aggregate amount_cents instead."""
+        return from_cents(self.amount_cents)
+    
+    @amount.inplace.expression
+    @classmethod
+    def _amount_expression(cls):
+        return (cast(cls.amount_cents, Float) / CENTS_PER_UNIT).label("amount")
     
     def __repr__(self):
         """String representation of the transaction."""
@@ -59,10 +100,17 @@ class Transaction(Base):
             "date": self.date.isoformat() if date else None,
             "description": self.description,
             "amount": self.amount,
+            "amount_cents": self.amount_cents,
+            "currency": self.currency,
             "transaction_type": self.transaction_type,
             "category": self.category,
             "is_business": self.is_business,
             "business_percentage": self.business_percentage,
             "created_at": self.created_at.isoformat() if created_at else None,
             "updated_at": self.updated_at.isoformat() if updated_at else None,
-        } 
\ No newline at end of file
+        } 
+
+
+# The description search index is built with dialect-specific DDL, see app.core.search_index
+event.listen(Transaction.__table__, "after_create", lambda target, connection, **kw: create_search_index(connection))
+event.listen(Transaction.__table__, "before_drop", lambda target, connection, **kw: drop_search_index(connection))
@@ -0,0 +1,38 @@
+"""
+Database models for uploaded files.
+
+This module records every imported file by content hash, so an
+identical re-upload can be answered without parsing it again.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class UploadedFile(Base):
+    """
+    A successfully imported upload, identified by its SHA-256 digest.
+    """
+    
+    __tablename__ = "uploaded_files"
+    __table_args__ = (
+        # Re-uploads are recognised per user
+        Index("ix_uploaded_files_user_sha256", "user_id", "sha256"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False)
+    filename = Column(String(255), nullable=True)
+    user_id = Column(Integer, nullable=True)
+    
+    # Row counts of the original import
+    rows_inserted = Column(Integer, nullable=False, default=0)
+    rows_skipped = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        """String representation of the uploaded file."""
+        return f"<UploadedFile(id={self.id}, filename='{self.filename}', sha256='{self.sha256[:12]}')>"
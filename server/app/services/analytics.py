@@ -0,0 +1,406 @@
+"""
+Columnar ledger analytics for PaySplit.AI.
+
+Trend, percentile and year-over-year queries run on a per-user snapshot
+of the ledger held in memory as NumPy-backed columns, sorted by date, so
+they never scan the transactions table. This module handles:
+- Loading snapshots and refreshing them after writes: appended rows are
+  fetched by id and merged in; deletes and in-place updates reload
+- Vectorized aggregation: periods are integer month numbers grouped with
+  `np.bincount`, date ranges are found with `np.searchsorted`
+- Rolling averages, per-category percentiles and year-over-year changes
+
+Freshness follows the response cache (see app.services.cache). A new
+cache epoch (a backfill) reloads the snapshot. With a cache shared by
+all worker processes (Redis), a snapshot is reused without queries while
+its user's data version and the epoch are unchanged. Otherwise writes
+made by other workers bump no version this worker can see, so every
+request compares the snapshot with the table's row count and highest
+id. That catches imports and deletes but not in-place updates, so such
+snapshots are also reloaded once older than ANALYTICS_SNAPSHOT_MAX_AGE.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.money import from_cents, normalize_currency, single_currency
+from app.models.transaction import Transaction
+from app.services.cache import ResponseCache, get_cache
+from app.services.csv_parser import TRANSACTION_TYPES
+from app.services.rollup_service import GRANULARITIES, period_label
+from app.services.transaction_service import owned_by
+
+
+# Snapshot columns, loaded from the transactions table
+SNAPSHOT_COLUMNS = (
+    "id",
+    "date",
+    "amount_cents",
+    "currency",
+    "transaction_type",
+    "category",
+    "is_business",
+    "business_percentage",
+)
+
+# Months per period of each granularity
+PERIOD_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
+
+# Percentiles reported per category
+DEFAULT_PERCENTILES = (50, 90)
+
+
+@dataclass
+class LedgerSnapshot:
+    """
+    One user's transactions as columns, sorted by date.
+    
+    `month` is the month number `year * 12 + month - 1` of each row, the
+    key every period aggregate is computed from. `version` is the cache
+    (epoch, user version) the snapshot was checked against, and
+    `loaded_at` the `time.monotonic()` of its last full load.
+    """
+    
+    frame: pd.DataFrame
+    max_id: int
+    version: Optional[Tuple[int, int]] = None
+    loaded_at: float = field(default_factory=time.monotonic)
+    
+    @property
+    def month(self) -> np.ndarray:
+        return self.frame["month"].to_numpy()
+    
+    def __len__(self) -> int:
+        return len(self.frame)
+
+
+class AnalyticsStore:
+    """
+    Per-user ledger snapshots, least recently used evicted first.
+    
+    Shared by all threads of a worker; each worker process keeps its own.
+    """
+    
+    def __init__(self, max_snapshots: int = 64, max_age: float = 300.0):
+        self.max_snapshots = max_snapshots
+        self.max_age = max_age
+        self._snapshots: "OrderedDict[Optional[int], LedgerSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def snapshot(self, db: Session, user_id: Optional[int] = None) -> LedgerSnapshot:
+        """
+        Return a user's snapshot, loading or refreshing it if the data changed.
+        
+        Args:
+            db: Session used to read new or changed transactions
+            user_id: User whose transactions are snapshotted
+        """
+        cache = get_cache()
+        version = _data_version(cache, user_id)
+        with self._lock:
+            snapshot = self._snapshots.get(user_id)
+            if snapshot is not None:
+                self._snapshots.move_to_end(user_id)
+        
+        if snapshot is None:
+            refreshed = _load(db, user_id)
+        elif version is not None and snapshot.version is not None and version[0] != snapshot.version[0]:
+            # A new epoch means rows may have been updated in place
+            refreshed = _load(db, user_id)
+        elif cache.shared and snapshot.version == version:
+            return snapshot
+        elif not cache.shared and time.monotonic() - snapshot.loaded_at > self.max_age:
+            # Other workers' in-place updates bump no version seen here
+            refreshed = _load(db, user_id)
+        else:
+            refreshed = _append_new_rows(db, user_id, snapshot)
+        refreshed.version = version
+        
+        with self._lock:
+            self._snapshots[user_id] = refreshed
+            self._snapshots.move_to_end(user_id)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return refreshed
+    
+    def clear(self) -> None:
+        """Drop every snapshot."""
+        with self._lock:
+            self._snapshots.clear()
+
+
+class AnalyticsService:
+    """Service class for analytics over one user's ledger snapshot."""
+    
+    def __init__(self, db: Session, user_id: Optional[int] = None):
+        self.db = db
+        self.user_id = user_id
+    
+    def get_spend_trend(
+        self,
+        granularity: str = 'month',
+        transaction_type: str = 'Expense',
+        window: int = 3,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        currency: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Totals per period with a trailing rolling average.
+        
+        Periods without transactions are included with a zero total, so
+        the rolling window always spans `window` consecutive periods.
+        
+        Args:
+            granularity: 'month', 'quarter' or 'year'
+            transaction_type: 'Income' or 'Expense'
+            window: Number of periods averaged, including the current one
+            start_date: Only include transactions on or after this date
+            end_date: Only include transactions on or before this date
+            currency: Only include amounts in this currency; required when
+                the matching rows span more than one currency
+        
+        Returns:
+            List of per-period totals, oldest first
+        
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        
+        snapshot, rows = self._select(transaction_type, start_date, end_date, currency)
+        periods = snapshot.month[rows] // PERIOD_MONTHS[granularity]
+        if len(periods) == 0:
+            return []
+        
+        first = periods.min()
+        totals = np.bincount(periods - first, weights=snapshot.frame["amount_cents"].to_numpy()[rows])
+        counts = np.bincount(periods - first)
+        # Sums of whole cents stay exact in float64 below 2**53
+        totals = totals.astype(np.int64)
+        rolling = pd.Series(totals).rolling(window, min_periods=1).mean().to_numpy()
+        
+        return [
+            {
+                "period": _period_label(first + offset, granularity),
+                "total": from_cents(int(totals[offset])),
+                "count": int(counts[offset]),
+                "rolling_average": round(from_cents(float(rolling[offset])), 2),
+            }
+            for offset in range(len(totals))
+        ]
+    
+    def get_category_stats(
+        self,
+        transaction_type: str = 'Expense',
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        currency: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Count, total, mean and percentiles of transaction amounts per category.
+        
+        Returns:
+            List of per-category statistics, largest total first;
+            uncategorized transactions have category None
+        
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        if any(not 0 <= p <= 100 for p in percentiles):
+            raise ValueError("percentiles must be between 0 and 100")
+        
+        snapshot, rows = self._select(transaction_type, start_date, end_date, currency)
+        if len(rows) == 0:
+            return []
+        amounts = snapshot.frame["amount_cents"].iloc[rows]
+        groups = amounts.groupby(snapshot.frame["category"].iloc[rows].fillna(""), sort=False)
+        stats = groups.agg(["count", "sum", "mean"])
+        quantiles = groups.quantile([p / 100 for p in percentiles]).unstack()
+        
+        results = []
+        for category, row in stats.sort_values("sum", ascending=False).iterrows():
+            results.append({
+                "category": category or None,
+                "count": int(row["count"]),
+                "total": from_cents(int(row["sum"])),
+                "mean": round(from_cents(row["mean"]), 2),
+                "percentiles": {
+                    f"p{p:g}": round(from_cents(quantiles.loc[category, p / 100]), 2) for p in percentiles
+                },
+            })
+        return results
+    
+    def get_year_over_year(
+        self,
+        granularity: str = 'month',
+        transaction_type: str = 'Expense',
+        currency: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Totals per month or quarter next to the same period a year earlier.
+        
+        Returns:
+            List of periods, oldest first, with `previous_year_total` and
+            `change_pct` (None when the earlier period had no total)
+        
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        if granularity not in ('month', 'quarter'):
+            raise ValueError("granularity must be one of month, quarter")
+        
+        snapshot, rows = self._select(transaction_type, None, None, currency)
+        per_year = 12 // PERIOD_MONTHS[granularity]
+        periods = snapshot.month[rows] // PERIOD_MONTHS[granularity]
+        if len(periods) == 0:
+            return []
+        
+        # Start a year early so the first year has its comparison periods
+        first = periods.min() - per_year
+        totals = np.bincount(
+            periods - first, weights=snapshot.frame["amount_cents"].to_numpy()[rows]
+        ).astype(np.int64)
+        current, previous = totals[per_year:], totals[:-per_year]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where(previous != 0, (current - previous) / np.abs(previous) * 100, np.nan)
+        
+        return [
+            {
+                "period": _period_label(first + per_year + offset, granularity),
+                "total": from_cents(int(current[offset])),
+                "previous_year_total": from_cents(int(previous[offset])),
+                "change_pct": None if np.isnan(change[offset]) else round(float(change[offset]), 2),
+            }
+            for offset in range(len(current))
+        ]
+    
+    def _select(
+        self,
+        transaction_type: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        currency: Optional[str]
+    ) -> Tuple[LedgerSnapshot, np.ndarray]:
+        """
+        The user's snapshot and the positions of its rows matching the filters.
+        
+        Raises:
+            ValueError: If a filter is invalid, or currency is None and the
+                matching rows are in more than one currency
+        """
+        if transaction_type not in TRANSACTION_TYPES:
+            raise ValueError(f"transaction_type must be one of {', '.join(TRANSACTION_TYPES)}")
+        
+        snapshot = get_analytics_store().snapshot(self.db, self.user_id)
+        dates = snapshot.frame["date"].to_numpy()
+        # Rows are sorted by date, so a date range is a slice
+        lo = 0 if start_date is None else np.searchsorted(dates, np.datetime64(start_date, 'ns'), side='left')
+        hi = len(dates) if end_date is None else np.searchsorted(dates, np.datetime64(end_date, 'ns'), side='right')
+        
+        frame = snapshot.frame.iloc[lo:hi]
+        mask = (frame["transaction_type"] == transaction_type).to_numpy()
+        if currency is not None:
+            mask &= (frame["currency"] == normalize_currency(currency)).to_numpy()
+        else:
+            codes = frame["currency"].cat.codes.to_numpy()[mask]
+            single_currency(frame["currency"].cat.categories[np.unique(codes)])
+        return snapshot, lo + np.flatnonzero(mask)
+
+
+def _data_version(cache: ResponseCache, user_id: Optional[int]) -> Optional[Tuple[int, int]]:
+    """(cache epoch, user data version), or None when the cache is disabled."""
+    if not cache.enabled:
+        return None
+    return cache.epoch(), cache.version(user_id)
+
+
+def _period_label(period: int, granularity: str) -> str:
+    """Label of a period number, counted in units of `granularity` from year 0."""
+    month = int(period) * PERIOD_MONTHS[granularity]
+    return period_label(date(month // 12, month % 12 + 1, 1), granularity)
+
+
+def _query(user_id: Optional[int], after_id: Optional[int] = None):
+    columns = [getattr(Transaction, name) for name in SNAPSHOT_COLUMNS]
+    query = select(*columns).where(owned_by(Transaction.user_id, user_id))
+    if after_id is not None:
+        query = query.where(Transaction.id > after_id)
+    return query
+
+
+def _to_frame(rows: List[Tuple]) -> pd.DataFrame:
+    """Build snapshot columns from result rows, sorted by date."""
+    frame = pd.DataFrame.from_records(rows, columns=SNAPSHOT_COLUMNS)
+    frame["date"] = pd.to_datetime(frame["date"]).astype("datetime64[ns]")
+    frame["amount_cents"] = frame["amount_cents"].astype(np.int64)
+    frame["is_business"] = frame["is_business"].fillna(False).astype(bool)
+    frame["business_percentage"] = frame["business_percentage"].fillna(0.0).astype(float)
+    frame["transaction_type"] = frame["transaction_type"].astype("category")
+    frame["currency"] = frame["currency"].astype("category")
+    frame["month"] = (frame["date"].dt.year * 12 + frame["date"].dt.month - 1).astype(np.int64)
+    return frame.sort_values("date", kind="stable", ignore_index=True)
+
+
+def _load(db: Session, user_id: Optional[int]) -> LedgerSnapshot:
+    frame = _to_frame(db.execute(_query(user_id)).all())
+    return LedgerSnapshot(frame=frame, max_id=int(frame["id"].max()) if len(frame) else 0)
+
+
+def _append_new_rows(db: Session, user_id: Optional[int], snapshot: LedgerSnapshot) -> LedgerSnapshot:
+    """
+    Merge rows inserted since the snapshot was taken, or reload if rows
+    were deleted: the table then no longer has exactly the snapshot's
+    rows plus the new ones.
+    """
+    count = db.execute(
+        select(func.count(Transaction.id)).where(owned_by(Transaction.user_id, user_id))
+    ).scalar_one()
+    new_rows = db.execute(_query(user_id, after_id=snapshot.max_id)).all()
+    if len(snapshot) + len(new_rows) != count:
+        return _load(db, user_id)
+    if not new_rows:
+        return LedgerSnapshot(frame=snapshot.frame, max_id=snapshot.max_id, loaded_at=snapshot.loaded_at)
+    
+    new = _to_frame(new_rows)
+    frame = pd.concat([snapshot.frame, new], ignore_index=True)
+    for column in ("transaction_type", "currency"):
+        # concat falls back to object columns when the categories differ
+        if not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype("category")
+    if not frame["date"].is_monotonic_increasing:
+        frame = frame.sort_values("date", kind="stable", ignore_index=True)
+    return LedgerSnapshot(frame=frame, max_id=int(new["id"].max()), loaded_at=snapshot.loaded_at)
+
+
+_analytics_store: Optional[AnalyticsStore] = None
+
+
+def get_analytics_store() -> AnalyticsStore:
+    """Return the process-wide snapshot store, creating it on first use."""
+    global _analytics_store
+    if _analytics_store is None:
+        _analytics_store = AnalyticsStore(
+            max_snapshots=settings.analytics_max_snapshots, max_age=settings.analytics_snapshot_max_age
+        )
+    return _analytics_store
+
+
+def set_analytics_store(store: Optional[AnalyticsStore]) -> None:
+    """Replace the process-wide snapshot store (used by tests)."""
+    global _analytics_store
+    _analytics_store = store
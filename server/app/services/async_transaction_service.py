@@ -0,0 +1,248 @@
+"""
+Async transaction service for non-blocking database operations.
+
+This module provides the async counterpart of TransactionService used by
+the API routes. It works with either kind of session:
+- AsyncSession (ASYNC_DATABASE_URL configured): queries go through the
+  async driver, with the ORM logic shared via `AsyncSession.run_sync`
+- Session (default): each call runs in the threadpool
+Either way, database round trips never block the event loop. Analytics
+always run in the threadpool: building a snapshot is pandas work that
+`run_sync` would run on the event loop, so under an AsyncSession they
+use a sync session of their own.
+"""
+
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.models.transaction import Transaction
+from app.services.analytics import AnalyticsService
+from app.services.cache import get_cache
+from app.services.csv_parser import DEFAULT_BATCH_SIZE, NormalizedBatch
+from app.services.dedup import RowFingerprinter, file_sha256
+from app.services.rollup_service import RollupService
+from app.services.statement_readers import iter_statement_batches
+from app.services.tax_service import TaxEstimateService, payment_periods_of
+from app.services.transaction_service import DEFAULT_CHUNK_SIZE, ImportResult, TransactionService
+
+
+class AsyncTransactionService:
+    """
+    Async service class for transaction database operations.
+    
+    Scoped to one user like TransactionService. `session_factory` opens
+    the sync sessions analytics use when `db` is an AsyncSession.
+    """
+    
+    def __init__(
+        self,
+        db: Union[AsyncSession, Session],
+        user_id: Optional[int] = None,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.db = db
+        self.user_id = user_id
+        self.session_factory = session_factory
+    
+    async def _run(self, fn: Callable[[TransactionService], Any]) -> Any:
+        """Run `fn` against a TransactionService without blocking the event loop."""
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(lambda session: fn(TransactionService(session, self.user_id)))
+        return await run_in_threadpool(fn, TransactionService(self.db, self.user_id))
+    
+    async def _run_analytics(self, fn: Callable[[AnalyticsService], Any]) -> Any:
+        """Run `fn` against the user's AnalyticsService in the threadpool."""
+        if not isinstance(self.db, AsyncSession):
+            return await run_in_threadpool(fn, AnalyticsService(self.db, self.user_id))
+        
+        def run() -> Any:
+            with self.session_factory() as db:
+                return fn(AnalyticsService(db, self.user_id))
+        return await run_in_threadpool(run)
+    
+    async def _commit(self) -> None:
+        if isinstance(self.db, AsyncSession):
+            await self.db.commit()
+        else:
+            await run_in_threadpool(self.db.commit)
+    
+    async def _rollback(self) -> None:
+        if isinstance(self.db, AsyncSession):
+            await self.db.rollback()
+        else:
+            await run_in_threadpool(self.db.rollback)
+    
+    async def import_file(
+        self,
+        file: BinaryIO,
+        filename: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_batch: Optional[Callable[[List[Transaction]], None]] = None,
+        profile: Optional[str] = None
+    ) -> ImportResult:
+        """
+        Import a statement upload, skipping files and rows that were seen before.
+        
+        Async counterpart of `TransactionService.import_file`; hashing the
+        file runs in the threadpool.
+        """
+        file_hash = await run_in_threadpool(file_sha256, file)
+        previous = await self._run(lambda service: service.find_uploaded_file(file_hash))
+        if previous is not None:
+            return ImportResult(
+                skipped=previous.rows_inserted + previous.rows_skipped,
+                duplicate_file=True
+            )
+        
+        return await self.import_batches(
+            iter_statement_batches(file, filename, batch_size, profile),
+            chunk_size=chunk_size,
+            on_batch=on_batch,
+            file_hash=file_hash,
+            filename=filename
+        )
+    
+    async def import_batches(
+        self,
+        batches: Iterator[NormalizedBatch],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_batch: Optional[Callable[[List[Transaction]], None]] = None,
+        file_hash: Optional[str] = None,
+        filename: Optional[str] = None
+    ) -> ImportResult:
+        """
+        Insert a stream of normalized batches in a single database transaction.
+        
+        Parsing the next batch (file reads and pandas work) happens in the
+        threadpool, and inserts go through the session, so other requests
+        keep being served while a large file is imported.
+        
+        Args:
+            batches: Iterator of normalized CSV batches
+            chunk_size: Number of rows written per INSERT statement
+            on_batch: Optional callback receiving each batch's created transactions
+            file_hash: Content hash of the source file, recorded with the import
+            filename: Original name of the source file
+        
+        Returns:
+            ImportResult: Counts of inserted, skipped and rejected rows
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        result = ImportResult()
+        fingerprinter = RowFingerprinter(self.user_id)
+        quarters = set()
+        try:
+            while (batch := await run_in_threadpool(next, batches, None)) is not None:
+                result.add_rejected(batch.rejected)
+                await run_in_threadpool(TransactionService.prepare_batch, batch, fingerprinter)
+                created = await self._run(lambda service: service.insert_batch(batch, chunk_size))
+                quarters |= payment_periods_of(t.date for t in created)
+                result.inserted += len(created)
+                result.skipped += len(batch) - len(created)
+                if on_batch:
+                    on_batch(created)
+            if file_hash is not None:
+                await self._run(lambda service: service.record_upload(file_hash, filename, result))
+            await self._commit()
+        except Exception:
+            await self._rollback()
+            raise
+        finally:
+            # Run the reader's cleanup now, while the upload is still open
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+        
+        get_cache().invalidate(self.user_id, quarters)
+        return result
+    
+    async def get_transactions_page(self, **filters: Any) -> Tuple[List[Transaction], Optional[str]]:
+        """
+        Retrieve one page of transactions, newest first.
+        
+        Accepts the same keyword arguments as
+        `TransactionService.get_transactions_page`.
+        """
+        return await self._run(lambda service: service.get_transactions_page(**filters))
+    
+    async def get_transaction_rows_page(self, **filters: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Retrieve one page of transactions as plain dictionaries.
+        
+        Accepts the same keyword arguments as
+        `TransactionService.get_transaction_rows_page`.
+        """
+        return await self._run(lambda service: service.get_transaction_rows_page(**filters))
+    
+    async def search_transactions(self, q: str, **filters: Any) -> Tuple[List[Dict[str, Any]], Optional[str], str]:
+        """Search transaction descriptions, best matches first."""
+        return await self._run(lambda service: service.search_transactions(q, **filters))
+    
+    async def get_transaction_by_id(self, transaction_id: int) -> Optional[Transaction]:
+        """Retrieve a specific transaction by ID."""
+        return await self._run(lambda service: service.get_transaction_by_id(transaction_id))
+    
+    async def get_transaction_summary(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        currency: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get a summary of the user's transactions, computed by the database."""
+        return await self._run(lambda service: service.get_transaction_summary(
+            start_date=start_date,
+            end_date=end_date,
+            category=category,
+            currency=currency
+        ))
+    
+    async def get_merchant_summary(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Get income and expense totals per merchant, grouped by the database."""
+        return await self._run(lambda service: service.get_merchant_summary(**filters))
+    
+    async def get_rollup(self, **params: Any) -> List[Dict[str, Any]]:
+        """
+        Read the user's period aggregates from the rollup table.
+        
+        Accepts the same keyword arguments as `RollupService.get_rollup`,
+        except `user_id`.
+        """
+        return await self._run(
+            lambda service: RollupService(service.db).get_rollup(user_id=self.user_id, **params)
+        )
+    
+    async def get_spend_trend(self, **params: Any) -> List[Dict[str, Any]]:
+        """Totals per period with a rolling average, from the user's analytics snapshot."""
+        return await self._run_analytics(lambda analytics: analytics.get_spend_trend(**params))
+    
+    async def get_category_stats(self, **params: Any) -> List[Dict[str, Any]]:
+        """Amount statistics per category, from the user's analytics snapshot."""
+        return await self._run_analytics(lambda analytics: analytics.get_category_stats(**params))
+    
+    async def get_year_over_year(self, **params: Any) -> List[Dict[str, Any]]:
+        """Totals per period next to the year before, from the user's analytics snapshot."""
+        return await self._run_analytics(lambda analytics: analytics.get_year_over_year(**params))
+    
+    async def get_tax_estimates(self, **params: Any) -> List[Dict[str, Any]]:
+        """
+        Estimate the user's quarterly taxes from the rollup table.
+        
+        Accepts the same keyword arguments as
+        `TaxEstimateService.get_quarterly_estimates`.
+        """
+        return await self._run(
+            lambda service: TaxEstimateService(service.db, self.user_id).get_quarterly_estimates(**params)
+        )
+    
+    async def delete_transaction(self, transaction_id: int) -> bool:
+        """Delete a transaction from the database."""
+        return await self._run(lambda service: service.delete_transaction(transaction_id))
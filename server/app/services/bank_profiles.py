@@ -0,0 +1,246 @@
+"""
+Bank statement profiles for PaySplit.AI.
+
+A profile describes the column layout of one bank's statement export
+and maps its frames to the CSV columns `normalize_frame` validates
+(`Date`, `Description`, `Amount`, `Type`, `Currency`). This module handles:
+- The registry of built-in profiles, extended with `register_profile`
+- Detecting the profile of a file from a header row
+- Deriving `Type` from signed amounts or split debit/credit columns
+
+Header layouts follow the banks' published CSV exports; column names
+are matched case-insensitively.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.money import CENTS_PER_UNIT, parse_cents
+from app.services.csv_parser import DATE_FORMAT
+
+
+@dataclass(frozen=True)
+class BankProfile:
+    """
+    Column layout of one statement export.
+    
+    Amounts come either from a `type_column` plus unsigned amounts (the
+    PaySplit layout), from one signed `amount_column`, or from split
+    `debit_column`/`credit_column`. Without a type column, rows are
+    Expenses when their signed amount has the sign of `expense_sign`.
+    """
+    
+    name: str
+    date_column: str
+    description_column: str
+    amount_column: Optional[str] = None
+    debit_column: Optional[str] = None
+    credit_column: Optional[str] = None
+    type_column: Optional[str] = None
+    currency_column: Optional[str] = None
+    date_format: str = DATE_FORMAT
+    expense_sign: int = -1
+    decimal: str = '.'
+    thousands: Optional[str] = None
+    # Further header cells that tell this export apart from similar ones
+    signature: Tuple[str, ...] = ()
+    
+    def __post_init__(self):
+        if (self.amount_column is None) == (self.debit_column is None or self.credit_column is None):
+            raise ValueError(f"profile {self.name!r} needs either an amount column or debit and credit columns")
+    
+    @property
+    def required_columns(self) -> FrozenSet[str]:
+        """Normalized header cells a file must have to match this profile."""
+        columns = (
+            self.date_column, self.description_column,
+            self.amount_column, self.debit_column, self.credit_column,
+            *self.signature
+        )
+        return frozenset(header_key(c) for c in columns if c is not None)
+    
+    @property
+    def read_options(self) -> Dict[str, Any]:
+        """
+        Options for `pd.read_csv`.
+        
+        Exports with decimal commas are read as text and their amounts
+        converted by `to_frame`: `read_csv`'s own `thousands='.'` would
+        also turn dd.mm.yy dates into numbers.
+        """
+        return {"dtype": str} if self.decimal != '.' else {}
+    
+    def to_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Map a raw frame of this export to the columns `normalize_frame` expects.
+        
+        Missing columns come out as missing values, so their rows are
+        rejected (or defaulted) by validation like any other bad row.
+        """
+        by_key = {header_key(c): c for c in df.columns}
+        missing = pd.Series(np.nan, index=df.index, dtype=object)
+        
+        def column(name: Optional[str]) -> pd.Series:
+            if name is None or header_key(name) not in by_key:
+                return missing
+            return df[by_key[header_key(name)]]
+        
+        frame = pd.DataFrame({
+            'Date': column(self.date_column),
+            'Description': column(self.description_column),
+            'Currency': column(self.currency_column),
+        }, index=df.index)
+        
+        if self.type_column is not None:
+            frame['Amount'] = column(self.amount_column)
+            frame['Type'] = column(self.type_column)
+            return frame
+        
+        # Signed cents, negative for money going out
+        if self.amount_column is not None:
+            cents = self._parse_cents(column(self.amount_column)) * -self.expense_sign
+        else:
+            debit = np.abs(self._parse_cents(column(self.debit_column)))
+            credit = np.abs(self._parse_cents(column(self.credit_column)))
+            cents = np.where(np.isnan(debit) | (debit == 0), credit, -debit)
+        frame['Amount'] = np.abs(cents) / CENTS_PER_UNIT
+        frame['Type'] = np.where(cents < 0, 'Expense', 'Income')
+        return frame
+    
+    def _parse_cents(self, values: pd.Series) -> np.ndarray:
+        """`parse_cents`, after rewriting text amounts with this export's separators."""
+        if self.decimal != '.' and values.dtype == object:
+            text = values.astype(str)
+            if self.thousands:
+                text = text.str.replace(self.thousands, '', regex=False)
+            values = text.str.replace(self.decimal, '.', regex=False).mask(values.isna())
+        return parse_cents(values)
+
+
+def header_key(cell) -> str:
+    """Normalized header cell used for matching: stripped and case-folded."""
+    return str(cell).strip().strip('"').strip().casefold()
+
+
+# The PaySplit CSV layout; used when no other profile matches
+DEFAULT_PROFILE = BankProfile(
+    name='paysplit',
+    date_column='Date',
+    description_column='Description',
+    amount_column='Amount',
+    type_column='Type',
+    currency_column='Currency',
+)
+
+PROFILES: Dict[str, BankProfile] = {}
+
+
+def register_profile(profile: BankProfile) -> BankProfile:
+    """
+    Add a profile to the registry, replacing one with the same name.
+    
+    Returns:
+        BankProfile: The registered profile
+    """
+    PROFILES[profile.name] = profile
+    return profile
+
+
+def get_profile(name: str) -> BankProfile:
+    """
+    Look up a registered profile by name.
+    
+    Raises:
+        ValueError: If no profile has that name
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"profile must be one of: {', '.join(PROFILES)}") from None
+
+
+def detect_profile(header: Iterable, candidates: Optional[Iterable[BankProfile]] = None) -> Optional[BankProfile]:
+    """
+    Find the profile whose columns a header row has.
+    
+    When several profiles match, the one requiring the most columns
+    wins, then the one registered first.
+    
+    Args:
+        header: Cells of a candidate header row
+        candidates: Profiles to consider; defaults to the registry
+    
+    Returns:
+        BankProfile: The matching profile, or None if the row matches none
+    """
+    keys = {header_key(cell) for cell in header if cell is not None}
+    matches = [p for p in (candidates or PROFILES.values()) if p.required_columns <= keys]
+    return max(matches, key=lambda p: len(p.required_columns), default=None)
+
+
+register_profile(DEFAULT_PROFILE)
+
+register_profile(BankProfile(
+    name='chase_card',
+    date_column='Transaction Date',
+    description_column='Description',
+    amount_column='Amount',
+    date_format='%m/%d/%Y',
+    signature=('Post Date',),
+))
+
+register_profile(BankProfile(
+    name='chase_checking',
+    date_column='Posting Date',
+    description_column='Description',
+    amount_column='Amount',
+    date_format='%m/%d/%Y',
+    signature=('Details',),
+))
+
+# Exports start with a few lines of account summary before the header
+register_profile(BankProfile(
+    name='bank_of_america',
+    date_column='Date',
+    description_column='Description',
+    amount_column='Amount',
+    date_format='%m/%d/%Y',
+    signature=('Running Bal.',),
+))
+
+# Charges are positive
+register_profile(BankProfile(
+    name='amex',
+    date_column='Date',
+    description_column='Description',
+    amount_column='Amount',
+    date_format='%m/%d/%Y',
+    expense_sign=1,
+    signature=('Card Member',),
+))
+
+register_profile(BankProfile(
+    name='capital_one',
+    date_column='Transaction Date',
+    description_column='Description',
+    debit_column='Debit',
+    credit_column='Credit',
+    signature=('Posted Date',),
+))
+
+# German savings banks' CSV-CAMT export: semicolons, decimal commas and
+# cp1252 text (the encoding is detected per file)
+register_profile(BankProfile(
+    name='sparkasse',
+    date_column='Buchungstag',
+    description_column='Beguenstigter/Zahlungspflichtiger',
+    amount_column='Betrag',
+    currency_column='Waehrung',
+    date_format='%d.%m.%y',
+    decimal=',',
+    thousands='.',
+    signature=('Auftragskonto',),
+))
@@ -0,0 +1,377 @@
+"""
+Response cache for PaySplit.AI read endpoints.
+
+This module handles:
+- Pluggable cache backends (in-process LRU with TTL, Redis-compatible)
+- Cache keys built from endpoint, query parameters and user scope
+- Invalidation by version bumps whenever transactions are written
+- Per-quarter entries, invalidated only by writes to their quarter
+- Hit/miss counters for monitoring
+
+Stored data only changes when a CSV is uploaded or a transaction is
+created or deleted, so cached responses stay valid until one of those
+writes bumps the version of the affected scope.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+
+# Scope of requests made without a user; its version is bumped by every
+# write, so it also serves as the version of data shared by all users
+ALL_USERS_SCOPE = "all"
+
+# Counter embedded in every key, bumped by writes that span all users
+EPOCH_KEY = "version:epoch"
+
+# Suffix of the per-scope counter bumped by writes whose quarters are unknown
+ANY_QUARTER = "quarters"
+
+
+class CacheBackend:
+    """Interface of a cache backend storing JSON-serializable values."""
+    
+    # Whether every worker process reads the same entries and counters
+    shared = False
+    
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+    
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer counter, creating it at 1."""
+        raise NotImplementedError
+    
+    def get_counter(self, key: str) -> int:
+        """Read an integer counter, 0 if it was never incremented."""
+        raise NotImplementedError
+    
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry expiry.
+    
+    Shared by all threads of a worker; each worker process has its own,
+    so use the Redis backend when several workers must see the same
+    invalidations immediately.
+    """
+    
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[float] = 60.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def incr(self, key: str) -> int:
+        # Counters live outside the LRU so versions are never evicted
+        with self._lock:
+            self._counters[key] += 1
+            return self._counters[key]
+    
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache backend for Redis or any client with the same get/set/incr API.
+    
+    Values are stored as JSON. Pass a stub client (anything implementing
+    `get`, `set(key, value, ex=...)`, `incr`, `scan_iter` and `delete`)
+    to run locally without a Redis server.
+    """
+    
+    shared = True
+    
+    def __init__(self, client: Any, prefix: str = "paysplit:", default_ttl: Optional[float] = 60.0):
+        self.client = client
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+    
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisCacheBackend":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+    
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self.client.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)) if ttl else None)
+    
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+    
+    def get_counter(self, key: str) -> int:
+        raw = self.client.get(self.prefix + key)
+        return int(raw) if raw is not None else 0
+    
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class ResponseCache:
+    """
+    Versioned response cache with hit/miss accounting.
+    
+    Every key embeds the current version of its user scope. Writes call
+    `invalidate`, which bumps the version of the written user's scope and
+    of the all-users scope, so older entries are simply never read again
+    and age out of the backend. Writes across all users (backfills) call
+    `invalidate_all`, which bumps an epoch embedded in every key.
+    
+    Entries cached per quarter (`get_quarters_or_compute`) embed the
+    version of their quarter instead, so a write only invalidates the
+    quarters its transactions fall in. Quarters are labels chosen by the
+    writers; they pass the estimated tax payment periods of their
+    transactions (see `app.services.tax_service.payment_periods_of`).
+    """
+    
+    def __init__(self, backend: Optional[CacheBackend]):
+        self.backend = backend
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+    
+    @property
+    def shared(self) -> bool:
+        """Whether versions bumped by one worker process are seen by all of them."""
+        return self.enabled and self.backend.shared
+    
+    @staticmethod
+    def _scope(user_id: Optional[int]) -> str:
+        return ALL_USERS_SCOPE if user_id is None else str(user_id)
+    
+    def version(self, user_id: Optional[int] = None) -> int:
+        """Current data version of a user scope."""
+        return self.backend.get_counter(f"version:{self._scope(user_id)}") if self.enabled else 0
+    
+    def epoch(self) -> int:
+        """Current epoch, bumped by writes spanning all users."""
+        return self.backend.get_counter(EPOCH_KEY) if self.enabled else 0
+    
+    def quarter_version(self, user_id: Optional[int], quarter: str) -> str:
+        """Current data version of one quarter ('2024-Q1') of a user scope."""
+        if not self.enabled:
+            return "0.0"
+        scope = self._scope(user_id)
+        return (
+            f"{self.backend.get_counter(f'version:{scope}:{ANY_QUARTER}')}."
+            f"{self.backend.get_counter(f'version:{scope}:{quarter}')}"
+        )
+    
+    def key(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        user_id: Optional[int] = None,
+        quarter: Optional[str] = None
+    ) -> str:
+        """
+        Build the cache key for an endpoint call.
+        
+        Keys of per-quarter entries carry the quarter and its version in
+        place of the version of the whole scope.
+        """
+        canonical = json.dumps(
+            sorted((k, str(v)) for k, v in params.items() if v is not None),
+            separators=(",", ":")
+        )
+        digest = hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+        scope = self._scope(user_id)
+        if quarter is not None:
+            version = f"{quarter}:q{self.quarter_version(user_id, quarter)}"
+        else:
+            version = f"v{self.version(user_id)}"
+        return f"{endpoint}:{scope}:e{self.epoch()}:{version}:{digest}"
+    
+    async def get_or_compute(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+        user_id: Optional[int] = None
+    ) -> Any:
+        """
+        Return the cached response for an endpoint call, computing it on a miss.
+        
+        Args:
+            endpoint: Name of the endpoint, e.g. 'transactions.summary'
+            params: Query parameters that affect the response
+            compute: Coroutine function producing the JSON-serializable response
+            user_id: User scope of the response (None for all users)
+        """
+        if not self.enabled:
+            return await compute()
+        
+        key = self.key(endpoint, params, user_id)
+        value = self.backend.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits[endpoint] += 1
+            return value
+        
+        with self._lock:
+            self.misses[endpoint] += 1
+        value = await compute()
+        self.backend.set(key, value)
+        return value
+    
+    async def get_quarters_or_compute(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        quarters: List[str],
+        compute: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+        user_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Return one cached value per quarter, computing the missing ones together.
+        
+        Args:
+            endpoint: Name of the endpoint, e.g. 'tax.estimate'
+            params: Query parameters, other than the quarter, that affect the values
+            quarters: Quarters to return, e.g. ['2024-Q1', '2024-Q2']
+            compute: Coroutine function mapping a list of quarters to a
+                dictionary of their JSON-serializable values
+            user_id: User scope of the values (None for all users)
+        """
+        if not self.enabled:
+            return await compute(quarters)
+        
+        keys = {quarter: self.key(endpoint, params, user_id, quarter) for quarter in quarters}
+        values = {}
+        for quarter, key in keys.items():
+            value = self.backend.get(key)
+            if value is not None:
+                values[quarter] = value
+        missing = [quarter for quarter in quarters if quarter not in values]
+        with self._lock:
+            self.hits[endpoint] += len(values)
+            self.misses[endpoint] += len(missing)
+        
+        if missing:
+            computed = await compute(missing)
+            for quarter in missing:
+                self.backend.set(keys[quarter], computed[quarter])
+            values.update(computed)
+        return {quarter: values[quarter] for quarter in quarters}
+    
+    def invalidate(self, user_id: Optional[int] = None, quarters: Optional[Iterable[str]] = None) -> None:
+        """
+        Bump data versions after a write affecting `user_id`'s transactions.
+        
+        Args:
+            user_id: User whose transactions were written
+            quarters: Quarters the written transactions fall in; None
+                when they are unknown, which invalidates every quarter
+        """
+        if not self.enabled:
+            return
+        self.backend.incr(f"version:{ALL_USERS_SCOPE}")
+        if user_id is not None:
+            self.backend.incr(f"version:{self._scope(user_id)}")
+        scope = self._scope(user_id)
+        for quarter in ([ANY_QUARTER] if quarters is None else set(quarters)):
+            self.backend.incr(f"version:{scope}:{quarter}")
+    
+    def invalidate_all(self) -> None:
+        """Bump the epoch shared by every scope, after a write spanning all users."""
+        if self.enabled:
+            self.backend.incr(EPOCH_KEY)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per endpoint."""
+        with self._lock:
+            endpoints = sorted(set(self.hits) | set(self.misses))
+            return {
+                "backend": type(self.backend).__name__ if self.enabled else None,
+                "hits": sum(self.hits.values()),
+                "misses": sum(self.misses.values()),
+                "endpoints": {
+                    name: {"hits": self.hits[name], "misses": self.misses[name]}
+                    for name in endpoints
+                },
+            }
+
+
+def build_cache() -> ResponseCache:
+    """Create the response cache selected by CACHE_BACKEND."""
+    if settings.cache_backend == "none":
+        return ResponseCache(None)
+    if settings.cache_backend == "redis":
+        return ResponseCache(RedisCacheBackend.from_url(
+            settings.redis_url, default_ttl=settings.cache_ttl_seconds
+        ))
+    if settings.cache_backend == "memory":
+        return ResponseCache(MemoryCacheBackend(
+            max_entries=settings.cache_max_entries, default_ttl=settings.cache_ttl_seconds
+        ))
+    raise ValueError(f"Unknown CACHE_BACKEND: {settings.cache_backend}")
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_cache() -> ResponseCache:
+    """Return the process-wide response cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = build_cache()
+    return _cache
+
+
+def set_cache(cache: ResponseCache) -> None:
+    """Replace the process-wide response cache (used by tests and benchmarks)."""
+    global _cache
+    _cache = cache
@@ -0,0 +1,342 @@
+"""
+Offline transaction categorization for PaySplit.AI.
+
+This module handles:
+- Merchant rule tables (regular expressions) for well-known merchants
+- A hashed-feature naive Bayes classifier for everything the rules miss
+- A memo cache keyed on the normalized description, because the same
+  merchants repeat thousands of times per upload
+
+`Categorizer.categorize` works on whole column arrays: each distinct
+description is normalized once, looked up in the memo, and all misses go
+through the rules and the classifier in a single vectorized call.
+"""
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.metrics import timed_stage
+from app.services.csv_parser import NormalizedBatch
+
+
+# Expense categories: known merchants (matched as rules) and generic
+# keywords (only used to train the classifier). Order matters for rules:
+# "uber eats" must be tried before "uber".
+EXPENSE_CATEGORIES: Dict[str, Dict[str, List[str]]] = {
+    "Meals & Dining": {
+        "merchants": ["starbucks", "dunkin", "chipotle", "mcdonald", "subway", "doordash",
+                      "grubhub", "uber eats", "panera", "taco bell", "chick fil a", "domino"],
+        "keywords": ["coffee", "cafe", "restaurant", "pizza", "grill", "diner", "bakery", "burger",
+                     "sushi", "taco", "kitchen", "bistro", "deli", "espresso", "brewing", "eatery"],
+    },
+    "Transportation": {
+        "merchants": ["uber", "lyft", "shell", "chevron", "exxon", "mobil", "citgo", "sunoco",
+                      "bp", "valero", "mta", "bart", "amtrak"],
+        "keywords": ["taxi", "cab", "fuel", "gas station", "parking", "toll", "transit", "metro",
+                     "ride", "car wash", "garage", "petroleum"],
+    },
+    "Travel": {
+        "merchants": ["delta air", "united airlines", "american airlines", "southwest", "jetblue",
+                      "airbnb", "marriott", "hilton", "hyatt", "expedia", "booking com"],
+        "keywords": ["airlines", "airways", "hotel", "motel", "inn", "resort", "travel", "flight",
+                     "lodging", "suites"],
+    },
+    "Groceries": {
+        "merchants": ["whole foods", "trader joe", "kroger", "safeway", "aldi", "publix", "wegmans",
+                      "costco", "sams club"],
+        "keywords": ["grocery", "market", "foods", "supermarket", "produce", "farm", "butcher"],
+    },
+    "Software & Subscriptions": {
+        "merchants": ["adobe", "github", "aws", "amazon web services", "google workspace", "gsuite",
+                      "microsoft", "slack", "zoom", "dropbox", "notion", "atlassian", "figma",
+                      "openai", "digitalocean", "heroku"],
+        "keywords": ["software", "subscription", "cloud", "saas", "hosting", "license", "app",
+                     "domain", "server"],
+    },
+    "Entertainment": {
+        "merchants": ["netflix", "spotify", "hulu", "disney plus", "hbo", "steam", "playstation",
+                      "xbox", "amc", "ticketmaster"],
+        "keywords": ["cinema", "theater", "movies", "music", "games", "concert", "tickets", "streaming"],
+    },
+    "Office Supplies": {
+        "merchants": ["staples", "office depot", "officemax"],
+        "keywords": ["office", "supplies", "paper", "printer", "ink", "toner", "stationery"],
+    },
+    "Shipping": {
+        "merchants": ["fedex", "ups", "usps", "dhl"],
+        "keywords": ["shipping", "postage", "post office", "courier", "freight", "delivery"],
+    },
+    "Utilities & Phone": {
+        "merchants": ["comcast", "xfinity", "at t", "verizon", "t mobile", "spectrum", "pg e",
+                      "con edison"],
+        "keywords": ["electric", "water", "internet", "wireless", "phone", "utility", "energy",
+                     "power", "broadband", "mobile"],
+    },
+    "Health": {
+        "merchants": ["walgreens", "cvs", "rite aid", "kaiser"],
+        "keywords": ["pharmacy", "medical", "clinic", "dental", "doctor", "hospital", "health",
+                     "vision", "fitness", "gym"],
+    },
+    "Shopping": {
+        "merchants": ["amazon", "target", "walmart", "home depot", "lowes", "best buy", "apple",
+                      "ikea", "ebay", "etsy"],
+        "keywords": ["store", "shop", "retail", "outlet", "mart", "depot", "boutique", "hardware"],
+    },
+    "Cash & Transfers": {
+        "merchants": ["venmo", "zelle", "cash app", "atm"],
+        "keywords": ["transfer", "withdrawal", "cash", "check", "deposit", "payment", "wire", "ach"],
+    },
+}
+
+# Income categories, matched by rules only
+INCOME_RULES: List[Tuple[str, str]] = [
+    ("Business Income", r"\b(client|invoice|freelance|consult\w*|contract\w*|stripe|paypal)\b"),
+    ("Salary", r"\b(payroll|salary|direct dep\w*|wages?)\b"),
+    ("Interest", r"\b(interest|dividends?)\b"),
+    ("Refunds", r"\b(refunds?|reimburse\w*|return)\b"),
+]
+DEFAULT_INCOME_CATEGORY = "Income"
+
+# Share of each category counted as a business expense
+BUSINESS_PERCENTAGES = {
+    "Software & Subscriptions": 1.0,
+    "Office Supplies": 1.0,
+    "Shipping": 1.0,
+    "Business Income": 1.0,
+    "Utilities & Phone": 0.5,
+}
+
+# Classifier predictions less confident than this leave the category empty
+MIN_CONFIDENCE = 0.6
+
+# Number of hashed feature buckets used by the classifier
+FEATURE_BUCKETS = 2 ** 14
+
+# Normalized descriptions remembered by the memo cache
+MEMO_MAX_ENTRIES = 100_000
+
+
+def normalize_description(description: str) -> str:
+    """
+    Reduce a bank description to the part that identifies the merchant.
+    
+    Lower-cases, drops store and reference numbers (`#1234`, `*A1B2`)
+    and punctuation, and collapses whitespace, so "STARBUCKS #4521" and
+    "Starbucks" share one memo entry.
+    """
+    text = description.casefold()
+    text = re.sub(r"[#*]\s*\w+|\d+", " ", text)
+    text = re.sub(r"[^\w\s]|_", " ", text)
+    return " ".join(text.split())
+
+
+def _features(text: str) -> List[int]:
+    """Hashed word and character-trigram features (stable across processes)."""
+    features = []
+    for word in text.split():
+        features.append(zlib.crc32(b"w:" + word.encode()) % FEATURE_BUCKETS)
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            features.append(zlib.crc32(b"c:" + padded[i:i + 3].encode()) % FEATURE_BUCKETS)
+    return features
+
+
+def _feature_matrix(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Flattened feature ids of all texts and the offset where each text starts."""
+    lists = [_features(text) for text in texts]
+    lengths = np.fromiter((len(f) for f in lists), dtype=np.int64, count=len(lists))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lists) else np.zeros(0, dtype=np.int64)
+    flat = np.fromiter((i for f in lists for i in f), dtype=np.int64, count=int(lengths.sum()))
+    return flat, offsets
+
+
+class NaiveBayesClassifier:
+    """Multinomial naive Bayes over hashed text features, in NumPy."""
+    
+    def __init__(self, alpha: float = 0.1):
+        self.alpha = alpha
+        self.labels: np.ndarray = np.array([], dtype=object)
+        self.log_prior: Optional[np.ndarray] = None
+        self.log_likelihood: Optional[np.ndarray] = None
+    
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> "NaiveBayesClassifier":
+        self.labels, label_ids = np.unique(np.asarray(labels, dtype=object), return_inverse=True)
+        flat, offsets = _feature_matrix(texts)
+        lengths = np.diff(np.append(offsets, len(flat)))
+        
+        counts = np.zeros((len(self.labels), FEATURE_BUCKETS))
+        np.add.at(counts, (np.repeat(label_ids, lengths), flat), 1)
+        smoothed = counts + self.alpha
+        self.log_likelihood = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+        self.log_prior = np.log(np.bincount(label_ids) / len(label_ids))
+        return self
+    
+    def predict(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict labels for many texts at once.
+        
+        Returns:
+            Tuple of predicted labels and their posterior probabilities
+        """
+        if not len(texts):
+            return np.array([], dtype=object), np.array([])
+        flat, offsets = _feature_matrix(texts)
+        scores = np.tile(self.log_prior, (len(texts), 1))
+        has_features = np.diff(np.append(offsets, len(flat))) > 0
+        if len(flat):
+            # Sum each text's feature columns in one reduceat over the flattened ids
+            sums = np.add.reduceat(self.log_likelihood[:, flat], offsets[has_features], axis=1).T
+            scores[has_features] += sums
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        confidence = probabilities[np.arange(len(texts)), best]
+        # Texts without any features carry no evidence, only the prior
+        confidence[~has_features] = 0.0
+        return self.labels[best], confidence
+
+
+def _training_data() -> Tuple[List[str], List[str]]:
+    texts, labels = [], []
+    for category, words in EXPENSE_CATEGORIES.items():
+        for text in words["merchants"] + words["keywords"]:
+            texts.append(text)
+            labels.append(category)
+    return texts, labels
+
+
+class Categorizer:
+    """
+    Rules-then-classifier categorization with a memo cache.
+    
+    Results are (category, is_business, business_percentage); a category
+    of None means neither the rules nor a confident prediction applied.
+    """
+    
+    def __init__(self, max_memo_entries: int = MEMO_MAX_ENTRIES):
+        self.max_memo_entries = max_memo_entries
+        self._memo: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        self._expense_rules = [
+            (category, re.compile(r"\b(" + "|".join(re.escape(m) for m in words["merchants"]) + r")\b"))
+            for category, words in EXPENSE_CATEGORIES.items()
+        ]
+        self._income_rules = [(category, re.compile(pattern)) for category, pattern in INCOME_RULES]
+        self.model = NaiveBayesClassifier().fit(*_training_data())
+    
+    def categorize(
+        self,
+        descriptions: Sequence[str],
+        transaction_types: Sequence[str]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Categorize column arrays of descriptions and transaction types.
+        
+        Args:
+            descriptions: Description of each row
+            transaction_types: 'Income' or 'Expense' of each row
+        
+        Returns:
+            Tuple of arrays: category (object, None when unknown),
+            is_business (bool) and business_percentage (float)
+        """
+        keys = pd.MultiIndex.from_arrays([
+            pd.Index(np.asarray(descriptions, dtype=object)),
+            pd.Index(np.asarray(transaction_types, dtype=object)),
+        ])
+        codes, uniques = pd.factorize(keys)
+        # Raw descriptions differing only in store numbers or case share a key
+        distinct: Dict[Tuple[str, str], int] = {}
+        key_codes = np.array(
+            [distinct.setdefault((normalize_description(str(d)), str(t)), len(distinct)) for d, t in uniques],
+            dtype=np.int64
+        )
+        codes = key_codes[codes]
+        normalized = list(distinct)
+        
+        categories = np.empty(len(normalized), dtype=object)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(normalized):
+                if key in self._memo:
+                    self._memo.move_to_end(key)
+                    categories[i] = self._memo[key]
+                else:
+                    missing.append(i)
+            self.hits += len(normalized) - len(missing)
+            self.misses += len(missing)
+        
+        if missing:
+            found = self._categorize_distinct([normalized[i] for i in missing])
+            categories[missing] = found
+            with self._lock:
+                for i, category in zip(missing, found):
+                    self._memo[normalized[i]] = category
+                while len(self._memo) > self.max_memo_entries:
+                    self._memo.popitem(last=False)
+        
+        percentages = np.array([BUSINESS_PERCENTAGES.get(c, 0.0) for c in categories], dtype=float)
+        category = categories[codes]
+        business_percentage = percentages[codes]
+        return category, business_percentage > 0, business_percentage
+    
+    def categorize_one(self, description: str, transaction_type: str) -> Tuple[Optional[str], bool, float]:
+        """Categorize a single row."""
+        category, is_business, percentage = self.categorize([description], [transaction_type])
+        return category[0], bool(is_business[0]), float(percentage[0])
+    
+    def apply(self, batch: NormalizedBatch) -> NormalizedBatch:
+        """Fill the category and business columns of a normalized batch."""
+        with timed_stage("categorize"):
+            category, is_business, percentage = self.categorize(
+                batch.columns["description"], batch.columns["transaction_type"]
+            )
+            batch.columns["category"] = category
+            batch.columns["is_business"] = is_business
+            batch.columns["business_percentage"] = percentage
+        return batch
+    
+    def stats(self) -> Dict[str, int]:
+        """Memo cache counters."""
+        with self._lock:
+            return {"memo_entries": len(self._memo), "hits": self.hits, "misses": self.misses}
+    
+    def _categorize_distinct(self, keys: List[Tuple[str, str]]) -> List[Optional[str]]:
+        results: List[Optional[str]] = [None] * len(keys)
+        unmatched = []
+        for i, (text, transaction_type) in enumerate(keys):
+            rules = self._income_rules if transaction_type == "Income" else self._expense_rules
+            category = next((c for c, pattern in rules if pattern.search(text)), None)
+            if category is not None:
+                results[i] = category
+            elif transaction_type == "Income":
+                results[i] = DEFAULT_INCOME_CATEGORY
+            else:
+                unmatched.append(i)
+        
+        if unmatched:
+            labels, confidence = self.model.predict([keys[i][0] for i in unmatched])
+            for i, label, score in zip(unmatched, labels, confidence):
+                results[i] = label if score >= MIN_CONFIDENCE else None
+        return results
+
+
+_categorizer: Optional[Categorizer] = None
+
+
+def get_categorizer() -> Categorizer:
+    """Return the process-wide categorizer, building it on first use."""
+    global _categorizer
+    if _categorizer is None:
+        _categorizer = Categorizer()
+    return _categorizer
@@ -1,6 +1,50 @@
+import io
+import numpy as np
 import pandas as pd
+from dataclasses import dataclass, field
 from io import StringIO
+from typing import Any, BinaryIO, Dict, Iterator, List
 from fastapi import UploadFile
+from app.core.config import settings
+from app.core.metrics import timed_stage
+from app.core.money import parse_cents
+
+# Number of CSV rows materialized at a time by the streaming parser
+DEFAULT_BATCH_SIZE = 5000
+
+# Expected format of the `Date` column
+DATE_FORMAT = '%Y-%m-%d'
+
+# Accepted values of the `Type` column
+TRANSACTION_TYPES = ('Income', 'Expense')
+
+# Values used when an optional column is missing or blank
+COLUMN_DEFAULTS = {
+    'Description': '',
+    'Type': 'Expense',
+}
+
+
+@dataclass
+class NormalizedBatch:
+    """
+    A batch of CSV rows normalized to Transaction column values.
+    
+    `columns` holds one array per Transaction column, all of the same
+    length, and `rejected` describes the rows that failed validation.
+    """
+    
+    columns: Dict[str, np.ndarray]
+    rejected: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.columns['date'])
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """Return the rows as dictionaries, ready for an executemany INSERT."""
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*(self.columns[n].tolist() for n in names))]
+
 
 async def parse_csv(file: UploadFile) -> list:
     """
@@ -24,6 +68,184 @@ async def parse_csv(file: UploadFile) -> list:
     df = pd.read_csv(csv_data)
     
     # Convert DataFrame to a list of dictionaries
-    transactions = df.where(pd.notnull(df), None).to_dict(orient='records')
+    return _to_records(df)
+
+
+def iter_csv_batches(file: BinaryIO, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict]]:
+    """
+    Streams a CSV file and yields transactions in fixed-size batches.
+    
+    Unlike `parse_csv`, the file is never read into memory as a whole:
+    pandas pulls from the binary stream through a text wrapper, so peak
+    memory depends on `batch_size` and not on the size of the upload.
+    
+    Args:
+        file (BinaryIO): Binary file object, e.g. `UploadFile.file`.
+        batch_size (int): Maximum number of rows per yielded batch.
+    
+    Yields:
+        list: Dictionaries representing the transactions of one batch.
+    """
+    for chunk in _iter_frames(file, batch_size):
+        yield _to_records(chunk)
+
+
+def iter_normalized_batches(file: BinaryIO, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[NormalizedBatch]:
+    """
+    Streams a CSV file and yields normalized, validated batches.
+    
+    This is `iter_csv_batches` followed by `normalize_frame`, so rows
+    never pass through per-row Python dictionaries before validation.
+    
+    Args:
+        file (BinaryIO): Binary file object, e.g. `UploadFile.file`.
+        batch_size (int): Maximum number of rows per yielded batch.
+    
+    Yields:
+        NormalizedBatch: Column arrays and rejected rows of one batch.
+    """
+    return normalize_frames(_iter_frames(file, batch_size))
+
+
+def normalize_frames(frames: Iterator[pd.DataFrame], date_format: str = DATE_FORMAT) -> Iterator[NormalizedBatch]:
+    """
+    Normalize a stream of raw frames with `normalize_frame`.
+    
+    This is the pipeline every statement format feeds: frames carry the
+    CSV column names (`Date`, `Description`, `Amount`, `Type`,
+    `Currency`), whichever reader and bank profile produced them.
+    
+    Args:
+        frames: Raw frames in file order.
+        date_format (str): `strptime` format of the `Date` column.
+    
+    Yields:
+        NormalizedBatch: Column arrays and rejected rows of one frame.
+    """
+    row_offset = 0
+    while True:
+        # Reading and validating are timed separately for X-Debug-Timing
+        with timed_stage("parse"):
+            chunk = next(frames, None)
+        if chunk is None:
+            return
+        with timed_stage("validate"):
+            batch = normalize_frame(chunk, row_offset=row_offset, date_format=date_format)
+        yield batch
+        row_offset += len(chunk)
+
+
+def normalize_frame(df: pd.DataFrame, row_offset: int = 0, date_format: str = DATE_FORMAT) -> NormalizedBatch:
+    """
+    Vectorized validation and normalization of raw CSV columns.
+    
+    - `Date` is parsed with `date_format`; unparseable dates reject the row
+    - `Amount` is parsed into integer cents, accepting currency strings
+      such as "$1,234.56" and "(45.00)"; missing or invalid amounts
+      reject the row
+    - `Description` and `Type` fall back to `COLUMN_DEFAULTS` when blank
+    - `Type` is matched case-insensitively against `TRANSACTION_TYPES`
+    - `Currency` is an optional ISO 4217 code, `settings.default_currency`
+      when missing or blank; anything but three letters rejects the row
+    
+    Args:
+        df (pd.DataFrame): Raw rows with the CSV's original column names.
+        row_offset (int): Number of data rows preceding `df` in the file,
+            used to report 1-based row numbers of rejected rows.
+        date_format (str): `strptime` format of the `Date` column.
+    
+    Returns:
+        NormalizedBatch: Column arrays for valid rows and rejected rows.
+    """
+    missing = pd.Series(np.nan, index=df.index, dtype=object)
+    
+    date = pd.to_datetime(df.get('Date', missing), format=date_format, errors='coerce')
+    amount_cents = parse_cents(df.get('Amount', missing))
+    description = _with_default(df.get('Description', missing), COLUMN_DEFAULTS['Description'])
+    transaction_type = _with_default(df.get('Type', missing), COLUMN_DEFAULTS['Type'], capitalize=True)
+    currency = _with_default(df.get('Currency', missing), settings.default_currency, upper=True)
     
-    return transactions
\ No newline at end of file
+    bad_date = date.isna().to_numpy()
+    bad_amount = np.isnan(amount_cents)
+    bad_type = ~np.isin(transaction_type, TRANSACTION_TYPES)
+    bad_currency = ~pd.Series(currency, dtype=object).str.fullmatch(r"[A-Z]{3}").to_numpy(dtype=bool)
+    reasons = np.select(
+        [bad_date, bad_amount, bad_type, bad_currency],
+        [f"invalid Date (expected {date_format})", "invalid Amount", "invalid Type", "invalid Currency"],
+        default=""
+    )
+    valid = reasons == ""
+    
+    rejected = [
+        {"row": row_offset + int(i) + 1, "reason": str(reasons[i])}
+        for i in np.flatnonzero(~valid)
+    ]
+    
+    count = int(valid.sum())
+    columns = {
+        "date": date.to_numpy(dtype='datetime64[us]')[valid].astype(object),
+        "description": description[valid],
+        "amount_cents": amount_cents[valid].astype(np.int64),
+        "currency": currency[valid],
+        "transaction_type": transaction_type[valid],
+        "category": np.full(count, None, dtype=object),
+        "is_business": np.zeros(count, dtype=bool),
+        "business_percentage": np.zeros(count, dtype=float),
+    }
+    return NormalizedBatch(columns=columns, rejected=rejected)
+
+
+def _with_default(values: pd.Series, default: str, capitalize: bool = False, upper: bool = False) -> np.ndarray:
+    """
+    Cast a column to stripped strings, replacing missing or blank values.
+    
+    String cleanup runs once per distinct value and is broadcast back
+    with the factorized codes, since bank exports repeat the same few
+    types and merchants over and over.
+    """
+    codes, uniques = pd.factorize(values)
+    cleaned = pd.Series(uniques, dtype=object).astype(str).str.strip()
+    if capitalize:
+        cleaned = cleaned.str.capitalize()
+    if upper:
+        cleaned = cleaned.str.upper()
+    cleaned = cleaned.mask(cleaned == '', default).to_numpy(dtype=object)
+    # Missing values have code -1, which picks the trailing default
+    return np.append(cleaned, default)[codes]
+
+
+def _iter_frames(
+    file: BinaryIO,
+    batch_size: int,
+    encoding: str = 'utf-8',
+    errors: str = 'strict',
+    **read_options: Any
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a binary CSV stream as DataFrames of at most `batch_size` rows.
+    
+    `read_options` (sep, skiprows, decimal, ...) are passed to `pd.read_csv`.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    
+    text_stream = io.TextIOWrapper(file, encoding=encoding, errors=errors, newline='')
+    try:
+        try:
+            reader = pd.read_csv(text_stream, chunksize=batch_size, **read_options)
+        except pd.errors.EmptyDataError:
+            # Empty upload: nothing to yield
+            return
+        
+        with reader:
+            yield from reader
+    finally:
+        # Hand the underlying file back to its owner instead of closing it;
+        # a generator collected after its owner closed the file has nothing to hand back
+        if not file.closed:
+            text_stream.detach()
+
+
+def _to_records(df: pd.DataFrame) -> List[Dict]:
+    """Convert a DataFrame to a list of dictionaries with NaN as None."""
+    return df.where(pd.notnull(df), None).to_dict(orient='records')
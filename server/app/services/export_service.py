@@ -0,0 +1,202 @@
+"""
+Streaming ledger export for PaySplit.AI.
+
+This module handles:
+- Reading transactions in fixed-size partitions through a server-side cursor
+- Encoding them as NDJSON, CSV or Parquet one partition at a time
+
+Memory use depends on the partition size, not on the size of the ledger,
+and the first bytes are produced before the whole result is read.
+"""
+
+import csv
+import importlib.util
+import io
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction
+from app.services.transaction_service import TransactionService, owned_by
+
+
+# Media type and file extension of each export format
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# Exported columns, in output order
+EXPORT_COLUMNS = (
+    "id",
+    "date",
+    "description",
+    "amount",
+    "currency",
+    "transaction_type",
+    "category",
+    "is_business",
+    "business_percentage",
+    "user_id",
+)
+
+# Rows fetched from the database per round trip
+DEFAULT_YIELD_PER = 1000
+
+# Rows buffered per Parquet row group
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+
+def check_export_format(format: str) -> None:
+    """
+    Validate an export format before any response is started.
+    
+    Raises:
+        ValueError: If the format is unknown or its optional dependency is missing
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ValueError("parquet export requires the optional pyarrow package")
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    format: str,
+    yield_per: int = DEFAULT_YIELD_PER,
+    user_id: Optional[int] = None,
+    **filters: Any
+) -> Iterator[bytes]:
+    """
+    Yield an export of the filtered transactions as encoded chunks.
+    
+    The session is opened when iteration starts and closed when it ends,
+    so the generator can be handed to a StreamingResponse.
+    
+    Args:
+        session_factory: Callable returning a new database session
+        format: One of EXPORT_FORMATS
+        yield_per: Rows fetched from the database per round trip
+        user_id: User whose transactions are exported
+        **filters: Filters accepted by `TransactionService.filter_clauses`
+    
+    Yields:
+        bytes: Consecutive pieces of the encoded export
+    """
+    check_export_format(format)
+    encode = {"ndjson": _encode_ndjson, "csv": _encode_csv, "parquet": _encode_parquet}[format]
+    
+    db = session_factory()
+    try:
+        yield from encode(_iter_partitions(db, yield_per, user_id, filters))
+    finally:
+        db.close()
+
+
+def _iter_partitions(
+    db: Session,
+    yield_per: int,
+    user_id: Optional[int],
+    filters: Dict[str, Any]
+) -> Iterator[Sequence[Sequence[Any]]]:
+    """Column tuples in (date, id) order, `yield_per` rows at a time."""
+    query = (
+        select(*(getattr(Transaction, name) for name in EXPORT_COLUMNS))
+        .where(owned_by(Transaction.user_id, user_id), *TransactionService.filter_clauses(**filters))
+        .order_by(Transaction.date, Transaction.id)
+        .execution_options(yield_per=yield_per)
+    )
+    yield from db.execute(query).partitions()
+
+
+def _text_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _encode_ndjson(partitions: Iterator[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    # orjson writes datetimes in the same ISO format as isoformat()
+    for rows in partitions:
+        yield b"".join(
+            orjson.dumps(dict(zip(EXPORT_COLUMNS, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows
+        )
+
+
+def _encode_csv(partitions: Iterator[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    # Send the header straight away, before the first query round trip
+    yield buffer.getvalue().encode("utf-8")
+    
+    for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_text_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose contents are handed out and dropped."""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _encode_parquet(partitions: Iterator[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("date", pa.timestamp("us")),
+        ("description", pa.string()),
+        ("amount", pa.float64()),
+        ("currency", pa.string()),
+        ("transaction_type", pa.string()),
+        ("category", pa.string()),
+        ("is_business", pa.bool_()),
+        ("business_percentage", pa.float64()),
+        ("user_id", pa.int64()),
+    ])
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    
+    def row_group(rows: List[Sequence[Any]]):
+        return pa.Table.from_arrays(
+            [pa.array([row[i] for row in rows], type=field.type) for i, field in enumerate(schema)],
+            schema=schema
+        )
+    
+    buffered: List[Sequence[Any]] = []
+    for rows in partitions:
+        buffered.extend(rows)
+        if len(buffered) >= PARQUET_ROW_GROUP_SIZE:
+            writer.write_table(row_group(buffered))
+            buffered = []
+            yield sink.drain()
+    if buffered:
+        writer.write_table(row_group(buffered))
+    writer.close()
+    yield sink.drain()
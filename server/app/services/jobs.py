@@ -0,0 +1,221 @@
+"""
+Background ingestion jobs for large statement uploads.
+
+This module handles:
+- Spooling an uploaded file to disk so the HTTP request can return at once
+- Importing spooled files on a worker pool
+- Tracking per-job progress (rows parsed, inserted, rejected, throughput)
+
+Jobs live in process memory: `GET /jobs/{id}` must reach the worker
+process that accepted the upload.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.dedup import file_sha256
+from app.services.parallel_ingest import create_ingest_pool, iter_parallel_batches
+from app.services.transaction_service import MAX_REJECTED_DETAILS, TransactionService
+
+
+# Size of the buffer used when copying uploads to the spool directory
+SPOOL_COPY_BUFFER = 1024 * 1024
+
+# Finished jobs kept for status polling before the oldest are forgotten
+MAX_FINISHED_JOBS = 1000
+
+
+@dataclass
+class Job:
+    """Status and progress of one background import."""
+    
+    id: str
+    filename: str
+    user_id: Optional[int] = None
+    profile: Optional[str] = None
+    status: str = "queued"  # queued -> running -> completed | failed
+    rows_parsed: int = 0
+    rows_inserted: int = 0
+    rows_skipped: int = 0
+    rows_rejected: int = 0
+    duplicate_file: bool = False
+    rejected: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact job summary for API responses."""
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "rows_parsed": self.rows_parsed,
+            "rows_inserted": self.rows_inserted,
+            "rows_skipped": self.rows_skipped,
+            "rows_rejected": self.rows_rejected,
+            "duplicate_file": self.duplicate_file,
+            "rejected": self.rejected,
+            "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+            "rows_per_second": round(self.rows_parsed / elapsed) if elapsed else None,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Runs spooled statement imports on a thread pool and tracks their progress.
+    
+    With `ingest_workers` above 1 (experimental), large CSV files are parsed
+    on a process pool shared by all jobs (see app.services.parallel_ingest),
+    while inserts stay on the job's thread.
+    """
+    
+    def __init__(
+        self,
+        max_workers: int = 2,
+        spool_dir: Optional[str] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        ingest_workers: int = 1
+    ):
+        self.spool_dir = spool_dir or tempfile.gettempdir()
+        self.session_factory = session_factory
+        self.ingest_workers = ingest_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._parse_pool = create_ingest_pool(ingest_workers) if ingest_workers > 1 else None
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def submit_upload(
+        self,
+        file: BinaryIO,
+        filename: str,
+        user_id: Optional[int] = None,
+        profile: Optional[str] = None
+    ) -> Job:
+        """
+        Spool an uploaded file to disk and queue it for import.
+        
+        Args:
+            file: Binary file object of the upload, e.g. `UploadFile.file`
+            filename: Original name of the uploaded file
+            user_id: User the imported transactions belong to
+            profile: Bank profile name; detected from the header when None
+            
+        Returns:
+            Job: The queued job
+        """
+        os.makedirs(self.spool_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=self.spool_dir, prefix="upload-", suffix=os.path.splitext(filename)[1], delete=False
+        ) as spool:
+            shutil.copyfileobj(file, spool, SPOOL_COPY_BUFFER)
+        
+        job = Job(id=uuid.uuid4().hex, filename=filename, user_id=user_id, profile=profile)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_old_jobs()
+        self._executor.submit(self._run, job, spool.name)
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=wait, cancel_futures=not wait)
+    
+    def _run(self, job: Job, path: str) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        db = self.session_factory()
+        try:
+            service = TransactionService(db, job.user_id)
+            with open(path, "rb") as f:
+                file_hash = file_sha256(f)
+                previous = service.find_uploaded_file(file_hash)
+                if previous is not None:
+                    job.duplicate_file = True
+                    job.rows_skipped = previous.rows_inserted + previous.rows_skipped
+                else:
+                    result = service.import_batches(
+                        self._track_parsing(job, iter_parallel_batches(
+                            path, self._parse_pool, self.ingest_workers, job.filename, profile=job.profile
+                        )),
+                        on_batch=lambda created: self._track_inserts(job, created),
+                        file_hash=file_hash,
+                        filename=job.filename
+                    )
+                    job.rows_skipped = result.skipped
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            db.close()
+            os.unlink(path)
+    
+    @staticmethod
+    def _track_parsing(job: Job, batches):
+        for batch in batches:
+            job.rows_parsed += len(batch) + len(batch.rejected)
+            job.rows_rejected += len(batch.rejected)
+            room = MAX_REJECTED_DETAILS - len(job.rejected)
+            if room > 0:
+                job.rejected.extend(batch.rejected[:room])
+            yield batch
+    
+    @staticmethod
+    def _track_inserts(job: Job, created: list) -> None:
+        job.rows_inserted += len(created)
+    
+    def _forget_old_jobs(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+
+_job_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager, creating it on first use."""
+    global _job_manager
+    if _job_manager is None:
+        _job_manager = JobManager(
+            max_workers=settings.job_workers,
+            spool_dir=settings.upload_spool_dir,
+            ingest_workers=settings.ingest_workers or os.cpu_count() or 1
+        )
+    return _job_manager
+
+
+def set_job_manager(manager: JobManager) -> None:
+    """Replace the process-wide job manager (used by tests)."""
+    global _job_manager
+    _job_manager = manager
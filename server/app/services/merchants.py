@@ -0,0 +1,236 @@
+"""
+Merchant normalization and lookup for PaySplit.AI.
+
+This module handles:
+- Normalizing bank descriptions to merchant keys (dropping payment
+  processor prefixes, card suffixes, store numbers, dates and references)
+- Mapping merchant keys to ids in the merchants table, creating missing
+  merchants on the fly
+- An in-process cache of descriptions and merchant ids, so after warm-up
+  resolving a batch costs one dictionary lookup per distinct description
+
+Ids of merchants created inside a database transaction are only added to
+the shared cache once that transaction commits; a rollback discards them.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import event, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.merchant import Merchant
+
+
+# Raw descriptions remembered with their normalized key
+DESCRIPTION_CACHE_MAX_ENTRIES = 100_000
+
+# Merchant keys looked up per SELECT ... WHERE name IN (...)
+LOOKUP_CHUNK_SIZE = 500
+
+# Maximum length of a merchant key or display name
+MAX_NAME_LENGTH = 255
+
+# Session.info key holding the merchants resolved by an open transaction
+_PENDING_KEY = "pending_merchant_ids"
+
+_MONTHS = r"jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec"
+
+# Noise removed from descriptions, in order
+_NOISE_PATTERNS = [
+    # Payment processor and card network prefixes: "SQ *", "TST* ", "POS DEBIT "
+    re.compile(r"^\s*(?:(?:sq|tst|sp|pp|ppl|paypal|dd|pos|ach|checkcard|debit|credit|card|"
+               r"purchase|recurring|pre ?auth)\b\s*\*?\s*)+", re.IGNORECASE),
+    # Card suffixes: "CARD 1234", "XXXX1234", "ending in 1234"
+    re.compile(r"\b(?:card|acct|account|ending in|x{2,}|\*{2,})\s*[x*]*\d{2,}\b", re.IGNORECASE),
+    # Dates: 01/15, 01/15/2024, 2024-01-15, 15 JAN, JAN 15
+    re.compile(r"\b\d{1,4}[/-]\d{1,2}(?:[/-]\d{2,4})?\b", re.IGNORECASE),
+    re.compile(rf"\b(?:\d{{1,2}}\s*(?:{_MONTHS})|(?:{_MONTHS})\s*\d{{1,2}})\b", re.IGNORECASE),
+    # Store numbers and references: "#4521", "STORE 12", "*2K3AB1C", "NO. 7"
+    re.compile(r"(?:#|\*|\bstore\b|\bno\.)\s*[\w-]*\d[\w-]*", re.IGNORECASE),
+    # Remaining reference numbers; short ones may be part of the name ("7-Eleven")
+    re.compile(r"\b\d{3,}\b"),
+]
+
+
+def clean_merchant_name(description: str) -> str:
+    """
+    Strip processor prefixes, card suffixes, store numbers and dates.
+    
+    Keeps the original case, for display: "SQ *BLUE BOTTLE #12 01/15"
+    becomes "BLUE BOTTLE".
+    """
+    text = description
+    for pattern in _NOISE_PATTERNS:
+        text = pattern.sub(" ", text)
+    return " ".join(text.replace("*", " ").split()).strip(" -.,")[:MAX_NAME_LENGTH]
+
+
+def normalize_merchant(description: str) -> Optional[str]:
+    """
+    Normalized merchant key of a description, or None if nothing is left.
+    
+    Case and punctuation are dropped on top of `clean_merchant_name`, so
+    "Starbucks #4521" and "STARBUCKS STORE 17" share the key "starbucks".
+    """
+    key = " ".join(re.sub(r"[^\w&]|_", " ", clean_merchant_name(description).casefold()).split())
+    return key or None
+
+
+class MerchantDirectory:
+    """
+    Process-wide cache from descriptions to merchant ids.
+    
+    `resolve` is safe to call from several threads; each call works in
+    the caller's session and never commits.
+    """
+    
+    def __init__(self, max_descriptions: int = DESCRIPTION_CACHE_MAX_ENTRIES):
+        self.max_descriptions = max_descriptions
+        self._descriptions: "OrderedDict[str, Tuple[Optional[str], str]]" = OrderedDict()
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def resolve(self, db: Session, descriptions: Sequence[str]) -> np.ndarray:
+        """
+        Map descriptions to merchant ids, creating missing merchants.
+        
+        Args:
+            db: Session of the surrounding database transaction
+            descriptions: Description of each row
+        
+        Returns:
+            np.ndarray: Merchant id of each row (object array, None for
+            descriptions that normalize to nothing)
+        """
+        codes, uniques = pd.factorize(np.asarray(descriptions, dtype=object))
+        keys = self._keys([str(d) for d in uniques])
+        pending: Dict[str, int] = db.info.setdefault(_PENDING_KEY, {})
+        
+        ids = np.full(len(keys), None, dtype=object)
+        missing: Dict[str, str] = {}
+        with self._lock:
+            for i, (key, display_name) in enumerate(keys):
+                if key is None:
+                    continue
+                merchant_id = pending.get(key, self._ids.get(key))
+                if merchant_id is None:
+                    missing.setdefault(key, display_name)
+                else:
+                    ids[i] = merchant_id
+        
+        if missing:
+            pending.update(self._load_or_create(db, missing))
+            for i, (key, _) in enumerate(keys):
+                if key in missing:
+                    ids[i] = pending[key]
+        return ids[codes]
+    
+    def publish(self, merchant_ids: Dict[str, int]) -> None:
+        """Add merchants of a committed transaction to the shared cache."""
+        with self._lock:
+            self._ids.update(merchant_ids)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._descriptions.clear()
+            self._ids.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Cache sizes."""
+        with self._lock:
+            return {"descriptions": len(self._descriptions), "merchants": len(self._ids)}
+    
+    def _keys(self, descriptions: List[str]) -> List[Tuple[Optional[str], str]]:
+        """(merchant key, display name) of each distinct description."""
+        result: List[Optional[Tuple[Optional[str], str]]] = []
+        with self._lock:
+            for description in descriptions:
+                cached = self._descriptions.get(description)
+                if cached is not None:
+                    self._descriptions.move_to_end(description)
+                result.append(cached)
+        
+        new = {}
+        for i, description in enumerate(descriptions):
+            if result[i] is None:
+                result[i] = new[description] = (
+                    normalize_merchant(description), clean_merchant_name(description) or description
+                )
+        if new:
+            with self._lock:
+                self._descriptions.update(new)
+                while len(self._descriptions) > self.max_descriptions:
+                    self._descriptions.popitem(last=False)
+        return result
+    
+    @staticmethod
+    def _load_or_create(db: Session, missing: Dict[str, str]) -> Dict[str, int]:
+        """
+        Ids of the given merchant keys, inserting the ones not stored yet.
+        
+        On PostgreSQL and SQLite, merchants inserted concurrently by another
+        upload are skipped with ON CONFLICT DO NOTHING and read back.
+        """
+        found = MerchantDirectory._select_ids(db, missing)
+        new = [
+            {"name": key, "display_name": display_name[:MAX_NAME_LENGTH]}
+            for key, display_name in missing.items() if key not in found
+        ]
+        if new:
+            dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(db.get_bind().dialect.name)
+            if dialect is None:
+                statement = insert(Merchant)
+            else:
+                statement = dialect.insert(Merchant).on_conflict_do_nothing(index_elements=["name"])
+            db.execute(statement, new)
+            found.update(MerchantDirectory._select_ids(db, [row["name"] for row in new]))
+        return found
+    
+    @staticmethod
+    def _select_ids(db: Session, keys: Iterable[str]) -> Dict[str, int]:
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+            found.update(db.execute(select(Merchant.name, Merchant.id).where(Merchant.name.in_(chunk))).tuples().all())
+        return found
+
+
+_directory: Optional[MerchantDirectory] = None
+
+
+def get_merchant_directory() -> MerchantDirectory:
+    """Return the process-wide merchant directory, building it on first use."""
+    global _directory
+    if _directory is None:
+        _directory = MerchantDirectory()
+    return _directory
+
+
+def set_merchant_directory(directory: MerchantDirectory) -> None:
+    """
+    Replace the process-wide merchant directory (used by tests and benchmarks).
+    
+    Cached ids belong to one database; code that drops or swaps the
+    database inside a running process needs a fresh directory.
+    """
+    global _directory
+    _directory = directory
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        get_merchant_directory().publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
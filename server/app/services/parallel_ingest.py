@@ -0,0 +1,363 @@
+"""
+Parallel parsing of large statement uploads for PaySplit.AI.
+
+A spooled CSV is split on record boundaries into byte ranges of about
+RANGE_BYTES, each range is parsed and normalized in a worker process,
+and the batches come back in file order, ready for `import_batches`.
+Steps that need shared state (row fingerprints, merchants, inserts)
+stay in the importing process. This module handles:
+- Finding where a CSV's data starts, after its preamble and header
+- Splitting the data into byte ranges, reading only around each split point
+- Parsing ranges on a process pool with a bounded number in flight
+- Shipping batches back as numeric arrays, with strings as codes into
+  the distinct values of each batch, so the importing process never
+  unpickles one object per value
+- Falling back to the serial readers for files that can't be split
+
+Quoted fields may span lines, so a range must end at a newline outside
+any quoted field. Whether a split point is inside one is guessed from
+the quotes that follow it (see `record_boundary`). Each worker checks
+the guess: a range starting outside a quoted field ends outside one if
+it holds an even number of quotes. If a range holds an odd number, the
+file is parsed serially from that range's start instead.
+
+Experimental: benchmarks so far ran on a single CPU, where the pool
+can't beat serial parsing (0.55-0.85x). The importing process's share of
+the work is about 3% of the serial parsing time, so the pool should
+scale with cores, but INGEST_WORKERS defaults to 1 until that has been
+measured on multi-core hosts.
+"""
+
+import io
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.metrics import timed_stage
+from app.services.bank_profiles import BankProfile, get_profile
+from app.services.csv_parser import DEFAULT_BATCH_SIZE, NormalizedBatch
+from app.services.statement_readers import (
+    check_statement_format, iter_csv_statement, iter_statement_batches, sniff_csv
+)
+
+
+# Bytes of CSV parsed per worker task; files no larger are parsed serially
+RANGE_BYTES = 8 * 1024 * 1024
+
+# Encodings in which a newline byte always ends a line
+SPLITTABLE_ENCODINGS = ("utf-8", "utf-8-sig", "cp1252")
+
+# Quote character of the CSV readers; doubled inside quoted fields
+QUOTE = b'"'
+
+# Bytes read after a split point to guess whether it is inside a quoted field
+BOUNDARY_WINDOW = 64 * 1024
+
+
+@dataclass
+class PackedBatch:
+    """
+    A NormalizedBatch in the form worker processes send back.
+    
+    `arrays` holds the numeric columns as they are, dates as
+    datetime64[us], and the string columns as integer codes into
+    `labels`, their distinct values (-1 for None).
+    """
+    
+    arrays: Dict[str, np.ndarray]
+    labels: Dict[str, np.ndarray] = field(default_factory=dict)
+    rejected: List[Dict[str, Any]] = field(default_factory=list)
+    
+    @classmethod
+    def pack(cls, batch: NormalizedBatch) -> "PackedBatch":
+        arrays, labels = {}, {}
+        for name, values in batch.columns.items():
+            if name == "date":
+                arrays[name] = pd.to_datetime(values).to_numpy("datetime64[us]")
+            elif values.dtype == object:
+                codes, labels[name] = pd.factorize(values)
+                arrays[name] = codes.astype(np.int32)
+            else:
+                arrays[name] = values
+        return cls(arrays=arrays, labels=labels, rejected=batch.rejected)
+    
+    def unpack(self) -> NormalizedBatch:
+        """The batch with the columns `normalize_frame` returns."""
+        columns = {}
+        for name, values in self.arrays.items():
+            if name == "date":
+                columns[name] = values.astype(object)
+            elif name in self.labels:
+                # Code -1 picks the trailing None
+                columns[name] = np.append(self.labels[name], None)[values]
+            else:
+                columns[name] = values
+        return NormalizedBatch(columns=columns, rejected=self.rejected)
+
+
+def create_ingest_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for `iter_parallel_batches`.
+    
+    Workers are spawned rather than forked: the importing process runs
+    threads and holds database connections, neither of which survive a fork.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def iter_parallel_batches(
+    path: str,
+    executor: Optional[Executor],
+    workers: int,
+    filename: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    profile: Optional[str] = None,
+    range_bytes: int = RANGE_BYTES
+) -> Iterator[NormalizedBatch]:
+    """
+    Stream a spooled statement file, parsing byte ranges in parallel.
+    
+    Yields the same batches as `iter_statement_batches`, in file order
+    and with rejected rows numbered from the start of the file. OFX and
+    xlsx files, files of at most one range, files in encodings where a
+    newline byte may be part of a character, and calls without an
+    executor are parsed serially.
+    
+    Args:
+        path: Path of the spooled file
+        executor: Process pool from `create_ingest_pool`, or None
+        workers: Number of workers of the pool; at most twice as many
+            ranges are parsed or held ahead of the consumer
+        filename: Original name of the file, which selects the reader
+        batch_size: Maximum number of rows per yielded batch
+        profile: Bank profile name; detected from the header when None
+        range_bytes: Approximate size of each parsed range
+    
+    Yields:
+        NormalizedBatch: Column arrays and rejected rows of one batch
+    """
+    format = check_statement_format(filename)
+    forced = get_profile(profile) if profile is not None else None
+    
+    with open(path, "rb") as file:
+        layout = None
+        if executor is not None and format == "csv" and os.fstat(file.fileno()).st_size > range_bytes:
+            layout = _csv_layout(file, forced)
+        if layout is None:
+            file.seek(0)
+            yield from iter_statement_batches(file, filename, batch_size, profile)
+            return
+        
+        bank_profile, read_options, header, data_start = layout
+        delimiter = read_options.get("sep", ",").encode(read_options["encoding"])
+        ranges = iter(split_ranges(file, data_start, range_bytes, delimiter))
+    
+    pending: Deque[Tuple[int, Future]] = deque()
+    try:
+        row_offset = 0
+        while True:
+            for start, end in itertools.islice(ranges, 2 * workers - len(pending)):
+                pending.append((start, executor.submit(
+                    _parse_range, path, start, end, header, bank_profile, read_options, batch_size
+                )))
+            if not pending:
+                return
+            start, future = pending.popleft()
+            with timed_stage("parse"):
+                packed = future.result()
+            if packed is None:
+                # The range ends inside a quoted field: its end was guessed wrong
+                rest = _parse_rest(path, start, header, bank_profile, read_options, batch_size)
+                yield from _renumbered(rest, row_offset)
+                return
+            row_offset = yield from _renumbered((batch.unpack() for batch in packed), row_offset)
+    finally:
+        # Stop queued ranges when the consumer stops early or fails
+        for _, future in pending:
+            future.cancel()
+
+
+def split_ranges(
+    file: BinaryIO,
+    start: int,
+    range_bytes: int,
+    delimiter: bytes = b","
+) -> List[Tuple[int, int]]:
+    """
+    Split a file from `start` to its end into byte ranges of whole records.
+    
+    Each range but the last ends at the `record_boundary` after its
+    nominal end, which only reads the bytes following that point.
+    
+    Returns:
+        list: (start, end) byte offsets, end exclusive
+    """
+    size = file.seek(0, os.SEEK_END)
+    ranges = []
+    while start < size:
+        end = size if start + range_bytes >= size else record_boundary(file, start + range_bytes, delimiter)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def record_boundary(file: BinaryIO, position: int, delimiter: bytes = b",") -> int:
+    """
+    Offset just past the first newline at or after `position` that is
+    outside any quoted field, or the size of the file.
+    
+    Whether `position` is inside a quoted field is guessed with
+    `_starts_inside_quotes` from the next BOUNDARY_WINDOW bytes; the
+    quotes from there on tell which newlines are outside. The guess is
+    only wrong when no quote in the window settles it, e.g. inside a
+    quoted field longer than the window.
+    
+    Args:
+        file: Seekable binary file object
+        position: Offset to search from, after the start of the data
+        delimiter: Field delimiter of the CSV
+    """
+    file.seek(position - 1)
+    chunk = file.read(BOUNDARY_WINDOW + 1)
+    inside = _starts_inside_quotes(chunk, delimiter)
+    offset, base = 1, position - 1
+    while chunk:
+        newline = chunk.find(b"\n", offset)
+        while newline >= 0:
+            inside ^= chunk.count(QUOTE, offset, newline) % 2 == 1
+            if not inside:
+                return base + newline + 1
+            offset = newline + 1
+            newline = chunk.find(b"\n", offset)
+        inside ^= chunk.count(QUOTE, offset) % 2 == 1
+        base += len(chunk)
+        chunk, offset = file.read(BOUNDARY_WINDOW), 0
+    return base
+
+
+def _starts_inside_quotes(window: bytes, delimiter: bytes) -> bool:
+    """
+    Guess whether `window[1:]` starts inside a quoted field.
+    
+    The first quote with an ordinary byte next to it settles it. A quote
+    followed by one opens a field, or is the second of a doubled quote,
+    so the quotes before it are balanced. A quote preceded by one closes
+    a field, or is the first of a doubled quote, so they are not.
+    Without such a quote the window is assumed to start outside.
+    """
+    separators = (delimiter, b"\n", b"\r", QUOTE)
+    quotes = 0
+    index = window.find(QUOTE, 1)
+    while index >= 0:
+        following = window[index + 1:index + 2]
+        if following and following not in separators:
+            return quotes % 2 == 1
+        if window[index - 1:index] not in separators:
+            return quotes % 2 == 0
+        quotes += 1
+        index = window.find(QUOTE, index + 1)
+    return False
+
+
+def _csv_layout(
+    file: BinaryIO,
+    profile: Optional[BankProfile]
+) -> Optional[Tuple[BankProfile, Dict[str, Any], bytes, int]]:
+    """
+    Profile, read options, header line and data offset of a splittable CSV.
+    
+    Returns:
+        tuple: Or None if the file can't be split on newline bytes
+    """
+    bank_profile, read_options = sniff_csv(file, profile)
+    if read_options["encoding"] not in SPLITTABLE_ENCODINGS:
+        return None
+    
+    file.seek(0)
+    for _ in range(read_options.pop("skiprows", 0)):
+        file.readline()
+    header = file.readline()
+    if not header.endswith(b"\n"):
+        # No data, or lines ending in a bare carriage return
+        return None
+    return bank_profile, read_options, header, file.tell()
+
+
+def _parse_range(
+    path: str,
+    start: int,
+    end: int,
+    header: bytes,
+    profile: BankProfile,
+    read_options: Dict[str, Any],
+    batch_size: int
+) -> Optional[List[PackedBatch]]:
+    """
+    Parse and normalize one byte range in a worker process.
+    
+    Returns:
+        list: Packed batches of the range, or None if it holds an odd
+            number of quotes, i.e. ends inside a quoted field
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    if data.count(QUOTE) % 2:
+        return None
+    batches = iter_csv_statement(io.BytesIO(header + data), profile, read_options, batch_size)
+    return [PackedBatch.pack(batch) for batch in batches]
+
+
+def _parse_rest(
+    path: str,
+    start: int,
+    header: bytes,
+    profile: BankProfile,
+    read_options: Dict[str, Any],
+    batch_size: int
+) -> Iterator[NormalizedBatch]:
+    """Parse a file from `start` to its end in the importing process."""
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = io.BufferedReader(_PrefixedFile(header, file))
+        yield from iter_csv_statement(data, profile, read_options, batch_size)
+
+
+class _PrefixedFile(io.RawIOBase):
+    """A binary file read from its current position, after some other bytes."""
+    
+    def __init__(self, prefix: bytes, file: BinaryIO):
+        self.prefix = prefix
+        self.file = file
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        if not self.prefix:
+            return self.file.readinto(buffer)
+        size = min(len(buffer), len(self.prefix))
+        buffer[:size] = self.prefix[:size]
+        self.prefix = self.prefix[size:]
+        return size
+
+
+def _renumbered(batches: Iterable[NormalizedBatch], row_offset: int) -> Iterator[NormalizedBatch]:
+    """
+    Yield the batches of one range with rejected rows numbered from the
+    start of the file, and return the row offset of the next range.
+    """
+    rows = 0
+    for batch in batches:
+        for rejected in batch.rejected:
+            rejected["row"] += row_offset
+        rows += len(batch) + len(batch.rejected)
+        yield batch
+    return row_offset + rows
@@ -0,0 +1,273 @@
+"""
+Rollup service for precomputed transaction aggregates.
+
+This module handles:
+- Incrementally applying inserted or deleted transactions to the rollup table
+- Rebuilding the rollup table from the transactions table
+- Reading period (month/quarter/year) aggregates from the rollup table
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import BigInteger, Date, Numeric, and_, cast, delete, func, insert, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.money import business_cents, from_cents, normalize_currency, single_currency
+from app.models.rollup import ROLLUP_KEY, TransactionRollup
+from app.models.transaction import Transaction
+
+
+# Supported period sizes for rollup queries
+GRANULARITIES = ('month', 'quarter', 'year')
+
+# Optional extra grouping columns for rollup queries
+GROUP_BY_COLUMNS = ('category', 'is_business')
+
+RollupKey = Tuple[Optional[int], date, str, str, Optional[str], bool]
+
+
+def month_start(column, dialect_name: str):
+    """SQL expression truncating a timestamp column to the first day of its month."""
+    if dialect_name == 'postgresql':
+        return cast(func.date_trunc('month', column), Date)
+    if dialect_name == 'sqlite':
+        return func.date(column, 'start of month')
+    raise NotImplementedError(f"Rollups are not supported on {dialect_name}")
+
+
+def period_label(month: date, granularity: str) -> str:
+    """Format the period a month falls in, e.g. '2024-03', '2024-Q1' or '2024'."""
+    if granularity == 'month':
+        return f"{month.year}-{month.month:02d}"
+    if granularity == 'quarter':
+        return f"{month.year}-Q{(month.month - 1) // 3 + 1}"
+    return str(month.year)
+
+
+def rollups_owned_by(user_id: Optional[int]) -> Any:
+    """
+    WHERE clause restricting rollups to one user's rows, like
+    `owned_by` but on the indexed form of the user column.
+    """
+    return ROLLUP_KEY[0] == (0 if user_id is None else user_id)
+
+
+class RollupService:
+    """Service class for transaction rollup maintenance and queries."""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def apply(self, transactions: Iterable[Transaction], sign: int = 1) -> List[RollupKey]:
+        """
+        Add (sign=1) or subtract (sign=-1) transactions from the rollups.
+        
+        Transactions are first folded into one delta per rollup key, and
+        the deltas are written with one INSERT ... ON CONFLICT DO UPDATE,
+        which adds each delta to the key's row or creates it. Increments
+        are done in SQL against a unique key, so concurrent writers never
+        lose updates or create a second row for a key. Rows whose count
+        drops to zero are deleted. The caller owns the commit.
+        
+        Args:
+            transactions: Inserted or about-to-be-deleted transactions
+            sign: 1 when transactions were added, -1 when removed
+        
+        Returns:
+            List of rollup keys that changed
+        """
+        deltas: Dict[RollupKey, List[int]] = defaultdict(lambda: [0, 0, 0])
+        for t in transactions:
+            key = (
+                t.user_id,
+                date(t.date.year, t.date.month, 1),
+                t.currency,
+                t.transaction_type,
+                t.category,
+                bool(t.is_business)
+            )
+            delta = deltas[key]
+            delta[0] += t.amount_cents
+            delta[1] += business_cents(t.amount_cents, t.business_percentage)
+            delta[2] += 1
+        if not deltas:
+            return []
+        
+        names = ('user_id', 'month', 'currency', 'transaction_type', 'category', 'is_business')
+        rows = [
+            {
+                **dict(zip(names, key)),
+                "total_cents": sign * total,
+                "business_cents": sign * business,
+                "transaction_count": sign * count,
+            }
+            for key, (total, business, count) in deltas.items()
+        ]
+        self.db.execute(self._upsert_statement(), rows)
+        if sign < 0:
+            for key in deltas:
+                self.db.execute(
+                    delete(TransactionRollup)
+                    .where(self._key_clause(key), TransactionRollup.transaction_count <= 0)
+                    .execution_options(synchronize_session=False)
+                )
+        
+        return list(deltas)
+    
+    def rebuild(self) -> int:
+        """
+        Recompute every rollup row from the transactions table.
+        
+        Runs as one DELETE plus one INSERT ... SELECT ... GROUP BY inside
+        the caller's transaction, so readers never see a half-built table.
+        
+        Returns:
+            int: Number of rollup rows written
+        """
+        month = month_start(Transaction.date, self.db.get_bind().dialect.name)
+        is_business = func.coalesce(Transaction.is_business, literal(False))
+        # Rounded like app.core.money.business_cents: ROUND on NUMERIC rounds
+        # half away from zero on both PostgreSQL and SQLite
+        business = cast(func.round(cast(
+            Transaction.amount_cents * func.coalesce(Transaction.business_percentage, 0.0), Numeric
+        )), BigInteger)
+        aggregate = select(
+            Transaction.user_id,
+            month,
+            Transaction.currency,
+            Transaction.transaction_type,
+            Transaction.category,
+            is_business,
+            func.sum(Transaction.amount_cents),
+            func.sum(business),
+            func.count(Transaction.id)
+        ).group_by(
+            Transaction.user_id, month, Transaction.currency, Transaction.transaction_type,
+            Transaction.category, is_business
+        )
+        
+        self.db.execute(delete(TransactionRollup))
+        self.db.execute(insert(TransactionRollup).from_select(
+            ['user_id', 'month', 'currency', 'transaction_type', 'category', 'is_business',
+             'total_cents', 'business_cents', 'transaction_count'],
+            aggregate
+        ))
+        return self.db.scalar(select(func.count()).select_from(TransactionRollup))
+    
+    def get_rollup(
+        self,
+        granularity: str = 'month',
+        group_by: Optional[str] = None,
+        user_id: Optional[int] = None,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None,
+        currency: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Read income/expense aggregates per period from the rollup table.
+        
+        Totals are summed in integer cents and converted to currency
+        units once per period, so they are exact.
+        
+        Args:
+            granularity: 'month', 'quarter' or 'year'
+            group_by: Optional extra grouping, 'category' or 'is_business'
+            user_id: User whose rollups are read (None for rows stored
+                without a user)
+            start_month: Only include months on or after this date
+            end_month: Only include months on or before this date
+            currency: Only include amounts in this currency; required when
+                the user's rollups span more than one currency
+        
+        Returns:
+            List of per-period (and per-group) totals, oldest first
+        
+        Raises:
+            ValueError: If granularity or group_by is not supported, or
+                the totals would add up amounts in different currencies
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+        if group_by is not None and group_by not in GROUP_BY_COLUMNS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY_COLUMNS)}")
+        
+        group_column = getattr(TransactionRollup, group_by) if group_by else literal(None)
+        query = select(
+            TransactionRollup.month,
+            TransactionRollup.transaction_type,
+            TransactionRollup.currency,
+            group_column,
+            func.sum(TransactionRollup.total_cents),
+            func.sum(TransactionRollup.business_cents),
+            func.sum(TransactionRollup.transaction_count)
+        ).group_by(
+            TransactionRollup.month, TransactionRollup.transaction_type, TransactionRollup.currency, group_column
+        )
+        
+        query = query.where(rollups_owned_by(user_id))
+        if start_month is not None:
+            query = query.where(TransactionRollup.month >= start_month)
+        if end_month is not None:
+            query = query.where(TransactionRollup.month <= end_month)
+        if currency is not None:
+            query = query.where(TransactionRollup.currency == normalize_currency(currency))
+        
+        results = self.db.execute(query).all()
+        single_currency(row_currency for _, _, row_currency, *_ in results)
+        
+        periods: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        for month, transaction_type, _, group, total, business, count in results:
+            if isinstance(month, datetime):
+                month = month.date()
+            label = period_label(month, granularity)
+            row = periods.get((label, group))
+            if row is None:
+                row = periods[(label, group)] = {
+                    "period": label,
+                    "total_income": 0,
+                    "total_expenses": 0,
+                    "business_amount": 0,
+                    "income_count": 0,
+                    "expense_count": 0,
+                }
+                if group_by:
+                    row[group_by] = group
+            if transaction_type == 'Income':
+                row["total_income"] += total
+                row["income_count"] += count
+            elif transaction_type == 'Expense':
+                row["total_expenses"] += total
+                row["expense_count"] += count
+            row["business_amount"] += business
+        
+        rows = sorted(periods.values(), key=lambda r: (r["period"], str(r.get(group_by))))
+        for row in rows:
+            row["net_amount"] = row["total_income"] - row["total_expenses"]
+            for name in ("total_income", "total_expenses", "business_amount", "net_amount"):
+                row[name] = from_cents(row[name])
+        return rows
+    
+    def _upsert_statement(self):
+        """INSERT adding each row's aggregates to the existing row of its key."""
+        dialect_name = self.db.get_bind().dialect.name
+        dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(dialect_name)
+        if dialect is None:
+            raise NotImplementedError(f"Rollups are not supported on {dialect_name}")
+        statement = dialect.insert(TransactionRollup)
+        return statement.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY),
+            set_={
+                name: getattr(TransactionRollup, name) + getattr(statement.excluded, name)
+                for name in ('total_cents', 'business_cents', 'transaction_count')
+            }
+        )
+    
+    @staticmethod
+    def _key_clause(key: RollupKey):
+        """WHERE clause matching a rollup key on its unique index."""
+        user_id, month, currency, transaction_type, category, is_business = key
+        values = (0 if user_id is None else user_id, month, currency, transaction_type, category or '', is_business)
+        return and_(*(column == value for column, value in zip(ROLLUP_KEY, values)))
@@ -0,0 +1,322 @@
+"""
+Statement file readers for PaySplit.AI.
+
+Every supported format is read into raw frames, mapped to the PaySplit
+CSV columns by a bank profile, and validated by the same vectorized
+`normalize_frames` pipeline. This module handles:
+- CSV statements: encoding, delimiter, header row and bank profile are
+  detected once per file from its first SNIFF_BYTES, then the file is
+  streamed in chunks with those options
+- OFX and QFX statements (SGML 1.x and XML 2.x), tokenized as a stream
+- Excel workbooks (.xlsx), read row by row when openpyxl is installed
+"""
+
+import codecs
+import csv
+import html
+import importlib.util
+import itertools
+import os
+import re
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from app.services.bank_profiles import DEFAULT_PROFILE, BankProfile, detect_profile, get_profile
+from app.services.csv_parser import DEFAULT_BATCH_SIZE, NormalizedBatch, _iter_frames, normalize_frames
+
+
+# Format of each accepted file extension
+STATEMENT_FORMATS = {
+    ".csv": "csv",
+    ".ofx": "ofx",
+    ".qfx": "ofx",
+    ".xlsx": "xlsx",
+}
+
+# Bytes read from the start of a CSV file to detect its layout
+SNIFF_BYTES = 8 * 1024
+
+# Lines (or worksheet rows) searched for the header, after account
+# summaries and other preamble some banks put first
+MAX_HEADER_LINE = 20
+
+# Candidate CSV delimiters, in order of preference
+DELIMITERS = (",", ";", "\t", "|")
+
+# Encoding assumed for files that are not valid UTF-8
+FALLBACK_ENCODING = "cp1252"
+
+# Characters decoded per read of an OFX file
+OFX_READ_SIZE = 64 * 1024
+
+# OFX transactions map onto a signed amount layout
+OFX_PROFILE = BankProfile(
+    name='ofx',
+    date_column='Date',
+    description_column='Description',
+    amount_column='Amount',
+    currency_column='Currency',
+    date_format='%Y%m%d',
+)
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def check_statement_format(filename: Optional[str]) -> str:
+    """
+    Validate an upload's file extension before it is read.
+    
+    Args:
+        filename: Original name of the uploaded file; None means CSV
+    
+    Returns:
+        str: 'csv', 'ofx' or 'xlsx'
+    
+    Raises:
+        ValueError: If the extension is not supported or its optional dependency is missing
+    """
+    if filename is None:
+        return "csv"
+    format = STATEMENT_FORMATS.get(os.path.splitext(filename)[1].lower())
+    if format is None:
+        raise ValueError("File must be a CSV, OFX, QFX or XLSX file.")
+    if format == "xlsx" and importlib.util.find_spec("openpyxl") is None:
+        raise ValueError("xlsx import requires the optional openpyxl package")
+    return format
+
+
+def iter_statement_batches(
+    file: BinaryIO,
+    filename: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    profile: Optional[str] = None
+) -> Iterator[NormalizedBatch]:
+    """
+    Stream a statement file and yield normalized, validated batches.
+    
+    Args:
+        file: Seekable binary file object, e.g. `UploadFile.file`
+        filename: Original name of the file, which selects the reader
+        batch_size: Maximum number of rows per yielded batch
+        profile: Name of the bank profile to use instead of detecting it
+            (CSV and xlsx only)
+    
+    Yields:
+        NormalizedBatch: Column arrays and rejected rows of one batch
+    
+    Raises:
+        ValueError: If the format or profile is unknown, or the profile's
+            header is not found
+    """
+    format = check_statement_format(filename)
+    forced = get_profile(profile) if profile is not None else None
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    
+    if format == "ofx":
+        frames, bank_profile = _iter_ofx_frames(file, batch_size), OFX_PROFILE
+    elif format == "xlsx":
+        frames, bank_profile = _iter_xlsx_frames(file, batch_size, forced)
+    else:
+        bank_profile, read_options = sniff_csv(file, forced)
+        return iter_csv_statement(file, bank_profile, read_options, batch_size)
+    
+    return normalize_frames((bank_profile.to_frame(f) for f in frames), date_format=bank_profile.date_format)
+
+
+def iter_csv_statement(
+    file: BinaryIO,
+    profile: BankProfile,
+    read_options: Dict[str, Any],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[NormalizedBatch]:
+    """
+    Stream a CSV statement whose layout is known, e.g. from `sniff_csv`.
+    
+    Args:
+        file: Binary file object positioned at the start of the CSV
+        profile: Bank profile of the file
+        read_options: `pd.read_csv` options returned with the profile
+        batch_size: Maximum number of rows per yielded batch
+    
+    Yields:
+        NormalizedBatch: Column arrays and rejected rows of one batch
+    """
+    frames = _iter_frames(file, batch_size, errors='replace', index_col=False, **read_options)
+    return normalize_frames((profile.to_frame(f) for f in frames), date_format=profile.date_format)
+
+
+def sniff_csv(file: BinaryIO, profile: Optional[BankProfile] = None) -> Tuple[BankProfile, Dict[str, Any]]:
+    """
+    Detect the layout of a CSV statement from its first SNIFF_BYTES.
+    
+    The file is rewound to where it was. Lines are split with each
+    candidate delimiter until one matches a registered profile; a file
+    that matches none is read as a PaySplit CSV.
+    
+    Args:
+        file: Seekable binary file object
+        profile: Only look for this profile's header
+    
+    Returns:
+        tuple: The bank profile, and `pd.read_csv` options (encoding,
+            delimiter, preamble lines to skip, number format)
+    
+    Raises:
+        ValueError: If `profile` is given and its header is not found
+    """
+    start = file.tell()
+    sample = file.read(SNIFF_BYTES)
+    file.seek(start)
+    
+    encoding = _detect_encoding(sample)
+    lines = sample.decode(encoding, errors='ignore').replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if len(sample) == SNIFF_BYTES:
+        # The last line may be cut off
+        lines.pop()
+    
+    candidates = [profile] if profile is not None else None
+    for line_number, line in enumerate(lines[:MAX_HEADER_LINE]):
+        for delimiter in DELIMITERS:
+            if delimiter not in line:
+                continue
+            detected = detect_profile(next(csv.reader([line], delimiter=delimiter)), candidates)
+            if detected is not None:
+                return detected, {
+                    "encoding": encoding, "sep": delimiter, "skiprows": line_number, **detected.read_options
+                }
+    
+    if profile is not None and profile is not DEFAULT_PROFILE:
+        raise ValueError(f"no {profile.name} header found in the first {MAX_HEADER_LINE} lines")
+    return DEFAULT_PROFILE, {"encoding": encoding}
+
+
+def _detect_encoding(sample: bytes) -> str:
+    """Encoding of a file from its first bytes: BOM, then UTF-8, then FALLBACK_ENCODING."""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        # Not final: the sample may end inside a multi-byte character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return "utf-8"
+
+
+def _iter_ofx_frames(file: BinaryIO, batch_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Tokenize an OFX/QFX file into frames of STMTTRN transactions.
+    
+    SGML OFX leaves elements unclosed (`<TRNAMT>-12.50`), XML OFX closes
+    them; both give a tag followed by its text, which is all that is
+    read. Aggregates are closed in both, so a transaction ends at
+    `</STMTTRN>`. The currency is the transaction's CURSYM, or the
+    statement's CURDEF.
+    """
+    rows: List[Dict[str, Any]] = []
+    transaction: Optional[Dict[str, str]] = None
+    statement_currency = None
+    
+    for closing, tag, text in _iter_ofx_tags(file):
+        tag = tag.upper()
+        if tag == "STMTTRN":
+            if not closing:
+                transaction = {}
+                continue
+            if transaction is not None:
+                rows.append({
+                    "Date": transaction.get("DTPOSTED", "")[:8] or None,
+                    "Description": transaction.get("NAME") or transaction.get("MEMO"),
+                    "Amount": transaction.get("TRNAMT"),
+                    "Currency": transaction.get("CURSYM") or statement_currency,
+                })
+                transaction = None
+                if len(rows) == batch_size:
+                    yield pd.DataFrame(rows)
+                    rows = []
+        elif not closing and text.strip():
+            value = html.unescape(text.strip())
+            if transaction is not None:
+                transaction[tag] = value
+            elif tag == "CURDEF":
+                statement_currency = value
+    
+    if rows:
+        yield pd.DataFrame(rows)
+
+
+def _iter_ofx_tags(file: BinaryIO) -> Iterator[Tuple[str, str, str]]:
+    """Yield (closing slash, tag, following text) of an OFX stream, one read at a time."""
+    first = file.read(OFX_READ_SIZE)
+    decoder = codecs.getincrementaldecoder(_detect_encoding(first))(errors='replace')
+    buffer = ""
+    block = first
+    while block:
+        buffer += decoder.decode(block)
+        # Keep the last, possibly incomplete, tag for the next read
+        cut = buffer.rfind("<")
+        for match in _OFX_TAG.finditer(buffer, 0, max(cut, 0)):
+            yield match.groups()
+        buffer = buffer[max(cut, 0):]
+        block = file.read(OFX_READ_SIZE)
+    buffer += decoder.decode(b"", final=True)
+    for match in _OFX_TAG.finditer(buffer):
+        yield match.groups()
+
+
+def _iter_xlsx_frames(
+    file: BinaryIO,
+    batch_size: int,
+    profile: Optional[BankProfile] = None
+) -> Tuple[Iterator[pd.DataFrame], BankProfile]:
+    """
+    Read the active worksheet of a workbook as frames, after its header row.
+    
+    The header is detected like a CSV header, in the first MAX_HEADER_LINE
+    rows; without a match the first row is the header. Cells keep their
+    Excel types, so dates may already be datetimes.
+    """
+    import openpyxl
+    
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    rows = workbook.active.iter_rows(values_only=True)
+    preamble = []
+    candidates = [profile] if profile is not None else None
+    for row in rows:
+        preamble.append(row)
+        detected = detect_profile(row, candidates)
+        if detected is not None or len(preamble) == MAX_HEADER_LINE:
+            break
+    else:
+        detected = None
+    
+    if detected is None:
+        if profile is not None and profile is not DEFAULT_PROFILE:
+            workbook.close()
+            raise ValueError(f"no {profile.name} header found in the first {MAX_HEADER_LINE} rows")
+        detected = DEFAULT_PROFILE
+        rows = itertools.chain(preamble[1:], rows)
+        header = preamble[0] if preamble else ()
+    else:
+        header = preamble[-1]
+    columns = [str(c) if c is not None else f"column_{i}" for i, c in enumerate(header)]
+    
+    def frames() -> Iterator[pd.DataFrame]:
+        try:
+            width = len(columns)
+            batch = []
+            for row in rows:
+                if any(cell is not None for cell in row):
+                    batch.append(tuple(row[:width]) + (None,) * (width - len(row)))
+                if len(batch) == batch_size:
+                    yield pd.DataFrame.from_records(batch, columns=columns)
+                    batch = []
+            if batch:
+                yield pd.DataFrame.from_records(batch, columns=columns)
+        finally:
+            workbook.close()
+    
+    return frames(), detected
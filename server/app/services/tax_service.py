@@ -0,0 +1,175 @@
+"""
+Quarterly tax estimates for PaySplit.AI.
+
+This module handles:
+- Grouping months into the IRS estimated-payment periods
+- Reading each period's income and deductible business expenses from
+  the rollup table
+- Estimating the period's self-employment and federal income tax,
+  vectorized over the requested periods
+- Estimated payment due dates
+
+The "quarters" of estimated tax are not calendar quarters: the payment
+due on Jun 15 covers April and May, the one due on Sep 15 covers June
+to August and the one due on Jan 15 covers September to December (see
+PAYMENT_PERIODS). Each period is estimated on its own: its net profit
+is annualized over the period's length, taxed with the year's tables,
+and the period's share of the annual tax is due. An estimate therefore
+only depends on the transactions of its period, which is what lets the
+API cache estimates per period.
+
+Income counts as self-employment income and deductible expenses are
+the business share (amount x business_percentage) of each expense, as
+summed in `TransactionRollup.business_cents`. Only amounts in the
+default currency are included. Credits, the qualified business income
+deduction and state taxes are not modelled.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.money import from_cents
+from app.models.rollup import TransactionRollup
+from app.services.rollup_service import rollups_owned_by
+from app.services.tax_tables import get_tax_table
+
+
+QUARTERS = (1, 2, 3, 4)
+
+# First and last month of the income each estimated payment covers
+PAYMENT_PERIODS = {1: (1, 3), 2: (4, 5), 3: (6, 8), 4: (9, 12)}
+
+# (month, day) each quarter's estimated payment is due; Q4 falls in the next year
+DUE_DATES = {1: (4, 15), 2: (6, 15), 3: (9, 15), 4: (1, 15)}
+
+# Payment period of each month, indexed by month number (index 0 unused)
+PERIOD_OF_MONTH = np.array(
+    [0] + [quarter for quarter, (first, last) in PAYMENT_PERIODS.items() for _ in range(first, last + 1)]
+)
+
+# Months covered by each payment period, in quarter order
+PERIOD_MONTHS = np.array([last - first + 1 for first, last in PAYMENT_PERIODS.values()])
+
+
+def quarter_label(year: int, quarter: int) -> str:
+    """Label of an estimated-payment period, e.g. '2024-Q2' (April and May 2024)."""
+    return f"{year}-Q{quarter}"
+
+
+def payment_periods_of(dates: Iterable[datetime]) -> Set[str]:
+    """Labels of the payment periods a collection of timestamps falls in, e.g. {'2024-Q1'}."""
+    months = np.unique(np.array(list(dates), dtype='datetime64[M]')).astype(object)
+    return {quarter_label(month.year, int(PERIOD_OF_MONTH[month.month])) for month in months}
+
+
+def period_end(year: int, quarter: int) -> date:
+    """Last day of the income a quarter's estimated payment covers."""
+    last = PAYMENT_PERIODS[quarter][1]
+    return date(year, 12, 31) if last == 12 else date(year, last + 1, 1) - timedelta(days=1)
+
+
+def due_date(year: int, quarter: int) -> date:
+    """Due date of a quarter's estimated payment."""
+    month, day = DUE_DATES[quarter]
+    return date(year + 1 if quarter == 4 else year, month, day)
+
+
+class TaxEstimateService:
+    """Service class for one user's quarterly tax estimates."""
+    
+    def __init__(self, db: Session, user_id: Optional[int] = None):
+        self.db = db
+        self.user_id = user_id
+    
+    def get_quarterly_estimates(
+        self,
+        year: int,
+        filing_status: str = 'single',
+        quarters: Optional[Sequence[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Estimate the self-employment and income tax of each payment period.
+        
+        Args:
+            year: Tax year
+            filing_status: 'single' or 'married_joint'
+            quarters: Payment periods (1-4) to estimate; all four when None
+        
+        Returns:
+            List of per-period estimates, in period order
+        
+        Raises:
+            ValueError: If there is no tax table for the year and filing
+                status, or a quarter is not 1-4
+        """
+        table = get_tax_table(year, filing_status)
+        quarters = sorted(set(QUARTERS if quarters is None else quarters))
+        if not quarters or any(q not in QUARTERS for q in quarters):
+            raise ValueError("quarters must be between 1 and 4")
+        
+        income, deductible = self._quarter_totals(year)
+        index = np.array(quarters) - 1
+        income, deductible = income[index], deductible[index]
+        # Share of the year each period covers
+        share = PERIOD_MONTHS[index] / 12
+        
+        net_profit = income - deductible
+        annual_profit = np.maximum(net_profit, 0) / share
+        se_tax = table.self_employment_tax(annual_profit)
+        # Half of the self-employment tax is deducted from income
+        taxable = annual_profit - se_tax / 2 - table.standard_deduction_cents
+        income_tax = table.income_tax(taxable)
+        
+        se_cents = np.rint(se_tax * share).astype(np.int64)
+        income_tax_cents = np.rint(income_tax * share).astype(np.int64)
+        return [
+            {
+                "period": quarter_label(year, quarter),
+                "period_start": date(year, PAYMENT_PERIODS[quarter][0], 1).isoformat(),
+                "period_end": period_end(year, quarter).isoformat(),
+                "due_date": due_date(year, quarter).isoformat(),
+                "income": from_cents(int(income[i])),
+                "deductible_expenses": from_cents(int(deductible[i])),
+                "net_profit": from_cents(int(net_profit[i])),
+                "self_employment_tax": from_cents(int(se_cents[i])),
+                "income_tax": from_cents(int(income_tax_cents[i])),
+                "estimated_tax": from_cents(int(se_cents[i] + income_tax_cents[i])),
+            }
+            for i, quarter in enumerate(quarters)
+        ]
+    
+    def _quarter_totals(self, year: int) -> tuple:
+        """Income and deductible expense cents of each payment period of a year, as arrays."""
+        rows = self.db.execute(
+            select(
+                TransactionRollup.month,
+                TransactionRollup.transaction_type,
+                func.sum(TransactionRollup.total_cents),
+                func.sum(TransactionRollup.business_cents)
+            )
+            .where(
+                rollups_owned_by(self.user_id),
+                TransactionRollup.currency == settings.default_currency,
+                TransactionRollup.month >= date(year, 1, 1),
+                TransactionRollup.month <= date(year, 12, 1),
+                TransactionRollup.transaction_type.in_(('Income', 'Expense'))
+            )
+            .group_by(TransactionRollup.month, TransactionRollup.transaction_type)
+        ).all()
+        
+        income = np.zeros(len(QUARTERS), dtype=np.int64)
+        deductible = np.zeros(len(QUARTERS), dtype=np.int64)
+        for month, transaction_type, total, business in rows:
+            if isinstance(month, datetime):
+                month = month.date()
+            quarter = PERIOD_OF_MONTH[month.month] - 1
+            if transaction_type == 'Income':
+                income[quarter] += total
+            else:
+                deductible[quarter] += business
+        return income, deductible
@@ -0,0 +1,149 @@
+"""
+Federal tax tables for PaySplit.AI tax estimates.
+
+This module handles:
+- Income tax brackets, standard deductions and the Social Security wage
+  base per tax year and filing status
+- Vectorized bracket lookup over arrays of taxable income
+- Looking up the table of a year and filing status
+
+Amounts are in integer cents. Brackets are stored as sorted arrays of
+lower bounds with the tax owed at each bound precomputed, so the tax on
+any number of incomes is one `searchsorted` and a multiply-add.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+
+# Filing statuses with bracket tables
+FILING_STATUSES = ('single', 'married_joint')
+
+# Marginal rates of the federal brackets, lowest first
+BRACKET_RATES = (0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37)
+
+# Self-employment tax: the share of net profit it applies to, the Social
+# Security rate (up to the wage base) and the Medicare rate (uncapped)
+SE_EARNINGS_SHARE = 0.9235
+SOCIAL_SECURITY_RATE = 0.124
+MEDICARE_RATE = 0.029
+
+# Net self-employment earnings below this owe no self-employment tax
+SE_TAX_MINIMUM_CENTS = 400_00
+
+
+@dataclass(frozen=True)
+class TaxTable:
+    """
+    Federal tax parameters of one tax year and filing status.
+    
+    `thresholds` holds the lower bound of each bracket in cents, starting
+    at 0, and `rates` the marginal rate of each bracket.
+    """
+    
+    year: int
+    filing_status: str
+    standard_deduction_cents: int
+    social_security_wage_base_cents: int
+    thresholds: np.ndarray = field(compare=False)
+    rates: np.ndarray = field(compare=False)
+    base_tax: np.ndarray = field(init=False, compare=False)
+    
+    def __post_init__(self):
+        if self.thresholds[0] != 0 or np.any(np.diff(self.thresholds) <= 0):
+            raise ValueError("bracket thresholds must start at 0 and increase")
+        if len(self.rates) != len(self.thresholds):
+            raise ValueError("every bracket needs a rate")
+        # Tax owed at the lower bound of each bracket
+        widths = np.diff(self.thresholds)
+        base_tax = np.concatenate(([0.0], np.cumsum(widths * self.rates[:-1])))
+        object.__setattr__(self, "base_tax", base_tax)
+    
+    def income_tax(self, taxable_cents: np.ndarray) -> np.ndarray:
+        """
+        Tax in cents on each taxable income, unrounded.
+        
+        Args:
+            taxable_cents: Taxable incomes in cents; negative values owe nothing
+        """
+        taxable = np.maximum(np.asarray(taxable_cents, dtype=float), 0.0)
+        bracket = np.searchsorted(self.thresholds, taxable, side='right') - 1
+        return self.base_tax[bracket] + (taxable - self.thresholds[bracket]) * self.rates[bracket]
+    
+    def self_employment_tax(self, net_profit_cents: np.ndarray) -> np.ndarray:
+        """
+        Annual self-employment tax in cents on each net profit, unrounded.
+        
+        The 0.9% Additional Medicare Tax on high earners is not included.
+        """
+        earnings = np.maximum(np.asarray(net_profit_cents, dtype=float), 0.0) * SE_EARNINGS_SHARE
+        tax = (
+            np.minimum(earnings, self.social_security_wage_base_cents) * SOCIAL_SECURITY_RATE
+            + earnings * MEDICARE_RATE
+        )
+        return np.where(earnings < SE_TAX_MINIMUM_CENTS, 0.0, tax)
+
+
+def build_table(
+    year: int,
+    filing_status: str,
+    standard_deduction: int,
+    wage_base: int,
+    bracket_starts: Sequence[int],
+    rates: Sequence[float] = BRACKET_RATES
+) -> TaxTable:
+    """
+    Build a table from amounts in whole dollars.
+    
+    Args:
+        bracket_starts: Lower bounds of every bracket but the first, which starts at 0
+    """
+    return TaxTable(
+        year=year,
+        filing_status=filing_status,
+        standard_deduction_cents=standard_deduction * 100,
+        social_security_wage_base_cents=wage_base * 100,
+        thresholds=np.array([0, *bracket_starts], dtype=float) * 100,
+        rates=np.array(rates, dtype=float)
+    )
+
+
+# year: (Social Security wage base, {filing status: (standard deduction, bracket starts)})
+_FEDERAL = {
+    2024: (168_600, {
+        'single': (14_600, (11_600, 47_150, 100_525, 191_950, 243_725, 609_350)),
+        'married_joint': (29_200, (23_200, 94_300, 201_050, 383_900, 487_450, 731_200)),
+    }),
+    2025: (176_100, {
+        'single': (15_750, (11_925, 48_475, 103_350, 197_300, 250_525, 626_350)),
+        'married_joint': (31_500, (23_850, 96_950, 206_700, 394_600, 501_050, 751_600)),
+    }),
+    2026: (184_500, {
+        'single': (16_100, (12_400, 50_400, 105_700, 201_775, 256_225, 640_600)),
+        'married_joint': (32_200, (24_800, 100_800, 211_400, 403_550, 512_450, 768_700)),
+    }),
+}
+
+TAX_TABLES: Dict[Tuple[int, str], TaxTable] = {
+    (year, status): build_table(year, status, deduction, wage_base, starts)
+    for year, (wage_base, statuses) in _FEDERAL.items()
+    for status, (deduction, starts) in statuses.items()
+}
+
+
+def get_tax_table(year: int, filing_status: str = 'single') -> TaxTable:
+    """
+    Look up the federal tax table of a year and filing status.
+    
+    Raises:
+        ValueError: If there is no table for the year or filing status
+    """
+    if filing_status not in FILING_STATUSES:
+        raise ValueError(f"filing_status must be one of: {', '.join(FILING_STATUSES)}")
+    table = TAX_TABLES.get((year, filing_status))
+    if table is None:
+        years = sorted({y for y, _ in TAX_TABLES})
+        raise ValueError(f"no tax table for {year}; supported years: {', '.join(map(str, years))}")
+    return table
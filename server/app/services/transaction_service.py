@@ -8,17 +8,172 @@ This module handles all database interactions for transactions:
 - Deleting transactions
 """
 
+from sqlalchemy import case, column, func, insert, literal, literal_column, select, table, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from itertools import islice
+from typing import BinaryIO, Callable, Iterable, List, Optional, Dict, Any, Tuple
+from dataclasses import dataclass, field
+import base64
+import binascii
+import json
+import re
+import time
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+from app.models.merchant import Merchant
 from app.models.transaction import Transaction
+from app.models.upload import UploadedFile
+from app.services.csv_parser import DEFAULT_BATCH_SIZE, NormalizedBatch, normalize_frame
+from app.core.metrics import timed_stage
+from app.core.money import from_cents, normalize_currency, single_currency, to_cents
+from app.core.search_index import FTS_TABLE, TSVECTOR_CONFIG, search_index_available
+from app.services.cache import get_cache
+from app.services.categorizer import get_categorizer
+from app.services.dedup import RowFingerprinter, file_sha256
+from app.services.merchants import get_merchant_directory
+from app.services.rollup_service import RollupService
+from app.services.statement_readers import iter_statement_batches
+from app.services.tax_service import payment_periods_of
+
+
+# Number of rows sent to the database per INSERT statement in bulk paths
+DEFAULT_CHUNK_SIZE = 1000
+
+# Rejected rows described individually in an ImportResult; the rest are only counted
+MAX_REJECTED_DETAILS = 100
+
+# Rows read and updated per round trip by the backfill jobs
+DEFAULT_BACKFILL_BATCH_SIZE = 5000
+
+# Merchants returned by get_merchant_summary unless asked otherwise
+DEFAULT_MERCHANT_LIMIT = 50
+
+# Search ranks only this many of the most recently added matches, which
+# keeps common terms ("amazon") from ranking every matching row; older
+# matches follow unranked
+SEARCH_RANK_WINDOW = 5000
+
+# Words of a search query beyond this are ignored
+MAX_SEARCH_TERMS = 8
+
+# Columns returned by the lean read paths, matching the keys of Transaction.to_dict
+TRANSACTION_FIELDS = (
+    "id",
+    "date",
+    "description",
+    "amount",
+    "amount_cents",
+    "currency",
+    "transaction_type",
+    "category",
+    "is_business",
+    "business_percentage",
+    "created_at",
+    "updated_at",
+)
+
+
+@dataclass
+class ImportResult:
+    """Outcome of a batch import."""
+    
+    inserted: int = 0
+    skipped: int = 0
+    rejected_count: int = 0
+    rejected: List[Dict[str, Any]] = field(default_factory=list)
+    duplicate_file: bool = False
+    
+    def add_rejected(self, rows: List[Dict[str, Any]]) -> None:
+        """Record rejected rows, keeping details for the first few only."""
+        self.rejected_count += len(rows)
+        room = MAX_REJECTED_DETAILS - len(self.rejected)
+        if room > 0:
+            self.rejected.extend(rows[:room])
+
+
+def encode_cursor(date: datetime, transaction_id: int) -> str:
+    """Encode a (date, id) keyset position as an opaque URL-safe token."""
+    payload = json.dumps([date.isoformat(), transaction_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a token produced by `encode_cursor`.
+    
+    Raises:
+        ValueError: If the token is not a valid cursor
+    """
+    try:
+        date, transaction_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(date), int(transaction_id)
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def encode_search_cursor(kind: str, value: int) -> str:
+    """
+    Encode a search position as an opaque URL-safe token: ("offset", n)
+    into the ranked results, or ("before", id) among the older matches.
+    """
+    return base64.urlsafe_b64encode(json.dumps([kind, value]).encode('utf-8')).decode('ascii')
+
+
+def decode_search_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a token produced by `encode_search_cursor`.
+    
+    Raises:
+        ValueError: If the token is not a valid cursor
+    """
+    try:
+        kind, value = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if kind not in ("offset", "before") or int(value) < 0:
+            raise ValueError(cursor)
+        return kind, int(value)
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def owned_by(column: Any, user_id: Optional[int]) -> Any:
+    """
+    WHERE clause restricting `column` to one user's rows.
+    
+    Rows stored without a user belong to the default (None) user, so
+    user_id None matches `column IS NULL` rather than every row.
+    """
+    return column.is_(None) if user_id is None else column == user_id
+
+
+def search_terms(q: str) -> List[str]:
+    """
+    Split a search query into lower-case words.
+    
+    Raises:
+        ValueError: If the query has no letters or digits
+    """
+    terms = re.findall(r"[^\W_]+", q.casefold())[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise ValueError("q must contain at least one letter or digit")
+    return terms
 
 
 class TransactionService:
-    """Service class for transaction database operations."""
+    """
+    Service class for transaction database operations.
     
-    def __init__(self, db: Session):
+    Every read and write is scoped to one user: `user_id` is stored on
+    created rows and all queries only see that user's rows (None is the
+    default user, owning rows stored without a user). The backfill jobs
+    are the exception and work across all users.
+    """
+    
+    def __init__(self, db: Session, user_id: Optional[int] = None):
         self.db = db
+        self.user_id = user_id
     
     def create_transaction(self, transaction_data: Dict[str, Any]) -> Transaction:
         """
@@ -29,35 +184,455 @@ class TransactionService:
             
         Returns:
             Transaction: The created transaction object
+            
+        Raises:
+            ValueError: If the date, amount, type or currency is invalid
         """
-        # Parse date string to datetime object
-        if isinstance(transaction_data.get('Date'), str):
-            try:
-                date = datetime.strptime(transaction_data['Date'], '%Y-%m-%d')
-            except ValueError:
-                # Fallback to current date if parsing fails
-                date = datetime.now()
-        else:
-            date = datetime.now()
-        
         # Create transaction object
-        transaction = Transaction(
-            date=date,
-            description=transaction_data.get('Description', ''),
-            amount=float(transaction_data.get('Amount', 0.0)),
-            transaction_type=transaction_data.get('Type', 'Expense'),
-            category=None,  # Will be set by AI categorization later
-            is_business=False,  # Will be determined by AI later
-            business_percentage=0.0  # Will be calculated later
-        )
+        values = self._build_transaction_values(transaction_data)
+        values["user_id"] = self.user_id
+        values["merchant_id"] = get_merchant_directory().resolve(self.db, [values["description"]])[0]
+        transaction = Transaction(**values)
         
-        # Save to database
+        # Save to database, keeping the rollups in the same transaction
         self.db.add(transaction)
+        self.db.flush()
+        RollupService(self.db).apply([transaction])
         self.db.commit()
+        get_cache().invalidate(self.user_id, payment_periods_of([transaction.date]))
         self.db.refresh(transaction)
         
         return transaction
     
+    def bulk_create_transactions(
+        self,
+        transactions_data: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> List[Transaction]:
+        """
+        Create many transactions in a single database transaction.
+        
+        Rows are validated and normalized up front with the vectorized
+        CSV normalization stage and written with one multi-row
+        INSERT ... RETURNING statement per chunk instead of an
+        add/commit/refresh round trip per row.
+        
+        Args:
+            transactions_data: Iterable of parsed CSV rows
+            chunk_size: Number of rows written per INSERT statement
+            
+        Returns:
+            List[Transaction]: The created transaction objects, in input order
+            
+        Raises:
+            ValueError: If any row fails validation (nothing is written)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        # Validate and normalize the whole batch before touching the database
+        batch = normalize_frame(pd.DataFrame.from_records(list(transactions_data)))
+        if batch.rejected:
+            raise ValueError(f"{len(batch.rejected)} invalid rows, first: {batch.rejected[0]}")
+        self.prepare_batch(batch)
+        
+        try:
+            self._link_batch(batch)
+            created = self._insert_values(batch.records(), chunk_size)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        get_cache().invalidate(self.user_id, payment_periods_of(t.date for t in created))
+        return created
+    
+    def import_file(
+        self,
+        file: BinaryIO,
+        filename: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_batch: Optional[Callable[[List[Transaction]], None]] = None,
+        profile: Optional[str] = None
+    ) -> ImportResult:
+        """
+        Import a statement upload, skipping files and rows that were seen before.
+        
+        A file whose content hash matches an earlier import is not parsed
+        at all; its result reports every previously imported row as skipped.
+        
+        Args:
+            file: Seekable binary file object of the upload
+            filename: Original name of the uploaded file, which selects the
+                statement reader (CSV when None)
+            chunk_size: Number of rows written per INSERT statement
+            batch_size: Number of rows parsed at a time
+            on_batch: Optional callback receiving each batch's created transactions
+            profile: Bank profile name; detected from the header when None
+            
+        Returns:
+            ImportResult: Counts of inserted, skipped and rejected rows
+        """
+        file_hash = file_sha256(file)
+        previous = self.find_uploaded_file(file_hash)
+        if previous is not None:
+            return ImportResult(
+                skipped=previous.rows_inserted + previous.rows_skipped,
+                duplicate_file=True
+            )
+        
+        return self.import_batches(
+            iter_statement_batches(file, filename, batch_size, profile),
+            chunk_size=chunk_size,
+            on_batch=on_batch,
+            file_hash=file_hash,
+            filename=filename
+        )
+    
+    def import_batches(
+        self,
+        batches: Iterable[NormalizedBatch],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        on_batch: Optional[Callable[[List[Transaction]], None]] = None,
+        file_hash: Optional[str] = None,
+        filename: Optional[str] = None
+    ) -> ImportResult:
+        """
+        Insert a stream of normalized batches in a single database transaction.
+        
+        Only one batch is held in memory at a time, which makes this the
+        insert path for the streaming CSV parser. Rows rejected during
+        normalization are skipped and reported in the result, and rows
+        already stored by an earlier upload are skipped and counted.
+        
+        Args:
+            batches: Iterable of normalized CSV batches
+            chunk_size: Number of rows written per INSERT statement
+            on_batch: Optional callback receiving each batch's created transactions
+            file_hash: Content hash of the source file, recorded with the import
+            filename: Original name of the source file
+            
+        Returns:
+            ImportResult: Counts of inserted, skipped and rejected rows
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        result = ImportResult()
+        fingerprinter = RowFingerprinter(self.user_id)
+        quarters = set()
+        try:
+            for batch in batches:
+                result.add_rejected(batch.rejected)
+                self.prepare_batch(batch, fingerprinter)
+                created = self.insert_batch(batch, chunk_size)
+                quarters |= payment_periods_of(t.date for t in created)
+                result.inserted += len(created)
+                result.skipped += len(batch) - len(created)
+                if on_batch:
+                    on_batch(created)
+            if file_hash is not None:
+                self.record_upload(file_hash, filename, result)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            # Run the reader's cleanup now, while the upload is still open
+            close = getattr(batches, "close", None)
+            if close is not None:
+                close()
+        
+        get_cache().invalidate(self.user_id, quarters)
+        return result
+    
+    @staticmethod
+    def prepare_batch(
+        batch: NormalizedBatch,
+        fingerprinter: Optional[RowFingerprinter] = None
+    ) -> NormalizedBatch:
+        """
+        Run the in-memory pipeline stages on a batch before it is inserted.
+        
+        Categorizes the rows (unless CATEGORIZER_ENABLED is off) and, when
+        a fingerprinter is given, fingerprints them so rows already stored
+        by an earlier upload are skipped on insert. No database access, so
+        the async service runs it in the threadpool.
+        
+        Args:
+            batch: Normalized CSV batch, updated in place
+            fingerprinter: Fingerprinter of the surrounding import
+            
+        Returns:
+            NormalizedBatch: The same batch
+        """
+        if settings.categorizer_enabled:
+            get_categorizer().apply(batch)
+        if fingerprinter is not None:
+            fingerprinter.apply(batch)
+        return batch
+    
+    def insert_batch(self, batch: NormalizedBatch, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Transaction]:
+        """
+        Insert the valid rows of one normalized batch without committing.
+        
+        Building block for `import_batches` and the async service, which
+        own the surrounding database transaction and call `prepare_batch`
+        first.
+        
+        Args:
+            batch: Normalized CSV batch
+            chunk_size: Number of rows written per INSERT statement
+            
+        Returns:
+            List[Transaction]: The created transaction objects
+        """
+        self._link_batch(batch)
+        with timed_stage("insert"):
+            return self._insert_values(batch.records(), chunk_size)
+    
+    def _link_batch(self, batch: NormalizedBatch) -> None:
+        """Fill the user_id and merchant_id columns, creating merchants seen for the first time."""
+        batch.columns["user_id"] = np.full(len(batch), self.user_id, dtype=object)
+        with timed_stage("merchants"):
+            batch.columns["merchant_id"] = get_merchant_directory().resolve(self.db, batch.columns["description"])
+    
+    def backfill_categories(
+        self,
+        batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE,
+        overwrite: bool = False,
+        on_progress: Optional[Callable[[int, float], None]] = None
+    ) -> int:
+        """
+        Categorize stored transactions in a single database transaction.
+        
+        Rows of all users are read in id order, `batch_size` at a time,
+        categorized with one vectorized call per batch and written back
+        with a bulk UPDATE by primary key. Rollups are rebuilt afterwards,
+        since they are grouped by category.
+        
+        Args:
+            batch_size: Rows read and categorized per round trip
+            overwrite: Recategorize rows that already have a category
+            on_progress: Optional callback receiving the rows processed so
+                far and the elapsed seconds after each batch
+            
+        Returns:
+            int: Number of rows updated
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        categorizer = get_categorizer()
+        start = time.perf_counter()
+        processed = updated = 0
+        last_id = 0
+        try:
+            while True:
+                query = select(Transaction.id, Transaction.description, Transaction.transaction_type).where(
+                    Transaction.id > last_id
+                )
+                if not overwrite:
+                    query = query.where(Transaction.category.is_(None))
+                rows = self.db.execute(query.order_by(Transaction.id).limit(batch_size)).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                
+                ids, descriptions, types = zip(*rows)
+                category, is_business, percentage = categorizer.categorize(descriptions, types)
+                values = [
+                    {"id": i, "category": c, "is_business": b, "business_percentage": p}
+                    for i, c, b, p in zip(ids, category.tolist(), is_business.tolist(), percentage.tolist())
+                    if overwrite or c is not None
+                ]
+                if values:
+                    self.db.execute(update(Transaction), values)
+                processed += len(rows)
+                updated += len(values)
+                if on_progress:
+                    on_progress(processed, time.perf_counter() - start)
+            
+            RollupService(self.db).rebuild()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        get_cache().invalidate_all()
+        return updated
+    
+    def backfill_merchants(
+        self,
+        batch_size: int = DEFAULT_BACKFILL_BATCH_SIZE,
+        on_progress: Optional[Callable[[int, float], None]] = None
+    ) -> int:
+        """
+        Link stored transactions without a merchant to their merchant.
+        
+        Rows of all users are read in id order, `batch_size` at a time,
+        resolved through the merchant directory and written back with a
+        bulk UPDATE by primary key, all in a single database transaction.
+        
+        Args:
+            batch_size: Rows read and resolved per round trip
+            on_progress: Optional callback receiving the rows processed so
+                far and the elapsed seconds after each batch
+            
+        Returns:
+            int: Number of rows updated
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        directory = get_merchant_directory()
+        start = time.perf_counter()
+        processed = updated = 0
+        last_id = 0
+        try:
+            while rows := self.db.execute(
+                select(Transaction.id, Transaction.description)
+                .where(Transaction.id > last_id, Transaction.merchant_id.is_(None))
+                .order_by(Transaction.id)
+                .limit(batch_size)
+            ).all():
+                last_id = rows[-1].id
+                ids, descriptions = zip(*rows)
+                values = [
+                    {"id": i, "merchant_id": merchant_id}
+                    for i, merchant_id in zip(ids, directory.resolve(self.db, descriptions).tolist())
+                    if merchant_id is not None
+                ]
+                if values:
+                    self.db.execute(update(Transaction), values)
+                processed += len(rows)
+                updated += len(values)
+                if on_progress:
+                    on_progress(processed, time.perf_counter() - start)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        get_cache().invalidate_all()
+        return updated
+    
+    def find_uploaded_file(self, file_hash: str) -> Optional[UploadedFile]:
+        """Return the user's earlier import of a file with this content hash, if any."""
+        return self.db.scalars(
+            select(UploadedFile).where(
+                owned_by(UploadedFile.user_id, self.user_id), UploadedFile.sha256 == file_hash
+            ).limit(1)
+        ).first()
+    
+    def record_upload(self, file_hash: str, filename: Optional[str], result: ImportResult) -> UploadedFile:
+        """Record a finished import of a file without committing."""
+        upload = UploadedFile(
+            sha256=file_hash,
+            filename=filename,
+            user_id=self.user_id,
+            rows_inserted=result.inserted,
+            rows_skipped=result.skipped,
+            rows_rejected=result.rejected_count
+        )
+        self.db.add(upload)
+        return upload
+    
+    def _insert_values(self, values: List[Dict[str, Any]], chunk_size: int) -> List[Transaction]:
+        """
+        Write normalized column values with one INSERT ... RETURNING per chunk.
+        
+        Rows carrying a fingerprint that is already stored are skipped and
+        left out of the result. Rollups are updated for the inserted rows.
+        The caller is responsible for committing or rolling back.
+        """
+        dedupe = bool(values) and "fingerprint" in values[0]
+        statement, skips_conflicts = self._insert_statement(dedupe)
+        # Rows with and without a category have different non-NULL keys; without
+        # render_nulls the ORM splits every change between them into its own INSERT
+        statement = statement.returning(Transaction).execution_options(render_nulls=True)
+        
+        created: List[Transaction] = []
+        rows = iter(values)
+        while chunk := list(islice(rows, chunk_size)):
+            if dedupe and not skips_conflicts:
+                chunk = self._without_stored_fingerprints(chunk)
+                if not chunk:
+                    continue
+            # Ids are assigned in VALUES order, so sorting by id restores input
+            # order without sort_by_parameter_order, which makes SQLite fall
+            # back to one statement per row
+            created.extend(sorted(self.db.scalars(statement, chunk).all(), key=lambda t: t.id))
+        RollupService(self.db).apply(created)
+        return created
+    
+    def _insert_statement(self, dedupe: bool) -> Tuple[Any, bool]:
+        """
+        INSERT for Transaction rows, and whether it skips stored fingerprints.
+        
+        PostgreSQL and SQLite skip conflicting rows in the INSERT itself
+        (ON CONFLICT DO NOTHING); other databases fall back to an
+        anti-join in `_insert_values`. The conflict has no target, since
+        partitioned tables (app.core.partitioning) extend the fingerprint
+        index with their partition key.
+        """
+        dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(self.db.get_bind().dialect.name)
+        if not dedupe or dialect is None:
+            return insert(Transaction), False
+        return dialect.insert(Transaction).on_conflict_do_nothing(), True
+    
+    def _without_stored_fingerprints(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        stored = set(self.db.scalars(
+            select(Transaction.fingerprint).where(
+                owned_by(Transaction.user_id, self.user_id),
+                Transaction.fingerprint.in_([row["fingerprint"] for row in chunk])
+            )
+        ))
+        return [row for row in chunk if row["fingerprint"] not in stored]
+    
+    @staticmethod
+    def _build_transaction_values(transaction_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize a parsed CSV row into Transaction column values.
+        
+        The row is validated by `normalize_frame`, like every row of an
+        import, so a missing or malformed date is rejected rather than
+        replaced with the current time.
+        
+        Args:
+            transaction_data: Dictionary containing transaction information
+            
+        Returns:
+            Dict mapping Transaction column names to values
+            
+        Raises:
+            ValueError: If the row would be rejected by an import
+        """
+        batch = normalize_frame(pd.DataFrame([transaction_data], dtype=object))
+        if batch.rejected:
+            raise ValueError(batch.rejected[0]["reason"])
+        row = batch.records()[0]
+        
+        description = row["description"]
+        transaction_type = row["transaction_type"]
+        category, is_business, business_percentage = None, False, 0.0
+        if settings.categorizer_enabled:
+            category, is_business, business_percentage = get_categorizer().categorize_one(
+                description, transaction_type
+            )
+        
+        return {
+            "date": row["date"],
+            "description": description,
+            "amount_cents": row["amount_cents"],
+            "currency": row["currency"],
+            "transaction_type": transaction_type,
+            "category": category,
+            "is_business": is_business,
+            "business_percentage": business_percentage
+        }
+    
     def get_all_transactions(self, limit: int = 100) -> List[Transaction]:
         """
         Retrieve all transactions from the database.
@@ -68,7 +643,291 @@ class TransactionService:
         Returns:
             List[Transaction]: List of transaction objects
         """
-        return self.db.query(Transaction).limit(limit).all()
+        return self.db.query(Transaction).filter(self._owned()).limit(limit).all()
+    
+    def get_transactions_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        transaction_type: Optional[str] = None,
+        category: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[List[Transaction], Optional[str]]:
+        """
+        Retrieve one page of transactions, newest first.
+        
+        Pages are addressed with keyset (cursor) pagination over
+        (date, id), so every page is a single index range scan no
+        matter how deep into the ledger it is.
+        
+        Args:
+            limit: Maximum number of transactions to return
+            cursor: Opaque `next_cursor` token from the previous page
+            transaction_type: Only include this type ('Income' or 'Expense')
+            category: Only include this category
+            min_amount: Only include amounts greater than or equal to this
+            max_amount: Only include amounts less than or equal to this
+            start_date: Only include transactions on or after this date
+            end_date: Only include transactions on or before this date
+            
+        Returns:
+            Tuple of the page's transactions and the cursor for the next
+            page (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self._page_query(
+            select(Transaction), limit, cursor, transaction_type, category,
+            min_amount, max_amount, start_date, end_date
+        )
+        
+        # Fetch one extra row to learn whether another page exists
+        transactions = self.db.scalars(query).all()
+        if len(transactions) <= limit:
+            return list(transactions), None
+        
+        page = list(transactions[:limit])
+        return page, encode_cursor(page[-1].date, page[-1].id)
+    
+    def get_transaction_rows_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        transaction_type: Optional[str] = None,
+        category: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Retrieve one page of transactions as plain dictionaries.
+        
+        Same page as `get_transactions_page`, but only the
+        TRANSACTION_FIELDS columns are selected and no ORM objects are
+        built, for endpoints that serialize the rows straight away.
+        Values are left as Python objects (dates stay datetimes).
+        
+        Returns:
+            Tuple of the page's rows and the cursor for the next page
+            (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self._page_query(
+            select(*(getattr(Transaction, name) for name in TRANSACTION_FIELDS)),
+            limit, cursor, transaction_type, category,
+            min_amount, max_amount, start_date, end_date
+        )
+        
+        rows = [row._asdict() for row in self.db.execute(query)]
+        if len(rows) <= limit:
+            return rows, None
+        
+        page = rows[:limit]
+        return page, encode_cursor(page[-1]["date"], page[-1]["id"])
+    
+    def search_transactions(
+        self,
+        q: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        transaction_type: Optional[str] = None,
+        category: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], str]:
+        """
+        Search transaction descriptions, best matches first.
+        
+        Every word of `q` must match the start of a word in the
+        description ("amaz prim" finds "Amazon Prime"). The index used
+        depends on the database, see app.core.search_index:
+        - fts5: SQLite FTS5, ranked by BM25
+        - postgresql: tsvector GIN index ranked by ts_rank, plus pg_trgm
+          fuzzy matches ranked by word similarity when installed
+        - like: sequential LIKE scan, newest first, no score
+        
+        Only the SEARCH_RANK_WINDOW most recently added matches are
+        ranked, so latency doesn't grow with the number of matching rows.
+        Pages past them continue with the older matches, most recently
+        added first and keyset-paginated on the id, so every match can
+        be reached.
+        
+        Args:
+            q: Search query
+            limit: Maximum number of rows returned
+            cursor: `next_cursor` of the previous page
+            transaction_type: Only include 'Income' or 'Expense' transactions
+            category: Only include transactions in this category
+            start_date: Only include transactions on or after this date
+            end_date: Only include transactions on or before this date
+            
+        Returns:
+            Tuple of the page's rows (TRANSACTION_FIELDS plus `score`),
+            the cursor for the next page (None on the last page) and the
+            search backend used
+            
+        Raises:
+            ValueError: If the query or cursor is malformed
+        """
+        terms = search_terms(q)
+        kind, position = decode_search_cursor(cursor) if cursor is not None else ("offset", 0)
+        clauses = [self._owned(), *self.filter_clauses(
+            transaction_type=transaction_type, category=category, start_date=start_date, end_date=end_date
+        )]
+        fields = [getattr(Transaction, name) for name in TRANSACTION_FIELDS]
+        
+        connection = self.db.connection()
+        dialect = connection.dialect.name
+        if dialect == "sqlite" and search_index_available(connection):
+            backend = "fts5"
+            fts = table(FTS_TABLE, column("rowid"), column("rank"))
+            match = literal_column(FTS_TABLE).op("MATCH")(" ".join(f'"{t}"*' for t in terms))
+            # BM25 is lower for better matches; scores are reported higher-is-better
+            score, recency = -fts.c.rank, fts.c.rowid
+            
+            def matching(*columns):
+                return select(*columns).join_from(fts, Transaction, Transaction.id == fts.c.rowid).where(
+                    match, *clauses
+                )
+        elif dialect == "postgresql":
+            backend = "postgresql"
+            vector = func.to_tsvector(literal_column(f"'{TSVECTOR_CONFIG}'"), Transaction.description)
+            tsquery = func.to_tsquery(literal_column(f"'{TSVECTOR_CONFIG}'"), " & ".join(f"{t}:*" for t in terms))
+            match, score = vector.op("@@")(tsquery), func.ts_rank(vector, tsquery)
+            if search_index_available(connection):
+                phrase = literal(" ".join(terms))
+                match = match | phrase.op("<%")(Transaction.description)
+                score = func.greatest(score, func.word_similarity(phrase, Transaction.description))
+            recency = Transaction.id
+            
+            def matching(*columns):
+                return select(*columns).where(match, *clauses)
+        else:
+            backend = "like"
+            if kind != "offset":
+                raise ValueError("Invalid pagination cursor")
+            likes = [Transaction.description.ilike(f"%{t}%") for t in terms]
+            query = (
+                select(*fields, literal(None).label("score"))
+                .where(*likes, *clauses)
+                .order_by(Transaction.date.desc(), Transaction.id.desc())
+                .offset(position)
+                .limit(limit + 1)
+            )
+            rows = [row._asdict() for row in self.db.execute(query)]
+            if len(rows) <= limit:
+                return rows, None, backend
+            return rows[:limit], encode_search_cursor("offset", position + limit), backend
+        
+        rows = []
+        if kind == "offset":
+            window = (
+                matching(Transaction.id, score.label("score"))
+                .order_by(recency.desc())
+                .limit(SEARCH_RANK_WINDOW)
+                .subquery()
+            )
+            query = (
+                select(*fields, window.c.score)
+                .join(window, window.c.id == Transaction.id)
+                .order_by(window.c.score.desc(), Transaction.date.desc(), Transaction.id.desc())
+                .offset(position)
+                .limit(limit + 1)
+            )
+            rows = [row._asdict() for row in self.db.execute(query)]
+            if len(rows) > limit:
+                return rows[:limit], encode_search_cursor("offset", position + limit), backend
+            if position + len(rows) < SEARCH_RANK_WINDOW:
+                return rows, None, backend
+            # The ranked window is full and used up; older matches follow
+            position = self.db.scalar(select(func.min(window.c.id)))
+            if position is None:
+                return rows, None, backend
+        
+        older = matching(*fields, score.label("score")).where(recency < position).order_by(recency.desc())
+        ranked = len(rows)
+        rows += [row._asdict() for row in self.db.execute(older.limit(limit - ranked + 1))]
+        if len(rows) <= limit:
+            return rows, None, backend
+        rows = rows[:limit]
+        # Continue below the last older match on the page, or below the window
+        before = rows[-1]["id"] if ranked < limit else position
+        return rows, encode_search_cursor("before", before), backend
+    
+    def _page_query(
+        self,
+        query,
+        limit: int,
+        cursor: Optional[str],
+        transaction_type: Optional[str],
+        category: Optional[str],
+        min_amount: Optional[float],
+        max_amount: Optional[float],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ):
+        """Apply filters, keyset position and ordering, fetching one extra row."""
+        query = query.order_by(Transaction.date.desc(), Transaction.id.desc())
+        query = query.where(self._owned(), *self.filter_clauses(
+            transaction_type=transaction_type,
+            category=category,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            start_date=start_date,
+            end_date=end_date
+        ))
+        
+        if cursor is not None:
+            cursor_date, cursor_id = decode_cursor(cursor)
+            query = query.where(tuple_(Transaction.date, Transaction.id) < tuple_(cursor_date, cursor_id))
+        
+        return query.limit(limit + 1)
+    
+    @staticmethod
+    def filter_clauses(
+        transaction_type: Optional[str] = None,
+        category: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        currency: Optional[str] = None
+    ) -> List[Any]:
+        """
+        WHERE clauses for the transaction list filters; None means no filter.
+        
+        Amount bounds are compared in cents, on the indexed integer column.
+        
+        Raises:
+            ValueError: If an amount bound or the currency is invalid
+        """
+        clauses = []
+        if transaction_type is not None:
+            clauses.append(Transaction.transaction_type == transaction_type)
+        if category is not None:
+            clauses.append(Transaction.category == category)
+        if min_amount is not None:
+            clauses.append(Transaction.amount_cents >= to_cents(min_amount))
+        if max_amount is not None:
+            clauses.append(Transaction.amount_cents <= to_cents(max_amount))
+        if start_date is not None:
+            clauses.append(Transaction.date >= start_date)
+        if end_date is not None:
+            clauses.append(Transaction.date <= end_date)
+        if currency is not None:
+            clauses.append(Transaction.currency == normalize_currency(currency))
+        return clauses
+    
+    def _owned(self) -> Any:
+        """WHERE clause restricting transactions to this service's user."""
+        return owned_by(Transaction.user_id, self.user_id)
     
     def get_transaction_by_id(self, transaction_id: int) -> Optional[Transaction]:
         """
@@ -78,9 +937,10 @@ class TransactionService:
             transaction_id: The ID of the transaction to retrieve
             
         Returns:
-            Optional[Transaction]: The transaction object or None if not found
+            Optional[Transaction]: The transaction object or None if not
+            found (or owned by another user)
         """
-        return self.db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        return self.db.query(Transaction).filter(Transaction.id == transaction_id, self._owned()).first()
     
     def get_transactions_by_type(self, transaction_type: str) -> List[Transaction]:
         """
@@ -93,7 +953,7 @@ class TransactionService:
             List[Transaction]: List of matching transaction objects
         """
         return self.db.query(Transaction).filter(
-            Transaction.transaction_type == transaction_type
+            Transaction.transaction_type == transaction_type, self._owned()
         ).all()
     
     def delete_transaction(self, transaction_id: int) -> bool:
@@ -108,35 +968,150 @@ class TransactionService:
         """
         transaction = self.get_transaction_by_id(transaction_id)
         if transaction:
+            RollupService(self.db).apply([transaction], sign=-1)
             self.db.delete(transaction)
             self.db.commit()
+            get_cache().invalidate(self.user_id, payment_periods_of([transaction.date]))
             return True
         return False
     
-    def get_transaction_summary(self) -> Dict[str, Any]:
+    def get_merchant_summary(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = DEFAULT_MERCHANT_LIMIT,
+        currency: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Get a summary of all transactions.
+        Get income and expense totals per merchant, most frequent first.
+        
+        Transactions are grouped on the integer merchant_id and only the
+        `limit` resulting groups are joined to the merchants table for
+        their names. Transactions without a merchant are left out.
         
+        Args:
+            start_date: Only include transactions on or after this date
+            end_date: Only include transactions on or before this date
+            transaction_type: Only include 'Income' or 'Expense' transactions
+            category: Only include transactions in this category
+            limit: Maximum number of merchants returned
+            currency: Only include transactions in this currency; required
+                when the returned totals span more than one currency
+            
         Returns:
-            Dict containing summary statistics
+            List of per-merchant totals
+            
+        Raises:
+            ValueError: If a filter is invalid, or the totals would add up
+                amounts in different currencies
         """
-        transactions = self.db.query(Transaction).all()
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
         
-        def is_income(t):
-            return getattr(t, "transaction_type", None) == 'Income'
+        def total(transaction_type: str):
+            return func.coalesce(func.sum(
+                case((Transaction.transaction_type == transaction_type, Transaction.amount_cents), else_=0)
+            ), 0)
         
-        def is_expense(t):
-            return getattr(t, "transaction_type", None) == 'Expense'
-
-        total_income = sum(t.amount for t in transactions if is_income(t))
-        total_expenses = sum(t.amount for t in transactions if is_expense(t))
-        net_amount = total_income - total_expenses
+        clauses = self.filter_clauses(
+            transaction_type=transaction_type, category=category, start_date=start_date, end_date=end_date,
+            currency=currency
+        )
+        
+        totals = (
+            select(
+                Transaction.merchant_id,
+                func.count(Transaction.id).label("transaction_count"),
+                total('Income').label("total_income"),
+                total('Expense').label("total_expenses"),
+                func.min(Transaction.date).label("first_date"),
+                func.max(Transaction.date).label("last_date"),
+                func.min(Transaction.currency).label("min_currency"),
+                func.max(Transaction.currency).label("max_currency"),
+            )
+            .where(self._owned(), Transaction.merchant_id.is_not(None), *clauses)
+            .group_by(Transaction.merchant_id)
+            .order_by(func.count(Transaction.id).desc(), Transaction.merchant_id)
+            .limit(limit)
+            .subquery()
+        )
+        query = (
+            select(totals, Merchant.display_name)
+            .join(Merchant, Merchant.id == totals.c.merchant_id)
+            .order_by(totals.c.transaction_count.desc(), totals.c.merchant_id)
+        )
+        
+        rows = self.db.execute(query).all()
+        if currency is None:
+            single_currency(c for row in rows for c in (row.min_currency, row.max_currency))
+        
+        return [
+            {
+                "merchant_id": row.merchant_id,
+                "merchant": row.display_name,
+                "transaction_count": row.transaction_count,
+                "total_income": from_cents(row.total_income),
+                "total_expenses": from_cents(row.total_expenses),
+                "first_date": row.first_date.isoformat() if row.first_date else None,
+                "last_date": row.last_date.isoformat() if row.last_date else None,
+            }
+            for row in rows
+        ]
+    
+    def get_transaction_summary(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None,
+        currency: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a summary of the user's transactions.
+        
+        Totals are computed by the database with a single grouped
+        SUM/COUNT query over integer cents, so no Transaction rows are
+        loaded into Python and the totals are exact.
+        
+        Args:
+            start_date: Only include transactions on or after this date
+            end_date: Only include transactions on or before this date
+            category: Only include transactions in this category
+            currency: Only include transactions in this currency; required
+                when the matching transactions span more than one currency
+            
+        Returns:
+            Dict containing summary statistics
+            
+        Raises:
+            ValueError: If the currency is invalid, or missing while the
+                transactions are in more than one currency
+        """
+        clauses = self.filter_clauses(
+            category=category, start_date=start_date, end_date=end_date, currency=currency
+        )
+        query = select(
+            Transaction.transaction_type,
+            Transaction.currency,
+            func.count(Transaction.id),
+            func.coalesce(func.sum(Transaction.amount_cents), 0)
+        ).where(self._owned(), *clauses).group_by(Transaction.transaction_type, Transaction.currency)
+        
+        rows = self.db.execute(query).all()
+        single_currency(row_currency for _, row_currency, _, _ in rows)
+        totals = {
+            transaction_type: (count, total)
+            for transaction_type, _, count, total in rows
+        }
+        income_count, total_income = totals.get('Income', (0, 0))
+        expense_count, total_expenses = totals.get('Expense', (0, 0))
         
         return {
-            "total_transactions": len(transactions),
-            "total_income": total_income,
-            "total_expenses": total_expenses,
-            "net_amount": net_amount,
-            "income_count": len([t for t in transactions if is_income(t)]),
-            "expense_count": len([t for t in transactions if is_expense(t)])
-        } 
\ No newline at end of file
+            "total_transactions": sum(count for count, _ in totals.values()),
+            "total_income": from_cents(total_income),
+            "total_expenses": from_cents(total_expenses),
+            "net_amount": from_cents(total_income - total_expenses),
+            "income_count": income_count,
+            "expense_count": expense_count
+        }
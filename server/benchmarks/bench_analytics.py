@@ -0,0 +1,86 @@
+"""
+Analytics snapshot benchmark for PaySplit.AI.
+
+Times the monthly spend trend answered from an in-memory snapshot
+(`AnalyticsService.get_spend_trend`) against the same totals computed
+by a GROUP BY on the transactions table, along with the one-off cost of
+loading the snapshot and of refreshing it after a small append.
+
+Usage:
+    python -m benchmarks.bench_analytics --rows 100000 1000000
+"""
+
+import argparse
+import os
+import tempfile
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.transaction import Transaction
+from app.services.analytics import AnalyticsService, AnalyticsStore, set_analytics_store
+from app.services.cache import get_cache
+from benchmarks.bench_summary import best_of, seed
+
+
+def sql_trend(db) -> list:
+    """Monthly expense totals straight from the OLTP table."""
+    month = func.strftime('%Y-%m', Transaction.date)
+    return db.execute(
+        select(month, func.sum(Transaction.amount_cents), func.count())
+        .where(Transaction.transaction_type == 'Expense')
+        .group_by(month)
+        .order_by(month)
+    ).all()
+
+
+def run(database_url: str, sizes: list, repeat: int) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    
+    seeded = 0
+    for rows in sizes:
+        seed(engine, rows, seeded)
+        seeded = rows
+        
+        with Session() as db:
+            store = AnalyticsStore()
+            set_analytics_store(store)
+            service = AnalyticsService(db)
+            
+            load = best_of(lambda: (store.clear(), store.snapshot(db)), repeat)
+            
+            seed(engine, seeded + 1000, seeded)
+            seeded += 1000
+            get_cache().invalidate()
+            refresh = best_of(lambda: store.snapshot(db), 1)
+            
+            snapshot_query = best_of(lambda: service.get_spend_trend(window=3), repeat)
+            sql_query = best_of(lambda: sql_trend(db), repeat)
+        
+        print(f"{rows:>10} rows: load {load * 1000:8.1f} ms  refresh(+1000) {refresh * 1000:7.1f} ms  "
+              f"trend {snapshot_query * 1000:7.2f} ms  SQL GROUP BY {sql_query * 1000:8.1f} ms  "
+              f"({sql_query / snapshot_query:.0f}x)")
+    
+    set_analytics_store(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+    
+    if args.database_url:
+        run(args.database_url, args.rows, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Response cache benchmark for PaySplit.AI.
+
+Issues repeated GET /transactions/summary calls against the in-process
+ASGI app with the cache disabled and with the in-process LRU cache, and
+reports latency percentiles.
+
+Usage:
+    python -m benchmarks.bench_cache --rows 1000000 --calls 300
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def measure(calls: int) -> list:
+    import httpx
+    from app.main import app
+    
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(calls):
+            start = time.perf_counter()
+            response = await client.get("/api/v1/transactions/summary")
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Configure the app before it is imported
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        
+        from app.core.database import Base, engine
+        from app.services.cache import MemoryCacheBackend, ResponseCache, set_cache
+        from benchmarks.bench_summary import seed
+        Base.metadata.create_all(bind=engine)
+        seed(engine, args.rows, 0)
+        
+        for name, backend in (("no cache", None), ("memory LRU", MemoryCacheBackend())):
+            set_cache(ResponseCache(backend))
+            latencies = asyncio.run(measure(args.calls))
+            print(f"{name:>10}: {args.calls} calls over {args.rows} rows  "
+                  f"p50 {statistics.median(latencies):8.2f} ms  p99 {percentile(latencies, 0.99):8.2f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Re-upload benchmark for PaySplit.AI.
+
+Imports a generated bank export, then times the three re-upload cases
+handled by TransactionService.import_file:
+- the identical file again (short-circuited by its content hash)
+- the same rows plus a few new ones (every old row skipped by fingerprint)
+and reports the table size afterwards, which stays at the distinct row count.
+
+Usage:
+    python -m benchmarks.bench_dedup --rows 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.transaction import Transaction
+from app.services.transaction_service import TransactionService
+from benchmarks.bench_ingest_memory import write_csv
+
+
+def timed_import(Session, path: str):
+    with Session() as db, open(path, 'rb') as f:
+        start = time.perf_counter()
+        result = TransactionService(db).import_file(f, filename=os.path.basename(path))
+        return result, time.perf_counter() - start
+
+
+def run(database_url: str, rows: int, tmp: str) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    
+    original = os.path.join(tmp, "export.csv")
+    extended = os.path.join(tmp, "export_extended.csv")
+    write_csv(original, rows)
+    write_csv(extended, rows + rows // 100)
+    
+    for label, path in (("first upload", original), ("identical file", original), ("overlapping", extended)):
+        result, seconds = timed_import(Session, path)
+        print(f"{label:>15}: {seconds:7.2f}s  inserted {result.inserted:>8}  "
+              f"skipped {result.skipped:>8}  duplicate_file={result.duplicate_file}")
+    
+    with Session() as db:
+        print(f"{'table rows':>15}: {db.query(Transaction).count()}")
+    
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run(url, args.rows, tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Ledger export benchmark for PaySplit.AI.
+
+Compares building the whole ledger as one JSON document from ORM
+objects (`to_dict()` into a list, the only way out before the export
+endpoint) with the streaming exporter in every available format.
+Reports time to the first chunk, total time and peak traced memory.
+
+Usage:
+    python -m benchmarks.bench_export --rows 1000000
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.transaction import Transaction
+from app.services.export_service import EXPORT_FORMATS, stream_export
+from benchmarks.bench_summary import seed
+
+
+def measure(fn):
+    """Run fn (a generator factory) and return first-chunk seconds, total seconds, peak MiB."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    try:
+        for chunk in fn():
+            if first is None:
+                first = time.perf_counter() - start
+            size += len(chunk)
+        return first, time.perf_counter() - start, tracemalloc.get_traced_memory()[1] / 2**20, size
+    finally:
+        tracemalloc.stop()
+
+
+def run(database_url: str, rows: int) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed(engine, rows, 0)
+    
+    def whole_document():
+        with Session() as db:
+            transactions = db.scalars(select(Transaction)).all()
+            yield json.dumps({"transactions": [t.to_dict() for t in transactions]}).encode()
+    
+    cases = [("to_dict list", whole_document)]
+    for format in EXPORT_FORMATS:
+        if format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            continue
+        cases.append((f"stream {format}", lambda format=format: stream_export(Session, format)))
+    
+    for label, fn in cases:
+        first, total, peak, size = measure(fn)
+        print(f"{label:>15}: first chunk {first * 1000:8.1f} ms, total {total:6.2f}s, "
+              f"peak {peak:7.1f} MiB, {size / 2**20:6.1f} MiB out")
+    
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        run(args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.rows)
+
+
+if __name__ == "__main__":
+    main()
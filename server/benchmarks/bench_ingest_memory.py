@@ -0,0 +1,77 @@
+"""
+Peak-memory benchmark for CSV ingestion in PaySplit.AI.
+
+Compares the whole-file parser (`parse_csv`) with the streaming
+`iter_csv_batches` parser on generated CSV files of increasing size.
+Peak memory is measured with tracemalloc, so it covers Python and
+pandas/NumPy allocations made while parsing.
+
+Usage:
+    python -m benchmarks.bench_ingest_memory --rows 100000 500000 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import tracemalloc
+
+from app.services.csv_parser import parse_csv, iter_csv_batches
+
+
+class _SpooledUpload:
+    """Minimal stand-in for UploadFile backed by a file on disk."""
+    
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+    
+    async def read(self) -> bytes:
+        return self.file.read()
+
+
+def write_csv(path: str, rows: int) -> None:
+    with open(path, 'w') as f:
+        f.write("Date,Description,Amount,Type\n")
+        for i in range(rows):
+            kind = 'Income' if i % 5 == 0 else 'Expense'
+            f.write(f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d},Transaction {i},{(i % 500) * 1.37:.2f},{kind}\n")
+
+
+def peak_mib(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def whole_file(path: str) -> None:
+    upload = _SpooledUpload(path)
+    with upload.file:
+        asyncio.run(parse_csv(upload))
+
+
+def streaming(path: str) -> None:
+    with open(path, 'rb') as f:
+        for _ in iter_csv_batches(f):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 500_000, 1_000_000])
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"ledger_{rows}.csv")
+            write_csv(path, rows)
+            size_mib = os.path.getsize(path) / 2**20
+            print(f"{rows:>9} rows ({size_mib:6.1f} MiB file): "
+                  f"whole-file peak {peak_mib(lambda: whole_file(path)):7.1f} MiB, "
+                  f"streaming peak {peak_mib(lambda: streaming(path)):6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Money representation benchmark for PaySplit.AI.
+
+Stores the same amounts both as floats (the old transactions.amount
+column) and as integer cents (amount_cents), then times the summary
+aggregate (SUM/COUNT grouped by type) over each column and reports how
+far the float totals drift from the exact ones. Also times parsing an
+Amount column into cents, for plain and currency-formatted strings.
+
+Usage:
+    python -m benchmarks.bench_money --rows 100000 1000000
+    python -m benchmarks.bench_money --database-url postgresql://localhost/paysplit_bench
+"""
+
+import argparse
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import BigInteger, Column, Float, Integer, MetaData, String, Table, create_engine, func, insert, select
+
+from app.core.money import parse_cents
+from benchmarks.bench_summary import best_of
+
+
+metadata = MetaData()
+
+amounts = Table(
+    "bench_amounts",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("transaction_type", String(50), nullable=False),
+    Column("amount", Float, nullable=False),
+    Column("amount_cents", BigInteger, nullable=False),
+)
+
+
+def seed(engine, start_at: int, rows: int) -> None:
+    """Append rows start_at..rows with amounts of up to $10,000.00."""
+    rng = np.random.default_rng(start_at)
+    cents = rng.integers(1, 1_000_000, rows - start_at)
+    values = [
+        {"transaction_type": 'Income' if i % 5 == 0 else 'Expense', "amount": c / 100, "amount_cents": c}
+        for i, c in zip(range(start_at, rows), cents.tolist())
+    ]
+    with engine.begin() as conn:
+        for offset in range(0, len(values), 50_000):
+            conn.execute(insert(amounts), values[offset:offset + 50_000])
+
+
+def summary(conn, column) -> dict:
+    query = select(amounts.c.transaction_type, func.count(), func.sum(column)).group_by(amounts.c.transaction_type)
+    return {transaction_type: total for transaction_type, _, total in conn.execute(query)}
+
+
+def run_aggregates(database_url: str, sizes: list, repeat: int) -> None:
+    engine = create_engine(database_url)
+    metadata.drop_all(bind=engine)
+    metadata.create_all(bind=engine)
+    
+    seeded = 0
+    for size in sorted(sizes):
+        seed(engine, seeded, size)
+        seeded = size
+        with engine.connect() as conn:
+            float_time = best_of(lambda: summary(conn, amounts.c.amount), repeat)
+            cents_time = best_of(lambda: summary(conn, amounts.c.amount_cents), repeat)
+            floats = summary(conn, amounts.c.amount)
+            cents = summary(conn, amounts.c.amount_cents)
+        drift = max(abs(float(floats[t]) * 100 - cents[t]) for t in cents)
+        print(
+            f"{size:>10} rows: float SUM {float_time * 1000:8.1f} ms, "
+            f"integer SUM {cents_time * 1000:8.1f} ms ({float_time / cents_time:.2f}x), "
+            f"float drift {drift:.4f} cents"
+        )
+    
+    metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def run_parsing(rows: int, repeat: int) -> None:
+    cents = np.random.default_rng(0).integers(-1_000_000, 1_000_000, rows)
+    plain = pd.Series(np.char.mod("%.2f", cents / 100).astype(object))
+    formatted = pd.Series([
+        f"(${-c / 100:,.2f})" if c < 0 else f"${c / 100:,.2f}" for c in cents.tolist()
+    ], dtype=object)
+    
+    to_numeric = best_of(lambda: pd.to_numeric(plain), repeat)
+    parse_plain = best_of(lambda: parse_cents(plain), repeat)
+    parse_formatted = best_of(lambda: parse_cents(formatted), repeat)
+    assert np.array_equal(parse_cents(formatted), cents)
+    
+    print(f"parsing {rows} amounts:")
+    print(f"  pd.to_numeric (old, floats):    {to_numeric * 1000:8.1f} ms")
+    print(f"  parse_cents, '1234.56':         {parse_plain * 1000:8.1f} ms")
+    print(f"  parse_cents, '$1,234.56':       {parse_formatted * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--parse-rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+    
+    run_parsing(args.parse_rows, args.repeat)
+    if args.database_url:
+        run_aggregates(args.database_url, args.rows, args.repeat)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        run_aggregates(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Normalization benchmark for PaySplit.AI.
+
+Compares the per-row path (DataFrame -> dicts -> strptime/float per
+row) with the vectorized `normalize_frame` stage on the same DataFrame.
+
+Usage:
+    python -m benchmarks.bench_normalize --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.services.csv_parser import _to_records, normalize_frame
+from app.services.transaction_service import TransactionService
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Raw CSV columns as read_csv would produce them."""
+    i = np.arange(rows)
+    dates = pd.Timestamp('2020-01-01') + pd.to_timedelta(i % 1825, unit='D')
+    return pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Description': 'Transaction ' + pd.Series(i).astype(str),
+        'Amount': np.round((i % 500) * 1.37, 2),
+        'Type': np.where(i % 5 == 0, 'Income', 'Expense')
+    })
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    
+    df = make_frame(args.rows)
+    per_row = timed(lambda: [TransactionService._build_transaction_values(r) for r in _to_records(df)])
+    vectorized = timed(lambda: normalize_frame(df))
+    with_records = timed(lambda: normalize_frame(df).records())
+    
+    print(f"{args.rows} rows")
+    print(f"  per-row:                     {per_row:6.2f}s ({args.rows / per_row:,.0f} rows/sec)")
+    print(f"  vectorized:                  {vectorized:6.2f}s ({args.rows / vectorized:,.0f} rows/sec, {per_row / vectorized:.0f}x)")
+    print(f"  vectorized + insert records: {with_records:6.2f}s ({args.rows / with_records:,.0f} rows/sec, {per_row / with_records:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Pagination benchmark for PaySplit.AI.
+
+Compares fetching a page deep into the ledger with keyset (cursor)
+pagination against the equivalent LIMIT/OFFSET query.
+
+Usage:
+    python -m benchmarks.bench_pagination --rows 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.transaction import Transaction
+from app.services.transaction_service import TransactionService, encode_cursor
+from benchmarks.bench_summary import seed
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(database_url: str, rows: int, page_size: int) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed(engine, rows, 0)
+    
+    ordered = select(Transaction).order_by(Transaction.date.desc(), Transaction.id.desc())
+    with Session() as db:
+        service = TransactionService(db)
+        for fraction in (0.0, 0.5, 0.99):
+            offset = int(rows * fraction)
+            # Position the cursor on the row just before the requested page
+            cursor = None
+            if offset:
+                anchor = db.scalars(ordered.offset(offset - 1).limit(1)).one()
+                cursor = encode_cursor(anchor.date, anchor.id)
+            keyset_ms = timed(lambda: service.get_transactions_page(limit=page_size, cursor=cursor))
+            offset_ms = timed(lambda: db.scalars(ordered.offset(offset).limit(page_size)).all())
+            print(f"offset {offset:>9}: keyset {keyset_ms:7.1f} ms, OFFSET {offset_ms:8.1f} ms")
+    
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+    
+    if args.database_url:
+        run(args.database_url, args.rows, args.page_size)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.rows, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
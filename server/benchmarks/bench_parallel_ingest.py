@@ -0,0 +1,108 @@
+"""
+Parallel parsing benchmark for PaySplit.AI.
+
+Generates a messy ledger (see `benchmarks.ledger_generator`), then times
+parsing and normalizing it with the serial statement reader and with
+`iter_parallel_batches` on process pools of increasing size. Only the
+parse stage is timed: fingerprints and inserts stay serial in the
+importing process. Pools are started before timing, so worker start-up
+is not counted.
+
+Scaling is bounded by the CPUs of the machine (printed first) and by
+the importing process, which finds the range boundaries and unpickles
+and unpacks every batch. That share is timed on its own as well: no
+number of workers can parse faster than it.
+
+Usage:
+    python -m benchmarks.bench_parallel_ingest --rows 5000000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+from app.services.parallel_ingest import (
+    RANGE_BYTES, _csv_layout, _parse_range, create_ingest_pool, iter_parallel_batches, split_ranges
+)
+from app.services.csv_parser import DEFAULT_BATCH_SIZE
+from app.services.statement_readers import iter_statement_batches
+from benchmarks.bench_summary import best_of
+from benchmarks.ledger_generator import write_ledger
+
+
+def consume(batches) -> int:
+    return sum(len(batch) + len(batch.rejected) for batch in batches)
+
+
+def serial(path: str) -> int:
+    with open(path, "rb") as f:
+        return consume(iter_statement_batches(f, "ledger.csv"))
+
+
+def importing_share(path: str, range_bytes: int) -> float:
+    """Seconds the importing process spends per file when workers parse every range."""
+    with open(path, "rb") as f:
+        started = time.perf_counter()
+        profile, read_options, header, data_start = _csv_layout(f, None)
+        delimiter = read_options["sep"].encode()
+        ranges = split_ranges(f, data_start, range_bytes, delimiter)
+        elapsed = time.perf_counter() - started
+    
+    for start, end in ranges:
+        results = pickle.dumps(_parse_range(path, start, end, header, profile, read_options, DEFAULT_BATCH_SIZE))
+        started = time.perf_counter()
+        for packed in pickle.loads(results):
+            packed.unpack()
+        elapsed += time.perf_counter() - started
+    return elapsed
+
+
+def warm_up(executor, workers: int) -> None:
+    """Start every worker process; the untimed first run then imports the parser in them."""
+    list(executor.map(time.sleep, [0.2] * workers))
+
+
+def run(path: str, rows: int, worker_counts: list, repeat: int, range_bytes: int) -> None:
+    print(f"{os.cpu_count()} CPUs, {rows} rows ({os.path.getsize(path) / 2**20:.0f} MiB), "
+          f"{range_bytes // 2**20} MiB ranges")
+    
+    assert serial(path) == rows
+    baseline = best_of(lambda: serial(path), repeat)
+    print(f"  serial:     {baseline:7.2f} s  {rows / baseline:>10,.0f} rows/s")
+    share = importing_share(path, range_bytes)
+    print(f"  importing:  {share:7.2f} s  (parallel parsing bounded at {baseline / share:.1f}x serial)")
+    
+    for workers in worker_counts:
+        executor = create_ingest_pool(workers)
+        try:
+            warm_up(executor, workers)
+            parallel = lambda: consume(iter_parallel_batches(
+                path, executor, workers, "ledger.csv", range_bytes=range_bytes
+            ))
+            assert parallel() == rows
+            elapsed = best_of(parallel, repeat)
+        finally:
+            executor.shutdown()
+        print(f"  {workers} workers:  {elapsed:7.2f} s  {rows / elapsed:>10,.0f} rows/s  "
+              f"({baseline / elapsed:.2f}x serial)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--range-mib", type=int, default=RANGE_BYTES // 2**20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ledger.csv")
+        with open(path, "w", newline="") as out:
+            write_ledger(out, args.rows, seed=42)
+        run(path, args.rows, args.workers, args.repeat, args.range_mib * 2**20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Search benchmark for PaySplit.AI.
+
+Imports a generated messy ledger plus one rare merchant, then times
+TransactionService.search_transactions with the database's search index
+and again with the LIKE fallback (index dropped), for a common term, a
+two-word prefix query and a rare term.
+
+Usage:
+    python -m benchmarks.bench_search --rows 1000000
+    python -m benchmarks.bench_search --database-url postgresql://localhost/paysplit_bench
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.search_index import drop_search_index
+from app.services.csv_parser import iter_normalized_batches
+from app.services.transaction_service import TransactionService
+from benchmarks.bench_summary import best_of
+from benchmarks.ledger_generator import write_ledger
+
+
+QUERIES = ("starbucks", "whole foo", "zanzibar")
+
+
+def run(database_url: str, rows: int, repeat: int) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    
+    ledger = io.StringIO()
+    write_ledger(ledger, rows)
+    ledger.write("2024-06-01,Zanzibar Bistro,42.00,Expense\n")
+    with Session() as db:
+        start = time.perf_counter()
+        TransactionService(db).import_batches(iter_normalized_batches(io.BytesIO(ledger.getvalue().encode())))
+        print(f"imported {rows + 1} rows in {time.perf_counter() - start:.1f}s")
+    
+    def search_all(label: str) -> None:
+        with Session() as db:
+            service = TransactionService(db)
+            for q in QUERIES:
+                found, _, backend = service.search_transactions(q)
+                seconds = best_of(lambda: service.search_transactions(q), repeat)
+                print(f"{label:>6} {backend:>10} {q!r:>12}: {seconds * 1000:8.1f}ms  ({len(found)} rows)")
+    
+    search_all("index")
+    with engine.begin() as connection:
+        drop_search_index(connection)
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("DROP INDEX IF EXISTS ix_transactions_description_tsv"))
+            connection.execute(text("DROP INDEX IF EXISTS ix_transactions_description_trgm"))
+    search_all("scan")
+    
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run(url, args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Serialization benchmark for PaySplit.AI read endpoints.
+
+Times turning N stored transactions into a JSON response body on the
+previous path (ORM objects, `to_dict()`, FastAPI's `jsonable_encoder`
+and `json.dumps`, as JSONResponse does) and on the lean path (a
+column-only select and `orjson.dumps`). The two halves of each path,
+loading and encoding, are also reported separately.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 100000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.transaction import Transaction
+from app.services.transaction_service import TRANSACTION_FIELDS
+from benchmarks.bench_summary import best_of, seed
+
+
+def orm_rows(db) -> list:
+    return [t.to_dict() for t in db.scalars(select(Transaction)).all()]
+
+
+def column_rows(db) -> list:
+    query = select(*(getattr(Transaction, name) for name in TRANSACTION_FIELDS))
+    return [row._asdict() for row in db.execute(query)]
+
+
+def stdlib_encode(rows: list) -> bytes:
+    return json.dumps(jsonable_encoder({"transactions": rows})).encode('utf-8')
+
+
+def orjson_encode(rows: list) -> bytes:
+    return orjson.dumps({"transactions": rows})
+
+
+def run(database_url: str, rows: int, repeat: int) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    seed(engine, rows, 0)
+    
+    with Session() as db:
+        def timed(fn):
+            db.expunge_all()
+            return best_of(fn, repeat)
+        
+        orm_loaded = orm_rows(db)
+        column_loaded = column_rows(db)
+        assert orjson.loads(orjson_encode(column_loaded)) == json.loads(stdlib_encode(orm_loaded))
+        
+        load_old = timed(lambda: orm_rows(db))
+        load_new = timed(lambda: column_rows(db))
+        encode_old = timed(lambda: stdlib_encode(orm_loaded))
+        encode_new = timed(lambda: orjson_encode(column_loaded))
+        total_old = timed(lambda: stdlib_encode(orm_rows(db)))
+        total_new = timed(lambda: orjson_encode(column_rows(db)))
+    
+    print(f"{rows} rows, best of {repeat}")
+    print(f"  load:   ORM + to_dict {load_old:6.3f}s   column select {load_new:6.3f}s")
+    print(f"  encode: jsonable_encoder + json {encode_old:6.3f}s   orjson {encode_new:6.3f}s")
+    print(f"  total:  old {total_old:6.3f}s   new {total_new:6.3f}s   ({total_old / total_new:.1f}x)")
+    
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        run(args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
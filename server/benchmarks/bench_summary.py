@@ -0,0 +1,116 @@
+"""
+Summary endpoint benchmark for PaySplit.AI.
+
+Times TransactionService.get_transaction_summary (one grouped SUM/COUNT
+query) against the previous implementation, which loaded every row as
+an ORM object and aggregated in Python, at increasing table sizes.
+
+Usage:
+    python -m benchmarks.bench_summary --rows 10000 100000 1000000
+    python -m benchmarks.bench_summary --rows 10000000 --skip-python \\
+        --database-url postgresql://localhost/paysplit_bench
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.transaction import Transaction
+from app.services.transaction_service import TransactionService
+
+
+def python_summary(db) -> dict:
+    """The pre-SQL summary: hydrate every row and aggregate in Python."""
+    transactions = db.query(Transaction).all()
+    income = [t for t in transactions if t.transaction_type == 'Income']
+    expenses = [t for t in transactions if t.transaction_type == 'Expense']
+    total_income = sum(t.amount for t in income)
+    total_expenses = sum(t.amount for t in expenses)
+    return {
+        "total_transactions": len(transactions),
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_amount": total_income - total_expenses,
+        "income_count": len(income),
+        "expense_count": len(expenses)
+    }
+
+
+def seed(engine, rows: int, start_at: int) -> None:
+    """Append rows start_at..rows with Core executemany (no ORM overhead)."""
+    base = datetime(2020, 1, 1)
+    values = (
+        {
+            "date": base + timedelta(days=i % 1825),
+            "description": f"Transaction {i}",
+            "amount_cents": (i % 500) * 137,
+            "transaction_type": 'Income' if i % 5 == 0 else 'Expense',
+            "is_business": False,
+            "business_percentage": 0.0
+        }
+        for i in range(start_at, rows)
+    )
+    with engine.begin() as conn:
+        while chunk := list(islice(values, 50_000)):
+            conn.execute(insert(Transaction), chunk)
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(database_url: str, sizes: list, repeat: int, skip_python: bool) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    
+    seeded = 0
+    for size in sorted(sizes):
+        seed(engine, size, seeded)
+        seeded = size
+        with Session() as db:
+            sql_time = best_of(lambda: TransactionService(db).get_transaction_summary(), repeat)
+            line = f"{size:>10} rows: sql {sql_time * 1000:9.1f} ms"
+            if not skip_python:
+                py_time = best_of(lambda: python_summary(db), repeat)
+                line += f", python {py_time * 1000:9.1f} ms"
+        print(line)
+    
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    parser.add_argument("--skip-python", action="store_true",
+                        help="Only time the SQL implementation")
+    args = parser.parse_args()
+    
+    if args.database_url:
+        run(args.database_url, args.rows, args.repeat, args.skip_python)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run(url, args.rows, args.repeat, args.skip_python)
+
+
+if __name__ == "__main__":
+    main()
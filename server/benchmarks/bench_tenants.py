@@ -0,0 +1,105 @@
+"""
+Multi-tenant benchmark for PaySplit.AI.
+
+Times one user's list page, filtered list page and summary as more
+users share the transactions table, each with the same number of rows.
+With user-led indexes the per-user latency should stay flat; the
+summary over every row (what the unscoped endpoint used to compute)
+is shown for contrast.
+
+Usage:
+    python -m benchmarks.bench_tenants --tenants 1 10 100 --rows-per-tenant 2000
+    python -m benchmarks.bench_tenants --database-url postgresql://localhost/paysplit_bench
+"""
+
+import argparse
+import os
+import tempfile
+from datetime import datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.transaction import Transaction
+from app.services.merchants import MerchantDirectory, set_merchant_directory
+from app.services.transaction_service import TransactionService
+from benchmarks.bench_summary import best_of
+
+
+def seed_tenants(engine, first_user: int, last_user: int, rows_per_tenant: int) -> None:
+    """Insert rows_per_tenant rows for each user in [first_user, last_user)."""
+    base = datetime(2020, 1, 1)
+    values = (
+        {
+            "user_id": user_id,
+            "date": base + timedelta(days=(i * 7 + user_id) % 1825),
+            "description": f"Transaction {i}",
+            "amount_cents": (i % 500) * 137,
+            "transaction_type": 'Income' if i % 5 == 0 else 'Expense',
+            "is_business": False,
+            "business_percentage": 0.0
+        }
+        for user_id in range(first_user, last_user)
+        for i in range(rows_per_tenant)
+    )
+    with engine.begin() as conn:
+        while chunk := list(islice(values, 50_000)):
+            conn.execute(insert(Transaction), chunk)
+
+
+def unscoped_summary(db) -> list:
+    return db.execute(
+        select(Transaction.transaction_type, func.count(Transaction.id), func.sum(Transaction.amount_cents))
+        .group_by(Transaction.transaction_type)
+    ).all()
+
+
+def run(database_url: str, tenants: list, rows_per_tenant: int, repeat: int) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    set_merchant_directory(MerchantDirectory())
+    
+    seeded = 0
+    for count in sorted(tenants):
+        seed_tenants(engine, seeded + 1, count + 1, rows_per_tenant)
+        seeded = count
+        with Session() as db:
+            # The last user seeded, so its rows are the newest in the table
+            service = TransactionService(db, user_id=count)
+            page = best_of(lambda: service.get_transaction_rows_page(limit=100), repeat)
+            filtered = best_of(lambda: service.get_transaction_rows_page(limit=100, transaction_type='Income'), repeat)
+            summary = best_of(lambda: service.get_transaction_summary(), repeat)
+            everything = best_of(lambda: unscoped_summary(db), repeat)
+        print(
+            f"{count:>6} tenants ({count * rows_per_tenant:>9} rows): page {page * 1000:6.2f} ms, "
+            f"filtered page {filtered * 1000:6.2f} ms, summary {summary * 1000:6.2f} ms, "
+            f"all-rows summary {everything * 1000:8.1f} ms"
+        )
+    
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tenants", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--rows-per-tenant", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    args = parser.parse_args()
+    
+    if args.database_url:
+        run(args.database_url, args.tenants, args.rows_per_tenant, args.repeat)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.tenants, args.rows_per_tenant, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Upload throughput benchmark for PaySplit.AI.
+
+Compares the legacy per-row insert path (add + commit + refresh for
+every CSV row) against TransactionService.bulk_create_transactions.
+
+Usage:
+    python -m benchmarks.bench_upload --rows 100000
+    python -m benchmarks.bench_upload --rows 100000 --database-url postgresql://localhost/paysplit_bench
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.transaction import Transaction
+from app.services.merchants import MerchantDirectory, set_merchant_directory
+from app.services.transaction_service import TransactionService
+
+
+def make_rows(count: int) -> list:
+    """Build `count` parsed CSV rows shaped like parse_csv output."""
+    return [
+        {
+            'Date': f'2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}',
+            'Description': f'Transaction {i}',
+            'Amount': round((i % 500) * 1.37, 2),
+            'Type': 'Income' if i % 5 == 0 else 'Expense'
+        }
+        for i in range(count)
+    ]
+
+
+def per_row_insert(service: TransactionService, rows: list) -> None:
+    """The pre-bulk upload path: one commit per row."""
+    for row in rows:
+        service.create_transaction(row)
+
+
+def bulk_insert(service: TransactionService, rows: list, chunk_size: int) -> None:
+    """The bulk upload path: one transaction, chunked INSERTs."""
+    service.bulk_create_transactions(rows, chunk_size=chunk_size)
+
+
+def run(database_url: str, rows: int, chunk_size: int, skip_per_row: bool) -> None:
+    engine = create_engine(database_url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    data = make_rows(rows)
+    
+    cases = [("bulk", lambda s: bulk_insert(s, data, chunk_size))]
+    if not skip_per_row:
+        cases.insert(0, ("per-row", lambda s: per_row_insert(s, data)))
+    
+    for name, fn in cases:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        set_merchant_directory(MerchantDirectory())
+        with Session() as db:
+            start = time.perf_counter()
+            fn(TransactionService(db))
+            elapsed = time.perf_counter() - start
+            assert db.query(Transaction).count() == rows
+        print(f"{name:>8}: {rows} rows in {elapsed:.2f}s -> {rows / elapsed:,.0f} rows/sec")
+    
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    parser.add_argument("--skip-per-row", action="store_true",
+                        help="Only run the bulk path")
+    args = parser.parse_args()
+    
+    if args.database_url:
+        run(args.database_url, args.rows, args.chunk_size, args.skip_per_row)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        run(url, args.rows, args.chunk_size, args.skip_per_row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Concurrent upload/read load test for PaySplit.AI.
+
+Runs the ASGI app in-process and measures GET /transactions/summary
+latency while large CSV uploads are in flight, to show whether uploads
+block the event loop for other requests.
+
+Usage:
+    python -m benchmarks.load_concurrent
+    python -m benchmarks.load_concurrent --async-db
+    python -m benchmarks.load_concurrent --uploads 4 \
+        --database-url postgresql://localhost/paysplit_bench \
+        --async-database-url postgresql+asyncpg://localhost/paysplit_bench
+
+SQLite allows a single writer, so the default throwaway SQLite database
+runs one upload at a time (in WAL mode, so reads are not locked out);
+use PostgreSQL for several concurrent uploads.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def make_csv(rows: int) -> bytes:
+    lines = ["Date,Description,Amount,Type"]
+    for i in range(rows):
+        kind = 'Income' if i % 5 == 0 else 'Expense'
+        lines.append(f"2024-{(i % 12) + 1:02d}-{(i % 28) + 1:02d},Transaction {i},{(i % 500) * 1.37:.2f},{kind}")
+    return ("\n".join(lines) + "\n").encode('utf-8')
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def read_loop(client, stop: asyncio.Event, latencies: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/v1/transactions/summary")
+        if response.status_code != 200:
+            raise RuntimeError(response.text)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def run(uploads: int, rows: int, readers: int) -> None:
+    import httpx
+    from app.main import app
+    
+    payload = make_csv(rows)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Idle baseline
+        idle = []
+        stop = asyncio.Event()
+        tasks = [asyncio.create_task(read_loop(client, stop, idle)) for _ in range(readers)]
+        await asyncio.sleep(1.0)
+        stop.set()
+        await asyncio.gather(*tasks)
+        
+        # Reads while uploads are running
+        busy = []
+        stop = asyncio.Event()
+        tasks = [asyncio.create_task(read_loop(client, stop, busy)) for _ in range(readers)]
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post(
+                "/api/v1/upload?include_transactions=false",
+                files={"file": (f"upload_{i}.csv", payload, "text/csv")}
+            )
+            for i in range(uploads)
+        ))
+        upload_seconds = time.perf_counter() - start
+        stop.set()
+        await asyncio.gather(*tasks)
+    
+    for response in responses:
+        response.raise_for_status()
+    print(f"{uploads} uploads x {rows} rows in {upload_seconds:.2f}s")
+    for name, values in (("idle", idle), ("during uploads", busy)):
+        print(f"  read latency {name:>14}: n={len(values):5d} "
+              f"p50 {statistics.median(values):8.1f} ms  p99 {percentile(values, 0.99):8.1f} ms  "
+              f"max {max(values):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--uploads", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--async-db", action="store_true",
+                        help="Configure ASYNC_DATABASE_URL (aiosqlite) for the app")
+    parser.add_argument("--database-url", default=None,
+                        help="Defaults to a throwaway SQLite file")
+    parser.add_argument("--async-database-url", default=None,
+                        help="Async URL for the same database as --database-url")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'load.db')
+        # Configure the app before it is imported
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{path}"
+        if args.async_database_url:
+            os.environ["ASYNC_DATABASE_URL"] = args.async_database_url
+        elif args.async_db:
+            os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+        
+        from app.core.database import Base, engine
+        import app.models.transaction  # noqa: F401  (register the table)
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        if engine.dialect.name == "sqlite":
+            # WAL lets readers proceed while an upload holds the write lock
+            with engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        
+        asyncio.run(run(args.uploads, args.rows, args.readers))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Benchmark suite runner for PaySplit.AI.
+
+Runs the core performance cases against generated messy ledgers (see
+`benchmarks.ledger_generator`) on one or more databases and writes the
+timings as JSON, keyed by git commit, so runs can be compared:
+- parse_csv: whole-file CSV parsing
+- parse_stream: streaming parse and normalization (the upload parser)
+- upload: POST /api/v1/upload through the ASGI app, response echo off
+- get_all_transactions: TransactionService.get_all_transactions
+- get_transaction_summary: TransactionService.get_transaction_summary
+
+The database cases drop and recreate every table of each database they
+run on, so a --database-url holding any table is refused unless
+--destroy-existing-data is given. Point it at a scratch database.
+
+Usage:
+    python -m benchmarks.run --rows 1000 10000 100000
+    python -m benchmarks.run --rows 1000000 --database-url sqlite \\
+        --database-url postgresql://localhost/paysplit_bench -o results.json
+    python -m benchmarks.run compare before.json after.json --threshold 0.10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, get_db, get_session_factory
+from app.main import app
+from app.services.cache import ResponseCache, set_cache
+from app.services.csv_parser import iter_normalized_batches, parse_csv
+from app.services.merchants import MerchantDirectory, set_merchant_directory
+from app.services.transaction_service import TransactionService
+from benchmarks.bench_ingest_memory import _SpooledUpload
+from benchmarks.ledger_generator import write_ledger
+
+
+CASES = ("parse_csv", "parse_stream", "upload", "get_all_transactions", "get_transaction_summary")
+
+# Rows requested from get_all_transactions; the table holds the full ledger
+LIST_LIMIT = 10_000
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def parse_whole_file(path: str) -> None:
+    upload = _SpooledUpload(path)
+    with upload.file:
+        asyncio.run(parse_csv(upload))
+
+
+def parse_stream(path: str) -> None:
+    with open(path, 'rb') as f:
+        for _ in iter_normalized_batches(f):
+            pass
+
+
+def result_entry(case: str, database: Optional[str], rows: int, seconds: float) -> Dict[str, Any]:
+    print(f"  {database or '-':>10} {case:>24} {rows:>10} rows  {seconds:9.3f}s", flush=True)
+    return {
+        "case": case,
+        "database": database,
+        "rows": rows,
+        "seconds": round(seconds, 6),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+    }
+
+
+def run_parsing(ledgers: Dict[int, str], repeat: int, cases: List[str]) -> List[Dict[str, Any]]:
+    """Run the database-independent parsing cases."""
+    results = []
+    for rows, path in sorted(ledgers.items()):
+        if "parse_csv" in cases:
+            results.append(result_entry("parse_csv", None, rows, best_of(lambda: parse_whole_file(path), repeat)))
+        if "parse_stream" in cases:
+            results.append(result_entry("parse_stream", None, rows, best_of(lambda: parse_stream(path), repeat)))
+    return results
+
+
+def refuse_existing_data(engine, destroy_existing_data: bool) -> None:
+    """
+    Refuse to benchmark a database that already holds tables.
+    
+    Raises:
+        RuntimeError: If the database has tables and destroying them wasn't asked for
+    """
+    tables = inspect(engine).get_table_names()
+    if tables and not destroy_existing_data:
+        raise RuntimeError(
+            f"database has {len(tables)} table(s) ({', '.join(sorted(tables)[:5])}) that the "
+            f"benchmark would drop; use an empty database or pass --destroy-existing-data"
+        )
+
+
+def run_database(
+    database_url: str,
+    ledgers: Dict[int, str],
+    repeat: int,
+    cases: List[str],
+    destroy_existing_data: bool = False
+) -> List[Dict[str, Any]]:
+    """Run the database cases for every ledger size against one database."""
+    engine = create_engine(database_url)
+    try:
+        refuse_existing_data(engine, destroy_existing_data)
+    except Exception:
+        engine.dispose()
+        raise
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    backend = make_url(database_url).get_backend_name()
+    results = []
+    
+    def db_override():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    # Reads are measured uncached; the upload goes through the real app
+    set_cache(ResponseCache(None))
+    app.dependency_overrides[get_db] = db_override
+    app.dependency_overrides[get_session_factory] = lambda: Session
+    client = TestClient(app)
+    
+    def record(case: str, rows: int, seconds: float) -> None:
+        results.append(result_entry(case, backend, rows, seconds))
+    
+    def upload(path: str) -> None:
+        # Each timed upload starts from an empty ledger, so duplicates of a
+        # previous repeat don't turn the upload into a skip-only run
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        set_merchant_directory(MerchantDirectory())
+        with open(path, 'rb') as f:
+            response = client.post(
+                "/api/v1/upload?include_transactions=false",
+                files={"file": ("ledger.csv", f, "text/csv")}
+            )
+        response.raise_for_status()
+    
+    try:
+        for rows, path in sorted(ledgers.items()):
+            if "upload" in cases:
+                record("upload", rows, best_of(lambda: upload(path), repeat))
+            else:
+                upload(path)
+            
+            with Session() as db:
+                service = TransactionService(db)
+                if "get_all_transactions" in cases:
+                    record("get_all_transactions", rows, best_of(
+                        lambda: (service.get_all_transactions(limit=LIST_LIMIT), db.expunge_all()), repeat
+                    ))
+                if "get_transaction_summary" in cases:
+                    record("get_transaction_summary", rows, best_of(service.get_transaction_summary, repeat))
+    finally:
+        app.dependency_overrides.clear()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+    return results
+
+
+def run(args) -> None:
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": [],
+    }
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        ledgers = {}
+        for rows in args.rows:
+            ledgers[rows] = os.path.join(tmp, f"ledger_{rows}.csv")
+            with open(ledgers[rows], "w", newline="") as out:
+                write_ledger(out, rows, seed=args.seed)
+        
+        print("parsing", flush=True)
+        report["results"].extend(run_parsing(ledgers, args.repeat, args.cases))
+        
+        for url in args.database_url or ["sqlite"]:
+            if url == "sqlite":
+                url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            print(f"{make_url(url).render_as_string(hide_password=True)}", flush=True)
+            try:
+                report["results"].extend(
+                    run_database(url, ledgers, args.repeat, args.cases, args.destroy_existing_data)
+                )
+            except Exception as e:
+                # One unreachable database shouldn't throw away the other results
+                print(f"  skipped: {e}", file=sys.stderr)
+    
+    output = args.output or os.path.join("benchmarks", "results", f"{report['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+def compare(args) -> int:
+    """Print per-case speed ratios; exit status 1 if any case regressed past the threshold."""
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    
+    def key(result):
+        return result["case"], result["database"], result["rows"]
+    
+    baseline = {key(r): r["seconds"] for r in before["results"]}
+    regressions = 0
+    print(f"{before.get('commit')} -> {after.get('commit')}")
+    for result in after["results"]:
+        old = baseline.get(key(result))
+        if not old:
+            continue
+        change = result["seconds"] / old - 1
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        case, database, rows = key(result)
+        print(f"  {database or '-':>10} {case:>24} {rows:>10} rows  {old:9.3f}s -> {result['seconds']:9.3f}s"
+              f"  {change:+7.1%}{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    if sys.argv[1:2] == ["compare"]:
+        parser = argparse.ArgumentParser(prog="python -m benchmarks.run compare")
+        parser.add_argument("before")
+        parser.add_argument("after")
+        parser.add_argument("--threshold", type=float, default=0.10,
+                            help="Slowdown ratio reported as a regression")
+        sys.exit(compare(parser.parse_args(sys.argv[2:])))
+    
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--database-url", action="append",
+                        help="Repeatable; 'sqlite' (the default) uses a throwaway file")
+    parser.add_argument("--destroy-existing-data", action="store_true",
+                        help="Benchmark databases that already have tables, dropping them")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=None,
+                        help="Defaults to benchmarks/results/<commit>.json")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Alembic environment for PaySplit.AI.
+
+Migrates the database given by DATABASE_URL, or the connection passed
+in by app.core.migrations. Each revision runs in its own transaction, so
+revisions can step out of it for CREATE INDEX CONCURRENTLY.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.migrations import include_object
+from app.models.merchant import Merchant  # noqa: F401
+from app.models.rollup import TransactionRollup  # noqa: F401
+from app.models.transaction import Transaction  # noqa: F401
+from app.models.upload import UploadedFile  # noqa: F401
+
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL for DATABASE_URL instead of running it."""
+    context.configure(
+        url=settings.database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        transaction_per_migration=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_with_connection(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+        # SQLite can't alter columns in place; batch mode copies the table
+        render_as_batch=connection.dialect.name == "sqlite",
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_with_connection(connection)
+        return
+    
+    from app.core.database import engine
+    
+    with engine.connect() as connection:
+        run_with_connection(connection)
+        connection.commit()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
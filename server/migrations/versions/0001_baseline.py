@@ -0,0 +1,46 @@
+"""Baseline: the transactions table as created before migrations
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 09:00:00
+
+Databases created with create_all before migrations existed already
+have this table; app.core.migrations.migrate stamps them with this
+revision instead of running it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('transaction_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('is_business', sa.Boolean(), nullable=True),
+        sa.Column('business_percentage', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_id', 'transactions', ['id'])
+    op.create_index('ix_transactions_date', 'transactions', ['date'])
+    op.create_index('ix_transactions_user_id', 'transactions', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('transactions')
@@ -0,0 +1,50 @@
+"""Row fingerprints and the uploaded_files table, for upload deduplication
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_online, drop_index_online, has_column, has_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not has_column('transactions', 'fingerprint'):
+        # Nullable with no default: a catalog-only change on PostgreSQL
+        op.add_column('transactions', sa.Column('fingerprint', sa.String(length=64), nullable=True))
+    create_index_online('uq_transactions_fingerprint', 'transactions', ['fingerprint'], unique=True)
+    
+    if not has_table('uploaded_files'):
+        op.create_table(
+            'uploaded_files',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('sha256', sa.String(length=64), nullable=False),
+            sa.Column('filename', sa.String(length=255), nullable=True),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('rows_inserted', sa.Integer(), nullable=False),
+            sa.Column('rows_skipped', sa.Integer(), nullable=False),
+            sa.Column('rows_rejected', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_uploaded_files_id', 'uploaded_files', ['id'])
+        op.create_index('ix_uploaded_files_sha256', 'uploaded_files', ['sha256'])
+
+
+def downgrade() -> None:
+    op.drop_table('uploaded_files')
+    drop_index_online('uq_transactions_fingerprint', 'transactions')
+    with op.batch_alter_table('transactions') as batch:
+        batch.drop_column('fingerprint')
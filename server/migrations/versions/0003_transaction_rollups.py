@@ -0,0 +1,47 @@
+"""Monthly transaction rollups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:20:00
+
+The table starts empty; fill it with `python -m app.core.rebuild_rollups`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import has_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if has_table('transaction_rollups'):
+        return
+    op.create_table(
+        'transaction_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('transaction_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('is_business', sa.Boolean(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('business_amount', sa.Float(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_transaction_rollups_key', 'transaction_rollups',
+        ['user_id', 'month', 'transaction_type', 'category', 'is_business']
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('transaction_rollups')
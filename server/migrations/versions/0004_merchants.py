@@ -0,0 +1,45 @@
+"""Merchants dimension table and transactions.merchant_id
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:30:00
+
+Stored rows are linked to merchants with `python -m app.core.backfill_merchants`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import has_column, has_table
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not has_table('merchants'):
+        op.create_table(
+            'merchants',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('display_name', sa.String(length=255), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name')
+        )
+    if not has_column('transactions', 'merchant_id'):
+        with op.batch_alter_table('transactions') as batch:
+            batch.add_column(sa.Column('merchant_id', sa.Integer(), nullable=True))
+            batch.create_foreign_key('fk_transactions_merchant_id', 'merchants', ['merchant_id'], ['id'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('transactions') as batch:
+        batch.drop_constraint('fk_transactions_merchant_id', type_='foreignkey')
+        batch.drop_column('merchant_id')
+    op.drop_table('merchants')
@@ -0,0 +1,34 @@
+"""Full-text search index over transaction descriptions
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 09:40:00
+
+See app.core.search_index: an FTS5 table on SQLite (filled from the
+stored rows), GIN indexes built concurrently on PostgreSQL.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.search_index import create_search_index, drop_search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            create_search_index(bind, concurrently=True)
+    else:
+        create_search_index(bind)
+
+
+def downgrade() -> None:
+    drop_search_index(op.get_bind())
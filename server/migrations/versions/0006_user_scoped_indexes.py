@@ -0,0 +1,59 @@
+"""Indexes leading with user_id for per-user queries
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 09:50:00
+
+Also drops indexes that the user-led ones replace, including those that
+databases created with create_all before this revision may carry.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.migrations import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+USER_INDEXES = {
+    'ix_transactions_user_date_id': ['user_id', 'date', 'id'],
+    'ix_transactions_user_type_date_id': ['user_id', 'transaction_type', 'date', 'id'],
+    'ix_transactions_user_category_date_id': ['user_id', 'category', 'date', 'id'],
+    'ix_transactions_user_merchant_type_amount_date': ['user_id', 'merchant_id', 'transaction_type', 'amount', 'date'],
+}
+
+REPLACED_INDEXES = {
+    'ix_transactions_date': ['date'],
+    'ix_transactions_user_id': ['user_id'],
+    'ix_transactions_date_id': ['date', 'id'],
+    'ix_transactions_type_date_id': ['transaction_type', 'date', 'id'],
+    'ix_transactions_category_date_id': ['category', 'date', 'id'],
+    'ix_transactions_merchant_type_amount_date': ['merchant_id', 'transaction_type', 'amount', 'date'],
+}
+
+
+def upgrade() -> None:
+    # New indexes first, so queries never run without one
+    for name, columns in USER_INDEXES.items():
+        create_index_online(name, 'transactions', columns)
+    create_index_online('ix_uploaded_files_user_sha256', 'uploaded_files', ['user_id', 'sha256'])
+    
+    for name in REPLACED_INDEXES:
+        drop_index_online(name, 'transactions')
+    drop_index_online('ix_uploaded_files_sha256', 'uploaded_files')
+
+
+def downgrade() -> None:
+    create_index_online('ix_uploaded_files_sha256', 'uploaded_files', ['sha256'])
+    for name in ('ix_transactions_date', 'ix_transactions_user_id'):
+        create_index_online(name, 'transactions', REPLACED_INDEXES[name])
+    
+    drop_index_online('ix_uploaded_files_user_sha256', 'uploaded_files')
+    for name in USER_INDEXES:
+        drop_index_online(name, 'transactions')
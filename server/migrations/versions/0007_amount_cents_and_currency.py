@@ -0,0 +1,253 @@
+"""Integer-cent amounts and a currency column
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 10:00:00
+
+transactions.amount (float) becomes amount_cents (bigint), and
+transactions gets a currency column, 'USD' for existing rows. The
+rollup table only holds derived data, so it is recreated in cents
+with currency in its key and refilled from the converted transactions.
+
+On PostgreSQL the table stays writable while amounts are converted:
+amount_cents is backfilled in batches of ids, each committed on its own,
+and made NOT NULL through a CHECK constraint added NOT VALID and then
+validated, so SET NOT NULL doesn't scan the table under an exclusive
+lock (PostgreSQL 12+). Each step is skipped or resumed when the
+revision is rerun after a failure.
+
+Downtime: code before this revision writes only `amount`, and code
+after it only `amount_cents`. So writes must be paused from the start
+of the backfill until the new code is deployed. Reads keep working
+throughout. A row written by the old code after its batch was converted
+makes the validation fail; rerun the revision with writes paused.
+
+Helpers this revision needs from the application (month truncation,
+the SQLite search triggers) are copied here as they were at this
+revision, so later changes to the application don't change what it does.
+"""
+from contextlib import nullcontext
+from typing import Any, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_online, drop_index_online, has_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COVERING_INDEX = 'ix_transactions_user_merchant_type_amount_date'
+
+# Rows converted per UPDATE; on PostgreSQL each batch commits on its own
+BACKFILL_BATCH_SIZE = 10_000
+
+# SQLite FTS triggers of app.core.search_index at this revision
+FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description) VALUES ('delete', old.id, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_au AFTER UPDATE OF description ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO transactions_fts(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+)
+
+transactions = sa.table(
+    'transactions',
+    sa.column('id', sa.Integer()),
+    sa.column('user_id', sa.Integer()),
+    sa.column('date', sa.DateTime()),
+    sa.column('amount', sa.Float()),
+    sa.column('amount_cents', sa.BigInteger()),
+    sa.column('currency', sa.String()),
+    sa.column('transaction_type', sa.String()),
+    sa.column('category', sa.String()),
+    sa.column('is_business', sa.Boolean()),
+    sa.column('business_percentage', sa.Float()),
+)
+
+
+def upgrade() -> None:
+    if not has_column('transactions', 'amount_cents'):
+        with op.batch_alter_table('transactions') as batch:
+            batch.add_column(sa.Column('amount_cents', sa.BigInteger(), nullable=True))
+            batch.add_column(sa.Column('currency', sa.String(length=3), server_default='USD', nullable=False))
+    if op.get_context().as_sql or has_column('transactions', 'amount'):
+        _backfill('amount_cents', sa.cast(sa.func.round(transactions.c.amount * 100), sa.BigInteger))
+        drop_index_online(COVERING_INDEX, 'transactions')
+        _set_not_null('amount_cents', sa.BigInteger())
+        with op.batch_alter_table('transactions') as batch:
+            batch.drop_column('amount')
+        _restore_search_triggers()
+    create_index_online(
+        COVERING_INDEX, 'transactions', ['user_id', 'merchant_id', 'transaction_type', 'amount_cents', 'date']
+    )
+    
+    if not has_column('transaction_rollups', 'total_cents'):
+        op.drop_table('transaction_rollups')
+        _create_rollups(cents=True)
+
+
+def downgrade() -> None:
+    # Refilled from amount_cents, before it is dropped
+    op.drop_table('transaction_rollups')
+    _create_rollups(cents=False)
+    
+    with op.batch_alter_table('transactions') as batch:
+        batch.add_column(sa.Column('amount', sa.Float(), nullable=True))
+    _backfill('amount', sa.cast(transactions.c.amount_cents, sa.Float) / 100)
+    drop_index_online(COVERING_INDEX, 'transactions')
+    _set_not_null('amount', sa.Float())
+    with op.batch_alter_table('transactions') as batch:
+        batch.drop_column('currency')
+        batch.drop_column('amount_cents')
+    _restore_search_triggers()
+    create_index_online(
+        COVERING_INDEX, 'transactions', ['user_id', 'merchant_id', 'transaction_type', 'amount', 'date']
+    )
+
+
+def _backfill(name: str, value: Any) -> None:
+    """
+    Set a transactions column on every row where it is NULL, in batches of ids.
+    
+    On PostgreSQL each batch is committed on its own, so row locks are
+    only held for one batch. Rows added while the batches run are
+    picked up by the later batches.
+    """
+    context = op.get_context()
+    t = transactions.c
+    column = t[name]
+    if context.as_sql:
+        op.execute(transactions.update().where(column.is_(None)).values({name: value}))
+        return
+    
+    bind = op.get_bind()
+    with context.autocommit_block() if bind.dialect.name == "postgresql" else nullcontext():
+        last_id = 0
+        while True:
+            ids = sa.select(t.id).where(t.id > last_id).order_by(t.id).limit(BACKFILL_BATCH_SIZE).subquery()
+            upper_id = bind.scalar(sa.select(sa.func.max(ids.c.id)))
+            if upper_id is None:
+                break
+            bind.execute(
+                transactions.update()
+                .where(t.id > last_id, t.id <= upper_id, column.is_(None))
+                .values({name: value})
+            )
+            last_id = upper_id
+
+
+def _set_not_null(name: str, type_: sa.types.TypeEngine) -> None:
+    """
+    Make a backfilled transactions column NOT NULL.
+    
+    On PostgreSQL a validated CHECK (column IS NOT NULL) lets SET NOT NULL
+    skip its scan. The CHECK is added NOT VALID, which is instant, and
+    validated outside the revision's transaction, which scans the table
+    without blocking writes.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table('transactions') as batch:
+            batch.alter_column(name, existing_type=type_, nullable=False)
+        return
+    
+    check = f"ck_transactions_{name}_not_null"
+    op.execute(f"ALTER TABLE transactions DROP CONSTRAINT IF EXISTS {check}")
+    op.execute(f"ALTER TABLE transactions ADD CONSTRAINT {check} CHECK ({name} IS NOT NULL) NOT VALID")
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE transactions VALIDATE CONSTRAINT {check}")
+    op.alter_column('transactions', name, existing_type=type_, nullable=False)
+    op.drop_constraint(check, 'transactions', type_='check')
+
+
+def _restore_search_triggers() -> None:
+    """
+    Recreate the FTS triggers on SQLite, where dropping a column copies
+    the transactions table and the triggers are dropped with the original.
+    Row ids are kept, so the FTS table itself is still valid.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite" and bind.execute(sa.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions_fts'"
+    )).first() is not None:
+        for statement in FTS_TRIGGERS:
+            op.execute(statement)
+
+
+def _month_start(column, dialect_name: str):
+    """SQL expression truncating a timestamp column to the first day of its month."""
+    if dialect_name == 'postgresql':
+        return sa.cast(sa.func.date_trunc('month', column), sa.Date)
+    if dialect_name == 'sqlite':
+        return sa.func.date(column, 'start of month')
+    raise NotImplementedError(f"Rollups are not supported on {dialect_name}")
+
+
+def _create_rollups(cents: bool) -> None:
+    """Create the rollup table in cents (or in floats, as before) and fill it from transactions."""
+    key = ['user_id', 'month', 'currency', 'transaction_type', 'category', 'is_business']
+    if not cents:
+        key.remove('currency')
+    amount_type = sa.BigInteger() if cents else sa.Float()
+    total, business = ('total_cents', 'business_cents') if cents else ('total_amount', 'business_amount')
+    
+    columns = [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('transaction_type', sa.String(length=50), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('is_business', sa.Boolean(), nullable=False),
+        sa.Column(total, amount_type, nullable=False),
+        sa.Column(business, amount_type, nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+    if cents:
+        columns.insert(3, sa.Column('currency', sa.String(length=3), server_default='USD', nullable=False))
+    rollups = op.create_table('transaction_rollups', *columns)
+    
+    t = transactions.c
+    share = sa.func.coalesce(t.business_percentage, 0.0)
+    if cents:
+        # Same rounding as RollupService.rebuild
+        sums = [
+            sa.func.sum(t.amount_cents),
+            sa.func.sum(sa.cast(sa.func.round(sa.cast(t.amount_cents * share, sa.Numeric)), sa.BigInteger)),
+        ]
+    else:
+        amount = sa.cast(t.amount_cents, sa.Float) / 100
+        sums = [sa.func.sum(amount), sa.func.sum(amount * share)]
+    
+    month = _month_start(t.date, op.get_bind().dialect.name)
+    group = {
+        'user_id': t.user_id,
+        'month': month,
+        'currency': t.currency,
+        'transaction_type': t.transaction_type,
+        'category': t.category,
+        'is_business': sa.func.coalesce(t.is_business, sa.false()),
+    }
+    group = [group[name] for name in key]
+    op.execute(rollups.insert().from_select(
+        key + [total, business, 'transaction_count'],
+        sa.select(*group, *sums, sa.func.count(t.id)).group_by(*group)
+    ))
+    op.create_index('ix_transaction_rollups_key', 'transaction_rollups', key)
@@ -0,0 +1,87 @@
+"""Unique rollup key
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 10:30:00
+
+Rollup rows were written with UPDATE, then INSERT when no row matched,
+so concurrent first writers could each insert a row for the same key.
+Rows sharing a key are merged into the oldest one, then the plain key
+index is replaced by a unique one over the key with NULL user ids and
+categories coalesced (see app.models.rollup.ROLLUP_KEY), which writers
+upsert against.
+
+A writer still running the old code between the merge and the index
+build can add a new duplicate; the build then fails, and rerunning the
+revision merges it and rebuilds the index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.migrations import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+KEY = ['user_id', 'month', 'currency', 'transaction_type', 'category', 'is_business']
+
+UNIQUE_KEY = [
+    sa.text("coalesce(user_id, 0)"), 'month', 'currency', 'transaction_type',
+    sa.text("coalesce(category, '')"), 'is_business',
+]
+
+rollups = sa.table(
+    'transaction_rollups',
+    sa.column('id', sa.Integer()),
+    sa.column('user_id', sa.Integer()),
+    sa.column('month', sa.Date()),
+    sa.column('currency', sa.String()),
+    sa.column('transaction_type', sa.String()),
+    sa.column('category', sa.String()),
+    sa.column('is_business', sa.Boolean()),
+    sa.column('total_cents', sa.BigInteger()),
+    sa.column('business_cents', sa.BigInteger()),
+    sa.column('transaction_count', sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    _merge_duplicate_keys()
+    create_index_online('uq_transaction_rollups_key', 'transaction_rollups', UNIQUE_KEY, unique=True)
+    drop_index_online('ix_transaction_rollups_key', 'transaction_rollups')
+
+
+def downgrade() -> None:
+    create_index_online('ix_transaction_rollups_key', 'transaction_rollups', KEY)
+    drop_index_online('uq_transaction_rollups_key', 'transaction_rollups')
+
+
+def _merge_duplicate_keys() -> None:
+    """Fold the aggregates of rows sharing a key into the key's oldest row."""
+    r = rollups.c
+    user = sa.func.coalesce(r.user_id, 0)
+    category = sa.func.coalesce(r.category, '')
+    key = [user, r.month, r.currency, r.transaction_type, category, r.is_business]
+    duplicates = op.get_bind().execute(
+        sa.select(
+            *key,
+            sa.func.min(r.id),
+            sa.func.sum(r.total_cents),
+            sa.func.sum(r.business_cents),
+            sa.func.sum(r.transaction_count)
+        ).group_by(*key).having(sa.func.count() > 1)
+    ).all()
+    
+    for *values, keep_id, total, business, count in duplicates:
+        match = sa.and_(*(column == value for column, value in zip(key, values)))
+        op.execute(rollups.update().where(r.id == keep_id).values(
+            total_cents=total, business_cents=business, transaction_count=count
+        ))
+        op.execute(rollups.delete().where(match, r.id != keep_id))
@@ -8,22 +8,120 @@ This file contains:
 """
 
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from io import BytesIO
 import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
+from app.core.database import Base, get_db, get_session_factory
+from app.services.analytics import AnalyticsStore, set_analytics_store
+from app.services.cache import MemoryCacheBackend, ResponseCache, set_cache
+from app.services.merchants import MerchantDirectory, set_merchant_directory
+
+
+@pytest.fixture(autouse=True)
+def response_cache():
+    """
+    Give every test its own empty response cache.
+    
+    Without this, responses cached by one test's database would be
+    served to the next test.
+    """
+    cache = ResponseCache(MemoryCacheBackend())
+    set_cache(cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def merchant_directory():
+    """
+    Give every test its own empty merchant directory.
+    
+    Merchant ids cached by one test's database don't exist in the next.
+    """
+    directory = MerchantDirectory()
+    set_merchant_directory(directory)
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def analytics_store():
+    """
+    Give every test its own empty analytics snapshot store.
+    
+    Snapshots loaded from one test's database would otherwise be
+    served to the next.
+    """
+    store = AnalyticsStore()
+    set_analytics_store(store)
+    return store
+
+
+@pytest.fixture
+def db_session():
+    """
+    Create an isolated in-memory SQLite database session.
+    
+    Every test gets a fresh schema, so tests never depend on a running
+    PostgreSQL server or on each other's data.
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_db_session():
+    """
+    Create an isolated in-memory SQLite database behind the async engine.
+    """
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    TestingAsyncSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+    await engine.dispose()
 
 
 @pytest.fixture
-def client():
+def client(db_session):
     """
     Create a test client for the FastAPI application.
     
     This fixture provides a way to make HTTP requests to your app
     without actually starting a server. Perfect for unit testing!
+    The database dependencies are pointed at the in-memory test database.
     """
-    return TestClient(app)
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_session_factory] = lambda: sessionmaker(
+        autocommit=False, autoflush=False, bind=db_session.get_bind()
+    )
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
 
 
 @pytest.fixture
@@ -0,0 +1,245 @@
+"""
+Tests for ledger analytics.
+
+This file tests:
+- Trends with rolling averages, category percentiles and year-over-year totals
+- Snapshot refresh after inserts, deletes and backfills
+- The /analytics endpoints
+"""
+
+import pytest
+
+from app.models.transaction import Transaction
+from app.services.analytics import AnalyticsService
+from app.services.cache import ResponseCache, set_cache
+from app.services.transaction_service import TransactionService
+
+
+ROWS = [
+    {'Date': '2023-01-10', 'Description': 'Uber Ride', 'Amount': 20.00, 'Type': 'Expense'},
+    {'Date': '2023-03-05', 'Description': 'Office Depot', 'Amount': 100.00, 'Type': 'Expense'},
+    {'Date': '2024-01-15', 'Description': 'Uber Ride', 'Amount': 30.00, 'Type': 'Expense'},
+    {'Date': '2024-01-20', 'Description': 'Lyft Ride', 'Amount': 10.00, 'Type': 'Expense'},
+    {'Date': '2024-02-17', 'Description': 'Client A', 'Amount': 500.00, 'Type': 'Income'},
+    {'Date': '2024-03-01', 'Description': 'Uber Ride', 'Amount': 50.00, 'Type': 'Expense', 'Currency': 'EUR'},
+]
+
+
+@pytest.fixture
+def ledger(db_session):
+    return TransactionService(db_session).bulk_create_transactions(ROWS)
+
+
+class TestAnalyticsService:
+    """Test suite for AnalyticsService queries."""
+    
+    def test_trend_fills_empty_periods(self, db_session, ledger):
+        """
+        Test that monthly totals include empty months and a trailing average.
+        """
+        trend = AnalyticsService(db_session).get_spend_trend(window=2, currency='USD')
+        
+        assert len(trend) == 13
+        assert trend[0] == {"period": "2023-01", "total": 20.0, "count": 1, "rolling_average": 20.0}
+        assert trend[1] == {"period": "2023-02", "total": 0.0, "count": 0, "rolling_average": 10.0}
+        assert trend[-1] == {"period": "2024-01", "total": 40.0, "count": 2, "rolling_average": 20.0}
+    
+    def test_trend_filters(self, db_session, ledger):
+        """
+        Test yearly totals restricted by date range and currency.
+        """
+        service = AnalyticsService(db_session)
+        
+        assert service.get_spend_trend(granularity='year', currency='usd') == [
+            {"period": "2023", "total": 120.0, "count": 2, "rolling_average": 120.0},
+            {"period": "2024", "total": 40.0, "count": 2, "rolling_average": 80.0},
+        ]
+        quarters = service.get_spend_trend(granularity='quarter', start_date='2024-01-16', transaction_type='Income')
+        assert quarters == [{"period": "2024-Q1", "total": 500.0, "count": 1, "rolling_average": 500.0}]
+    
+    def test_category_percentiles(self, db_session, ledger):
+        """
+        Test per-category totals and percentiles, largest total first.
+        """
+        stats = AnalyticsService(db_session).get_category_stats(percentiles=[50, 100], currency='USD')
+        travel = next(s for s in stats if s["count"] == 3)
+        
+        assert stats[0]["total"] == 100.0
+        assert travel["total"] == 60.0
+        assert travel["mean"] == 20.0
+        assert travel["percentiles"] == {"p50": 20.0, "p100": 30.0}
+    
+    def test_year_over_year(self, db_session, ledger):
+        """
+        Test that each month is compared with the same month a year earlier.
+        """
+        periods = AnalyticsService(db_session).get_year_over_year(currency='USD')
+        by_period = {p["period"]: p for p in periods}
+        
+        assert by_period["2023-01"] == {
+            "period": "2023-01", "total": 20.0, "previous_year_total": 0.0, "change_pct": None
+        }
+        assert by_period["2023-03"]["total"] == 100.0
+        assert by_period["2024-01"]["change_pct"] == 100.0
+    
+    def test_mixed_currencies_need_a_filter(self, db_session, ledger):
+        """
+        Test that amounts in different currencies are never added together.
+        """
+        service = AnalyticsService(db_session)
+        
+        with pytest.raises(ValueError, match="EUR, USD"):
+            service.get_spend_trend()
+        with pytest.raises(ValueError, match="EUR, USD"):
+            service.get_category_stats()
+        assert service.get_spend_trend(granularity='year', end_date='2024-02-01')[-1]["total"] == 40.0
+        assert service.get_spend_trend(currency='EUR')[0]["total"] == 50.0
+    
+    def test_invalid_parameters(self, db_session):
+        """
+        Test that unsupported parameters are rejected.
+        """
+        service = AnalyticsService(db_session)
+        
+        with pytest.raises(ValueError):
+            service.get_spend_trend(granularity='week')
+        with pytest.raises(ValueError):
+            service.get_spend_trend(transaction_type='Transfer')
+        with pytest.raises(ValueError):
+            service.get_year_over_year(granularity='year')
+
+
+class TestSnapshotRefresh:
+    """Test suite for keeping snapshots in step with the table."""
+    
+    def test_insert_is_appended(self, db_session, ledger, analytics_store, monkeypatch):
+        """
+        Test that new rows are merged into the snapshot without a reload.
+        """
+        service = AnalyticsService(db_session)
+        first = analytics_store.snapshot(db_session)
+        monkeypatch.setattr("app.services.analytics._load", lambda *args: pytest.fail("snapshot reloaded"))
+        
+        TransactionService(db_session).create_transaction(
+            {'Date': '2022-12-31', 'Description': 'Uber Ride', 'Amount': 5.00, 'Type': 'Expense'}
+        )
+        
+        assert service.get_spend_trend(currency='USD')[0] == {
+            "period": "2022-12", "total": 5.0, "count": 1, "rolling_average": 5.0
+        }
+        assert len(analytics_store.snapshot(db_session)) == len(first) + 1
+    
+    def test_unchanged_snapshot_skips_database(self, db_session, ledger, analytics_store, response_cache, monkeypatch):
+        """
+        Test that a snapshot is reused without queries while a shared data version is unchanged.
+        """
+        monkeypatch.setattr(response_cache.backend, "shared", True)
+        analytics_store.snapshot(db_session)
+        db_session.close()
+        db_session.get_bind().dispose()
+        
+        assert analytics_store.snapshot(db_session) is analytics_store.snapshot(db_session)
+    
+    def test_delete_reloads(self, db_session, ledger):
+        """
+        Test that a deleted row disappears from the snapshot.
+        """
+        service = AnalyticsService(db_session)
+        service.get_spend_trend(currency='USD')
+        
+        TransactionService(db_session).delete_transaction(ledger[0].id)
+        
+        assert service.get_spend_trend(currency='USD')[0]["period"] == "2023-03"
+    
+    def test_backfill_reloads(self, db_session, ledger):
+        """
+        Test that rows updated in place by a backfill are reloaded.
+        """
+        service = AnalyticsService(db_session)
+        service.get_category_stats(currency='USD')
+        
+        db_session.query(Transaction).update({"category": "Everything"})
+        db_session.commit()
+        TransactionService(db_session).backfill_categories(overwrite=False)
+        
+        assert [s["category"] for s in service.get_category_stats(currency='USD')] == ["Everything"]
+    
+    def test_unshared_cache_checks_table(self, db_session, ledger, analytics_store):
+        """
+        Test that rows written by another worker are seen when the cache is per process.
+        """
+        first = analytics_store.snapshot(db_session)
+        
+        # Another worker's write bumps its own in-memory version, not ours
+        db_session.add(Transaction(
+            date=ledger[0].date, description='Taxi', amount_cents=700, transaction_type='Expense'
+        ))
+        db_session.commit()
+        
+        assert len(analytics_store.snapshot(db_session)) == len(first) + 1
+    
+    def test_old_snapshot_reloads(self, db_session, ledger, analytics_store):
+        """
+        Test that a snapshot older than the max age sees rows updated in place elsewhere.
+        """
+        service = AnalyticsService(db_session)
+        service.get_category_stats(currency='USD')
+        db_session.query(Transaction).update({"category": "Everything"})
+        db_session.commit()
+        
+        assert "Everything" not in [s["category"] for s in service.get_category_stats(currency='USD')]
+        analytics_store.max_age = 0
+        assert [s["category"] for s in service.get_category_stats(currency='USD')] == ["Everything"]
+    
+    def test_without_cache_checks_table(self, db_session, ledger):
+        """
+        Test that inserts are seen when the cache gives no change signal.
+        """
+        set_cache(ResponseCache(None))
+        service = AnalyticsService(db_session)
+        assert service.get_spend_trend(granularity='year', currency='USD')[-1]["count"] == 2
+        
+        TransactionService(db_session).create_transaction(
+            {'Date': '2024-06-01', 'Description': 'Taxi', 'Amount': 15.00, 'Type': 'Expense'}
+        )
+        
+        assert service.get_spend_trend(granularity='year', currency='USD')[-1]["count"] == 3
+
+
+class TestAnalyticsAPI:
+    """Test suite for the /analytics endpoints."""
+    
+    def test_endpoints(self, client, ledger):
+        """
+        Test that each endpoint answers from the ledger.
+        """
+        trend = client.get("/api/v1/analytics/trend", params={"granularity": "year", "currency": "USD"}).json()
+        categories = client.get(
+            "/api/v1/analytics/categories", params={"percentiles": "25,75", "currency": "USD"}
+        ).json()
+        yoy = client.get(
+            "/api/v1/analytics/year-over-year", params={"granularity": "quarter", "currency": "USD"}
+        ).json()
+        
+        assert [p["period"] for p in trend["periods"]] == ["2023", "2024"]
+        assert set(categories["categories"][0]["percentiles"]) == {"p25", "p75"}
+        assert yoy["periods"][-1] == {
+            "period": "2024-Q1", "total": 40.0, "previous_year_total": 120.0, "change_pct": -66.67
+        }
+    
+    def test_bad_parameters(self, client):
+        """
+        Test that invalid parameters are a bad request.
+        """
+        assert client.get("/api/v1/analytics/trend", params={"granularity": "week"}).status_code == 400
+        assert client.get("/api/v1/analytics/categories", params={"percentiles": "median"}).status_code == 400
+        assert client.get("/api/v1/analytics/year-over-year", params={"currency": "dollars"}).status_code == 400
+    
+    def test_mixed_currencies_are_a_bad_request(self, client, ledger):
+        """
+        Test that totals over several currencies without a filter are refused.
+        """
+        response = client.get("/api/v1/analytics/trend")
+        
+        assert response.status_code == 400
+        assert "EUR, USD" in response.json()["detail"]
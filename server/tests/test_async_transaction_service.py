@@ -0,0 +1,92 @@
+"""
+Unit tests for the async transaction service.
+
+The same service is exercised on top of an AsyncSession (aiosqlite)
+and on top of a plain Session (threadpool fallback).
+"""
+
+import threading
+
+import pytest
+from io import BytesIO
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.services.analytics import AnalyticsService
+from app.services.async_transaction_service import AsyncTransactionService
+from app.services.csv_parser import iter_normalized_batches
+
+
+CSV_CONTENT = (
+    b"Date,Description,Amount,Type\n"
+    b"2024-01-15,Uber Ride,25.50,Expense\n"
+    b"2024-01-16,Starbucks,4.50,Expense\n"
+    b"2024-01-17,Client,500.00,Income\n"
+)
+
+
+class TestAsyncTransactionService:
+    """Test suite for AsyncTransactionService."""
+    
+    @pytest.mark.asyncio
+    async def test_import_and_summary_with_async_session(self, async_db_session):
+        """
+        Test a full import and summary through the async engine.
+        """
+        service = AsyncTransactionService(async_db_session)
+        
+        result = await service.import_batches(iter_normalized_batches(BytesIO(CSV_CONTENT), batch_size=2))
+        summary = await service.get_transaction_summary()
+        page, cursor = await service.get_transactions_page(limit=10)
+        
+        assert result.inserted == 3
+        assert summary["total_income"] == 500.0
+        assert summary["total_expenses"] == 30.0
+        assert [t.description for t in page] == ['Client', 'Starbucks', 'Uber Ride']
+        assert cursor is None
+    
+    @pytest.mark.asyncio
+    async def test_import_with_sync_session(self, db_session):
+        """
+        Test that the threadpool fallback behaves the same way.
+        """
+        service = AsyncTransactionService(db_session)
+        
+        result = await service.import_batches(iter_normalized_batches(BytesIO(CSV_CONTENT)))
+        transaction = await service.get_transaction_by_id(1)
+        
+        assert result.inserted == 3
+        assert transaction.description == 'Uber Ride'
+        assert await service.delete_transaction(1) is True
+        assert await service.get_transaction_by_id(1) is None
+    
+    @pytest.mark.asyncio
+    async def test_analytics_leave_the_event_loop(self, tmp_path, monkeypatch):
+        """
+        Test that analytics under an AsyncSession run in the threadpool on a sync session.
+        """
+        path = tmp_path / "ledger.db"
+        sync_engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(sync_engine)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        threads = []
+        get_spend_trend = AnalyticsService.get_spend_trend
+        
+        def spy(analytics, **params):
+            threads.append(threading.get_ident())
+            return get_spend_trend(analytics, **params)
+        monkeypatch.setattr(AnalyticsService, "get_spend_trend", spy)
+        
+        try:
+            async with async_sessionmaker(async_engine, expire_on_commit=False)() as db:
+                service = AsyncTransactionService(db, session_factory=sessionmaker(bind=sync_engine))
+                await service.import_batches(iter_normalized_batches(BytesIO(CSV_CONTENT)))
+                trend = await service.get_spend_trend(currency='USD')
+        finally:
+            await async_engine.dispose()
+            sync_engine.dispose()
+        
+        assert trend == [{"period": "2024-01", "total": 30.0, "count": 2, "rolling_average": 30.0}]
+        assert threads and threads[0] != threading.get_ident()
@@ -0,0 +1,175 @@
+"""
+Tests for the response cache.
+
+This file tests:
+- LRU eviction and TTL expiry of the in-process backend
+- The Redis backend against a local stub client
+- Version-based invalidation on writes, end to end through the API
+"""
+
+import fnmatch
+
+import pytest
+
+from app.services.cache import MemoryCacheBackend, RedisCacheBackend, ResponseCache
+
+
+class StubRedis:
+    """Dictionary-backed stand-in for a Redis client."""
+    
+    def __init__(self):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+    
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+    
+    def scan_iter(self, match):
+        return [k for k in list(self.data) if fnmatch.fnmatch(k, match)]
+    
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class TestMemoryCacheBackend:
+    """Test suite for the in-process LRU backend."""
+    
+    def test_evicts_least_recently_used(self):
+        """
+        Test that the oldest untouched entry is evicted first.
+        """
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+        
+        assert backend.get("a") == 1
+        assert backend.get("b") is None
+        assert backend.get("c") == 3
+    
+    def test_expired_entries_are_misses(self, monkeypatch):
+        """
+        Test that entries past their TTL are not returned.
+        """
+        clock = [100.0]
+        monkeypatch.setattr("app.services.cache.time.monotonic", lambda: clock[0])
+        backend = MemoryCacheBackend(default_ttl=10)
+        backend.set("a", 1)
+        
+        clock[0] = 111.0
+        
+        assert backend.get("a") is None
+
+
+class TestResponseCache:
+    """Test suite for versioned response caching."""
+    
+    @pytest.mark.parametrize("backend", [
+        MemoryCacheBackend(),
+        RedisCacheBackend(StubRedis())
+    ], ids=["memory", "redis"])
+    @pytest.mark.asyncio
+    async def test_invalidate_bumps_versions(self, backend):
+        """
+        Test that writes make earlier responses unreachable.
+        """
+        cache = ResponseCache(backend)
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            return {"value": len(calls)}
+        
+        first = await cache.get_or_compute("summary", {"category": "Food"}, compute, user_id=7)
+        second = await cache.get_or_compute("summary", {"category": "Food"}, compute, user_id=7)
+        cache.invalidate(user_id=7)
+        third = await cache.get_or_compute("summary", {"category": "Food"}, compute, user_id=7)
+        
+        assert first == second == {"value": 1}
+        assert third == {"value": 2}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_other_users_keep_their_entries(self):
+        """
+        Test that a write for one user leaves other users' entries valid.
+        """
+        cache = ResponseCache(MemoryCacheBackend())
+        
+        async def compute():
+            return {"value": 1}
+        
+        await cache.get_or_compute("summary", {}, compute, user_id=1)
+        cache.invalidate(user_id=2)
+        await cache.get_or_compute("summary", {}, compute, user_id=1)
+        
+        assert cache.stats()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_all_reaches_every_user(self):
+        """
+        Test that a write across all users invalidates every user's entries.
+        """
+        cache = ResponseCache(MemoryCacheBackend())
+        
+        async def compute():
+            return {"value": 1}
+        
+        for user_id in (1, 2):
+            await cache.get_or_compute("summary", {}, compute, user_id=user_id)
+        cache.invalidate_all()
+        for user_id in (1, 2):
+            await cache.get_or_compute("summary", {}, compute, user_id=user_id)
+        
+        assert cache.stats()["hits"] == 0
+        assert cache.stats()["misses"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_quarters_invalidated_separately(self):
+        """
+        Test that a write to one quarter only recomputes that quarter.
+        """
+        cache = ResponseCache(MemoryCacheBackend())
+        computed = []
+        
+        async def compute(quarters):
+            computed.append(quarters)
+            return {q: {"quarter": q, "run": len(computed)} for q in quarters}
+        
+        quarters = ["2024-Q1", "2024-Q2"]
+        await cache.get_quarters_or_compute("tax", {}, quarters, compute, user_id=1)
+        cache.invalidate(user_id=1, quarters=["2024-Q2"])
+        cache.invalidate(user_id=2)
+        values = await cache.get_quarters_or_compute("tax", {}, quarters, compute, user_id=1)
+        cache.invalidate(user_id=1)
+        await cache.get_quarters_or_compute("tax", {}, quarters, compute, user_id=1)
+        
+        assert computed == [quarters, ["2024-Q2"], quarters]
+        assert values == {"2024-Q1": {"quarter": "2024-Q1", "run": 1}, "2024-Q2": {"quarter": "2024-Q2", "run": 2}}
+
+
+class TestCachedEndpoints:
+    """Test suite for caching on the read endpoints."""
+    
+    def test_summary_cached_until_upload(self, client, sample_csv_file):
+        """
+        Test that repeated summaries are hits and an upload invalidates them.
+        """
+        assert client.get("/api/v1/transactions/summary").json()["total_transactions"] == 0
+        assert client.get("/api/v1/transactions/summary").json()["total_transactions"] == 0
+        
+        files = {"file": ("transactions.csv", sample_csv_file, "text/csv")}
+        client.post("/api/v1/upload", files=files)
+        
+        assert client.get("/api/v1/transactions/summary").json()["total_transactions"] == 3
+        stats = client.get("/internal/cache").json()
+        assert stats["endpoints"]["transactions.summary"] == {"hits": 1, "misses": 2}
@@ -0,0 +1,142 @@
+"""
+Tests for transaction categorization.
+
+This file tests:
+- Description normalization
+- Merchant rules, income rules and the classifier fallback
+- The memo cache
+- Categorization during import and the backfill job
+"""
+
+from io import BytesIO
+
+import pytest
+
+from app.models.rollup import TransactionRollup
+from app.models.transaction import Transaction
+from app.services.categorizer import Categorizer, normalize_description
+from app.services.csv_parser import iter_normalized_batches
+from app.services.transaction_service import TransactionService
+
+
+class TestNormalizeDescription:
+    """Test suite for normalize_description."""
+    
+    def test_store_numbers_and_case_are_dropped(self):
+        """
+        Test that store numbers, punctuation and case don't split memo entries.
+        """
+        assert normalize_description("STARBUCKS #4521") == "starbucks"
+        assert normalize_description("  Starbucks  Store*A1B2 ") == "starbucks store"
+
+
+class TestCategorizer:
+    """Test suite for Categorizer."""
+    
+    @pytest.fixture
+    def categorizer(self):
+        return Categorizer()
+    
+    def test_merchant_rules(self, categorizer):
+        """
+        Test that known merchants are categorized by the rules.
+        """
+        category, is_business, percentage = categorizer.categorize(
+            ["Uber Ride", "UBER EATS #123", "Starbucks Coffee", "Adobe Creative Cloud"],
+            ["Expense"] * 4
+        )
+        
+        assert category.tolist() == ["Transportation", "Meals & Dining", "Meals & Dining", "Software & Subscriptions"]
+        assert is_business.tolist() == [False, False, False, True]
+        assert percentage.tolist() == [0.0, 0.0, 0.0, 1.0]
+    
+    def test_income_rules(self, categorizer):
+        """
+        Test that income rows use the income categories.
+        """
+        category, is_business, _ = categorizer.categorize(
+            ["Freelance Payment", "Payroll ACME", "Gift from Mom"], ["Income"] * 3
+        )
+        
+        assert category.tolist() == ["Business Income", "Salary", "Income"]
+        assert is_business.tolist() == [True, False, False]
+    
+    def test_classifier_fallback(self, categorizer):
+        """
+        Test that unknown merchants are categorized from their words,
+        and unrecognizable ones are left uncategorized.
+        """
+        category, _, _ = categorizer.categorize(["Joe's Pizza Kitchen", "Corner Gas Station", "xyz"], ["Expense"] * 3)
+        
+        assert category.tolist() == ["Meals & Dining", "Transportation", None]
+    
+    def test_memo_cache(self, categorizer):
+        """
+        Test that each normalized description is categorized once.
+        """
+        categorizer.categorize(["Starbucks #1", "Starbucks #2", "STARBUCKS"], ["Expense"] * 3)
+        categorizer.categorize(["Starbucks #3"], ["Expense"])
+        
+        stats = categorizer.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+    
+    def test_memo_cache_is_bounded(self):
+        """
+        Test that the least recently used entries are evicted.
+        """
+        categorizer = Categorizer(max_memo_entries=2)
+        categorizer.categorize(["Uber", "Lyft", "Shell"], ["Expense"] * 3)
+        
+        assert categorizer.stats()["memo_entries"] == 2
+
+
+class TestCategorizationPipeline:
+    """Test suite for categorization during import and backfill."""
+    
+    CSV = (
+        b"Date,Description,Amount,Type\n"
+        b"2024-01-15,Uber Ride,25.50,Expense\n"
+        b"2024-01-16,Github,4.00,Expense\n"
+        b"2024-01-17,Client Payment,500.00,Income\n"
+    )
+    
+    def test_import_categorizes_rows(self, db_session):
+        """
+        Test that imported rows are stored with their category.
+        """
+        TransactionService(db_session).import_batches(iter_normalized_batches(BytesIO(self.CSV)))
+        
+        rows = db_session.query(Transaction).order_by(Transaction.id).all()
+        assert [t.category for t in rows] == ["Transportation", "Software & Subscriptions", "Business Income"]
+        assert [t.is_business for t in rows] == [False, True, True]
+    
+    def test_create_transaction_categorizes_row(self, db_session):
+        """
+        Test that single-row creation is categorized too.
+        """
+        transaction = TransactionService(db_session).create_transaction(
+            {"Date": "2024-01-15", "Description": "Staples #12", "Amount": 30.0, "Type": "Expense"}
+        )
+        
+        assert transaction.category == "Office Supplies"
+        assert transaction.business_percentage == 1.0
+    
+    def test_backfill_categorizes_stored_rows(self, db_session):
+        """
+        Test that the backfill fills in rows imported without categories and rebuilds rollups.
+        """
+        service = TransactionService(db_session)
+        service.import_batches(iter_normalized_batches(BytesIO(self.CSV)))
+        db_session.query(Transaction).update({"category": None, "is_business": False, "business_percentage": 0.0})
+        db_session.commit()
+        progress = []
+        
+        updated = service.backfill_categories(batch_size=2, on_progress=lambda rows, seconds: progress.append(rows))
+        
+        assert updated == 3
+        assert progress == [2, 3]
+        categories = {t.category for t in db_session.query(Transaction)}
+        assert categories == {"Transportation", "Software & Subscriptions", "Business Income"}
+        rollup_categories = {r.category for r in db_session.query(TransactionRollup)}
+        assert rollup_categories == categories
@@ -0,0 +1,111 @@
+"""
+Tests for settings and database engine configuration.
+
+This file tests:
+- Environment-driven settings
+- Engine pool/echo options per database backend
+- Connection pool statistics
+"""
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.core.config import Settings
+from app.core.database import engine_options
+from app.core.pool import InstrumentedQueuePool, pool_stats
+
+
+class TestSettings:
+    """Test suite for environment-driven settings."""
+    
+    def test_defaults_disable_echo(self, monkeypatch):
+        """
+        Test that SQL echo is off unless explicitly enabled.
+        """
+        monkeypatch.delenv("DB_ECHO", raising=False)
+        
+        assert Settings.from_env().db_echo is False
+    
+    def test_reads_pool_settings_from_env(self, monkeypatch):
+        """
+        Test that pool tunables are parsed from environment variables.
+        """
+        monkeypatch.setenv("DB_ECHO", "true")
+        monkeypatch.setenv("DB_POOL_SIZE", "20")
+        monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+        monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "off")
+        monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+        
+        config = Settings.from_env()
+        
+        assert config.db_echo is True
+        assert config.db_pool_size == 20
+        assert config.db_max_overflow == 0
+        assert config.db_pool_timeout == 2.5
+        assert config.db_pool_pre_ping is False
+        assert config.db_statement_timeout_ms == 5000
+
+
+class TestEngineOptions:
+    """Test suite for engine option building."""
+    
+    def test_postgres_gets_pool_and_statement_timeout(self):
+        """
+        Test that server databases get pool sizing and a statement timeout.
+        """
+        config = Settings(db_pool_size=7, db_max_overflow=3, db_statement_timeout_ms=1000)
+        
+        options = engine_options("postgresql://localhost/db", config)
+        async_options = engine_options("postgresql+asyncpg://localhost/db", config, is_async=True)
+        
+        assert options["pool_size"] == 7
+        assert options["max_overflow"] == 3
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["connect_args"] == {"options": "-c statement_timeout=1000"}
+        assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "1000"}}
+    
+    def test_sqlite_keeps_default_pool(self):
+        """
+        Test that SQLite is not given QueuePool sizing arguments.
+        """
+        options = engine_options("sqlite:///./dev.db", Settings(db_statement_timeout_ms=1000))
+        
+        assert "pool_size" not in options
+        assert "connect_args" not in options
+
+
+class TestPoolStats:
+    """Test suite for connection pool statistics."""
+    
+    def test_counts_waits_and_timeouts(self, tmp_path):
+        """
+        Test that checkouts from an exhausted pool are counted.
+        """
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05
+        )
+        
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+            stats = pool_stats(engine.pool)
+        engine.dispose()
+        
+        assert stats["checked_out"] == 1
+        assert stats["checkouts"] == 2
+        assert stats["waits"] == 1
+        assert stats["timeouts"] == 1
+    
+    def test_pool_endpoint(self, client):
+        """
+        Test that the internal endpoint reports the sync pool.
+        """
+        response = client.get("/internal/pool")
+        
+        assert response.status_code == 200
+        assert "pool_class" in response.json()["sync"]
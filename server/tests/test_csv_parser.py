@@ -11,9 +11,10 @@ from the HTTP layer. This is important for:
 import pytest
 import pandas as pd
 from io import BytesIO
+from datetime import datetime
 from unittest.mock import AsyncMock
 
-from app.services.csv_parser import parse_csv
+from app.services.csv_parser import parse_csv, iter_csv_batches, normalize_frame
 
 
 class TestCSVParser:
@@ -181,4 +182,117 @@ class TestCSVParser:
         
         transaction = result[0]
         assert transaction['Description'] == 'Café & Restaurant 🍕'
-        assert transaction['Amount'] == 45.99 
\ No newline at end of file
+        assert transaction['Amount'] == 45.99 
+
+
+class TestStreamingCSVParser:
+    """Test suite for the batched, streaming CSV parser."""
+    
+    def test_iter_csv_batches_splits_rows(self):
+        """
+        Test that rows are yielded in batches of at most `batch_size`.
+        """
+        data = {
+            'Date': [f'2024-01-{i:02d}' for i in range(1, 8)],
+            'Description': [f'Transaction {i}' for i in range(1, 8)],
+            'Amount': [float(i) for i in range(1, 8)],
+            'Type': ['Expense'] * 7
+        }
+        csv_content = pd.DataFrame(data).to_csv(index=False)
+        
+        batches = list(iter_csv_batches(BytesIO(csv_content.encode('utf-8')), batch_size=3))
+        
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert batches[0][0]['Description'] == 'Transaction 1'
+        assert batches[2][0]['Amount'] == 7.0
+    
+    def test_iter_csv_batches_empty_file(self):
+        """
+        Test that an empty file yields no batches.
+        """
+        assert list(iter_csv_batches(BytesIO(b""))) == []
+    
+    def test_iter_csv_batches_leaves_file_open(self):
+        """
+        Test that the caller's file object is not closed by the parser.
+        
+        The upload spool belongs to FastAPI, which closes it itself.
+        """
+        file = BytesIO(b"Date,Description,Amount,Type\n2024-01-15,Uber,25.5,Expense\n")
+        
+        list(iter_csv_batches(file))
+        
+        assert not file.closed
+    
+    def test_unfinished_reader_outlives_file(self):
+        """
+        Test that closing a reader after its file was closed raises nothing.
+        """
+        file = BytesIO(b"Date,Description,Amount,Type\n2024-01-15,Uber,25.5,Expense\n" * 5)
+        batches = iter_csv_batches(file, batch_size=2)
+        next(batches)
+        file.close()
+        
+        batches.close()
+
+
+class TestNormalizeFrame:
+    """Test suite for vectorized CSV normalization."""
+    
+    def test_normalize_valid_rows(self):
+        """
+        Test that valid rows become Transaction column values.
+        """
+        df = pd.DataFrame({
+            'Date': ['2024-01-15', '2024-01-16'],
+            'Description': ['Uber Ride', None],
+            'Amount': ['25.50', '4.75'],
+            'Type': ['expense', '']
+        })
+        
+        batch = normalize_frame(df)
+        records = batch.records()
+        
+        assert batch.rejected == []
+        assert records[0]['date'] == datetime(2024, 1, 15)
+        assert records[0]['amount_cents'] == 2550
+        assert records[0]['currency'] == 'USD'
+        assert records[0]['transaction_type'] == 'Expense'
+        # Blank optional columns fall back to their defaults
+        assert records[1]['description'] == ''
+        assert records[1]['transaction_type'] == 'Expense'
+    
+    def test_normalize_reports_rejected_rows(self):
+        """
+        Test that invalid rows are reported with 1-based row numbers.
+        """
+        df = pd.DataFrame({
+            'Date': ['2024-01-15', '15/01/2024', '2024-01-17', '2024-01-18'],
+            'Description': ['Ok', 'Bad date', 'Bad amount', 'Bad type'],
+            'Amount': [1.0, 2.0, None, 4.0],
+            'Type': ['Income', 'Income', 'Income', 'Refund']
+        })
+        
+        batch = normalize_frame(df, row_offset=10)
+        
+        assert len(batch) == 1
+        assert [r['row'] for r in batch.rejected] == [12, 13, 14]
+        assert batch.rejected[1]['reason'] == 'invalid Amount'
+        assert batch.rejected[2]['reason'] == 'invalid Type'
+    
+    def test_normalize_currency_amounts_and_codes(self):
+        """
+        Test that formatted amounts and the optional Currency column are normalized.
+        """
+        df = pd.DataFrame({
+            'Date': ['2024-01-15', '2024-01-16', '2024-01-17', '2024-01-18'],
+            'Amount': ['$1,234.56', '(45.00)', '3.10', '1.00'],
+            'Type': ['Income', 'Expense', 'Expense', 'Expense'],
+            'Currency': ['usd', ' EUR ', None, 'EURO']
+        })
+        
+        batch = normalize_frame(df)
+        
+        assert batch.columns['amount_cents'].tolist() == [123456, -4500, 310]
+        assert batch.columns['currency'].tolist() == ['USD', 'EUR', 'USD']
+        assert batch.rejected == [{'row': 4, 'reason': 'invalid Currency'}]
@@ -0,0 +1,77 @@
+"""
+Tests for upload deduplication.
+
+This file tests:
+- File hashing
+- Row fingerprints and occurrence counting across batches
+"""
+
+from io import BytesIO
+
+from app.services.csv_parser import iter_normalized_batches
+from app.services.dedup import RowFingerprinter, file_sha256
+
+
+def fingerprints(csv_content: bytes, batch_size: int = 5000, user_id=None) -> list:
+    fingerprinter = RowFingerprinter(user_id=user_id)
+    result = []
+    for batch in iter_normalized_batches(BytesIO(csv_content), batch_size=batch_size):
+        result.extend(fingerprinter.apply(batch).columns["fingerprint"].tolist())
+    return result
+
+
+class TestFileHash:
+    """Test suite for file_sha256."""
+    
+    def test_hash_rewinds_file(self):
+        """
+        Test that the file can still be parsed after hashing.
+        """
+        file = BytesIO(b"Date,Description,Amount,Type\n")
+        
+        assert len(file_sha256(file)) == 64
+        assert file.read() == b"Date,Description,Amount,Type\n"
+
+
+class TestRowFingerprinter:
+    """Test suite for RowFingerprinter."""
+    
+    def test_formatting_differences_match(self):
+        """
+        Test that case, spacing and amount formatting don't change the fingerprint.
+        """
+        first = fingerprints(b"Date,Description,Amount,Type\n2024-01-15,Coffee  Shop,4.5,expense\n")
+        second = fingerprints(b"Date,Description,Amount,Type\n2024-01-15, coffee shop ,4.50,Expense\n")
+        
+        assert first == second
+    
+    def test_repeated_rows_differ_across_batches(self):
+        """
+        Test that identical rows get distinct fingerprints, even when split across batches.
+        """
+        csv_content = b"Date,Description,Amount,Type\n" + b"2024-01-15,Coffee,4.50,Expense\n" * 3
+        
+        single = fingerprints(csv_content)
+        split = fingerprints(csv_content, batch_size=2)
+        
+        assert len(set(single)) == 3
+        assert split == single
+    
+    def test_user_changes_fingerprint(self):
+        """
+        Test that the same row belonging to another user is not a duplicate.
+        """
+        csv_content = b"Date,Description,Amount,Type\n2024-01-15,Coffee,4.50,Expense\n"
+        
+        assert fingerprints(csv_content, user_id=1) != fingerprints(csv_content, user_id=2)
+    
+    def test_currency_changes_fingerprint(self):
+        """
+        Test that the same amount in another currency is not a duplicate.
+        """
+        header = b"Date,Description,Amount,Type,Currency\n"
+        usd = fingerprints(header + b"2024-01-15,Coffee,5.00,Expense,USD\n")
+        eur = fingerprints(header + b"2024-01-15,Coffee,5.00,Expense,EUR\n")
+        
+        assert usd != eur
+        assert usd == fingerprints(b"Date,Description,Amount,Type\n2024-01-15,Coffee,5.00,Expense\n")
@@ -0,0 +1,104 @@
+"""
+Tests for background upload jobs.
+
+This file tests:
+- Queueing an upload and importing it on the worker pool
+- Progress counters and rejected rows on the job
+- The job status endpoint
+"""
+
+from io import BytesIO
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.transaction import Transaction
+from app.services.jobs import JobManager, set_job_manager
+
+
+@pytest.fixture
+def job_manager(db_session, tmp_path):
+    """Job manager that imports into the test database and spools to a temp dir."""
+    manager = JobManager(
+        max_workers=1,
+        spool_dir=str(tmp_path),
+        session_factory=sessionmaker(autoflush=False, bind=db_session.get_bind())
+    )
+    set_job_manager(manager)
+    yield manager
+    manager.shutdown()
+    set_job_manager(None)
+
+
+class TestJobManager:
+    """Test suite for JobManager."""
+    
+    def test_import_completes_and_cleans_up(self, job_manager, db_session, sample_csv_data, tmp_path):
+        """
+        Test that a queued file is imported and its spool file removed.
+        """
+        job = job_manager.submit_upload(BytesIO(sample_csv_data.encode()), "sample.csv")
+        job_manager.shutdown()
+        
+        assert job.status == "completed"
+        assert job.rows_parsed == 3
+        assert job.rows_inserted == 3
+        assert job.rows_rejected == 0
+        assert db_session.query(Transaction).count() == 3
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_rejected_rows_are_counted(self, job_manager):
+        """
+        Test that rows failing validation are reported on the job.
+        """
+        csv_data = "Date,Description,Amount,Type\n2024-01-01,Ok,10,Income\nbad,Broken,5,Expense\n"
+        job = job_manager.submit_upload(BytesIO(csv_data.encode()), "mixed.csv")
+        job_manager.shutdown()
+        
+        summary = job.to_dict()
+        assert summary["status"] == "completed"
+        assert summary["rows_parsed"] == 2
+        assert summary["rows_inserted"] == 1
+        assert summary["rows_rejected"] == 1
+        assert summary["rejected"][0]["row"] == 2
+        assert summary["rows_per_second"] is not None
+
+
+class TestJobsAPI:
+    """Test suite for background uploads over HTTP."""
+    
+    def test_background_upload_returns_job(self, client, job_manager, sample_csv_file):
+        """
+        Test that a background upload returns 202 and a pollable job.
+        """
+        files = {"file": ("transactions.csv", sample_csv_file, "text/csv")}
+        response = client.post("/api/v1/upload?background=true", files=files)
+        
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] in ("queued", "running", "completed")
+        
+        job_manager.shutdown()
+        status = client.get(data["status_url"])
+        assert status.status_code == 200
+        assert status.json()["status"] == "completed"
+        assert status.json()["rows_inserted"] == 3
+    
+    def test_unknown_job(self, client, job_manager):
+        """
+        Test that an unknown job ID returns 404.
+        """
+        response = client.get("/api/v1/jobs/does-not-exist")
+        assert response.status_code == 404
+    
+    def test_job_belongs_to_uploading_user(self, client, job_manager, db_session, sample_csv_file):
+        """
+        Test that a background upload is stored for, and only visible to, its user.
+        """
+        files = {"file": ("transactions.csv", sample_csv_file, "text/csv")}
+        data = client.post("/api/v1/upload?background=true", files=files, headers={"X-User-Id": "7"}).json()
+        job_manager.shutdown()
+        
+        assert client.get(data["status_url"], headers={"X-User-Id": "7"}).status_code == 200
+        assert client.get(data["status_url"]).status_code == 404
+        assert {t.user_id for t in db_session.query(Transaction)} == {7}
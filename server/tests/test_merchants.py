@@ -0,0 +1,138 @@
+"""
+Tests for merchant normalization and lookup.
+
+This file tests:
+- Normalizing descriptions to merchant keys
+- Resolving merchant ids, including rollback handling
+- Merchant ids on imported rows and the by-merchant endpoint
+"""
+
+from io import BytesIO
+
+import pytest
+
+from app.models.merchant import Merchant
+from app.models.transaction import Transaction
+from app.services.csv_parser import iter_normalized_batches
+from app.services.merchants import clean_merchant_name, normalize_merchant
+from app.services.transaction_service import TransactionService
+
+
+CSV = (
+    b"Date,Description,Amount,Type\n"
+    b"2024-01-15,STARBUCKS #4521,4.50,Expense\n"
+    b"2024-01-16,Starbucks Store 17 01/16,5.25,Expense\n"
+    b"2024-01-17,SQ *BLUE BOTTLE,6.00,Expense\n"
+    b"2024-01-18,Client Payment,500.00,Income\n"
+)
+
+
+class TestNormalizeMerchant:
+    """Test suite for merchant normalization."""
+    
+    @pytest.mark.parametrize("description,key", [
+        ("STARBUCKS #4521", "starbucks"),
+        ("Starbucks Store 17 01/16", "starbucks"),
+        ("SQ *BLUE BOTTLE #12 01/15", "blue bottle"),
+        ("POS DEBIT SHELL OIL 57444 CARD 1234", "shell oil"),
+        ("Whole Foods Market XXXX1234", "whole foods market"),
+        ("TST* JOE'S PIZZA JAN 15", "joe s pizza"),
+        ("7-Eleven", "7 eleven"),
+        ("12345", None),
+    ])
+    def test_noise_is_dropped(self, description, key):
+        """
+        Test that card suffixes, store numbers, dates and processor prefixes are dropped.
+        """
+        assert normalize_merchant(description) == key
+    
+    def test_display_name_keeps_case(self):
+        """
+        Test that the display name is the cleaned original text.
+        """
+        assert clean_merchant_name("PAYPAL *SPOTIFY 2024-01-15") == "SPOTIFY"
+
+
+class TestMerchantDirectory:
+    """Test suite for MerchantDirectory."""
+    
+    def test_resolve_interns_merchants(self, db_session, merchant_directory):
+        """
+        Test that descriptions of one merchant share an id and merchants are created once.
+        """
+        ids = merchant_directory.resolve(db_session, ["Starbucks #1", "STARBUCKS #2", "Uber", "12345"])
+        again = merchant_directory.resolve(db_session, ["Starbucks #3"])
+        
+        assert ids[0] == ids[1] == again[0]
+        assert ids[2] != ids[0]
+        assert ids[3] is None
+        assert db_session.query(Merchant).count() == 2
+    
+    def test_ids_are_cached_after_commit(self, db_session, merchant_directory):
+        """
+        Test that only committed merchants enter the shared cache.
+        """
+        merchant_directory.resolve(db_session, ["Uber"])
+        db_session.rollback()
+        assert merchant_directory.stats()["merchants"] == 0
+        
+        merchant_directory.resolve(db_session, ["Uber"])
+        db_session.commit()
+        assert merchant_directory.stats()["merchants"] == 1
+        assert db_session.query(Merchant).count() == 1
+
+
+class TestMerchantPipeline:
+    """Test suite for merchant ids on import, backfill and the API."""
+    
+    def test_import_sets_merchant_ids(self, db_session):
+        """
+        Test that imported rows point at their merchant.
+        """
+        TransactionService(db_session).import_batches(iter_normalized_batches(BytesIO(CSV)))
+        
+        names = {
+            t.description: db_session.get(Merchant, t.merchant_id).name
+            for t in db_session.query(Transaction)
+        }
+        assert names == {
+            "STARBUCKS #4521": "starbucks",
+            "Starbucks Store 17 01/16": "starbucks",
+            "SQ *BLUE BOTTLE": "blue bottle",
+            "Client Payment": "client payment",
+        }
+    
+    def test_backfill_links_stored_rows(self, db_session):
+        """
+        Test that the backfill links rows stored without a merchant.
+        """
+        service = TransactionService(db_session)
+        service.import_batches(iter_normalized_batches(BytesIO(CSV)))
+        db_session.query(Transaction).update({"merchant_id": None})
+        db_session.commit()
+        
+        assert service.backfill_merchants(batch_size=3) == 4
+        assert db_session.query(Transaction).filter(Transaction.merchant_id.is_(None)).count() == 0
+    
+    def test_by_merchant_endpoint(self, client):
+        """
+        Test that the endpoint groups on the merchant, most frequent first.
+        """
+        response = client.post("/api/v1/upload", files={"file": ("ledger.csv", BytesIO(CSV), "text/csv")})
+        assert response.status_code == 200
+        
+        response = client.get("/api/v1/transactions/by-merchant?transaction_type=Expense")
+        
+        assert response.status_code == 200
+        merchants = response.json()["merchants"]
+        assert [(m["merchant"], m["transaction_count"]) for m in merchants] == [("STARBUCKS", 2), ("BLUE BOTTLE", 1)]
+        assert merchants[0]["total_expenses"] == pytest.approx(9.75)
+        assert merchants[0]["first_date"].startswith("2024-01-15")
+    
+    def test_by_merchant_limit(self, client):
+        """
+        Test that limit is validated.
+        """
+        response = client.get("/api/v1/transactions/by-merchant?limit=0")
+        
+        assert response.status_code == 422
@@ -0,0 +1,73 @@
+"""
+Tests for request and database instrumentation.
+
+This file tests:
+- Prometheus rendering of histograms
+- The /metrics endpoint
+- Query counting and the X-Debug-Timing header
+"""
+
+from app.core.metrics import Histogram
+
+
+def debug_timing(response) -> dict:
+    """Parse an X-Debug-Timing header into a dict of strings."""
+    return dict(part.split("=") for part in response.headers["x-debug-timing"].split(", "))
+
+
+class TestHistogram:
+    """Test suite for the in-process histogram."""
+    
+    def test_render_is_cumulative(self):
+        """
+        Test that buckets are cumulative and count/sum are reported.
+        """
+        histogram = Histogram("test_seconds", "Test", ("route",), (0.1, 1.0))
+        histogram.observe(0.0625, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5.0, "/a")
+        
+        lines = list(histogram.render())
+        
+        assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'test_seconds_bucket{route="/a",le="1.0"} 2' in lines
+        assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'test_seconds_count{route="/a"} 3' in lines
+        assert 'test_seconds_sum{route="/a"} 5.5625' in lines
+
+
+class TestMetricsEndpoint:
+    """Test suite for /metrics and the timing header."""
+    
+    def test_requests_are_recorded_by_route_template(self, client):
+        """
+        Test that latency is labelled with the route template, not the raw path.
+        """
+        client.get("/api/v1/transactions/12345")
+        
+        body = client.get("/metrics").text
+        
+        assert 'route="/api/v1/transactions/{transaction_id}"' in body
+        assert "/api/v1/transactions/12345" not in body
+        assert "# TYPE http_request_db_queries histogram" in body
+    
+    def test_debug_timing_header_on_upload(self, client, sample_csv_file):
+        """
+        Test that uploads report per-stage timing and query counts on request.
+        """
+        files = {"file": ("transactions.csv", sample_csv_file, "text/csv")}
+        
+        response = client.post("/api/v1/upload", files=files, headers={"X-Debug-Timing": "1"})
+        
+        assert response.status_code == 200
+        timing = debug_timing(response)
+        assert {"total", "db", "queries", "parse", "validate", "insert", "serialize"} <= set(timing)
+        assert int(timing["queries"]) > 0
+    
+    def test_no_debug_timing_header_by_default(self, client):
+        """
+        Test that the timing header is only sent when asked for.
+        """
+        response = client.get("/api/v1/transactions")
+        
+        assert "x-debug-timing" not in response.headers
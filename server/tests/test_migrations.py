@@ -0,0 +1,197 @@
+"""
+Tests for schema migrations.
+
+This file tests, against throwaway SQLite files:
+- Upgrading an empty database through every revision to the models' schema
+- Downgrading back to an empty database
+- Creating, adopting and upgrading databases with `migrate`
+- The index check
+"""
+
+import warnings
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.check_indexes import check_indexes
+from app.core.database import Base
+from app.core.migrations import alembic_config, current_revision, head_revision, include_object, migrate
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def run(engine, fn, revision):
+    with engine.connect() as connection:
+        fn(alembic_config(connection), revision)
+        connection.commit()
+
+
+def schema_differences(engine) -> list:
+    with engine.connect() as connection, warnings.catch_warnings():
+        # SQLite can't reflect the expression index on the rollup key, so
+        # autogenerate skips it; check_indexes covers it instead
+        warnings.filterwarnings("ignore", message=".*expression-based index")
+        context = MigrationContext.configure(connection, opts={"include_object": include_object})
+        return compare_metadata(context, Base.metadata)
+
+
+class TestRevisions:
+    """Test suite for the Alembic revisions."""
+    
+    def test_upgrade_matches_models(self, engine):
+        """
+        Test that replaying every revision produces the schema the models declare.
+        """
+        run(engine, command.upgrade, "head")
+        
+        assert schema_differences(engine) == []
+        with engine.connect() as connection:
+            report = check_indexes(connection)
+        assert report.ok
+        assert report.unexpected == []
+        assert report.revision == report.head == head_revision()
+    
+    def test_amounts_are_converted_to_cents(self, engine):
+        """
+        Test that stored float amounts become cents and rollups are rebuilt.
+        """
+        run(engine, command.upgrade, "0006")
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO transactions (date, description, amount, transaction_type, is_business, business_percentage) "
+                "VALUES ('2024-01-15 00:00:00', 'Client A', 1234.56, 'Income', 0, 0.0), "
+                "('2024-01-20 00:00:00', 'Coffee', 4.1, 'Expense', 1, 0.5)"
+            ))
+        
+        run(engine, command.upgrade, "head")
+        
+        with engine.connect() as connection:
+            amounts = connection.execute(text("SELECT amount_cents, currency FROM transactions ORDER BY id")).all()
+            rollups = connection.execute(text(
+                "SELECT transaction_type, currency, total_cents, business_cents FROM transaction_rollups "
+                "ORDER BY transaction_type"
+            )).all()
+            triggers = connection.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")).scalar()
+        assert amounts == [(123456, 'USD'), (410, 'USD')]
+        assert rollups == [('Expense', 'USD', 410, 205), ('Income', 'USD', 123456, 0)]
+        # Dropping the float column copies the table; the search triggers are restored
+        assert triggers == 3
+    
+    def test_amounts_are_converted_in_batches(self, engine):
+        """
+        Test that the cents backfill converts every row when it takes several batches.
+        """
+        batch_size = ScriptDirectory.from_config(alembic_config()).get_revision("0007").module.BACKFILL_BATCH_SIZE
+        run(engine, command.upgrade, "0006")
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "INSERT INTO transactions (id, date, description, amount, transaction_type, is_business, business_percentage) "
+                    "VALUES (:id, '2024-01-15 00:00:00', 'Coffee', :amount, 'Expense', 0, 0.0)"
+                ),
+                # Gaps in the ids must not end a batch early
+                [{"id": 3 * i + 1, "amount": (i % 100) / 100} for i in range(2 * batch_size + 1)],
+            )
+        
+        run(engine, command.upgrade, "0007")
+        
+        with engine.connect() as connection:
+            converted = connection.execute(text(
+                "SELECT count(*), sum(amount_cents) FROM transactions WHERE amount_cents IS NOT NULL"
+            )).one()
+        assert converted == (2 * batch_size + 1, sum(i % 100 for i in range(2 * batch_size + 1)))
+    
+    def test_duplicate_rollup_keys_are_merged(self, engine):
+        """
+        Test that rollup rows sharing a key are merged before the key becomes unique.
+        """
+        run(engine, command.upgrade, "0007")
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO transaction_rollups (user_id, month, currency, transaction_type, category, "
+                "is_business, total_cents, business_cents, transaction_count) "
+                "VALUES (NULL, '2024-01-01', 'USD', 'Expense', NULL, 0, 1000, 0, 1), "
+                "(NULL, '2024-01-01', 'USD', 'Expense', NULL, 0, 2000, 500, 2), "
+                "(7, '2024-01-01', 'USD', 'Expense', NULL, 0, 50, 0, 1)"
+            ))
+        
+        run(engine, command.upgrade, "head")
+        
+        with engine.connect() as connection:
+            rows = connection.execute(text(
+                "SELECT user_id, total_cents, business_cents, transaction_count FROM transaction_rollups ORDER BY id"
+            )).all()
+        assert rows == [(None, 3000, 500, 3), (7, 50, 0, 1)]
+    
+    def test_downgrade_to_base(self, engine):
+        """
+        Test that every revision can be reverted.
+        """
+        run(engine, command.upgrade, "head")
+        run(engine, command.downgrade, "base")
+        
+        assert inspect(engine).get_table_names() == ["alembic_version"]
+
+
+class TestMigrate:
+    """Test suite for migrate."""
+    
+    def test_empty_database_is_created_at_head(self, engine):
+        """
+        Test that a new database is created from the models and stamped.
+        """
+        assert migrate(engine) == "created"
+        
+        with engine.connect() as connection:
+            assert current_revision(connection) == head_revision()
+        assert schema_differences(engine) == []
+    
+    def test_database_without_revision_is_adopted(self, engine):
+        """
+        Test that a database created with create_all before migrations is adopted.
+        """
+        run(engine, command.upgrade, "0003")
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE alembic_version"))
+        
+        assert migrate(engine) == "adopted"
+        
+        assert schema_differences(engine) == []
+        with engine.connect() as connection:
+            assert current_revision(connection) == head_revision()
+    
+    def test_migrated_database_is_upgraded(self, engine):
+        """
+        Test that a database at an older revision is upgraded to head.
+        """
+        run(engine, command.upgrade, "0005")
+        
+        assert migrate(engine) == "upgraded"
+        assert schema_differences(engine) == []
+
+
+class TestCheckIndexes:
+    """Test suite for check_indexes."""
+    
+    def test_reports_missing_and_unexpected_indexes(self, engine):
+        """
+        Test that dropped and unknown indexes are reported.
+        """
+        migrate(engine)
+        with engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_transactions_user_date_id"))
+            connection.execute(text("CREATE INDEX ix_transactions_amount ON transactions (amount_cents)"))
+            report = check_indexes(connection)
+        
+        assert not report.ok
+        assert report.missing == [("transactions", "ix_transactions_user_date_id")]
+        assert report.unexpected == [("transactions", "ix_transactions_amount")]
@@ -0,0 +1,96 @@
+"""
+Unit tests for money amounts.
+
+This file tests parsing amounts into integer cents, the rounding of
+business shares, currency code validation and refusing mixed-currency
+totals.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.money import (
+    MAX_ABS_CENTS, business_cents, normalize_currency, parse_cents, single_currency, to_cents
+)
+
+
+class TestParseCents:
+    """Test suite for parse_cents and to_cents."""
+    
+    def test_numbers_and_numeric_strings(self):
+        """
+        Test the fast path for numbers and plain numeric strings.
+        """
+        cents = parse_cents(pd.Series([25.5, 0.1, -4.75, 1234.56]))
+        
+        assert cents.tolist() == [2550, 10, -475, 123456]
+        assert parse_cents(pd.Series(['25.50', '-0.07'])).tolist() == [2550, -7]
+    
+    def test_currency_strings(self):
+        """
+        Test that symbols, separators and parenthesized negatives are understood.
+        """
+        cents = parse_cents(pd.Series(['$1,234.56', '(45.00)', '-$3.10', ' € 12 ', '($1,000)', 7.5], dtype=object))
+        
+        assert cents.tolist() == [123456, -4500, -310, 1200, -100000, 750]
+    
+    def test_invalid_amounts_are_nan(self):
+        """
+        Test that missing, unparseable and out-of-range amounts become NaN.
+        """
+        cents = parse_cents(pd.Series(
+            [None, 'abc', '', '1e300', str(MAX_ABS_CENTS), '1.234,56', '12,50', '1,23'], dtype=object
+        ))
+        
+        assert np.isnan(cents).all()
+    
+    def test_to_cents(self):
+        """
+        Test single values, and that invalid ones raise.
+        """
+        assert to_cents('$19.99') == 1999
+        assert to_cents(0) == 0
+        with pytest.raises(ValueError):
+            to_cents('twelve')
+
+
+class TestBusinessCents:
+    """Test suite for business_cents."""
+    
+    @pytest.mark.parametrize("cents, percentage, expected", [
+        (1000, 0.5, 500),
+        (1001, 0.5, 501),
+        (-1001, 0.5, -501),
+        (999, 1 / 3, 333),
+        (1000, None, 0),
+    ])
+    def test_rounds_half_away_from_zero(self, cents, percentage, expected):
+        """
+        Test the per-transaction rounding shared with the SQL rebuild.
+        """
+        assert business_cents(cents, percentage) == expected
+
+
+class TestNormalizeCurrency:
+    """Test suite for normalize_currency."""
+    
+    def test_normalizes_case_and_spacing(self):
+        assert normalize_currency(' eur ') == 'EUR'
+    
+    @pytest.mark.parametrize("code", ['EURO', 'E1R', '', '€'])
+    def test_rejects_invalid_codes(self, code):
+        with pytest.raises(ValueError):
+            normalize_currency(code)
+
+
+class TestSingleCurrency:
+    """Test suite for single_currency."""
+    
+    def test_shared_currency(self):
+        assert single_currency(['EUR', 'EUR']) == 'EUR'
+        assert single_currency([]) is None
+    
+    def test_rejects_mixed_currencies(self):
+        with pytest.raises(ValueError, match="EUR, USD"):
+            single_currency(['USD', 'EUR', 'USD'])
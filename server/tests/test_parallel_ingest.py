@@ -0,0 +1,169 @@
+"""
+Tests for parallel parsing of large uploads.
+
+This file tests:
+- Splitting files into line-aligned byte ranges, outside quoted fields
+- Parallel batches matching the serial reader, rejected row numbers included
+- Serial parsing of the rest of a file after a range ends inside a quoted field
+- Parsing on a real process pool
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+
+from app.services.parallel_ingest import create_ingest_pool, iter_parallel_batches, split_ranges
+from app.services.statement_readers import iter_statement_batches
+
+
+def statement(rows: int, multiline: bool = False, ambiguous: bool = False) -> bytes:
+    lines = [
+        "Account summary,,,",
+        "Date,Description,Amount,Running Bal.",
+    ]
+    for i in range(rows):
+        # Every seventh row has a bad date
+        day = "13/45/2024" if i % 7 == 3 else f"01/{i % 28 + 1:02d}/2024"
+        description = f"Shop {i}"
+        if multiline and i % 3 == 0:
+            description = f'"Shop {i}\n""Aisle"" {i % 9}\n"'
+        if ambiguous:
+            # Every quote sits next to a newline, delimiter or quote
+            description = '"\n"",""\n"'
+        lines.append(f"{day},{description},-{i % 90 + 1}.25,{1000 - i}.00")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def collect(batches) -> tuple:
+    rows, rejected = [], []
+    for batch in batches:
+        rows.extend(batch.records())
+        rejected.extend(batch.rejected)
+    return rows, rejected
+
+
+@pytest.fixture
+def spooled(tmp_path):
+    path = tmp_path / "statement.csv"
+    path.write_bytes(statement(500))
+    return str(path)
+
+
+class TestSplitRanges:
+    """Test suite for split_ranges."""
+    
+    def test_ranges_end_on_line_boundaries(self):
+        """
+        Test that ranges cover the file after `start` and end after a newline.
+        """
+        content = statement(100)
+        start = content.index(b"\n", content.index(b"Date")) + 1
+        
+        ranges = split_ranges(BytesIO(content), start, 300)
+        
+        assert ranges[0][0] == start
+        assert ranges[-1][1] == len(content)
+        assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+        assert all(content[end - 1:end] == b"\n" for _, end in ranges)
+    
+    def test_quoted_newlines_stay_in_one_range(self):
+        """
+        Test that no range ends inside a quoted field spanning lines.
+        """
+        content = statement(100, multiline=True)
+        start = content.index(b"\n", content.index(b"Date")) + 1
+        
+        ranges = split_ranges(BytesIO(content), start, 300)
+        
+        assert len(ranges) > 5
+        assert ranges[-1][1] == len(content)
+        assert all(content[s:e].count(b'"') % 2 == 0 for s, e in ranges)
+
+
+class TestParallelBatches:
+    """Test suite for iter_parallel_batches."""
+    
+    def test_matches_serial_reader(self, spooled):
+        """
+        Test that ranges parsed on a pool give the serial rows and row numbers.
+        """
+        with open(spooled, "rb") as f:
+            expected = collect(iter_statement_batches(f, "statement.csv", batch_size=64))
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            actual = collect(iter_parallel_batches(
+                spooled, executor, 2, "statement.csv", batch_size=64, range_bytes=1024
+            ))
+        
+        assert actual == expected
+        assert len(actual[0]) == 429
+        assert actual[1][0] == {"row": 4, "reason": "invalid Date (expected %m/%d/%Y)"}
+    
+    def test_quoted_newlines_match_serial_reader(self, tmp_path):
+        """
+        Test that fields spanning lines are parsed whole at every range boundary.
+        """
+        path = tmp_path / "statement.csv"
+        path.write_bytes(statement(300, multiline=True))
+        with open(path, "rb") as f:
+            expected = collect(iter_statement_batches(f, "statement.csv"))
+        
+        for range_bytes in range(256, 320, 7):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                actual = collect(iter_parallel_batches(
+                    str(path), executor, 2, "statement.csv", range_bytes=range_bytes
+                ))
+            assert actual == expected
+        assert expected[0][0]["description"] == 'Shop 0\n"Aisle" 0'
+    
+    def test_wrong_boundary_guess_falls_back_to_serial(self, tmp_path):
+        """
+        Test that a range ending inside a quoted field hands the rest of the file to the serial reader.
+        """
+        content = statement(200, ambiguous=True)
+        path = tmp_path / "statement.csv"
+        path.write_bytes(content)
+        with open(path, "rb") as f:
+            expected = collect(iter_statement_batches(f, "statement.csv", batch_size=16))
+        start = content.index(b"\n", content.index(b"Date")) + 1
+        wrong_guesses = 0
+        
+        for range_bytes in range(256, 320, 7):
+            ranges = split_ranges(BytesIO(content), start, range_bytes)
+            wrong_guesses += sum(content[s:e].count(b'"') % 2 for s, e in ranges)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                actual = collect(iter_parallel_batches(
+                    str(path), executor, 2, "statement.csv", batch_size=16, range_bytes=range_bytes
+                ))
+            assert actual == expected
+        assert wrong_guesses > 0
+        assert expected[0][0]["description"] == '","'
+    
+    def test_small_file_is_parsed_serially(self, spooled):
+        """
+        Test that a file of one range never reaches the executor.
+        """
+        class NoExecutor:
+            def submit(self, *args, **kwargs):
+                raise AssertionError("file should not be split")
+        
+        rows, _ = collect(iter_parallel_batches(spooled, NoExecutor(), 2, "statement.csv"))
+        
+        assert len(rows) == 429
+    
+    def test_process_pool(self, spooled):
+        """
+        Test that profiles, ranges and batches survive the trip to worker processes.
+        """
+        executor = create_ingest_pool(2)
+        try:
+            rows, rejected = collect(iter_parallel_batches(
+                spooled, executor, 2, "statement.csv", range_bytes=4096
+            ))
+        finally:
+            executor.shutdown()
+        
+        assert len(rows) == 429
+        assert len(rejected) == 71
+        assert rows[-1]["description"] == "Shop 499"
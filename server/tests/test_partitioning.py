@@ -0,0 +1,67 @@
+"""
+Tests for the PostgreSQL partitioning DDL.
+
+This file tests the generated statements only; applying them needs a
+PostgreSQL server.
+"""
+
+from datetime import date
+
+import pytest
+
+from app.core.partitioning import month_partition_ddl, partitioned_table_ddl
+
+
+class TestPartitionedTableDDL:
+    """Test suite for partitioned_table_ddl."""
+    
+    def test_hash_partitions_by_user(self):
+        """
+        Test that user partitioning keys the table, primary key and fingerprint index on user_id.
+        """
+        ddl = partitioned_table_ddl("user", partitions=4)
+        
+        assert ddl[0].endswith("PARTITION BY HASH (user_id)")
+        assert "user_id INTEGER NOT NULL" in ddl[0]
+        assert "PRIMARY KEY (id, user_id)" in ddl[0]
+        assert sum("FOR VALUES WITH (MODULUS 4" in s for s in ddl) == 4
+        assert ddl[-1] == "CREATE UNIQUE INDEX uq_transactions_fingerprint ON transactions (fingerprint, user_id)"
+        assert any("ix_transactions_user_date_id ON transactions (user_id, date, id)" in s for s in ddl)
+    
+    def test_range_partitions_by_month(self):
+        """
+        Test that month partitioning adds one partition per month and a default partition.
+        """
+        ddl = partitioned_table_ddl("month", start_month=date(2024, 11, 1), end_month=date(2025, 1, 1))
+        
+        assert ddl[0].endswith("PARTITION BY RANGE (date)")
+        assert "PRIMARY KEY (id, date)" in ddl[0]
+        assert "user_id INTEGER," in ddl[0]
+        assert any("transactions_default PARTITION OF transactions DEFAULT" in s for s in ddl)
+        assert ddl[-1].endswith("(fingerprint, date)")
+    
+    def test_invalid_options(self):
+        """
+        Test that unknown schemes and missing month bounds are rejected.
+        """
+        with pytest.raises(ValueError):
+            partitioned_table_ddl("category")
+        with pytest.raises(ValueError):
+            partitioned_table_ddl("month")
+
+
+class TestMonthPartitionDDL:
+    """Test suite for month_partition_ddl."""
+    
+    def test_months_cross_the_year_boundary(self):
+        """
+        Test that each month covers [first day, first day of the next month).
+        """
+        ddl = month_partition_ddl(date(2024, 12, 15), date(2025, 1, 1))
+        
+        assert ddl == [
+            "CREATE TABLE IF NOT EXISTS transactions_y2024m12 PARTITION OF transactions "
+            "FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')",
+            "CREATE TABLE IF NOT EXISTS transactions_y2025m01 PARTITION OF transactions "
+            "FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')",
+        ]
@@ -0,0 +1,138 @@
+"""
+Unit tests for the rollup service.
+
+This file tests that incrementally maintained rollups always agree with
+a rebuild from the transactions table.
+"""
+
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.rollup import TransactionRollup
+from app.models.transaction import Transaction
+from app.services.rollup_service import RollupService
+from app.services.transaction_service import TransactionService
+
+
+ROWS = [
+    {'Date': '2024-01-15', 'Description': 'Uber Ride', 'Amount': 25.50, 'Type': 'Expense'},
+    {'Date': '2024-01-20', 'Description': 'Starbucks', 'Amount': 4.50, 'Type': 'Expense'},
+    {'Date': '2024-02-17', 'Description': 'Client A', 'Amount': 500.0, 'Type': 'Income'},
+    {'Date': '2024-04-01', 'Description': 'Client B', 'Amount': 250.0, 'Type': 'Income'},
+]
+
+
+def snapshot(db_session):
+    """Rollup contents as comparable tuples."""
+    return sorted(
+        (r.month, r.transaction_type, r.category, r.is_business, r.total_cents, r.business_cents, r.transaction_count)
+        for r in db_session.query(TransactionRollup)
+    )
+
+
+class TestRollupService:
+    """Test suite for rollup maintenance and queries."""
+    
+    def test_incremental_matches_rebuild(self, db_session):
+        """
+        Test that upload-time updates equal a full rebuild.
+        """
+        service = TransactionService(db_session)
+        service.bulk_create_transactions(ROWS[:2])
+        service.bulk_create_transactions(ROWS[2:])
+        incremental = snapshot(db_session)
+        
+        RollupService(db_session).rebuild()
+        db_session.commit()
+        
+        assert incremental == snapshot(db_session)
+        # Uber and Starbucks are categorized differently, so January has two rows
+        assert len(incremental) == 4
+    
+    def test_delete_updates_rollup(self, db_session):
+        """
+        Test that deleting a transaction subtracts it and drops empty rows.
+        """
+        service = TransactionService(db_session)
+        created = service.bulk_create_transactions(ROWS)
+        
+        service.delete_transaction(created[0].id)
+        service.delete_transaction(created[3].id)
+        
+        rows = RollupService(db_session).get_rollup()
+        assert [r["period"] for r in rows] == ['2024-01', '2024-02']
+        assert rows[0]["total_expenses"] == 4.50
+        assert rows[0]["expense_count"] == 1
+    
+    def test_quarter_granularity(self, db_session):
+        """
+        Test that months are folded into quarters.
+        """
+        TransactionService(db_session).bulk_create_transactions(ROWS)
+        
+        rows = RollupService(db_session).get_rollup(granularity='quarter')
+        
+        assert [r["period"] for r in rows] == ['2024-Q1', '2024-Q2']
+        assert rows[0]["total_income"] == 500.0
+        assert rows[0]["total_expenses"] == 30.0
+        assert rows[0]["net_amount"] == 470.0
+        assert rows[1]["income_count"] == 1
+    
+    def test_currencies_are_not_added_together(self, db_session):
+        """
+        Test that periods spanning several currencies require a currency filter.
+        """
+        TransactionService(db_session).bulk_create_transactions(ROWS + [
+            {'Date': '2024-01-21', 'Description': 'Hotel', 'Amount': 120.0, 'Type': 'Expense', 'Currency': 'EUR'},
+        ])
+        service = RollupService(db_session)
+        
+        with pytest.raises(ValueError, match="EUR, USD"):
+            service.get_rollup()
+        assert service.get_rollup(currency='EUR')[0]["total_expenses"] == 120.0
+        assert service.get_rollup(currency='USD')[0]["total_expenses"] == 30.0
+    
+    def test_writers_share_the_row_of_a_key(self, db_session):
+        """
+        Test that a delta is added to a key's row inserted by another writer.
+        
+        Rows without a user or category must conflict too, or two first
+        writers racing on a key would each insert a row for it.
+        """
+        db_session.add(TransactionRollup(
+            user_id=None, month=date(2024, 1, 1), currency='USD', transaction_type='Expense',
+            category=None, is_business=False, total_cents=1000, business_cents=0, transaction_count=1
+        ))
+        db_session.flush()
+        expense = Transaction(
+            user_id=None, date=datetime(2024, 1, 9), currency='USD', transaction_type='Expense',
+            category=None, is_business=False, amount_cents=1000, business_percentage=0.0
+        )
+        
+        RollupService(db_session).apply([expense])
+        RollupService(db_session).apply([expense])
+        
+        rows = db_session.query(TransactionRollup).all()
+        assert [(r.total_cents, r.transaction_count) for r in rows] == [(3000, 3)]
+    
+    def test_duplicate_key_is_rejected(self, db_session):
+        """
+        Test that the unique key treats missing users and categories as equal.
+        """
+        for _ in range(2):
+            db_session.add(TransactionRollup(
+                user_id=None, month=date(2024, 1, 1), currency='USD', transaction_type='Expense',
+                category=None, is_business=False, total_cents=1000, business_cents=0, transaction_count=1
+            ))
+        
+        with pytest.raises(IntegrityError):
+            db_session.flush()
+    
+    def test_rejects_unknown_granularity(self, db_session):
+        """
+        Test that unsupported granularities are rejected.
+        """
+        with pytest.raises(ValueError):
+            RollupService(db_session).get_rollup(granularity='week')
@@ -0,0 +1,190 @@
+"""
+Tests for transaction search.
+
+This file tests:
+- Query parsing
+- FTS5-backed search on SQLite: prefix matching, ranking, filters,
+  pagination past the ranked window and index maintenance
+- The LIKE fallback and the search endpoint
+"""
+
+from io import BytesIO
+
+import pytest
+from app.core.search_index import create_search_index, drop_search_index
+from app.models.transaction import Transaction
+from app.services.csv_parser import iter_normalized_batches
+from app.services.transaction_service import TransactionService, search_terms
+
+
+CSV = (
+    b"Date,Description,Amount,Type\n"
+    b"2024-01-15,AMAZON MKTP US*2K3AB1C,25.50,Expense\n"
+    b"2024-02-16,Amazon Prime,14.99,Expense\n"
+    b"2024-03-17,Amazon Prime Video Channels and Add-ons,5.99,Expense\n"
+    b"2024-03-18,Starbucks Coffee,4.50,Expense\n"
+    b"2024-03-19,Amazon Refund,30.00,Income\n"
+)
+
+
+@pytest.fixture
+def service(db_session):
+    service = TransactionService(db_session)
+    service.import_batches(iter_normalized_batches(BytesIO(CSV)))
+    return service
+
+
+def descriptions(rows):
+    return [row["description"] for row in rows]
+
+
+class TestSearchTerms:
+    """Test suite for query parsing."""
+    
+    def test_punctuation_is_dropped(self):
+        """
+        Test that only words survive, lower-cased.
+        """
+        assert search_terms('Amazon "Prime"*') == ["amazon", "prime"]
+    
+    def test_query_without_words_is_rejected(self):
+        """
+        Test that a query of punctuation only is an error.
+        """
+        with pytest.raises(ValueError):
+            search_terms('"*"')
+
+
+class TestSearchTransactions:
+    """Test suite for TransactionService.search_transactions."""
+    
+    def test_prefix_match_and_ranking(self, service):
+        """
+        Test that words match by prefix and tighter matches rank first.
+        """
+        rows, next_cursor, backend = service.search_transactions("amaz prim")
+        
+        assert backend == "fts5"
+        assert descriptions(rows) == ["Amazon Prime", "Amazon Prime Video Channels and Add-ons"]
+        assert rows[0]["score"] > rows[1]["score"]
+        assert next_cursor is None
+    
+    def test_filters(self, service):
+        """
+        Test that list filters narrow the matches.
+        """
+        rows, _, _ = service.search_transactions("amazon", transaction_type="Income")
+        
+        assert descriptions(rows) == ["Amazon Refund"]
+    
+    def test_pagination(self, service):
+        """
+        Test that pages cover every match once.
+        """
+        first, cursor, _ = service.search_transactions("amazon", limit=3)
+        second, last_cursor, _ = service.search_transactions("amazon", limit=3, cursor=cursor)
+        
+        assert len(first) == 3
+        assert len(second) == 1
+        assert last_cursor is None
+        assert len(set(descriptions(first + second))) == 4
+    
+    @pytest.mark.parametrize("limit", [1, 2, 3, 5])
+    def test_pagination_past_rank_window(self, service, monkeypatch, limit):
+        """
+        Test that matches older than the ranked window are reached by paging, newest first.
+        """
+        monkeypatch.setattr("app.services.transaction_service.SEARCH_RANK_WINDOW", 2)
+        pages, cursor = [], None
+        while True:
+            rows, cursor, _ = service.search_transactions("amazon", limit=limit, cursor=cursor)
+            pages.extend(rows)
+            if cursor is None:
+                break
+        
+        assert len(pages) == 4
+        assert set(descriptions(pages[:2])) == {"Amazon Prime Video Channels and Add-ons", "Amazon Refund"}
+        assert descriptions(pages[2:]) == ["Amazon Prime", "AMAZON MKTP US*2K3AB1C"]
+    
+    def test_index_is_checked_once(self, service, monkeypatch):
+        """
+        Test that searches don't query the catalog for the index every time.
+        """
+        service.search_transactions("amazon")
+        monkeypatch.setattr("app.core.search_index.fts_available", lambda connection: pytest.fail("checked again"))
+        
+        rows, _, backend = service.search_transactions("starbucks")
+        
+        assert backend == "fts5"
+        assert descriptions(rows) == ["Starbucks Coffee"]
+    
+    def test_invalid_cursor(self, service):
+        """
+        Test that a cursor from the list endpoint is rejected.
+        """
+        with pytest.raises(ValueError):
+            service.search_transactions("amazon", cursor="garbage")
+    
+    def test_index_follows_updates_and_deletes(self, service, db_session):
+        """
+        Test that the triggers keep the FTS table in sync.
+        """
+        starbucks = db_session.query(Transaction).filter_by(description="Starbucks Coffee").one()
+        starbucks.description = "Blue Bottle Coffee"
+        db_session.commit()
+        service.delete_transaction(db_session.query(Transaction).filter_by(description="Amazon Prime").one().id)
+        
+        assert service.search_transactions("starbucks")[0] == []
+        assert descriptions(service.search_transactions("bottle")[0]) == ["Blue Bottle Coffee"]
+        assert "Amazon Prime" not in descriptions(service.search_transactions("amazon")[0])
+    
+    def test_like_fallback(self, service, db_session):
+        """
+        Test that search still works without the FTS table, newest first.
+        """
+        drop_search_index(db_session.connection())
+        db_session.commit()
+        
+        rows, _, backend = service.search_transactions("prime")
+        
+        assert backend == "like"
+        assert descriptions(rows) == ["Amazon Prime Video Channels and Add-ons", "Amazon Prime"]
+    
+    def test_existing_rows_are_indexed(self, db_session):
+        """
+        Test that creating the index on a populated database indexes stored rows.
+        """
+        drop_search_index(db_session.connection())
+        TransactionService(db_session).import_batches(iter_normalized_batches(BytesIO(CSV)))
+        create_search_index(db_session.connection())
+        db_session.commit()
+        
+        rows, _, backend = TransactionService(db_session).search_transactions("starbucks")
+        assert backend == "fts5"
+        assert descriptions(rows) == ["Starbucks Coffee"]
+
+
+class TestSearchAPI:
+    """Test suite for GET /transactions/search."""
+    
+    def test_search(self, client):
+        """
+        Test that the endpoint returns ranked matches.
+        """
+        client.post("/api/v1/upload", files={"file": ("ledger.csv", BytesIO(CSV), "text/csv")})
+        
+        response = client.get("/api/v1/transactions/search", params={"q": "amazon prime", "limit": 1})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 1
+        assert data["transactions"][0]["description"] == "Amazon Prime"
+        assert data["next_cursor"] is not None
+    
+    def test_search_without_words(self, client):
+        """
+        Test that a query without words is a client error.
+        """
+        response = client.get("/api/v1/transactions/search", params={"q": "**"})
+        
+        assert response.status_code == 400
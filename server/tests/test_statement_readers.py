@@ -0,0 +1,305 @@
+"""
+Tests for bank statement ingestion.
+
+This file tests:
+- Bank profile detection from header rows
+- CSV statements with other layouts, delimiters, encodings and preambles
+- OFX/QFX statements
+- Excel workbooks, when openpyxl is installed
+- Uploading non-CSV statements
+"""
+
+import importlib.util
+from datetime import datetime
+from io import BytesIO
+
+import pytest
+
+from app.services.bank_profiles import BankProfile, DEFAULT_PROFILE, detect_profile, get_profile
+from app.services.statement_readers import check_statement_format, iter_statement_batches, sniff_csv
+
+
+def read_rows(content: bytes, filename: str = "statement.csv", **kwargs) -> tuple:
+    rows, rejected = [], []
+    for batch in iter_statement_batches(BytesIO(content), filename, **kwargs):
+        rows.extend(batch.records())
+        rejected.extend(batch.rejected)
+    return rows, rejected
+
+
+OFX_SGML = b"""OFXHEADER:100
+DATA:OFXSGML
+VERSION:102
+ENCODING:USASCII
+CHARSET:1252
+
+<OFX>
+<BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<CURDEF>USD
+<BANKTRANLIST>
+<DTSTART>20240101
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240115120000.000[-5:EST]
+<TRNAMT>-25.50
+<FITID>1001
+<NAME>UBER *TRIP
+<MEMO>Ride downtown
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20240131
+<TRNAMT>3000.00
+<FITID>1002
+<MEMO>Payroll &amp; bonus
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240201
+<TRNAMT>-9.99
+<FITID>1003
+<NAME>Streaming
+<CURRENCY><CURRATE>1.1<CURSYM>EUR</CURRENCY>
+</STMTTRN>
+</BANKTRANLIST>
+</STMTRS></STMTTRNRS></BANKMSGSRSV1>
+</OFX>
+"""
+
+
+class TestBankProfiles:
+    """Test suite for profile detection."""
+    
+    def test_most_specific_profile_wins(self):
+        """
+        Test that a header matching several profiles picks the one with the most columns.
+        """
+        assert detect_profile(["Date", "Description", "Amount", "Type"]) is DEFAULT_PROFILE
+        assert detect_profile([" date ", "DESCRIPTION", "Amount", "Running Bal."]).name == "bank_of_america"
+        assert detect_profile(["Date", "Amount"]) is None
+    
+    def test_profile_needs_amount_columns(self):
+        """
+        Test that a profile must have an amount column or both debit and credit columns.
+        """
+        with pytest.raises(ValueError):
+            BankProfile(name="broken", date_column="Date", description_column="Payee", debit_column="Out")
+    
+    def test_unknown_profile(self):
+        """
+        Test that looking up an unknown profile lists the known ones.
+        """
+        with pytest.raises(ValueError, match="paysplit"):
+            get_profile("no_such_bank")
+
+
+class TestCSVStatements:
+    """Test suite for CSV statements of other banks."""
+    
+    def test_paysplit_csv_is_unchanged(self):
+        """
+        Test that the PaySplit layout still reads as before.
+        """
+        rows, rejected = read_rows(
+            b"Date,Description,Amount,Type\n2024-01-15,Uber Ride,25.50,Expense\n2024-01-16,Salary,3000,income\n"
+        )
+        
+        assert rejected == []
+        assert [(r["date"], r["amount_cents"], r["transaction_type"]) for r in rows] == [
+            (datetime(2024, 1, 15), 2550, "Expense"),
+            (datetime(2024, 1, 16), 300000, "Income"),
+        ]
+    
+    def test_signed_amounts(self):
+        """
+        Test that a signed amount column gives the type and an unsigned amount.
+        """
+        content = (
+            b"Transaction Date,Post Date,Description,Category,Type,Amount,Memo\n"
+            b"01/15/2024,01/16/2024,UBER *TRIP,Travel,Sale,-25.50,\n"
+            b"01/20/2024,01/20/2024,Payment Thank You,,Payment,500.00,\n"
+        )
+        rows, rejected = read_rows(content)
+        
+        assert rejected == []
+        assert [(r["date"], r["description"], r["amount_cents"], r["transaction_type"]) for r in rows] == [
+            (datetime(2024, 1, 15), "UBER *TRIP", 2550, "Expense"),
+            (datetime(2024, 1, 20), "Payment Thank You", 50000, "Income"),
+        ]
+    
+    def test_debit_and_credit_columns(self):
+        """
+        Test that split debit/credit columns give the type.
+        """
+        content = (
+            b"Transaction Date,Posted Date,Card No.,Description,Category,Debit,Credit\n"
+            b"2024-01-15,2024-01-16,1234,COFFEE SHOP,Dining,4.75,\n"
+            b"2024-01-17,2024-01-17,1234,REFUND,Other,,12.00\n"
+            b"2024-01-18,2024-01-18,1234,NOTHING,Other,,\n"
+        )
+        rows, rejected = read_rows(content)
+        
+        assert [(r["amount_cents"], r["transaction_type"]) for r in rows] == [(475, "Expense"), (1200, "Income")]
+        assert rejected == [{"row": 3, "reason": "invalid Amount"}]
+    
+    def test_preamble_before_header(self):
+        """
+        Test that account summary lines before the header are skipped.
+        """
+        content = (
+            b"Description,,Summary Amt.\n"
+            b"Beginning balance as of 01/01/2024,,\"1,000.00\"\n"
+            b"\n"
+            b"Date,Description,Amount,Running Bal.\n"
+            b"01/15/2024,Grocery Store,-82.10,917.90\n"
+            b"01/16/2024,Deposit,\"1,200.00\",\"2,117.90\"\n"
+        )
+        rows, rejected = read_rows(content)
+        
+        assert rejected == []
+        assert [(r["date"], r["amount_cents"], r["transaction_type"]) for r in rows] == [
+            (datetime(2024, 1, 15), 8210, "Expense"),
+            (datetime(2024, 1, 16), 120000, "Income"),
+        ]
+    
+    def test_semicolons_decimal_commas_and_cp1252(self):
+        """
+        Test a German export: semicolons, dd.mm.yy dates, decimal commas and cp1252 text.
+        """
+        content = (
+            '"Auftragskonto";"Buchungstag";"Valutadatum";"Buchungstext";"Verwendungszweck";'
+            '"Beguenstigter/Zahlungspflichtiger";"Kontonummer";"BLZ";"Betrag";"Waehrung";"Info"\n'
+            '"DE001";"15.01.24";"15.01.24";"KARTENZAHLUNG";"Einkauf";"Bäckerei Müller";"";"";"-1.234,56";"EUR";""\n'
+            '"DE001";"31.01.24";"31.01.24";"GEHALT";"Januar";"Arbeitgeber GmbH";"";"";"2500,00";"EUR";""\n'
+        ).encode("cp1252")
+        profile, options = sniff_csv(BytesIO(content))
+        rows, rejected = read_rows(content)
+        
+        assert profile.name == "sparkasse"
+        assert options["encoding"] == "cp1252"
+        assert options["sep"] == ";"
+        assert rejected == []
+        assert [(r["date"], r["description"], r["amount_cents"], r["currency"], r["transaction_type"]) for r in rows] == [
+            (datetime(2024, 1, 15), "Bäckerei Müller", 123456, "EUR", "Expense"),
+            (datetime(2024, 1, 31), "Arbeitgeber GmbH", 250000, "EUR", "Income"),
+        ]
+    
+    def test_byte_order_mark(self):
+        """
+        Test that a UTF-8 byte order mark does not hide the first column.
+        """
+        rows, rejected = read_rows(b"\xef\xbb\xbfDate,Description,Amount,Type\n2024-01-15,Caf\xc3\xa9,3.50,Expense\n")
+        
+        assert rejected == []
+        assert rows[0]["description"] == "Café"
+    
+    def test_forced_profile(self):
+        """
+        Test that a named profile is used, and that a missing header is an error.
+        """
+        content = b"Date,Description,Amount,Card Member,Account #\n01/15/2024,HOTEL,250.00,J DOE,-1001\n"
+        
+        rows, _ = read_rows(content)
+        assert (rows[0]["amount_cents"], rows[0]["transaction_type"]) == (25000, "Expense")
+        with pytest.raises(ValueError, match="capital_one"):
+            read_rows(content, profile="capital_one")
+
+
+class TestOFXStatements:
+    """Test suite for OFX/QFX statements."""
+    
+    def test_sgml_statement(self):
+        """
+        Test that SGML OFX transactions are read with their statement currency.
+        """
+        rows, rejected = read_rows(OFX_SGML, "statement.qfx", batch_size=2)
+        
+        assert rejected == []
+        assert [
+            (r["date"], r["description"], r["amount_cents"], r["currency"], r["transaction_type"]) for r in rows
+        ] == [
+            (datetime(2024, 1, 15), "UBER *TRIP", 2550, "USD", "Expense"),
+            (datetime(2024, 1, 31), "Payroll & bonus", 300000, "USD", "Income"),
+            (datetime(2024, 2, 1), "Streaming", 999, "EUR", "Expense"),
+        ]
+    
+    def test_xml_statement_split_across_reads(self, monkeypatch):
+        """
+        Test XML OFX with tags cut between reads.
+        """
+        monkeypatch.setattr("app.services.statement_readers.OFX_READ_SIZE", 7)
+        content = (
+            b'<?xml version="1.0"?><?OFX OFXHEADER="200"?><OFX><CURDEF>CAD</CURDEF><BANKTRANLIST>'
+            b'<STMTTRN><DTPOSTED>20240301</DTPOSTED><TRNAMT>-12.00</TRNAMT><NAME>Parking</NAME></STMTTRN>'
+            b'</BANKTRANLIST></OFX>'
+        )
+        rows, rejected = read_rows(content, "statement.ofx")
+        
+        assert rejected == []
+        assert [(r["date"], r["description"], r["amount_cents"], r["currency"]) for r in rows] == [
+            (datetime(2024, 3, 1), "Parking", 1200, "CAD"),
+        ]
+
+
+class TestStatementFormats:
+    """Test suite for file format checks and uploads."""
+    
+    def test_unsupported_extension(self):
+        """
+        Test that unsupported extensions are rejected before reading.
+        """
+        assert check_statement_format("Statement.QFX") == "ofx"
+        with pytest.raises(ValueError, match="File must be a CSV"):
+            check_statement_format("statement.pdf")
+    
+    @pytest.mark.skipif(importlib.util.find_spec("openpyxl") is not None, reason="openpyxl is installed")
+    def test_xlsx_without_openpyxl(self):
+        """
+        Test that xlsx uploads need the optional openpyxl package.
+        """
+        with pytest.raises(ValueError, match="openpyxl"):
+            check_statement_format("statement.xlsx")
+    
+    @pytest.mark.skipif(importlib.util.find_spec("openpyxl") is None, reason="openpyxl is not installed")
+    def test_xlsx_statement(self):
+        """
+        Test that a workbook is read after its title rows, keeping Excel dates.
+        """
+        import openpyxl
+        
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["Account activity"])
+        sheet.append(["Transaction Date", "Posted Date", "Card No.", "Description", "Category", "Debit", "Credit"])
+        sheet.append([datetime(2024, 1, 15), datetime(2024, 1, 16), 1234, "COFFEE SHOP", "Dining", 4.75, None])
+        sheet.append(["2024-01-17", "2024-01-17", 1234, "REFUND", "Other", None, 12])
+        file = BytesIO()
+        workbook.save(file)
+        
+        rows, rejected = read_rows(file.getvalue(), "statement.xlsx")
+        
+        assert rejected == []
+        assert [(r["date"], r["amount_cents"], r["transaction_type"]) for r in rows] == [
+            (datetime(2024, 1, 15), 475, "Expense"),
+            (datetime(2024, 1, 17), 1200, "Income"),
+        ]
+    
+    def test_upload_ofx(self, client):
+        """
+        Test that the upload endpoint imports OFX statements.
+        """
+        files = {"file": ("statement.ofx", BytesIO(OFX_SGML), "application/x-ofx")}
+        response = client.post("/api/v1/upload", files=files, params={"include_transactions": False})
+        
+        assert response.status_code == 200
+        assert response.json()["count"] == 3
+    
+    def test_upload_unknown_profile(self, client):
+        """
+        Test that an unknown profile name is a bad request.
+        """
+        files = {"file": ("statement.csv", BytesIO(b"Date,Description,Amount\n"), "text/csv")}
+        response = client.post("/api/v1/upload", files=files, params={"profile": "no_such_bank"})
+        
+        assert response.status_code == 400
+        assert "profile must be one of" in response.json()["detail"]
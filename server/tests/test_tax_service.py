@@ -0,0 +1,172 @@
+"""
+Tests for quarterly tax estimates.
+
+This file tests:
+- Vectorized bracket and self-employment tax lookups
+- Quarterly estimates from income and deductible business expenses
+- The IRS payment periods the quarters cover
+- The /tax/estimate endpoint and its per-quarter caching
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.services.cache import get_cache
+from app.services.tax_service import TaxEstimateService, payment_periods_of
+from app.services.tax_tables import get_tax_table
+from app.services.transaction_service import TransactionService
+
+
+ROWS = [
+    {'Date': '2024-01-10', 'Description': 'Client A', 'Amount': 25000.00, 'Type': 'Income'},
+    {'Date': '2024-02-05', 'Description': 'Office Depot', 'Amount': 5000.00, 'Type': 'Expense'},
+    {'Date': '2024-03-15', 'Description': 'Uber Ride', 'Amount': 1000.00, 'Type': 'Expense'},
+    {'Date': '2024-03-20', 'Description': 'Client B', 'Amount': 9000.00, 'Type': 'Income', 'Currency': 'EUR'},
+    {'Date': '2024-07-01', 'Description': 'Client A', 'Amount': 100.00, 'Type': 'Income'},
+]
+
+
+@pytest.fixture
+def ledger(db_session):
+    return TransactionService(db_session).bulk_create_transactions(ROWS)
+
+
+class TestTaxTables:
+    """Test suite for the tax table lookups."""
+    
+    def test_income_tax_brackets(self):
+        """
+        Test that each income is taxed through every bracket below it.
+        """
+        table = get_tax_table(2024, 'single')
+        taxable = np.array([-500, 0, 11_600, 50_000, 1_000_000]) * 100
+        
+        tax = table.income_tax(taxable) / 100
+        
+        np.testing.assert_allclose(tax[:4], [0, 0, 1_160, 6_053])
+        assert tax[4] == pytest.approx(183_647.25 + (1_000_000 - 609_350) * 0.37)
+    
+    def test_self_employment_tax(self):
+        """
+        Test the wage base cap and the minimum for self-employment tax.
+        """
+        table = get_tax_table(2024, 'single')
+        
+        tax = table.self_employment_tax(np.array([300, 100_000, 200_000]) * 100) / 100
+        
+        np.testing.assert_allclose(tax, [0, 14_129.55, 20_906.40 + 5_356.30])
+    
+    def test_unknown_table(self):
+        """
+        Test that unsupported years and filing statuses are rejected.
+        """
+        with pytest.raises(ValueError, match="supported years"):
+            get_tax_table(1999)
+        with pytest.raises(ValueError, match="filing_status"):
+            get_tax_table(2024, 'head_of_household')
+
+
+class TestTaxEstimateService:
+    """Test suite for TaxEstimateService."""
+    
+    def test_quarterly_estimate(self, db_session, ledger):
+        """
+        Test a quarter's estimate from its income and business expenses.
+        """
+        q1 = TaxEstimateService(db_session).get_quarterly_estimates(2024, quarters=[1])[0]
+        
+        assert q1 == {
+            "period": "2024-Q1",
+            "period_start": "2024-01-01",
+            "period_end": "2024-03-31",
+            "due_date": "2024-04-15",
+            "income": 25000.0,
+            "deductible_expenses": 5000.0,
+            "net_profit": 20000.0,
+            "self_employment_tax": 2825.91,
+            "income_tax": 2049.4,
+            "estimated_tax": 4875.31,
+        }
+    
+    def test_quarters_without_profit(self, db_session, ledger):
+        """
+        Test that empty and low-profit quarters owe nothing, Q4 due next year.
+        """
+        estimates = TaxEstimateService(db_session).get_quarterly_estimates(2024, 'married_joint')
+        
+        assert [e["period"] for e in estimates] == ["2024-Q1", "2024-Q2", "2024-Q3", "2024-Q4"]
+        assert estimates[1]["estimated_tax"] == 0.0
+        assert estimates[2]["self_employment_tax"] == 0.0
+        assert estimates[3]["due_date"] == "2025-01-15"
+    
+    def test_quarters_are_payment_periods(self, db_session):
+        """
+        Test that June income is due in September, and a two-month period is annualized over two months.
+        """
+        TransactionService(db_session).bulk_create_transactions([
+            {'Date': '2024-05-31', 'Description': 'Client A', 'Amount': 10000.00, 'Type': 'Income'},
+            {'Date': '2024-06-01', 'Description': 'Client B', 'Amount': 7000.00, 'Type': 'Income'},
+        ])
+        q2, q3 = TaxEstimateService(db_session).get_quarterly_estimates(2024, quarters=[2, 3])
+        
+        assert (q2["period_start"], q2["period_end"], q2["due_date"]) == ("2024-04-01", "2024-05-31", "2024-06-15")
+        assert q2["income"] == 10000.0
+        assert q3["income"] == 7000.0
+        # $60,000 a year: $8,477.73 self-employment tax, a sixth of it due for April-May
+        assert q2["self_employment_tax"] == 1412.96
+    
+    def test_payment_periods_of(self):
+        """
+        Test the payment period labels of transaction dates.
+        """
+        dates = [datetime(2024, 3, 31), datetime(2024, 6, 1), datetime(2024, 8, 31), datetime(2024, 9, 1)]
+        
+        assert payment_periods_of(dates) == {"2024-Q1", "2024-Q3", "2024-Q4"}
+    
+    def test_invalid_quarter(self, db_session):
+        """
+        Test that quarters outside 1-4 are rejected.
+        """
+        with pytest.raises(ValueError):
+            TaxEstimateService(db_session).get_quarterly_estimates(2024, quarters=[5])
+
+
+class TestTaxEstimateAPI:
+    """Test suite for the /tax/estimate endpoint."""
+    
+    def test_estimate(self, client, ledger):
+        """
+        Test that the endpoint returns every quarter and the year's total.
+        """
+        response = client.get("/api/v1/tax/estimate", params={"year": 2024})
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["quarters"]) == 4
+        assert body["estimated_tax"] == 4875.31
+    
+    def test_write_recomputes_its_quarter_only(self, client, db_session, ledger):
+        """
+        Test that adding a transaction only invalidates its quarter's estimate.
+        """
+        client.get("/api/v1/tax/estimate", params={"year": 2024})
+        TransactionService(db_session).create_transaction(
+            {'Date': '2024-05-02', 'Description': 'Client C', 'Amount': 40000.00, 'Type': 'Income'}
+        )
+        
+        body = client.get("/api/v1/tax/estimate", params={"year": 2024}).json()
+        
+        assert body["quarters"][1]["income"] == 40000.0
+        assert get_cache().stats()["endpoints"]["tax.estimate"] == {"hits": 3, "misses": 5}
+    
+    def test_bad_parameters(self, client):
+        """
+        Test that unsupported years, filing statuses and quarters are bad requests.
+        """
+        assert client.get("/api/v1/tax/estimate", params={"year": 1999}).status_code == 400
+        assert client.get(
+            "/api/v1/tax/estimate", params={"year": 2024, "filing_status": "widow"}
+        ).status_code == 400
+        assert client.get("/api/v1/tax/estimate", params={"year": 2024, "quarter": 5}).status_code == 422
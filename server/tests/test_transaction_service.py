@@ -0,0 +1,372 @@
+"""
+Unit tests for the transaction service.
+
+This file tests the database layer against an in-memory SQLite
+database, independently from the HTTP layer.
+"""
+
+import orjson
+import pytest
+from datetime import datetime
+from io import BytesIO
+
+from app.models.transaction import Transaction
+from app.services.csv_parser import iter_normalized_batches
+from app.services.transaction_service import TransactionService
+
+
+class TestBulkCreateTransactions:
+    """Test suite for the bulk insert path."""
+    
+    def test_bulk_create_returns_rows_in_order(self, db_session):
+        """
+        Test that every row is inserted and returned in input order.
+        """
+        rows = [
+            {'Date': '2024-01-15', 'Description': 'Uber Ride', 'Amount': 25.50, 'Type': 'Expense'},
+            {'Date': '2024-01-16', 'Description': 'Starbucks', 'Amount': 4.75, 'Type': 'Expense'},
+            {'Date': '2024-01-17', 'Description': 'Freelance Payment', 'Amount': 500.0, 'Type': 'Income'},
+        ]
+        
+        service = TransactionService(db_session)
+        created = service.bulk_create_transactions(rows, chunk_size=2)
+        
+        assert [t.description for t in created] == ['Uber Ride', 'Starbucks', 'Freelance Payment']
+        assert all(t.id is not None for t in created)
+        assert db_session.query(Transaction).count() == 3
+    
+    def test_bulk_create_rejects_invalid_batch(self, db_session):
+        """
+        Test that a bad row aborts the whole batch.
+        
+        A partially imported file is worse than a failed one, so
+        nothing should be written when any row is invalid.
+        """
+        rows = [
+            {'Date': '2024-01-15', 'Description': 'Uber Ride', 'Amount': 25.50, 'Type': 'Expense'},
+            {'Date': 'yesterday', 'Description': 'Starbucks', 'Amount': 4.75, 'Type': 'Expense'},
+        ]
+        
+        service = TransactionService(db_session)
+        with pytest.raises(ValueError):
+            service.bulk_create_transactions(rows, chunk_size=1)
+        
+        assert db_session.query(Transaction).count() == 0
+    
+    @pytest.mark.parametrize("date", ['yesterday', '', None])
+    def test_create_rejects_missing_or_invalid_date(self, db_session, date):
+        """
+        Test that a single row without a valid date is rejected, not dated today.
+        """
+        service = TransactionService(db_session)
+        with pytest.raises(ValueError, match="invalid Date"):
+            service.create_transaction({'Date': date, 'Description': 'Starbucks', 'Amount': 4.75, 'Type': 'Expense'})
+        with pytest.raises(ValueError, match="invalid Date"):
+            service.create_transaction({'Description': 'Starbucks', 'Amount': 4.75, 'Type': 'Expense'})
+        
+        assert db_session.query(Transaction).count() == 0
+    
+    def test_bulk_create_rejects_invalid_chunk_size(self, db_session):
+        """
+        Test that a non-positive chunk size is rejected.
+        """
+        service = TransactionService(db_session)
+        with pytest.raises(ValueError):
+            service.bulk_create_transactions([], chunk_size=0)
+
+
+class TestImportBatches:
+    """Test suite for the streaming batch import path."""
+    
+    def test_import_batches_reports_each_batch(self, db_session):
+        """
+        Test that every batch is inserted and handed to the callback.
+        """
+        csv_content = (
+            b"Date,Description,Amount,Type\n"
+            b"2024-01-15,Uber Ride,25.50,Expense\n"
+            b"2024-01-16,Starbucks,4.75,Expense\n"
+            b"not-a-date,Broken,1.00,Expense\n"
+            b"2024-01-17,Client,500.00,Income\n"
+        )
+        seen = []
+        
+        service = TransactionService(db_session)
+        result = service.import_batches(
+            iter_normalized_batches(BytesIO(csv_content), batch_size=2),
+            on_batch=lambda created: seen.append(len(created))
+        )
+        
+        assert result.inserted == 3
+        assert result.rejected_count == 1
+        assert result.rejected == [{"row": 3, "reason": "invalid Date (expected %Y-%m-%d)"}]
+        assert seen == [2, 1]
+        assert db_session.query(Transaction).count() == 3
+    
+    def test_import_batches_closes_reader_on_error(self, db_session):
+        """
+        Test that a failed import closes the reader while the file is open.
+        """
+        file = BytesIO(b"Date,Description,Amount,Type\n" + b"2024-01-15,Uber Ride,25.50,Expense\n" * 4)
+        batches = iter_normalized_batches(file, batch_size=2)
+        
+        def fail(created):
+            raise RuntimeError("callback failed")
+        
+        with pytest.raises(RuntimeError):
+            TransactionService(db_session).import_batches(batches, on_batch=fail)
+        
+        assert batches.gi_frame is None
+        assert not file.closed
+        assert db_session.query(Transaction).count() == 0
+
+
+class TestTransactionSummary:
+    """Test suite for the SQL-side transaction summary."""
+    
+    @pytest.fixture
+    def seeded_service(self, db_session):
+        rows = [
+            {'Date': '2024-01-15', 'Description': 'Uber Ride', 'Amount': 25.50, 'Type': 'Expense'},
+            {'Date': '2024-02-16', 'Description': 'Starbucks', 'Amount': 4.50, 'Type': 'Expense'},
+            {'Date': '2024-02-17', 'Description': 'Client A', 'Amount': 500.0, 'Type': 'Income'},
+            {'Date': '2024-03-01', 'Description': 'Client B', 'Amount': 250.0, 'Type': 'Income'},
+        ]
+        service = TransactionService(db_session)
+        service.bulk_create_transactions(rows)
+        return service
+    
+    def test_summary_totals(self, seeded_service):
+        """
+        Test that totals and counts match the inserted rows.
+        """
+        summary = seeded_service.get_transaction_summary()
+        
+        assert summary == {
+            "total_transactions": 4,
+            "total_income": 750.0,
+            "total_expenses": 30.0,
+            "net_amount": 720.0,
+            "income_count": 2,
+            "expense_count": 2
+        }
+    
+    def test_summary_date_range_filter(self, seeded_service):
+        """
+        Test that the date range narrows the aggregated rows.
+        """
+        summary = seeded_service.get_transaction_summary(
+            start_date=datetime(2024, 2, 1),
+            end_date=datetime(2024, 2, 29)
+        )
+        
+        assert summary["total_transactions"] == 2
+        assert summary["total_income"] == 500.0
+        assert summary["total_expenses"] == 4.50
+    
+    def test_summary_totals_are_exact(self, db_session):
+        """
+        Test that many small amounts add up without float drift.
+        """
+        rows = [
+            {'Date': '2024-01-15', 'Description': f'Fee {i}', 'Amount': '0.10', 'Type': 'Expense'}
+            for i in range(1000)
+        ]
+        TransactionService(db_session).bulk_create_transactions(rows)
+        
+        summary = TransactionService(db_session).get_transaction_summary()
+        
+        # Adding 0.1 as a float a thousand times gives 99.9999999999986
+        assert summary["total_expenses"] == 100.0
+        assert summary["net_amount"] == -100.0
+    
+    def test_summary_currency_filter(self, db_session):
+        """
+        Test that totals can be restricted to one currency.
+        """
+        service = TransactionService(db_session)
+        service.bulk_create_transactions([
+            {'Date': '2024-01-15', 'Description': 'Hotel', 'Amount': '€120.00', 'Type': 'Expense', 'Currency': 'EUR'},
+            {'Date': '2024-01-16', 'Description': 'Taxi', 'Amount': '$30.00', 'Type': 'Expense', 'Currency': 'USD'},
+        ])
+        
+        assert service.get_transaction_summary(currency='eur')["total_expenses"] == 120.0
+        assert service.get_transaction_summary(currency='USD')["total_expenses"] == 30.0
+        with pytest.raises(ValueError):
+            service.get_transaction_summary(currency='euro')
+    
+    def test_mixed_currencies_are_not_added(self, db_session):
+        """
+        Test that totals over several currencies require a currency filter.
+        """
+        service = TransactionService(db_session)
+        service.bulk_create_transactions([
+            {'Date': '2024-01-15', 'Description': 'Starbucks', 'Amount': 5.00, 'Type': 'Expense', 'Currency': 'EUR'},
+            {'Date': '2024-01-16', 'Description': 'Starbucks', 'Amount': 5.00, 'Type': 'Expense'},
+            {'Date': '2024-02-01', 'Description': 'Client A', 'Amount': 100.00, 'Type': 'Income'},
+        ])
+        
+        with pytest.raises(ValueError, match="EUR, USD"):
+            service.get_transaction_summary()
+        with pytest.raises(ValueError, match="EUR, USD"):
+            service.get_merchant_summary()
+        assert service.get_transaction_summary(start_date=datetime(2024, 1, 16))["net_amount"] == 95.0
+        assert [m["total_expenses"] for m in service.get_merchant_summary(currency='EUR')] == [5.0]
+    
+    def test_summary_empty_table(self, db_session):
+        """
+        Test that an empty table produces zero totals.
+        """
+        summary = TransactionService(db_session, user_id=42).get_transaction_summary()
+        
+        assert summary["total_transactions"] == 0
+        assert summary["net_amount"] == 0.0
+
+
+class TestTransactionsPage:
+    """Test suite for keyset pagination and filtering."""
+    
+    @pytest.fixture
+    def seeded_service(self, db_session):
+        # Several rows share a date so the id tie-breaker is exercised
+        rows = [
+            {'Date': f'2024-01-{(i // 3) + 1:02d}', 'Description': f'Row {i}',
+             'Amount': float(i), 'Type': 'Income' if i % 2 else 'Expense'}
+            for i in range(10)
+        ]
+        service = TransactionService(db_session)
+        service.bulk_create_transactions(rows)
+        return service
+    
+    def test_pages_cover_every_row_once(self, seeded_service):
+        """
+        Test that following next_cursor visits every row exactly once, newest first.
+        """
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = seeded_service.get_transactions_page(limit=3, cursor=cursor)
+            seen.extend(page)
+            if cursor is None:
+                break
+        
+        assert len(seen) == 10
+        assert len({t.id for t in seen}) == 10
+        keys = [(t.date, t.id) for t in seen]
+        assert keys == sorted(keys, reverse=True)
+    
+    def test_filters_apply_with_pagination(self, seeded_service):
+        """
+        Test that type and amount filters combine with the cursor.
+        """
+        page, cursor = seeded_service.get_transactions_page(
+            limit=2, transaction_type='Income', min_amount=3.0
+        )
+        rest, last_cursor = seeded_service.get_transactions_page(
+            limit=10, cursor=cursor, transaction_type='Income', min_amount=3.0
+        )
+        
+        amounts = sorted(t.amount for t in page + rest)
+        assert amounts == [3.0, 5.0, 7.0, 9.0]
+        assert last_cursor is None
+    
+    def test_invalid_cursor_raises(self, seeded_service):
+        """
+        Test that a tampered cursor is rejected instead of ignored.
+        """
+        with pytest.raises(ValueError):
+            seeded_service.get_transactions_page(cursor="not-a-cursor")
+    
+    def test_rows_page_matches_orm_page(self, seeded_service):
+        """
+        Test that the column-only page serializes exactly like to_dict().
+        """
+        orm_page, orm_cursor = seeded_service.get_transactions_page(limit=4, transaction_type='Expense')
+        rows, cursor = seeded_service.get_transaction_rows_page(limit=4, transaction_type='Expense')
+        
+        assert cursor == orm_cursor
+        assert orjson.loads(orjson.dumps(rows)) == [t.to_dict() for t in orm_page]
+
+
+class TestDeduplication:
+    """Test suite for skipping previously uploaded rows and files."""
+    
+    HEADER = b"Date,Description,Amount,Type\n"
+    
+    def test_overlapping_upload_skips_stored_rows(self, db_session):
+        """
+        Test that rows from an earlier upload are skipped, including repeated rows.
+        """
+        service = TransactionService(db_session)
+        first = self.HEADER + b"2024-01-15,Coffee,4.50,Expense\n2024-01-15,Coffee,4.50,Expense\n"
+        second = first + b"2024-01-15,Coffee,4.50,Expense\n2024-01-16,Rent,900.00,Expense\n"
+        
+        service.import_file(BytesIO(first), filename="january.csv")
+        result = service.import_file(BytesIO(second), filename="january-full.csv")
+        
+        assert result.inserted == 2
+        assert result.skipped == 2
+        assert not result.duplicate_file
+        assert db_session.query(Transaction).count() == 4
+    
+    def test_identical_file_is_not_parsed(self, db_session, monkeypatch):
+        """
+        Test that re-uploading the same bytes short-circuits before parsing.
+        """
+        service = TransactionService(db_session)
+        content = self.HEADER + b"2024-01-15,Coffee,4.50,Expense\n2024-01-16,Rent,900.00,Expense\n"
+        service.import_file(BytesIO(content))
+        
+        def fail(*args, **kwargs):
+            raise AssertionError("file was parsed again")
+        monkeypatch.setattr("app.services.transaction_service.iter_statement_batches", fail)
+        result = service.import_file(BytesIO(content))
+        
+        assert result.duplicate_file
+        assert result.inserted == 0
+        assert result.skipped == 2
+
+
+class TestUserScoping:
+    """Test suite for keeping each user's transactions apart."""
+    
+    CSV = b"Date,Description,Amount,Type\n2024-01-15,Coffee,4.50,Expense\n2024-01-16,Client,100.00,Income\n"
+    
+    @pytest.fixture
+    def services(self, db_session):
+        alice, bob = TransactionService(db_session, user_id=1), TransactionService(db_session, user_id=2)
+        alice.import_file(BytesIO(self.CSV))
+        bob.bulk_create_transactions([{'Date': '2024-02-01', 'Description': 'Rent', 'Amount': 900.0, 'Type': 'Expense'}])
+        return alice, bob
+    
+    def test_rows_are_stored_for_the_user(self, services, db_session):
+        """
+        Test that created rows carry the service's user.
+        """
+        owners = sorted(t.user_id for t in db_session.query(Transaction))
+        
+        assert owners == [1, 1, 2]
+    
+    def test_reads_only_see_the_users_rows(self, services):
+        """
+        Test that pages, summaries and lookups by ID are scoped to the user.
+        """
+        alice, bob = services
+        rows, _ = bob.get_transaction_rows_page()
+        
+        assert [row["description"] for row in rows] == ["Rent"]
+        assert alice.get_transaction_summary()["total_transactions"] == 2
+        assert TransactionService(alice.db).get_transaction_summary()["total_transactions"] == 0
+        assert alice.get_transaction_by_id(rows[0]["id"]) is None
+        assert alice.delete_transaction(rows[0]["id"]) is False
+    
+    def test_same_file_imports_once_per_user(self, services):
+        """
+        Test that another user's identical upload is neither skipped nor deduplicated.
+        """
+        alice, bob = services
+        
+        assert alice.import_file(BytesIO(self.CSV)).duplicate_file
+        result = bob.import_file(BytesIO(self.CSV))
+        assert not result.duplicate_file
+        assert result.inserted == 2
@@ -0,0 +1,185 @@
+"""
+Tests for the transaction read endpoints.
+
+This file tests:
+- Listing and paging through transactions
+- Summary totals
+- Streaming exports
+- Error handling for bad query parameters
+"""
+
+import csv
+import importlib.util
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def uploaded_client(client, sample_csv_file):
+    """Client whose database already holds the sample CSV transactions."""
+    files = {"file": ("transactions.csv", sample_csv_file, "text/csv")}
+    response = client.post("/api/v1/upload", files=files)
+    assert response.status_code == 200
+    return client
+
+
+class TestTransactionsAPI:
+    """Test suite for transaction read endpoints."""
+    
+    def test_list_transactions_pagination(self, uploaded_client):
+        """
+        Test that the list endpoint returns a cursor until the last page.
+        """
+        first = uploaded_client.get("/api/v1/transactions?limit=2").json()
+        assert first["count"] == 2
+        assert first["next_cursor"] is not None
+        
+        second = uploaded_client.get(
+            "/api/v1/transactions", params={"limit": 2, "cursor": first["next_cursor"]}
+        ).json()
+        assert second["count"] == 1
+        assert second["next_cursor"] is None
+    
+    def test_list_transactions_invalid_cursor(self, uploaded_client):
+        """
+        Test that a malformed cursor is reported as a client error.
+        """
+        response = uploaded_client.get("/api/v1/transactions?cursor=garbage")
+        
+        assert response.status_code == 400
+    
+    def test_summary(self, uploaded_client):
+        """
+        Test that the summary endpoint aggregates the uploaded rows.
+        """
+        response = uploaded_client.get("/api/v1/transactions/summary")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_transactions"] == 3
+        assert data["income_count"] == 1
+        assert data["expense_count"] == 2
+    
+    def test_summary_currency(self, uploaded_client):
+        """
+        Test that totals can be restricted to a currency, and that bad codes are client errors.
+        """
+        usd = uploaded_client.get("/api/v1/transactions/summary?currency=usd").json()
+        eur = uploaded_client.get("/api/v1/transactions/summary?currency=EUR").json()
+        
+        assert usd["total_transactions"] == 3
+        assert eur["total_transactions"] == 0
+        assert uploaded_client.get("/api/v1/transactions/summary?currency=dollars").status_code == 400
+    
+    def test_rollup(self, uploaded_client):
+        """
+        Test that the rollup endpoint groups the uploaded rows by month.
+        """
+        response = uploaded_client.get("/api/v1/transactions/rollup?granularity=month&group_by=is_business")
+        
+        assert response.status_code == 200
+        periods = response.json()["periods"]
+        assert [p["period"] for p in periods] == ['2025-06']
+        assert periods[0]["is_business"] is False
+        assert periods[0]["income_count"] + periods[0]["expense_count"] == 3
+    
+    def test_rollup_invalid_granularity(self, uploaded_client):
+        """
+        Test that an unknown granularity is a client error.
+        """
+        response = uploaded_client.get("/api/v1/transactions/rollup?granularity=week")
+        
+        assert response.status_code == 400
+    
+    def test_export_ndjson(self, uploaded_client):
+        """
+        Test that the NDJSON export streams one object per transaction, oldest first.
+        """
+        response = uploaded_client.get("/api/v1/transactions/export?format=ndjson")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["description"] for r in rows] == ['Uber Ride', 'Starbucks Coffee', 'Freelance Payment']
+        assert rows[0]["date"] == "2025-06-20T00:00:00"
+    
+    def test_export_csv_with_filter(self, uploaded_client):
+        """
+        Test that the CSV export has a header row and honours list filters.
+        """
+        response = uploaded_client.get("/api/v1/transactions/export?format=csv&transaction_type=Expense")
+        
+        assert response.status_code == 200
+        assert "transactions.csv" in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [r["description"] for r in rows] == ['Starbucks Coffee', 'Freelance Payment']
+    
+    def test_export_unknown_format(self, uploaded_client):
+        """
+        Test that an unknown export format is a client error.
+        """
+        response = uploaded_client.get("/api/v1/transactions/export?format=xml")
+        
+        assert response.status_code == 400
+    
+    @pytest.mark.skipif(importlib.util.find_spec("pyarrow") is not None, reason="pyarrow is installed")
+    def test_export_parquet_without_pyarrow(self, uploaded_client):
+        """
+        Test that Parquet export explains the missing optional dependency.
+        """
+        response = uploaded_client.get("/api/v1/transactions/export?format=parquet")
+        
+        assert response.status_code == 400
+        assert "pyarrow" in response.json()["detail"]
+    
+    @pytest.mark.skipif(importlib.util.find_spec("pyarrow") is None, reason="pyarrow is not installed")
+    def test_export_parquet(self, uploaded_client):
+        """
+        Test that the Parquet export can be read back.
+        """
+        import pyarrow.parquet as pq
+        
+        response = uploaded_client.get("/api/v1/transactions/export?format=parquet")
+        
+        assert response.status_code == 200
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.num_rows == 3
+
+
+class TestUserHeader:
+    """Test suite for scoping requests with the X-User-Id header."""
+    
+    def test_users_see_only_their_uploads(self, client, sample_csv_data):
+        """
+        Test that uploads, lists, summaries and exports follow the X-User-Id header.
+        """
+        files = {"file": ("transactions.csv", sample_csv_data.encode(), "text/csv")}
+        assert client.post("/api/v1/upload", files=files, headers={"X-User-Id": "7"}).status_code == 200
+        
+        mine = client.get("/api/v1/transactions", headers={"X-User-Id": "7"}).json()
+        assert mine["count"] == 3
+        assert client.get("/api/v1/transactions", headers={"X-User-Id": "8"}).json()["count"] == 0
+        assert client.get("/api/v1/transactions/summary").json()["total_transactions"] == 0
+        assert client.get("/api/v1/transactions/export", headers={"X-User-Id": "8"}).text == ""
+        
+        transaction_id = mine["transactions"][0]["id"]
+        assert client.get(f"/api/v1/transactions/{transaction_id}", headers={"X-User-Id": "7"}).status_code == 200
+        assert client.get(f"/api/v1/transactions/{transaction_id}", headers={"X-User-Id": "8"}).status_code == 404
+    
+    def test_header_required_when_configured(self, client, monkeypatch):
+        """
+        Test that REQUIRE_USER_ID rejects requests without the header.
+        """
+        from app.core.config import Settings
+        monkeypatch.setattr("app.api.dependencies.settings", Settings(require_user_id=True))
+        
+        assert client.get("/api/v1/transactions").status_code == 401
+        assert client.get("/api/v1/transactions", headers={"X-User-Id": "7"}).status_code == 200
+    
+    def test_invalid_header(self, client):
+        """
+        Test that a non-numeric user ID is a validation error.
+        """
+        assert client.get("/api/v1/transactions", headers={"X-User-Id": "abc"}).status_code == 422
@@ -34,24 +34,27 @@ class TestCSVUpload:
         # Check response structure
         assert "message" in data
         assert "transactions" in data
-        assert data["message"] == "CSV processed successfully"
+        assert data["message"] == "CSV processed successfully. 3 transactions saved, 0 duplicates skipped."
+        assert data["count"] == 3
+        assert data["skipped_count"] == 0
         
         # Check that we got the expected transactions
         transactions = data["transactions"]
         assert len(transactions) == 3  # We have 3 sample transactions
         
-        # Verify the first transaction structure
+        # Verify the first transaction structure: the saved rows are returned
         first_transaction = transactions[0]
-        assert "Date" in first_transaction
-        assert "Description" in first_transaction
-        assert "Amount" in first_transaction
-        assert "Type" in first_transaction
+        assert "id" in first_transaction
+        assert "date" in first_transaction
+        assert "description" in first_transaction
+        assert "amount" in first_transaction
+        assert "transaction_type" in first_transaction
         
         # Check specific values
-        assert first_transaction["Date"] == "2024-01-15"
-        assert first_transaction["Description"] == "Uber Ride"
-        assert first_transaction["Amount"] == 25.50
-        assert first_transaction["Type"] == "Expense"
+        assert first_transaction["date"].startswith("2025-06-20")
+        assert first_transaction["description"] == "Uber Ride"
+        assert first_transaction["amount"] == 25.50
+        assert first_transaction["transaction_type"] == "Income"
     
     def test_non_csv_file_rejection(self, client):
         """
@@ -124,9 +127,9 @@ class TestCSVUpload:
         # Create a larger CSV with more transactions
         import pandas as pd
         
-        # Generate 100 sample transactions
+        # Generate 100 sample transactions on 100 consecutive (valid) days
         data = {
-            'Date': [f'2024-01-{i:02d}' for i in range(1, 101)],
+            'Date': pd.date_range('2024-01-01', periods=100).strftime('%Y-%m-%d').tolist(),
             'Description': [f'Transaction {i}' for i in range(1, 101)],
             'Amount': [float(i * 10.50) for i in range(1, 101)],
             'Type': ['Expense' if i % 2 == 0 else 'Income' for i in range(1, 101)]
@@ -143,4 +146,56 @@ class TestCSVUpload:
         # Should handle successfully
         assert response.status_code == 200
         data = response.json()
-        assert len(data["transactions"]) == 100 
\ No newline at end of file
+        assert len(data["transactions"]) == 100
+    
+    def test_invalid_rows_are_reported(self, client):
+        """
+        Test that rows with bad dates or amounts are rejected, not guessed.
+        """
+        csv_data = (
+            b"Date,Description,Amount,Type\n"
+            b"2024-01-15,Uber Ride,25.50,Expense\n"
+            b"2024-01-99,Bad Date,4.75,Expense\n"
+            b"2024-01-17,Bad Amount,abc,Income\n"
+        )
+        files = {"file": ("transactions.csv", csv_data, "text/csv")}
+        
+        response = client.post("/api/v1/upload", files=files)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 1
+        assert data["rejected_count"] == 2
+        assert [r["row"] for r in data["rejected"]] == [2, 3] 
+    
+    def test_upload_without_transaction_echo(self, client, sample_csv_file):
+        """
+        Test that large-file mode only returns the saved count.
+        """
+        files = {"file": ("transactions.csv", sample_csv_file, "text/csv")}
+        
+        response = client.post("/api/v1/upload?include_transactions=false", files=files)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 3
+        assert "transactions" not in data
+    
+    def test_reupload_reports_skipped_rows(self, client, sample_csv_data):
+        """
+        Test that uploading overlapping exports reports inserted vs skipped rows.
+        """
+        files = {"file": ("transactions.csv", sample_csv_data.encode(), "text/csv")}
+        assert client.post("/api/v1/upload", files=files).json()["count"] == 3
+        
+        same = client.post("/api/v1/upload", files=files).json()
+        assert same["duplicate_file"] is True
+        assert same["count"] == 0
+        assert same["skipped_count"] == 3
+        
+        extended = sample_csv_data + "2024-01-18,Office Supplies,42.00,Expense\n"
+        files = {"file": ("transactions.csv", extended.encode(), "text/csv")}
+        overlap = client.post("/api/v1/upload", files=files).json()
+        assert overlap["duplicate_file"] is False
+        assert overlap["count"] == 1
+        assert overlap["skipped_count"] == 3